@@ -0,0 +1 @@
+# Este archivo indica que la carpeta 'controllers' es un paquete de Python
\ No newline at end of file
@@ -0,0 +1,924 @@
+import csv
+import os
+from contextlib import ExitStack, contextmanager
+
+from models.coordinates import Coordinates
+from models.guide import Guide
+from models.guide_library import GuideLibrary
+from models.guide_linter import GuideLinter
+from models.quest import DerivedQuestHistory, QuestHistory
+from models.spatial_index import SpatialIndex
+from utils.background_task import BackgroundWriter
+from utils.data_loader import DataLoader
+from utils.exporters import ExportPipeline
+from utils.file_handler import FileHandler
+from utils.guide_diff import GuideDiff
+from utils.guide_serializer import GuideSerializer
+from utils.lua_generator import LuaGenerator
+from utils.quest_reference import QuestReference
+from utils.route_optimizer import RouteOptimizer
+from utils.step_importer import StepImporter
+
+class GuideError(Exception):
+    """Error de una operación sobre la guía (mensaje pensado para mostrarse al usuario)."""
+
+class GuideController:
+    """
+    Lógica de la aplicación sin dependencias de Tk.
+    
+    Reúne los modelos (guía, historial, linter, biblioteca e índices) y expone
+    las operaciones de edición, guardado, carga, autoguardado y generación con
+    entradas y salidas explícitas. La interfaz gráfica solo pide datos al
+    usuario, llama a estos métodos y actualiza las vistas; las herramientas
+    de línea de comandos y las pruebas de rendimiento usan los mismos métodos
+    sin necesidad de una pantalla.
+    
+    Los errores que deben mostrarse al usuario se lanzan como GuideError.
+    
+    Las vistas no necesitan saber qué método cambió la guía: se suscriben a los
+    eventos de la guía y del historial (ver ChangeNotifier). El linter y el
+    índice espacial se mantienen al día de la misma forma, y el autoguardado,
+    si está activado, se hace una vez por lote de cambios de pasos: se escribe
+    una instantánea de la guía en un hilo de trabajo (BackgroundWriter) sin
+    bloquear la edición.
+    """
+    
+    # Clave de la guía abierta dentro de la biblioteca de guías
+    CURRENT_GUIDE_KEY = "<current guide>"
+    
+    # Eventos de la guía que modifican sus pasos (y por tanto se autoguardan)
+    STEP_EVENTS = ('inserted', 'removed', 'moved', 'updated')
+    
+    def __init__(self, autosave=False):
+        """
+        Inicializa el controlador con una guía vacía.
+        
+        Args:
+            autosave (bool, optional): Autoguardar tras cada lote de cambios de pasos.
+                Defaults to False.
+        """
+        self.guide = Guide()
+        
+        # Historial persistente (entre guías) y estado de las misiones de la guía abierta
+        self.quest_history = QuestHistory()
+        self.guide_quests = DerivedQuestHistory(self.guide)
+        
+        # Referencia de misiones incluida (se consulta cuando el historial no las conoce)
+        self.quest_reference = QuestReference()
+        
+        # Motor de validación del flujo de misiones
+        self.linter = GuideLinter(self.guide)
+        
+        # Biblioteca de guías para consultas entre guías
+        self.guide_library = GuideLibrary()
+        self.guide.subscribe(self.unsync_library)
+        
+        # Índice de rangos de niveles del directorio de la biblioteca (y su directorio)
+        self.level_index = None
+        self.level_index_directory = None
+        
+        # Índice espacial de puntos conocidos (pasos con coordenadas) por zona
+        self.spatial_index = SpatialIndex()
+        self.guide.subscribe(self.update_spatial_index, immediate=True)
+        
+        # Codificadores JSON con caché de pasos (guardado legible, autoguardado compacto)
+        self.serializer = GuideSerializer()
+        self.autosave_serializer = GuideSerializer(compact=True)
+        
+        # Escritor de autoguardados en segundo plano (None si no se autoguarda)
+        self.autosave_writer = None
+        if autosave:
+            self.autosave_writer = BackgroundWriter(self.write_autosave)
+            self.guide.subscribe(self.autosave_changes)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa los cambios de la guía y del historial en un solo lote por modelo,
+        de modo que una operación compuesta actualiza las vistas y autoguarda una vez.
+        """
+        with ExitStack() as stack:
+            stack.enter_context(self.guide.transaction())
+            stack.enter_context(self.quest_history.transaction())
+            yield self
+    
+    def update_spatial_index(self, events):
+        """
+        Aplica los cambios de la guía al índice espacial.
+        
+        Args:
+            events (list): Eventos de la guía (ver Guide)
+        """
+        for event in events:
+            event_type = event['type']
+            if event_type == 'inserted':
+                self.spatial_index.add_steps(event['steps'])
+            elif event_type == 'removed':
+                self.spatial_index.remove_steps(event['steps'])
+            elif event_type == 'updated':
+                self.spatial_index.remove_steps([event['old_step']])
+                self.spatial_index.add_steps([event['step']])
+            elif event_type == 'reset':
+                self.rebuild_spatial_index()
+    
+    def unsync_library(self, events):
+        """
+        Quita la guía abierta de la biblioteca cuando cambia, porque los índices
+        de paso guardados al sincronizarla dejan de ser válidos (ver sync_library).
+        
+        Args:
+            events (list): Eventos de la guía (ver Guide)
+        """
+        if self.CURRENT_GUIDE_KEY in self.guide_library.guides:
+            self.guide_library.remove_guide(self.CURRENT_GUIDE_KEY)
+    
+    def autosave_changes(self, events):
+        """
+        Autoguarda tras un lote de cambios si alguno modificó los pasos.
+        
+        Args:
+            events (list): Eventos de la guía (ver Guide)
+        """
+        if any(event['type'] in self.STEP_EVENTS for event in events):
+            self.autosave_writer.submit(self.get_guide_data(snapshot=True))
+    
+    def set_metadata(self, zone, level_range, next_zone, faction):
+        """
+        Establece los metadatos de la guía.
+        
+        Args:
+            zone (str): Zona de la guía
+            level_range (str): Rango de niveles
+            next_zone (str): Zona siguiente
+            faction (str): Facción (Horde, Alliance, Both)
+        """
+        self.guide.set_metadata(zone, level_range, next_zone, faction)
+    
+    def get_guide_data(self, snapshot=False):
+        """
+        Construye el diccionario serializable de la guía con el historial de misiones.
+        
+        Args:
+            snapshot (bool, optional): Usar instantáneas de la guía y del historial
+                (en O(1)) para codificarlas en otro hilo. Defaults to False.
+        
+        Returns:
+            dict: Datos de la guía
+        """
+        if snapshot:
+            guide_data = self.guide.snapshot()
+            guide_data["quest_history"] = self.quest_history.snapshot()
+            return guide_data
+        
+        guide_data = self.guide.to_dict()
+        guide_data["quest_history"] = self.quest_history.get_all_quests()
+        return guide_data
+    
+    def apply_guide_data(self, guide_data):
+        """
+        Carga los datos de una guía en los modelos.
+        
+        Args:
+            guide_data (dict): Datos de la guía
+        """
+        with self.transaction():
+            self.guide.from_dict(guide_data)
+        
+            # Cargar historial si está disponible
+            if "quest_history" in guide_data:
+                self.quest_history.update_from_dict(guide_data["quest_history"])
+    
+    def new_guide(self):
+        """Vacía la guía abierta (el historial de misiones se conserva)."""
+        with self.transaction():
+            self.guide.clear()
+            self.guide.set_metadata("", "", "", "Horde")
+    
+    @staticmethod
+    def validate_step(step_data):
+        """
+        Valida los datos de un paso.
+        
+        Args:
+            step_data (dict): Datos del paso
+        
+        Raises:
+            GuideError: Si faltan campos obligatorios o las coordenadas no son válidas
+        """
+        if not step_data.get('action') or not step_data.get('quest_name'):
+            raise GuideError("Action and Quest Name are required fields")
+        
+        coords_error = Coordinates.validate_step(step_data)
+        if coords_error:
+            raise GuideError(coords_error)
+    
+    def add_step(self, step_data, index=None):
+        """
+        Añade un paso al final de la guía o sustituye un paso existente.
+        
+        Args:
+            step_data (dict): Datos del paso
+            index (int, optional): Índice del paso a sustituir. Defaults to None (añadir).
+        
+        Returns:
+            int: Índice del paso añadido o actualizado
+        
+        Raises:
+            GuideError: Si el paso no es válido
+        """
+        self.validate_step(step_data)
+        
+        with self.transaction():
+            if index is not None:
+                self.guide.update_step(index, step_data)
+            else:
+                self.guide.add_step(step_data)
+                index = len(self.guide.get_all_steps()) - 1
+            self.record_quest(step_data)
+        return index
+    
+    def record_quest(self, step_data):
+        """
+        Registra en el historial de misiones la misión de un paso.
+        
+        Args:
+            step_data (dict): Datos del paso
+        """
+        if step_data.get('quest_id'):
+            self.quest_history.add_quest(*self.quest_record(step_data))
+    
+    @staticmethod
+    def quest_record(step_data):
+        """
+        Obtiene los argumentos de QuestHistory.add_quest para un paso.
+        
+        Args:
+            step_data (dict): Datos del paso
+        
+        Returns:
+            tuple: (quest_id, quest_name, action, coord_x, coord_y, class)
+        """
+        return (
+            step_data.get('quest_id'),
+            step_data['quest_name'],
+            step_data['action'],
+            step_data.get('coord_x'),
+            step_data.get('coord_y'),
+            step_data.get('class')
+        )
+    
+    @staticmethod
+    def read_step_table(filename, mapping=None, delimiter=None, task=None):
+        """
+        Lee y valida los pasos de una tabla CSV o TSV.
+        No toca los modelos, así que puede ejecutarse en un hilo de trabajo.
+        
+        Args:
+            filename (str): Ruta del archivo
+            mapping (dict, optional): Cabecera -> campo del paso. Defaults to None (detección automática).
+            delimiter (str, optional): Separador de columnas. Defaults to None (detección automática).
+            task (BackgroundTask, optional): Tarea para informar del progreso. Defaults to None.
+        
+        Returns:
+            dict: Resultado de StepImporter.read_steps ('steps', 'errors', 'ignored_columns')
+        
+        Raises:
+            GuideError: Si la tabla no se puede importar
+        """
+        try:
+            return StepImporter().read_steps(filename, mapping, delimiter, task)
+        except (ValueError, csv.Error) as e:
+            raise GuideError(f"Cannot import {os.path.basename(filename)}: {str(e)}")
+    
+    def import_steps(self, steps, index=None):
+        """
+        Inserta un bloque de pasos ya validados y registra sus misiones.
+        
+        Los pasos entran en la guía con una sola inserción y el historial se
+        actualiza con un solo evento, de modo que las vistas se actualizan y la
+        guía se autoguarda una sola vez.
+        
+        Args:
+            steps (list): Pasos a insertar (ver read_step_table)
+            index (int, optional): Posición del primer paso. Defaults to None (al final).
+        
+        Returns:
+            int: Índice del primer paso insertado
+        """
+        if index is None:
+            index = len(self.guide.get_all_steps())
+        with self.transaction():
+            index = self.guide.insert_steps(index, steps)
+            self.quest_history.add_quests(self.quest_record(step) for step in steps if step.get('quest_id'))
+        return index
+    
+    def remove_range(self, start, end):
+        """
+        Elimina un bloque contiguo de pasos.
+        
+        Args:
+            start (int): Índice del primer paso
+            end (int): Índice siguiente al último paso
+        
+        Returns:
+            list: Pasos eliminados
+        """
+        return self.guide.remove_range(start, end)
+    
+    def move_range(self, start, end, target_index):
+        """
+        Mueve un bloque contiguo de pasos.
+        
+        Args:
+            start (int): Índice del primer paso
+            end (int): Índice siguiente al último paso
+            target_index (int): Índice que ocupará el primer paso del bloque
+        
+        Returns:
+            int or None: Nuevo índice del primer paso o None si el bloque no se movió
+        """
+        new_index = self.guide.move_range(start, end, target_index)
+        if new_index is None or new_index == start:
+            return None
+        return new_index
+    
+    def duplicate_range(self, start, end):
+        """
+        Duplica un bloque contiguo de pasos justo después del bloque.
+        
+        Args:
+            start (int): Índice del primer paso
+            end (int): Índice siguiente al último paso
+        
+        Returns:
+            int or None: Índice de la primera copia o None si el rango es inválido
+        """
+        return self.guide.duplicate_range(start, end)
+    
+    def replace_range(self, start, end, steps):
+        """
+        Sustituye un bloque contiguo de pasos como una sola mutación.
+        
+        Args:
+            start (int): Índice del primer paso
+            end (int): Índice siguiente al último paso
+            steps (list): Pasos que ocuparán el bloque
+        
+        Returns:
+            list: Pasos sustituidos
+        """
+        return self.guide.replace_range(start, end, steps)
+    
+    def plan_route(self, start, end):
+        """
+        Calcula un orden más corto para un bloque de pasos, sin aplicarlo.
+        
+        Args:
+            start (int): Índice del primer paso
+            end (int): Índice siguiente al último paso
+        
+        Returns:
+            tuple: (nuevos pasos, distancia antes, distancia después)
+        """
+        steps = self.guide.get_all_steps()
+        
+        # Posición de partida: último paso con coordenadas antes del rango
+        start_coords = None
+        for index in range(start - 1, -1, -1):
+            start_coords = Coordinates.from_step(steps[index])
+            if start_coords is not None:
+                break
+        
+        return RouteOptimizer.optimize(steps[start:end], start_coords)
+    
+    def merge_steps(self, base_steps, their_steps):
+        """
+        Fusiona en la guía abierta los cambios de otra copia a partir de su ancestro común.
+        
+        Args:
+            base_steps (list): Pasos del ancestro común
+            their_steps (list): Pasos de la otra copia
+        
+        Solo se aplican a la guía los bloques que cambian (ver apply_steps), de
+        modo que los pasos no afectados conservan su identificador estable y las
+        vistas y los índices solo actualizan las filas cambiadas.
+        
+        Returns:
+            dict: Resultado de GuideDiff.merge (con 'steps' y 'conflicts')
+        """
+        result = GuideDiff.merge(base_steps, list(self.guide.get_all_steps()), their_steps)
+        self.apply_steps(result['steps'])
+        return result
+    
+    def apply_steps(self, new_steps):
+        """
+        Convierte los pasos de la guía en `new_steps` aplicando solo las diferencias.
+        
+        Args:
+            new_steps (list): Pasos que debe tener la guía
+        
+        Returns:
+            int: Número de bloques modificados
+        """
+        opcodes = [opcode for opcode in GuideDiff.diff(list(self.guide.get_all_steps()), new_steps)
+                   if opcode[0] != 'equal']
+        
+        # De atrás hacia delante: los índices de los bloques anteriores no cambian
+        with self.transaction():
+            for tag, i1, i2, j1, j2 in reversed(opcodes):
+                if tag == 'delete':
+                    self.guide.remove_range(i1, i2)
+                elif tag == 'insert':
+                    self.guide.insert_steps(i1, new_steps[j1:j2])
+                else:
+                    self.guide.replace_range(i1, i2, new_steps[j1:j2])
+        return len(opcodes)
+    
+    def lookup_quest(self, quest_id, action):
+        """
+        Reúne los datos para autocompletar el formulario.
+        
+        Args:
+            quest_id (str): ID de la misión
+            action (str): Acción actual del formulario
+        
+        Returns:
+            dict or None: Diccionario con 'name', 'next_action' y 'coords' (ver
+            QuestHistory.lookup) tomado de la guía abierta, del historial o, si
+            ninguno conoce la misión, de QuestReference.lookup
+        """
+        return self.lookup_known_quest(quest_id, action) or self.lookup_reference_quest(quest_id, action)
+    
+    def lookup_reference_quest(self, quest_id, action):
+        """
+        Consulta una misión en la referencia incluida (QuestReference.lookup).
+        
+        No lee la guía ni el historial, que se modifican en el hilo de Tk, así
+        que es la única parte de lookup_quest que puede ejecutarse en un hilo
+        de trabajo (siempre el mismo: la referencia se abre en la primera consulta).
+        
+        Args:
+            quest_id (str): ID de la misión
+            action (str): Acción actual del formulario
+        
+        Returns:
+            dict or None: Mismo formato que lookup_quest
+        """
+        return self.quest_reference.lookup(quest_id, action)
+    
+    def lookup_known_quest(self, quest_id, action):
+        """
+        Consulta una misión en la guía abierta y en el historial (en memoria).
+        Lee los modelos, así que debe llamarse desde el hilo que los modifica.
+        
+        Args:
+            quest_id (str): ID de la misión
+            action (str): Acción actual del formulario
+        
+        Returns:
+            dict or None: Mismo formato que lookup_quest, o None si ninguno conoce la misión
+        """
+        if not self.guide_quests.has_quest(quest_id):
+            return self.quest_history.lookup(quest_id, action)
+        
+        next_action = self.suggest_next_action(quest_id)
+        
+        # Las coordenadas solo se autocompletan al entregar la misión
+        coords = None
+        if (next_action or action) == 'T':
+            coord_x, coord_y = self.get_quest_coords(quest_id, 'T')
+            if coord_x and coord_y:
+                coords = (coord_x, coord_y)
+        
+        return {
+            'name': self.guide_quests.get_quest_name(quest_id),
+            'next_action': next_action,
+            'coords': coords
+        }
+    
+    def suggest_next_action(self, quest_id):
+        """
+        Sugiere la siguiente acción para una misión.
+        Si la misión aparece en la guía abierta, la sugerencia sale solo de sus
+        pasos actuales; si no, del historial persistente.
+        
+        Args:
+            quest_id (str): ID de la misión
+        
+        Returns:
+            str: Acción sugerida o None si no hay sugerencia
+        """
+        if self.guide_quests.has_quest(quest_id):
+            return self.guide_quests.suggest_next_action(quest_id)
+        return self.quest_history.suggest_next_action(quest_id)
+    
+    def get_quest_coords(self, quest_id, action=None):
+        """
+        Obtiene las coordenadas de una misión, primero de la guía abierta y después del historial.
+        
+        Args:
+            quest_id (str): ID de la misión
+            action (str, optional): Acción específica. Defaults to None.
+        
+        Returns:
+            tuple: Par (coord_x, coord_y) o (None, None) si no hay datos
+        """
+        coords = self.guide_quests.get_quest_coords(quest_id, action)
+        if coords[0] is None:
+            coords = self.quest_history.get_quest_coords(quest_id, action)
+        return coords
+    
+    def get_quest_class(self, quest_id):
+        """
+        Obtiene la clase de una misión, primero de la guía abierta y después del historial.
+        
+        Args:
+            quest_id (str): ID de la misión
+        
+        Returns:
+            str: Clase de la misión o None si no se conoce
+        """
+        return self.guide_quests.get_quest_class(quest_id) or self.quest_history.get_quest_class(quest_id)
+    
+    def get_nearby_points(self, zone, coord_x, coord_y, limit=10):
+        """
+        Busca pasos conocidos cerca de unas coordenadas.
+        
+        Args:
+            zone (str): Zona del paso (si está vacía se usa la zona de la guía)
+            coord_x (str): Coordenada X escrita
+            coord_y (str): Coordenada Y escrita
+            limit (int, optional): Número máximo de resultados. Defaults to 10.
+        
+        Returns:
+            list: Datos de los puntos cercanos con su distancia, del más cercano al más lejano
+        """
+        coords = Coordinates.parse_pair(coord_x, coord_y)
+        if coords is None:
+            return []
+        
+        guide_zone = self.guide.zone
+        zone = zone or guide_zone
+        results = self.spatial_index.nearby(zone, coords[0], coords[1])
+        
+        # Los pasos sin zona propia están indexados en la zona de la guía abierta
+        if zone == guide_zone:
+            results = sorted(results + self.spatial_index.nearby("", coords[0], coords[1]), key=lambda r: r[0])
+        
+        return [dict(data, distance=distance) for distance, _, _, data in results[:limit]]
+    
+    def rebuild_spatial_index(self):
+        """Reconstruye el índice espacial con la guía abierta y la biblioteca."""
+        self.spatial_index.clear()
+        for key, guide in self.guide_library.guides.items():
+            if key != self.CURRENT_GUIDE_KEY:
+                self.spatial_index.add_steps(guide.get_all_steps(), guide.zone)
+        self.spatial_index.add_steps(self.guide.get_all_steps())
+    
+    def get_guide_names(self):
+        """
+        Obtiene los nombres de la guía y de la guía siguiente según los metadatos.
+        
+        Returns:
+            tuple: (nombre de la guía, nombre de la guía siguiente)
+        """
+        return LuaGenerator.get_guide_names(self.guide.zone, self.guide.level_range, self.guide.next_zone)
+    
+    def get_lua_header(self):
+        """
+        Genera la cabecera Lua a partir de los metadatos.
+        
+        Returns:
+            str: Cabecera de registro de la guía
+        """
+        guide_name, next_zone_name = self.get_guide_names()
+        return LuaGenerator.format_header(guide_name, next_zone_name, self.guide.faction)
+    
+    def require_steps(self, operation):
+        """
+        Comprueba que la guía tiene pasos.
+        
+        Args:
+            operation (str): Operación, para el mensaje de error ("generate", "save"...)
+        
+        Raises:
+            GuideError: Si la guía está vacía
+        """
+        if not self.guide.get_all_steps():
+            raise GuideError(f"No quest steps to {operation}")
+    
+    def generate_lua(self, optimize=False):
+        """
+        Genera el código Lua de la guía.
+        
+        Args:
+            optimize (bool, optional): Intentar la salida reducida. Defaults to False.
+        
+        Returns:
+            tuple: (código Lua, informe de LuaGenerator.compare_output o None). La salida
+            reducida solo se devuelve si el informe indica que es equivalente.
+        
+        Raises:
+            GuideError: Si la guía está vacía
+        """
+        self.require_steps("generate")
+        
+        steps = self.guide.get_all_steps()
+        guide_name, next_zone_name = self.get_guide_names()
+        lua_code = LuaGenerator.generate_lua(steps, guide_name, next_zone_name, self.guide.faction)
+        if not optimize:
+            return lua_code, None
+        
+        optimized_code = LuaGenerator.generate_lua(steps, guide_name, next_zone_name, self.guide.faction,
+                                                   optimize=True, guide_zone=self.guide.zone)
+        report = LuaGenerator.compare_output(lua_code, optimized_code, self.guide.zone)
+        return (optimized_code if report['equivalent'] else lua_code), report
+    
+    def generate_variants(self, specs, optimize=False):
+        """
+        Genera varias compilaciones Lua (facción/clase/raza) de la guía.
+        
+        Args:
+            specs (list): Variantes como "faction[:class[:race]]"
+            optimize (bool, optional): Salida reducida. Defaults to False.
+        
+        Returns:
+            dict: Nombre de la variante -> código Lua
+        
+        Raises:
+            GuideError: Si la guía está vacía o alguna variante no es válida
+        """
+        self.require_steps("generate")
+        
+        races_by_faction = DataLoader.load_races_by_faction()
+        classes = DataLoader.load_class_list()
+        try:
+            variants = [LuaGenerator.parse_variant(spec, self.guide.faction, races_by_faction, classes)
+                        for spec in specs]
+        except ValueError as e:
+            raise GuideError(str(e))
+        guide_name, next_zone_name = self.get_guide_names()
+        return LuaGenerator.generate_variants(
+            self.guide.get_all_steps(), guide_name, next_zone_name, variants,
+            optimize=optimize, guide_zone=self.guide.zone
+        )
+    
+    def generate_chunks(self, max_steps=None, split_at_levels=True, optimize=False):
+        """
+        Divide la guía en bloques RegisterGuide encadenados.
+        
+        Args:
+            max_steps (int, optional): Máximo de pasos por bloque. Defaults to None.
+            split_at_levels (bool, optional): Cortar en los hitos de nivel. Defaults to True.
+            optimize (bool, optional): Salida reducida. Defaults to False.
+        
+        Returns:
+            list: Pares (rango de niveles, código Lua)
+        
+        Raises:
+            GuideError: Si la guía está vacía
+        """
+        self.require_steps("generate")
+        
+        return LuaGenerator.generate_chunked_lua(
+            self.guide.get_all_steps(), self.guide.zone, self.guide.level_range, self.guide.next_zone,
+            self.guide.faction, max_steps=max_steps, split_at_levels=split_at_levels, optimize=optimize
+        )
+    
+    def get_variant_files(self, directory, code_by_variant):
+        """
+        Calcula los archivos de salida de las variantes Lua.
+        
+        Args:
+            directory (str): Directorio de salida
+            code_by_variant (dict): Nombre de la variante -> código Lua
+        
+        Returns:
+            dict: Ruta del archivo -> código Lua
+        """
+        return {
+            os.path.join(directory, FileHandler.get_lua_filename(self.guide.zone, self.guide.level_range, name)): code
+            for name, code in code_by_variant.items()
+        }
+    
+    def get_export_name(self):
+        """
+        Obtiene el nombre predeterminado (sin extensión) de los archivos exportados.
+        
+        Returns:
+            str: Nombre basado en la zona y el rango de niveles
+        """
+        return os.path.splitext(FileHandler.get_lua_filename(self.guide.zone, self.guide.level_range))[0]
+    
+    @staticmethod
+    def export_guide(guide_data, formats, directory, base_name, optimize=False, task=None):
+        """
+        Exporta una guía a varios formatos con un solo recorrido de los pasos.
+        No toca los modelos, así que puede ejecutarse en un hilo de trabajo.
+        
+        Args:
+            guide_data (dict): Datos de la guía (obtenidos con get_guide_data)
+            formats (list): Claves de los formatos (ver ExportPipeline.EXPORTERS)
+            directory (str): Directorio de salida
+            base_name (str): Nombre de los archivos sin extensión
+            optimize (bool, optional): Salida Lua reducida. Defaults to False.
+            task (BackgroundTask, optional): Tarea para informar del progreso. Defaults to None.
+        
+        Returns:
+            list: Rutas de los archivos escritos
+        
+        Raises:
+            GuideError: Si algún formato no existe
+        """
+        try:
+            return ExportPipeline.export_to_files(
+                guide_data["steps"], guide_data["metadata"], formats, directory, base_name,
+                optimize=optimize, task=task
+            )
+        except ValueError as e:
+            raise GuideError(str(e))
+    
+    def write_guide(self, filename, guide_data, task=None):
+        """
+        Escribe una guía en disco y actualiza el índice de niveles de su directorio.
+        No toca los modelos, así que puede ejecutarse en un hilo de trabajo.
+        
+        Args:
+            filename (str): Ruta del archivo
+            guide_data (dict): Datos de la guía (obtenidos con get_guide_data)
+            task (BackgroundTask, optional): Tarea para informar del progreso. Defaults to None.
+        """
+        self.serializer.write(filename, guide_data, task)
+        FileHandler.update_level_index(filename, guide_data)
+    
+    def write_autosave(self, guide_data):
+        """
+        Escribe un autoguardado (solo se codifican los pasos cambiados desde el anterior).
+        No toca los modelos, así que puede ejecutarse en un hilo de trabajo.
+        
+        Args:
+            guide_data (dict): Datos de la guía (obtenidos con get_guide_data)
+        
+        Returns:
+            bool: True si se guardó correctamente
+        """
+        return FileHandler.autosave(guide_data, self.autosave_serializer)
+    
+    def guide_saved(self, filename, guide_data):
+        """
+        Registra una guía guardada en el índice de niveles cargado, si es de la biblioteca.
+        
+        Args:
+            filename (str): Ruta del archivo guardado
+            guide_data (dict): Datos de la guía guardada
+        """
+        directory = os.path.dirname(os.path.abspath(filename))
+        if self.level_index is not None and directory == self.level_index_directory:
+            metadata = guide_data["metadata"]
+            self.level_index.add(os.path.join(directory, os.path.basename(filename)),
+                                 metadata["zone"], metadata["level_range"], metadata["faction"],
+                                 FileHandler.get_guide_stamp(filename))
+    
+    def save_guide(self, filename):
+        """
+        Guarda la guía abierta en el hilo actual.
+        
+        Args:
+            filename (str): Ruta del archivo
+        
+        Returns:
+            dict: Datos guardados
+        
+        Raises:
+            GuideError: Si la guía está vacía
+        """
+        self.require_steps("save")
+        guide_data = self.get_guide_data()
+        self.write_guide(filename, guide_data)
+        self.guide_saved(filename, guide_data)
+        return guide_data
+    
+    def load_guide(self, filename):
+        """
+        Carga una guía desde un archivo en el hilo actual.
+        
+        Args:
+            filename (str): Ruta del archivo
+        
+        Returns:
+            dict: Datos de la guía cargada
+        """
+        guide_data = FileHandler.read_guide_file(filename)
+        self.apply_guide_data(guide_data)
+        return guide_data
+    
+    def autosave(self):
+        """
+        Guarda automáticamente el estado actual.
+        
+        Returns:
+            bool: True si se guardó correctamente
+        """
+        # Esperar a los autoguardados en segundo plano para no quedar sobrescritos
+        if self.autosave_writer is not None:
+            self.autosave_writer.flush()
+        return self.write_autosave(self.get_guide_data())
+    
+    def close(self):
+        """Termina los autoguardados pendientes antes de cerrar la aplicación."""
+        if self.autosave_writer is not None:
+            self.autosave_writer.flush()
+    
+    def load_autosave(self, basename=None):
+        """
+        Carga un autoguardado (por defecto, el más reciente).
+        
+        Args:
+            basename (str, optional): Nombre del archivo de autoguardado. Defaults to None.
+        
+        Returns:
+            dict or None: Datos cargados o None si no hay autoguardados
+        """
+        basename = basename or FileHandler.get_latest_autosave()
+        if not basename:
+            return None
+        guide_data = FileHandler.read_autosave(basename)
+        self.apply_guide_data(guide_data)
+        return guide_data
+    
+    def import_quest_db(self, filename):
+        """
+        Importa una base de datos de misiones en el historial.
+        
+        Args:
+            filename (str): Ruta del archivo JSON
+        
+        Returns:
+            int: Número de misiones importadas
+        """
+        imported_db = FileHandler.read_quest_db(filename)
+        self.quest_history.update_from_dict(imported_db)
+        return len(imported_db)
+    
+    def load_library(self, directory):
+        """
+        Carga en la biblioteca todas las guías de un directorio y su índice de niveles.
+        
+        Args:
+            directory (str): Directorio con los archivos de guía
+        """
+        self.guide_library = GuideLibrary()
+        for path, guide_data in FileHandler.load_guide_directory(directory).items():
+            guide = Guide()
+            guide.from_dict(guide_data)
+            self.guide_library.add_guide(path, guide)
+        self.rebuild_spatial_index()
+        
+        self.level_index_directory = os.path.abspath(directory)
+        self.level_index = FileHandler.load_level_index(self.level_index_directory)
+    
+    def sync_library(self):
+        """
+        Incorpora la guía abierta a la biblioteca, sustituyendo la copia con el mismo nombre.
+        
+        La biblioteca guarda los índices de los pasos en el momento de sincronizar,
+        así que la guía abierta sale de ella en cuanto cambia (ver unsync_library):
+        las consultas sobre la guía abierta requieren llamar antes a este método.
+        Los puntos de las copias sustituidas se quitan también del índice espacial.
+        
+        Returns:
+            GuideLibrary: Biblioteca actualizada
+        """
+        if self.guide.get_all_steps():
+            guide_name = self.guide.get_guide_name()
+            for key in list(self.guide_library.guides):
+                if key != self.CURRENT_GUIDE_KEY and self.guide_library.get_guide_name(key) == guide_name:
+                    self.spatial_index.remove_steps(self.guide_library.guides[key].get_all_steps())
+                    self.guide_library.remove_guide(key)
+            self.guide_library.add_guide(self.CURRENT_GUIDE_KEY, self.guide)
+        return self.guide_library
+    
+    def find_guides(self, level_text, faction=None, zone=None):
+        """
+        Busca en el índice de niveles las guías que cubren un nivel o rango de niveles.
+        
+        Args:
+            level_text (str): Nivel o rango ("34" o "30-35")
+            faction (str, optional): Facción del personaje. Defaults to None.
+            zone (str, optional): Limitar a una zona. Defaults to None.
+        
+        Returns:
+            list: Pares (ruta de la guía, entrada del índice) ordenados por nivel inicial
+        
+        Raises:
+            GuideError: Si no hay biblioteca cargada o el nivel no es válido
+        """
+        if self.level_index is None:
+            raise GuideError("Load a guide library first.")
+        
+        low, high = Guide.parse_level_range(level_text if '-' in level_text else f"{level_text}-{level_text}")
+        if low is None:
+            raise GuideError(f"Invalid level: {level_text}")
+        
+        keys = self.level_index.overlap(min(low, high), max(low, high), faction, zone)
+        return [(key, self.level_index.entries[key]) for key in keys]
@@ -1,21 +1,30 @@
+import os
 import tkinter as tk
-from tkinter import messagebox
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk, messagebox, simpledialog
 
 from gui.guide_info_frame import GuideInfoFrame
 from gui.form_frame import FormFrame
 from gui.quest_list_frame import QuestListFrame
-from gui.dialogs import CodeViewDialog, QuestHistoryDialog, show_action_types_dialog, confirm_new_guide
+from gui.lua_preview_frame import LuaPreviewFrame
+from gui.file_dialogs import FileDialogs
+from gui.dialogs import (CodeViewDialog, QuestHistoryDialog, AutosaveBrowserDialog, GuideLibraryDialog, ProgressDialog,
+                         show_action_types_dialog, confirm_new_guide)
 
-from models.guide import Guide
-from models.quest import QuestHistory
+from controllers.guide_controller import GuideController, GuideError
 
 from utils.data_loader import DataLoader
 from utils.file_handler import FileHandler
-from utils.lua_generator import LuaGenerator
+from utils.background_task import BackgroundTask
+from utils.exporters import ExportPipeline
+from utils.guide_diff import GuideDiff
 
 class GuiaPhermuthCreator:
     """Clase principal de la aplicación GuiaPhermuth Quest Guide Creator."""
     
+    # Intervalo (ms) para comprobar si terminó una consulta de misión
+    LOOKUP_POLL_INTERVAL = 20
+    
     def __init__(self, root):
         """
         Inicializa la aplicación.
@@ -27,13 +36,22 @@ class GuiaPhermuthCreator:
         self.root.title("GuiaPhermuth Quest Guide Creator")
         self.root.geometry("1000x800")
         
-        # Inicializar modelos
-        self.guide = Guide()
-        self.quest_history = QuestHistory()
+        # Lógica de la aplicación y modelos (sin dependencias de Tk)
+        self.controller = GuideController(autosave=True)
+        
+        # Hilo único para las consultas a la referencia de misiones y la consulta pendiente
+        self.lookup_executor = ThreadPoolExecutor(max_workers=1)
+        self.pending_lookup = None
         
         # Variable para rastrear el paso que se está editando
         self.editing_step_index = None
         
+        # Mostrar u ocultar la vista previa Lua acoplada
+        self.show_lua_preview_var = tk.BooleanVar(value=False)
+        
+        # Generar la salida Lua reducida
+        self.optimize_lua_var = tk.BooleanVar(value=False)
+        
         # Añadir protocolo para manejar cierre de la aplicación
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
@@ -42,6 +60,7 @@ class GuiaPhermuthCreator:
         
         # Crear widgets principales
         self.guide_info_frame = GuideInfoFrame(self.root)
+        self.guide_info_frame.set_change_callback(self.sync_metadata)
         self.guide_info_frame.pack(fill="x", padx=10, pady=10)
         
         self.form_frame = FormFrame(
@@ -51,20 +70,34 @@ class GuiaPhermuthCreator:
             on_generate_lua=self.generate_lua,
             on_delete_selected=self.delete_selected,
             on_move_up=lambda: self.move_step(-1),
-            on_move_down=lambda: self.move_step(1)
+            on_move_down=lambda: self.move_step(1),
+            on_move_to=self.move_selected_to,
+            on_duplicate_selected=self.duplicate_selected
         )
         self.form_frame.set_quest_changed_callback(self.quest_id_changed)
         
         # Establecer callback para obtener coordenadas
-        self.form_frame.set_coords_callback(self.get_quest_coords)
+        self.form_frame.set_coords_callback(self.controller.get_quest_coords)
+        self.form_frame.set_nearby_callback(self.get_nearby_points)
         
         self.form_frame.pack(fill="x", padx=10, pady=10)
         
+        # Lista de pasos y vista previa Lua (acoplada a la derecha cuando está visible)
+        self.content_pane = ttk.PanedWindow(self.root, orient="horizontal")
+        self.content_pane.pack(fill="both", expand=True, padx=10, pady=10)
+        
         self.quest_list_frame = QuestListFrame(
-            self.root,
-            on_edit_step=self.edit_step
+            self.content_pane,
+            on_edit_step=self.edit_step,
+            on_drop_steps=self.drop_steps
         )
-        self.quest_list_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.quest_list_frame.set_diagnostics_callback(self.controller.linter.get_diagnostics)
+        self.content_pane.add(self.quest_list_frame.frame, weight=3)
+        
+        self.lua_preview = LuaPreviewFrame(self.content_pane)
+        
+        # Las vistas se actualizan a partir de los eventos de la guía
+        self.controller.guide.subscribe(self.guide_changed)
         
         # Cargar datos predefinidos
         self.load_predefined_data()
@@ -77,11 +110,16 @@ class GuiaPhermuthCreator:
                                     "Hay una edición en progreso. ¿Descartar los cambios y salir?"):
                 return
         
+        # Terminar los autoguardados en segundo plano
+        self.controller.close()
+        
         # Preguntar si desea guardar la guía antes de salir
-        if self.guide.get_all_steps():
+        if self.controller.guide.get_all_steps():
             if messagebox.askyesno("Guardar antes de salir",
                                 "¿Deseas guardar la guía antes de salir?"):
-                self.save_guide()
+                # El guardado es asíncrono: cerrar cuando termine
+                if self.save_guide(on_saved=self.root.destroy):
+                    return
         
         # Cerrar la aplicación
         self.root.destroy()
@@ -95,11 +133,14 @@ class GuiaPhermuthCreator:
         file_menu.add_command(label="New Guide", command=self.new_guide)
         file_menu.add_command(label="Save Guide", command=self.save_guide)
         file_menu.add_command(label="Load Guide", command=self.load_guide)
+        file_menu.add_command(label="Export...", command=self.export_guide)
+        file_menu.add_command(label="Import Steps (CSV/TSV)...", command=self.import_steps)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         
         file_menu.add_separator()
         file_menu.add_command(label="Load Last Autosave", command=self.load_last_autosave)
+        file_menu.add_command(label="Browse Autosaves...", command=self.browse_autosaves)
         file_menu.add_command(label="Force Autosave Now", command=self.force_autosave)
         
         # Menú de misiones
@@ -107,6 +148,23 @@ class GuiaPhermuthCreator:
         quest_menu.add_command(label="View Quest History", command=self.view_quest_history)
         quest_menu.add_command(label="Export Quest Database", command=self.export_quest_db)
         quest_menu.add_command(label="Import Quest Database", command=self.import_quest_db)
+        quest_menu.add_separator()
+        quest_menu.add_command(label="Load Guide Library...", command=self.load_guide_library)
+        quest_menu.add_command(label="Check Guide Library", command=self.view_guide_library)
+        quest_menu.add_command(label="Find Guides By Level...", command=self.find_guides_by_level)
+        
+        # Menú de herramientas
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        tools_menu.add_checkbutton(label="Show Lua Preview", variable=self.show_lua_preview_var,
+                                   command=self.toggle_lua_preview)
+        tools_menu.add_separator()
+        tools_menu.add_checkbutton(label="Optimize Lua Output", variable=self.optimize_lua_var)
+        tools_menu.add_command(label="Generate Lua Variants...", command=self.generate_lua_variants)
+        tools_menu.add_command(label="Generate Chunked Lua...", command=self.generate_chunked_lua)
+        tools_menu.add_command(label="Optimize Route", command=self.optimize_route)
+        tools_menu.add_separator()
+        tools_menu.add_command(label="Compare With Guide...", command=self.compare_with_guide)
+        tools_menu.add_command(label="Merge Guides...", command=self.merge_guides)
         
         # Menú de ayuda
         help_menu = tk.Menu(menubar, tearoff=0)
@@ -116,6 +174,7 @@ class GuiaPhermuthCreator:
         # Añadir menús a la barra de menú
         menubar.add_cascade(label="File", menu=file_menu)
         menubar.add_cascade(label="Quests", menu=quest_menu)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
         menubar.add_cascade(label="Help", menu=help_menu)
         
         self.root.config(menu=menubar)
@@ -138,87 +197,52 @@ class GuiaPhermuthCreator:
             Args:
                 step_data (dict): Datos del paso a añadir o actualizar
             """
-            # Validar campos requeridos
-            if not step_data['action'] or not step_data['quest_name']:
-                messagebox.showerror("Error", "Action and Quest Name are required fields")
+            try:
+                index_to_select = self.controller.add_step(step_data, self.editing_step_index)
+            except GuideError as e:
+                messagebox.showerror("Error", str(e))
                 return
             
-            index_to_select = None
-            
             if self.editing_step_index is not None:
-                # Estamos editando un paso existente
-                # Actualizar en el modelo Guide
-                self.guide.update_step(self.editing_step_index, step_data)
-                
-                # Guardamos el índice para seleccionarlo después
-                index_to_select = self.editing_step_index
-                
                 # Restablecer el índice de edición
                 self.editing_step_index = None
                 
                 # Cambiar la UI al modo de adición
                 self.form_frame.set_edit_mode(False)
-            else:
-                # Añadir nuevo paso al modelo Guide
-                self.guide.add_step(step_data)
-                # Seleccionaremos el último paso
-                index_to_select = len(self.guide.get_all_steps()) - 1
             
-            # Actualizar historial de misiones (en ambos casos)
-            quest_id = step_data['quest_id']
-            if quest_id:
-                self.quest_history.add_quest(
-                    quest_id, 
-                    step_data['quest_name'],
-                    step_data['action'],
-                    step_data.get('coord_x'),
-                    step_data.get('coord_y'),
-                    step_data.get('class')
-                )
-            
-            # Actualizar vista
-            self.quest_list_frame.refresh(self.guide.get_all_steps())
-
-            # Después de refrescar la lista, quitar el destacado de edición
+            # La lista ya se actualizó con el evento de la guía: quitar el destacado de edición
             self.quest_list_frame.highlight_editing_row(None)
             
             # Seleccionar el paso que acabamos de añadir/actualizar
-            if index_to_select is not None:
-                self.quest_list_frame.select_by_index(index_to_select)
+            self.quest_list_frame.select_by_index(index_to_select)
             
             # Limpiar formulario
             self.clear_form()
             
             # Sugerir siguiente acción si aplica
+            quest_id = step_data['quest_id']
             if quest_id:
-                next_action = self.quest_history.suggest_next_action(quest_id)
+                next_action = self.controller.suggest_next_action(quest_id)
                 if next_action:
                     self.form_frame.set_next_action(next_action)
             
-            # Autoguardar
-            self.autosave()
-    
-    def get_quest_coords(self, quest_id, action):
+    def get_nearby_points(self, zone, coord_x, coord_y):
         """
-        Obtiene coordenadas para una misión y acción específicas.
+        Busca pasos conocidos cerca de unas coordenadas.
         
         Args:
-            quest_id (str): ID de la misión
-            action (str): Tipo de acción
+            zone (str): Zona del paso (si está vacía se usa la zona de la guía)
+            coord_x (str): Coordenada X escrita
+            coord_y (str): Coordenada Y escrita
             
         Returns:
-            tuple: Coordenadas (x, y) o (None, None) si no existen
+            list: Datos de los puntos cercanos con su distancia, del más cercano al más lejano
         """
-        return self.quest_history.get_quest_coords(quest_id, action)
-    
-    def clear_form(self):
-        """Limpia el formulario y cancela cualquier edición en progreso."""
-        self.form_frame.clear_form()
+        return self.controller.get_nearby_points(zone, coord_x, coord_y)
         
-        # Si estábamos editando, cancelar la edición
-        if self.editing_step_index is not None:
-            self.editing_step_index = None
-            self.form_frame.update_add_button_text("Add Step")
+    def sync_metadata(self):
+        """Copia en la guía los metadatos del formulario de información cada vez que cambian."""
+        self.controller.set_metadata(*self.guide_info_frame.get_metadata())
     
     def generate_lua(self):
         """Genera y muestra el código Lua."""
@@ -228,45 +252,187 @@ class GuiaPhermuthCreator:
                                     "Hay una edición en progreso. ¿Deseas continuar sin guardar los cambios?"):
                 return
         
-        # Verificar que hay pasos para generar
-        if not self.guide.get_all_steps():
-            messagebox.showerror("Error", "No quest steps to generate")
+        try:
+            lua_code, report = self.controller.generate_lua(optimize=self.optimize_lua_var.get())
+        except GuideError as e:
+            messagebox.showerror("Error", str(e))
             return
+        title = "Generated Lua Code"
         
-        # Obtener metadatos de la guía
-        zone, level_range, next_zone, faction = self.guide_info_frame.get_metadata()
-        
-        # Generar nombre de la guía
-        if zone and level_range:
-            guide_name = f"{zone} ({level_range})"
-            if next_zone and '-' in level_range:
-                next_zone_name = f"{next_zone} ({level_range.split('-')[1]}-XX)"
+        # Salida reducida: solo se usa si describe exactamente los mismos pasos
+        if report is not None:
+            if report['equivalent']:
+                title += f" (optimized, {report['saved_bytes']} bytes saved)"
             else:
-                next_zone_name = next_zone
-        else:
-            guide_name = "Custom Guide"
-            next_zone_name = next_zone if next_zone else "nil"
-        
-        # Generar código Lua
-        lua_code = LuaGenerator.generate_lua(
-            self.guide.get_all_steps(),
-            guide_name,
-            next_zone_name,
-            faction
-        )
+                messagebox.showwarning("Optimize Lua Output",
+                                       "Optimized output did not round-trip; using the normal output.")
         
         # Mostrar el código generado
+        zone, level_range = self.controller.guide.zone, self.controller.guide.level_range
         dialog = CodeViewDialog(
             self.root,
-            "Generated Lua Code",
+            title,
             lua_code,
             on_copy=lambda code: self.root.clipboard_clear() or self.root.clipboard_append(code),
-            on_save=lambda code: FileHandler.save_lua_to_file(code, zone, level_range),
-            on_close=lambda: None
+            on_save=lambda code: self.save_lua_code(code, zone, level_range),
+            on_close=lambda: None,
+            highlight=True
+        )
+    
+    def generate_lua_variants(self):
+        """Genera y guarda varias compilaciones Lua (facción/clase/raza) de la guía."""
+        if not self.controller.guide.get_all_steps():
+            messagebox.showerror("Error", "No quest steps to generate")
+            return
+        
+        faction = self.controller.guide.faction
+        default_specs = "Horde Alliance" if faction == "Both" else faction
+        specs = simpledialog.askstring(
+            "Lua Variants",
+            "Variants as faction[:class[:race]], separated by spaces:",
+            initialvalue=default_specs,
+            parent=self.root
+        )
+        if not specs or not specs.split():
+            return
+        
+        directory = FileDialogs.choose_guide_directory("Select output folder")
+        if not directory:
+            return
+        
+        try:
+            code_by_variant = self.controller.generate_variants(specs.split(), optimize=self.optimize_lua_var.get())
+        except GuideError as e:
+            messagebox.showerror("Lua Variants", str(e))
+            return
+        
+        try:
+            written = FileHandler.write_text_files(self.controller.get_variant_files(directory, code_by_variant))
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al guardar las variantes: {str(e)}")
+            return
+        
+        messagebox.showinfo("Lua Variants",
+                            f"{len(written)} variants saved:\n" +
+                            "\n".join(os.path.basename(filename) for filename in written))
+    
+    def generate_chunked_lua(self):
+        """Divide la guía en bloques RegisterGuide encadenados y los guarda en archivos."""
+        if not self.controller.guide.get_all_steps():
+            messagebox.showerror("Error", "No quest steps to generate")
+            return
+        
+        max_steps = simpledialog.askinteger(
+            "Chunked Lua",
+            "Maximum steps per chunk (0 = split only at level milestones):",
+            initialvalue=300,
+            minvalue=0,
+            parent=self.root
         )
+        if max_steps is None:
+            return
+        
+        directory = FileDialogs.choose_guide_directory("Select output folder")
+        if not directory:
+            return
+        
+        chunks = self.controller.generate_chunks(max_steps=max_steps or None, optimize=self.optimize_lua_var.get())
+        
+        guide = self.controller.guide
+        try:
+            written = FileHandler.write_text_files(
+                FileHandler.get_chunk_files(directory, guide.zone, guide.level_range, chunks)
+            )
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al guardar los fragmentos: {str(e)}")
+            return
+        
+        messagebox.showinfo("Chunked Lua",
+                            f"{len(written)} chunks saved:\n" +
+                            "\n".join(os.path.basename(filename) for filename in written))
+    
+    def get_lua_header(self):
+        """
+        Genera la cabecera Lua a partir de los metadatos de la guía.
+        
+        Returns:
+            str: Cabecera de registro de la guía
+        """
+        return self.controller.get_lua_header()
+    
+    def toggle_lua_preview(self):
+        """Muestra u oculta la vista previa Lua acoplada."""
+        if self.show_lua_preview_var.get():
+            self.content_pane.add(self.lua_preview.frame, weight=2)
+            self.reload_lua_preview()
+        else:
+            self.content_pane.forget(self.lua_preview.frame)
+    
+    def reload_lua_preview(self):
+        """Carga de nuevo todo el código en la vista previa (solo al cambiar de guía)."""
+        if self.show_lua_preview_var.get():
+            self.lua_preview.load(self.get_lua_header(), self.controller.guide.get_all_steps())
+    
+    def guide_changed(self, events):
+        """
+        Aplica a las vistas un lote de cambios de la guía.
+        Solo se tocan las filas y líneas afectadas; al cambiar de guía se recarga todo.
+        
+        Args:
+            events (list): Eventos de la guía (ver Guide)
+        """
+        preview = self.show_lua_preview_var.get()
+        current_index = None
+        
+        # Pasos cuyas filas se escribieron en este lote (ya con sus diagnósticos finales)
+        written_steps = set()
+        
+        for event in events:
+            event_type = event['type']
+            if event_type == 'reset':
+                # Las vistas se recargan con el estado final: el resto del lote ya está incluido
+                self.quest_list_frame.refresh(self.controller.guide.get_all_steps())
+                self.reload_lua_preview()
+                self.controller.linter.pop_changed_steps()
+                return
+            
+            if event_type == 'inserted':
+                self.quest_list_frame.insert_rows(event['index'], event['steps'])
+                written_steps.update(id(step) for step in event['steps'])
+                if preview:
+                    self.lua_preview.replace_steps(event['index'], 0, event['steps'])
+                current_index = event['index']
+            elif event_type == 'removed':
+                self.quest_list_frame.delete_rows(event['index'], event['index'] + len(event['steps']))
+                if preview:
+                    self.lua_preview.replace_steps(event['index'], len(event['steps']), [])
+                current_index = event['index'] - 1
+            elif event_type == 'moved':
+                self.quest_list_frame.move_rows(event['start'], event['end'], event['index'])
+                if preview:
+                    self.lua_preview.move_steps(event['start'], event['end'], event['index'])
+                current_index = event['index']
+            elif event_type == 'updated':
+                self.quest_list_frame.update_row(event['index'], event['step'])
+                written_steps.add(id(event['step']))
+                if preview:
+                    self.lua_preview.replace_steps(event['index'], 1, [event['step']])
+                current_index = event['index']
+            elif event_type == 'metadata':
+                self.update_lua_preview_header()
+        
+        # Diagnósticos de los pasos no afectados directamente (misma misión)
+        self.update_diagnostics(self.controller.linter.pop_changed_steps() - written_steps)
+        if preview and current_index is not None:
+            self.lua_preview.show_step(current_index)
+    
+    def update_lua_preview_header(self):
+        """Actualiza la cabecera de la vista previa al cambiar los metadatos."""
+        if self.show_lua_preview_var.get():
+            self.lua_preview.set_header(self.get_lua_header())
     
     def delete_selected(self):
-        """Elimina el paso seleccionado."""
+        """Elimina los pasos seleccionados."""
         # Si estamos editando, preguntar si quiere cancelar la edición primero
         if self.editing_step_index is not None:
             if not messagebox.askyesno("Edición en progreso",
@@ -278,54 +444,166 @@ class GuiaPhermuthCreator:
             self.form_frame.set_edit_mode(False)
             self.clear_form()
         
-        selected_index = self.quest_list_frame.get_selected_index()
-        if selected_index is None:
+        selected_indices = self.quest_list_frame.get_selected_indices()
+        if not selected_indices:
             return
         
         # Confirmar eliminación
-        if not messagebox.askyesno("Confirmar eliminación",
-                                "¿Estás seguro de que deseas eliminar este paso?"):
+        if len(selected_indices) == 1:
+            message = "¿Estás seguro de que deseas eliminar este paso?"
+        else:
+            message = f"¿Estás seguro de que deseas eliminar {len(selected_indices)} pasos?"
+        if not messagebox.askyesno("Confirmar eliminación", message):
             return
         
-        # Eliminar del modelo
-        self.guide.remove_step(selected_index)
-        
-        # Actualizar vista
-        self.quest_list_frame.refresh(self.guide.get_all_steps())
-        
-        # Autoguardar
-        self.autosave()
+        # Eliminar del modelo por bloques contiguos, del último al primero (un solo lote)
+        with self.controller.transaction():
+            for start, end in reversed(self.split_into_ranges(selected_indices)):
+                self.controller.remove_range(start, end)
     
     def move_step(self, direction):
         """
-        Mueve un paso hacia arriba o hacia abajo en la guía.
+        Mueve los pasos seleccionados hacia arriba o hacia abajo en la guía.
         
         Args:
             direction (int): Dirección de movimiento (-1 para arriba, 1 para abajo)
         """
-        # Si estamos editando y se intenta mover otro paso, advertir al usuario
-        if self.editing_step_index is not None:
-            messagebox.showwarning("Edición en progreso",
-                                "Por favor, termina la edición actual antes de mover pasos.")
+        selected_range = self.get_selected_range("mover")
+        if selected_range is None:
             return
         
-        selected_index = self.quest_list_frame.get_selected_index()
-        if selected_index is None:
+        start, _ = selected_range
+        self.move_range(selected_range, start + direction)
+    
+    def move_selected_to(self):
+        """Mueve los pasos seleccionados a una posición indicada por el usuario."""
+        selected_range = self.get_selected_range("mover")
+        if selected_range is None:
             return
         
-        # Mover en el modelo
-        new_index = self.guide.move_step(selected_index, direction)
+        position = simpledialog.askinteger(
+            "Move To",
+            "Posición de destino:",
+            parent=self.root,
+            minvalue=1,
+            maxvalue=len(self.controller.guide.get_all_steps())
+        )
+        if position is None:
+            return
+        
+        self.move_range(selected_range, position - 1)
+    
+    def move_range(self, selected_range, target_index):
+        """
+        Mueve un bloque de pasos y selecciona su nueva posición.
+        
+        Args:
+            selected_range (tuple): Par (inicio, fin) del bloque a mover
+            target_index (int): Índice que ocupará el primer paso del bloque
+        """
+        start, end = selected_range
+        
+        # Mover en el modelo (las vistas se actualizan con el evento de la guía)
+        new_index = self.controller.move_range(start, end, target_index)
         if new_index is None:
             return
         
-        # Actualizar vista
-        self.quest_list_frame.refresh(self.guide.get_all_steps())
+        # Seleccionar los ítems movidos
+        self.quest_list_frame.select_range(new_index, new_index + end - start)
+    
+    def drop_steps(self, target_index):
+        """
+        Mueve los pasos seleccionados a la fila donde se soltaron al arrastrar.
+        
+        Args:
+            target_index (int): Índice de la fila sobre la que se soltaron
+        """
+        selected_range = self.get_selected_range("mover")
+        if selected_range is None:
+            return
+        
+        start, end = selected_range
+        if start <= target_index < end:
+            return
         
-        # Seleccionar el ítem movido
-        self.quest_list_frame.select_by_index(new_index)
+        # Al bajar, el bloque termina en la fila de destino
+        if target_index >= end:
+            target_index -= end - start - 1
+        self.move_range(selected_range, target_index)
+    
+    def update_diagnostics(self, changed_step_ids):
+        """
+        Actualiza en la lista los diagnósticos de los pasos indicados.
         
-        # Autoguardar
-        self.autosave()
+        Args:
+            changed_step_ids (set): Claves del linter de los pasos cuyos diagnósticos cambiaron
+        """
+        steps = self.controller.guide.get_all_steps()
+        for step_key in changed_step_ids:
+            step = self.controller.linter.steps_by_id.get(step_key)
+            index = steps.index_of_step(step) if step is not None else None
+            if index is not None:
+                self.quest_list_frame.update_row_diagnostics(index, self.controller.linter.get_diagnostics(step))
+    
+    def duplicate_selected(self):
+        """Duplica los pasos seleccionados justo después del bloque."""
+        selected_range = self.get_selected_range("duplicar")
+        if selected_range is None:
+            return
+        
+        start, end = selected_range
+        
+        # Duplicar en el modelo y seleccionar las copias
+        copy_index = self.controller.duplicate_range(start, end)
+        if copy_index is None:
+            return
+        self.quest_list_frame.select_range(copy_index, copy_index + end - start)
+    
+    def get_selected_range(self, operation):
+        """
+        Obtiene el bloque contiguo de pasos seleccionados.
+        
+        Args:
+            operation (str): Nombre de la operación, para los mensajes al usuario
+            
+        Returns:
+            tuple or None: Par (inicio, fin) o None si no hay un bloque válido
+        """
+        # Si estamos editando y se intenta mover otro paso, advertir al usuario
+        if self.editing_step_index is not None:
+            messagebox.showwarning("Edición en progreso",
+                                f"Por favor, termina la edición actual antes de {operation} pasos.")
+            return None
+        
+        selected_indices = self.quest_list_frame.get_selected_indices()
+        if not selected_indices:
+            return None
+        
+        ranges = self.split_into_ranges(selected_indices)
+        if len(ranges) > 1:
+            messagebox.showwarning("Selección no contigua",
+                                f"Selecciona un bloque contiguo de pasos para {operation}.")
+            return None
+        return ranges[0]
+    
+    @staticmethod
+    def split_into_ranges(indices):
+        """
+        Agrupa índices ordenados en bloques contiguos.
+        
+        Args:
+            indices (list): Índices en orden ascendente
+            
+        Returns:
+            list: Pares (inicio, fin) de cada bloque contiguo
+        """
+        ranges = []
+        for index in indices:
+            if ranges and ranges[-1][1] == index:
+                ranges[-1][1] = index + 1
+            else:
+                ranges.append([index, index + 1])
+        return [tuple(r) for r in ranges]
     
     def edit_step(self, event):
         """
@@ -346,7 +624,7 @@ class GuiaPhermuthCreator:
             return
         
         # Obtener datos del paso
-        step_data = self.guide.get_step(selected_index)
+        step_data = self.controller.guide.get_step(selected_index)
         if not step_data:
             return
         
@@ -375,24 +653,45 @@ class GuiaPhermuthCreator:
         # Quitar el destacado de edición
         self.quest_list_frame.highlight_editing_row(None)
     
-    def quest_id_changed(self, quest_id):
+    def quest_id_changed(self, quest_id, action, generation):
         """
         Maneja el evento de cambio en el ID de misión.
+        La guía y el historial se consultan en el hilo de Tk (están en memoria
+        y solo se modifican en él). Si no conocen la misión, la referencia de
+        misiones se consulta en un hilo de trabajo único y el resultado se
+        aplica al formulario solo si sigue siendo actual.
         
         Args:
             quest_id (str): ID de la misión cambiada
+            action (str): Acción actual del formulario
+            generation (int): Generación de la consulta en el formulario
         """
-        # Verificar si está en el historial
-        if quest_id and self.quest_history.has_quest(quest_id):
-            # Auto-completar nombre de la misión
-            quest_name = self.quest_history.get_quest_name(quest_id)
-            if quest_name:
-                self.form_frame.quest_name_var.set(quest_name)
-            
-            # Sugerir siguiente acción
-            next_action = self.quest_history.suggest_next_action(quest_id)
-            if next_action:
-                self.form_frame.set_next_action(next_action)
+        # La guía y el historial están en memoria y solo se leen en el hilo de Tk
+        result = self.controller.lookup_known_quest(quest_id, action)
+        if result:
+            self.form_frame.apply_lookup(generation, quest_id, result)
+            return
+        
+        # Solo la referencia de misiones se consulta en el hilo de trabajo
+        future = self.lookup_executor.submit(self.controller.lookup_reference_quest, quest_id, action)
+        polling = self.pending_lookup is not None
+        self.pending_lookup = (future, quest_id, generation)
+        if not polling:
+            self.root.after(self.LOOKUP_POLL_INTERVAL, self.poll_quest_lookup)
+    
+    def poll_quest_lookup(self):
+        """
+        Comprueba si terminó la última consulta a la referencia y aplica su resultado.
+        Las consultas sustituidas por otra más reciente se descartan.
+        """
+        future, quest_id, generation = self.pending_lookup
+        if not future.done():
+            self.root.after(self.LOOKUP_POLL_INTERVAL, self.poll_quest_lookup)
+            return
+        
+        self.pending_lookup = None
+        if future.exception() is None and future.result():
+            self.form_frame.apply_lookup(generation, quest_id, future.result())
     
     def new_guide(self):
         """Crea una nueva guía."""
@@ -409,131 +708,263 @@ class GuiaPhermuthCreator:
         if not confirm_new_guide(self.root):
             return
         
-        # Limpiar modelos
-        self.guide.clear()
+        # Limpiar modelos (las vistas se actualizan con el evento de la guía)
+        self.controller.new_guide()
         
         # Limpiar formularios
         self.guide_info_frame.set_metadata("", "", "", "Horde")
         self.form_frame.clear_form()
+    
+    def run_file_task(self, title, work, on_success):
+        """
+        Ejecuta una operación de archivo en segundo plano con diálogo de progreso.
+        
+        Args:
+            title (str): Descripción de la operación
+            work: Función que recibe la BackgroundTask y devuelve el resultado
+            on_success: Función que recibe el resultado (se llama en el hilo de Tk)
+        """
+        def finished(task):
+            if task.error is not None:
+                messagebox.showerror("Error", f"{title}: {str(task.error)}")
+            elif not task.cancelled:
+                on_success(task.result)
         
-        # Actualizar vista
-        self.quest_list_frame.refresh([])
+        dialog = ProgressDialog(self.root, title, BackgroundTask(work, title), finished)
     
-    def save_guide(self):
-        """Guarda la guía actual."""
-        if not self.guide.get_all_steps():
+    def save_guide(self, on_saved=None):
+        """
+        Guarda la guía actual en segundo plano.
+        
+        Args:
+            on_saved: Función a llamar tras guardar correctamente. Defaults to None.
+            
+        Returns:
+            bool: True si se inició el guardado, False si no había nada que guardar o se canceló
+        """
+        if not self.controller.guide.get_all_steps():
             messagebox.showerror("Error", "No quest steps to save")
-            return
+            return False
         
-        # Actualizar metadatos de la guía
-        zone, level_range, next_zone, faction = self.guide_info_frame.get_metadata()
-        self.guide.set_metadata(zone, level_range, next_zone, faction)
+        # Crear diccionario con todos los datos (instantánea: se codifica en otro hilo)
+        guide_data = self.controller.get_guide_data(snapshot=True)
         
-        # Crear diccionario con todos los datos
-        guide_data = self.guide.to_dict()
-        guide_data["quest_history"] = self.quest_history.get_all_quests()
+        filename = FileDialogs.ask_guide_save_filename(guide_data)
+        if not filename:
+            return False
         
-        # Guardar a archivo
-        FileHandler.save_guide(guide_data)
+        def saved(result):
+            self.controller.guide_saved(filename, guide_data)
+            messagebox.showinfo("Éxito", f"Datos de la guía guardados en {filename}")
+            if on_saved:
+                on_saved()
+        
+        self.run_file_task("Saving guide",
+                           lambda task: self.controller.write_guide(filename, guide_data, task), saved)
+        return True
     
     def load_guide(self):
-        """Carga una guía desde un archivo."""
+        """Carga una guía desde un archivo en segundo plano."""
         # Si hay una edición en progreso, preguntar si quiere descartarla
-        if self.editing_step_index is not None:
-            if not messagebox.askyesno("Edición en progreso",
-                                    "Hay una edición en progreso. ¿Descartar los cambios?"):
+        if not self.discard_editing():
+            return
+        
+        filename = FileDialogs.choose_guide_file()
+        if not filename:
+            return
+        
+        def loaded(guide_data):
+            self.apply_guide_data(guide_data)
+            messagebox.showinfo("Éxito", f"Guía cargada desde {filename}")
+        
+        self.run_file_task("Loading guide", lambda task: task.read_json(filename), loaded)
+    
+    def import_steps(self):
+        """Importa pasos desde una tabla CSV o TSV y los añade al final de la guía."""
+        filename = FileDialogs.choose_step_table_file()
+        if not filename:
+            return
+        
+        def read(result):
+            steps = result['steps']
+            message = f"{len(steps)} valid steps in {os.path.basename(filename)}."
+            if result['ignored_columns']:
+                message += f"\nIgnored columns: {', '.join(result['ignored_columns'])}"
+            if result['errors']:
+                shown = "\n".join(result['errors'][:10])
+                more = len(result['errors']) - 10
+                if more > 0:
+                    shown += f"\n... and {more} more"
+                message += f"\n\n{len(result['errors'])} invalid rows:\n{shown}"
+            if not steps:
+                messagebox.showerror("Import", message)
+                return
+            if not messagebox.askyesno("Import", f"{message}\n\nAppend {len(steps)} steps to the guide?"):
                 return
             
-            # Cancelar la edición
-            self.editing_step_index = None
-            self.form_frame.set_edit_mode(False)
+            # Una sola inserción: una actualización de la vista y un autoguardado
+            index = self.controller.import_steps(steps)
+            self.quest_list_frame.select_range(index, index + len(steps))
         
-        guide_data = FileHandler.load_guide()
-        if not guide_data:
+        self.run_file_task("Importing steps", lambda task: GuideController.read_step_table(filename, task=task), read)
+    
+    def export_guide(self):
+        """Exporta la guía a varios formatos (Lua, CSV, Markdown, HTML) en un solo recorrido."""
+        if not self.controller.guide.get_all_steps():
+            messagebox.showerror("Error", "No quest steps to export")
             return
         
-        # Cargar en modelos
-        self.guide.from_dict(guide_data)
+        formats = simpledialog.askstring(
+            "Export",
+            f"Formats ({', '.join(ExportPipeline.EXPORTERS)}), separated by spaces:",
+            initialvalue=" ".join(ExportPipeline.EXPORTERS),
+            parent=self.root
+        )
+        if not formats or not formats.split():
+            return
+        unknown = [name for name in formats.split() if name not in ExportPipeline.EXPORTERS]
+        if unknown:
+            messagebox.showerror("Error", f"Unknown export format: {', '.join(unknown)}")
+            return
         
-        # Cargar historial si está disponible
-        if "quest_history" in guide_data:
-            self.quest_history.update_from_dict(guide_data["quest_history"])
+        directory = FileDialogs.choose_guide_directory("Select output folder")
+        if not directory:
+            return
         
-        # Actualizar vistas
-        metadata = guide_data.get("metadata", {})
-        self.guide_info_frame.set_metadata(
-            metadata.get("zone", ""),
-            metadata.get("level_range", ""),
-            metadata.get("next_zone", ""),
-            metadata.get("faction", "Horde")
+        guide_data = self.controller.guide.snapshot()
+        base_name = self.controller.get_export_name()
+        optimize = self.optimize_lua_var.get()
+        
+        self.run_file_task(
+            "Exporting guide",
+            lambda task: GuideController.export_guide(
+                guide_data, formats.split(), directory, base_name, optimize=optimize, task=task
+            ),
+            lambda filenames: messagebox.showinfo(
+                "Export", "Exported:\n" + "\n".join(os.path.basename(filename) for filename in filenames)
+            )
         )
-        
-        self.quest_list_frame.refresh(self.guide.get_all_steps())
     
-    def autosave(self):
-        """Guarda automáticamente el estado actual."""
-        # Actualizar metadatos de la guía
-        zone, level_range, next_zone, faction = self.guide_info_frame.get_metadata()
-        self.guide.set_metadata(zone, level_range, next_zone, faction)
+    def save_lua_code(self, lua_code, zone, level_range):
+        """
+        Guarda código Lua en un archivo en segundo plano.
         
-        # Crear diccionario con todos los datos
-        guide_data = self.guide.to_dict()
-        guide_data["quest_history"] = self.quest_history.get_all_quests()
+        Args:
+            lua_code (str): Código a guardar
+            zone (str): Zona de la guía (para el nombre predeterminado)
+            level_range (str): Rango de niveles (para el nombre predeterminado)
+        """
+        filename = FileDialogs.ask_lua_save_filename(zone, level_range)
+        if not filename:
+            return
         
-        # Guardar a archivo de autoguardado
-        FileHandler.autosave(guide_data)
+        self.run_file_task(
+            "Saving Lua",
+            lambda task: task.write_text(filename, lua_code),
+            lambda result: messagebox.showinfo("Éxito", f"Guía guardada en {filename}")
+        )
     
     def force_autosave(self):
         """Fuerza un autoguardado manual."""
-        self.autosave()
+        self.controller.autosave()
         messagebox.showinfo("Autosave", "Guide autosaved successfully.")
     
     def load_last_autosave(self):
         """Carga el último autoguardado disponible."""
         # Si hay una edición en progreso, preguntar si quiere descartarla
+        if not self.discard_editing():
+            return
+        
+        guide_data = FileDialogs.load_last_autosave()
+        if not guide_data:
+            return
+        
+        self.apply_guide_data(guide_data)
+    
+    def browse_autosaves(self):
+        """Muestra el historial de autoguardados a partir del manifiesto."""
+        autosave_history = FileHandler.get_autosave_history()
+        if not autosave_history:
+            messagebox.showinfo("Autoguardado", "No hay archivos de autoguardado disponibles.")
+            return
+        
+        dialog = AutosaveBrowserDialog(
+            self.root,
+            autosave_history,
+            on_load_selected=self.load_autosave
+        )
+    
+    def load_autosave(self, filename):
+        """
+        Carga un autoguardado concreto.
+        
+        Args:
+            filename (str): Nombre del archivo de autoguardado
+        """
+        if not self.discard_editing():
+            return
+        
+        guide_data = FileDialogs.load_autosave(filename)
+        if not guide_data:
+            return
+        
+        self.apply_guide_data(guide_data)
+    
+    def discard_editing(self):
+        """
+        Pregunta si se descarta la edición en progreso y, si es así, la cancela.
+        
+        Returns:
+            bool: True si no hay edición en progreso o el usuario la descartó
+        """
         if self.editing_step_index is not None:
             if not messagebox.askyesno("Edición en progreso",
                                     "Hay una edición en progreso. ¿Descartar los cambios?"):
-                return
+                return False
             
             # Cancelar la edición
             self.editing_step_index = None
             self.form_frame.set_edit_mode(False)
+        return True
+    
+    def apply_guide_data(self, guide_data):
+        """
+        Carga los datos de una guía en los modelos y actualiza las vistas.
         
-        guide_data = FileHandler.load_last_autosave()
-        if not guide_data:
-            return
-        
-        # Cargar en modelos
-        self.guide.from_dict(guide_data)
-        
-        # Cargar historial si está disponible
-        if "quest_history" in guide_data:
-            self.quest_history.update_from_dict(guide_data["quest_history"])
-        
-        # Actualizar vistas
-        metadata = guide_data.get("metadata", {})
-        self.guide_info_frame.set_metadata(
-            metadata.get("zone", ""),
-            metadata.get("level_range", ""),
-            metadata.get("next_zone", ""),
-            metadata.get("faction", "Horde")
-        )
+        Args:
+            guide_data (dict): Datos de la guía cargada
+        """
+        # Las vistas de pasos se actualizan con el evento de la guía
+        self.controller.apply_guide_data(guide_data)
         
-        self.quest_list_frame.refresh(self.guide.get_all_steps())
+        guide = self.controller.guide
+        self.guide_info_frame.set_metadata(guide.zone, guide.level_range, guide.next_zone, guide.faction)
     
     def view_quest_history(self):
         """Muestra el historial de misiones."""
-        if not self.quest_history.get_all_quests():
+        if not self.controller.quest_history.get_all_quests():
             messagebox.showinfo("Quest History", "No quests in history yet.")
             return
         
         # Mostrar diálogo de historial
+        quest_history = self.controller.quest_history
         dialog = QuestHistoryDialog(
             self.root,
-            self.quest_history.get_all_quests(),
+            quest_history.get_all_quests(),
             on_use_selected=self.use_selected_quest
         )
+        
+        # Mantener el diálogo al día mientras esté abierto
+        def quests_changed(events):
+            dialog.quest_history = quest_history.get_all_quests()
+            dialog.quests_changed(events)
+        
+        def closed(event):
+            if event.widget is dialog.window:
+                quest_history.unsubscribe(quests_changed)
+        
+        quest_history.subscribe(quests_changed)
+        dialog.window.bind("<Destroy>", closed)
     
     def use_selected_quest(self, quest_id, quest_name):
         """
@@ -548,24 +979,215 @@ class GuiaPhermuthCreator:
         self.form_frame.quest_name_var.set(quest_name)
             
         # Establecer clase si está disponible
-        quest_class = self.quest_history.get_quest_class(quest_id)
+        quest_class = self.controller.get_quest_class(quest_id)
         if quest_class:
             self.form_frame.set_quest_class(quest_class)
             
         # Sugerir siguiente acción
-        next_action = self.quest_history.suggest_next_action(quest_id)
+        next_action = self.controller.suggest_next_action(quest_id)
         if next_action:
             self.form_frame.set_next_action(next_action)
     
     def export_quest_db(self):
-        """Exporta la base de datos de misiones."""
-        FileHandler.export_quest_db(self.quest_history.get_all_quests())
+        """Exporta la base de datos de misiones en segundo plano."""
+        if not self.controller.quest_history.get_all_quests():
+            messagebox.showinfo("Exportar", "No hay misiones en el historial para exportar.")
+            return
+        
+        filename = FileDialogs.ask_quest_db_export_filename()
+        if not filename:
+            return
+        
+        # Instantánea del historial: se codifica en otro hilo mientras la interfaz sigue activa
+        snapshot = self.controller.quest_history.snapshot()
+        self.run_file_task(
+            "Exporting quest database",
+            lambda task: task.write_json(filename, snapshot),
+            lambda result: messagebox.showinfo("Éxito", f"Base de datos de misiones exportada a {filename}")
+        )
     
     def import_quest_db(self):
         """Importa una base de datos de misiones."""
-        imported_db = FileHandler.import_quest_db()
-        if imported_db:
-            self.quest_history.update_from_dict(imported_db)
+        filename = FileDialogs.ask_quest_db_import_filename()
+        if not filename:
+            return
+        
+        try:
+            count = self.controller.import_quest_db(filename)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al importar la base de datos: {str(e)}")
+            return
+        messagebox.showinfo("Éxito", f"Base de datos de misiones importada desde {filename}\nImportadas {count} misiones.")
+    
+    def load_guide_library(self):
+        """Carga en la biblioteca todas las guías de un directorio."""
+        directory = FileDialogs.choose_guide_directory()
+        if not directory:
+            return
+        
+        self.controller.load_library(directory)
+        self.view_guide_library()
+    
+    def find_guides_by_level(self):
+        """Busca en la biblioteca las guías que cubren un nivel o rango de niveles."""
+        if self.controller.level_index is None:
+            messagebox.showinfo("Find Guides", "Load a guide library first.")
+            return
+        
+        query = simpledialog.askstring(
+            "Find Guides",
+            "Level or level range, optionally followed by a faction\n(e.g. 34 Alliance, 30-35):",
+            parent=self.root
+        )
+        if not query or not query.split():
+            return
+        
+        parts = query.split()
+        faction = parts[1].capitalize() if len(parts) > 1 else None
+        try:
+            results = self.controller.find_guides(parts[0], faction)
+        except GuideError as e:
+            messagebox.showerror("Find Guides", str(e))
+            return
+        if not results:
+            messagebox.showinfo("Find Guides", f"No guides cover {parts[0]}.")
+            return
+        
+        lines = [
+            f"{entry['zone']} ({entry['level_range']}) [{entry['faction']}] - {os.path.basename(key)}"
+            for key, entry in results
+        ]
+        messagebox.showinfo("Find Guides", "\n".join(lines))
+    
+    def view_guide_library(self):
+        """Muestra las consultas y problemas de orden de la biblioteca de guías."""
+        # La guía abierta (con sus metadatos actuales) sustituye a la copia de la biblioteca
+        guide_library = self.controller.sync_library()
+        
+        if not guide_library.guides:
+            messagebox.showinfo("Guide Library", "No guides loaded in the library.")
+            return
+        
+        dialog = GuideLibraryDialog(self.root, guide_library)
+    
+    def optimize_route(self):
+        """
+        Reordena los pasos seleccionados (o toda la guía) para reducir la distancia
+        recorrida, respetando el orden A -> C -> T y los pasos fijos.
+        """
+        steps = self.controller.guide.get_all_steps()
+        if not steps:
+            messagebox.showerror("Error", "No quest steps to optimize")
+            return
+        
+        if len(self.quest_list_frame.get_selected_indices()) > 1:
+            selected_range = self.get_selected_range("optimizar")
+            if selected_range is None:
+                return
+        elif self.editing_step_index is None:
+            selected_range = (0, len(steps))
+        else:
+            messagebox.showwarning("Edición en progreso",
+                                "Por favor, termina la edición actual antes de optimizar pasos.")
+            return
+        
+        start, end = selected_range
+        new_steps, distance_before, distance_after = self.controller.plan_route(start, end)
+        if distance_after >= distance_before:
+            messagebox.showinfo("Optimize Route",
+                                f"No shorter route found.\nTotal distance: {distance_before:.1f}")
+            return
+        
+        saving = 100 * (distance_before - distance_after) / distance_before
+        if not messagebox.askyesno("Optimize Route",
+                                f"Total distance: {distance_before:.1f} -> {distance_after:.1f} "
+                                f"(-{saving:.0f}%)\n\nApply the new order?"):
+            return
+        
+        # Aplicar como una sola mutación del modelo (un solo lote de eventos)
+        self.controller.replace_range(start, end, new_steps)
+        self.quest_list_frame.select_range(start, end)
+    
+    def read_steps_from_file(self, title):
+        """
+        Solicita un archivo de guía y devuelve sus pasos.
+        
+        Args:
+            title (str): Título del diálogo de selección
+            
+        Returns:
+            list or None: Pasos de la guía o None si se canceló o hubo un error
+        """
+        filename = FileDialogs.choose_guide_file(title)
+        if not filename:
+            return None
+        try:
+            return FileHandler.read_guide_file(filename).get("steps", [])
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al cargar la guía: {str(e)}")
+            return None
+    
+    def compare_with_guide(self):
+        """Muestra los bloques cambiados entre un archivo de guía y la guía abierta."""
+        other_steps = self.read_steps_from_file("Compare With Guide")
+        if other_steps is None:
+            return
+        
+        hunks = GuideDiff.format_hunks(other_steps, list(self.controller.guide.get_all_steps()))
+        if not hunks:
+            messagebox.showinfo("Compare", "The guides have identical steps.")
+            return
+        
+        dialog = CodeViewDialog(
+            self.root,
+            "Guide Diff",
+            hunks,
+            on_copy=lambda code: self.root.clipboard_clear() or self.root.clipboard_append(code),
+            on_save=self.save_diff_text,
+            on_close=lambda: None
+        )
+    
+    def save_diff_text(self, diff_text):
+        """
+        Guarda el texto de una comparación de guías en segundo plano.
+        
+        Args:
+            diff_text (str): Bloques cambiados (ver GuideDiff.format_hunks)
+        """
+        filename = FileDialogs.ask_diff_save_filename(self.controller.guide.zone, self.controller.guide.level_range)
+        if not filename:
+            return
+        
+        self.run_file_task(
+            "Saving Diff",
+            lambda task: task.write_text(filename, diff_text),
+            lambda result: messagebox.showinfo("Éxito", f"Comparación guardada en {filename}")
+        )
+    
+    def merge_guides(self):
+        """Fusiona en la guía abierta los cambios de otra copia a partir de su ancestro común."""
+        if not self.discard_editing():
+            return
+        
+        base_steps = self.read_steps_from_file("Select Common Ancestor (Base)")
+        if base_steps is None:
+            return
+        their_steps = self.read_steps_from_file("Select Their Guide")
+        if their_steps is None:
+            return
+        
+        # Aplicar como una sola mutación del modelo (un solo lote de eventos)
+        result = self.controller.merge_steps(base_steps, their_steps)
+        
+        if result['conflicts']:
+            positions = ", ".join(str(conflict['index'] + 1) for conflict in result['conflicts'][:10])
+            messagebox.showwarning(
+                "Merge",
+                f"Merged with {len(result['conflicts'])} conflicts (kept our version).\n"
+                f"Conflicting steps start at: {positions}"
+            )
+        else:
+            messagebox.showinfo("Merge", "Guides merged without conflicts.")
     
     def show_about(self):
         """Muestra información sobre la aplicación."""
@@ -1,13 +1,23 @@
+import re
 import tkinter as tk
 from tkinter import ttk, messagebox
 
 class CodeViewDialog:
     """Diálogo para mostrar código generado."""
     
-    def __init__(self, parent, title, code, on_copy, on_save, on_close):
+    # Caracteres aproximados por bloque insertado en cada ciclo inactivo
+    CHUNK_SIZE = 64 * 1024
+    
+    # Etiquetas de la guía a resaltar (|QID|, |N|, |C|, |R|, |Z|, |OBJ|...)
+    TAG_PATTERN = re.compile(r"\|[A-Z]+\|")
+    
+    def __init__(self, parent, title, code, on_copy, on_save, on_close, highlight=False):
         """
         Inicializa el diálogo para mostrar código.
         
+        La ventana se muestra de inmediato y el código se inserta por bloques
+        en los ciclos inactivos de Tk, para no congelar la interfaz con guías grandes.
+        
         Args:
             parent: Widget padre
             title (str): Título de la ventana
@@ -15,42 +25,178 @@ class CodeViewDialog:
             on_copy: Función para copiar código al portapapeles
             on_save: Función para guardar código a un archivo
             on_close: Función para cerrar el diálogo
+            highlight (bool, optional): Resaltar las etiquetas de la guía en la zona
+                visible. Defaults to False.
         """
         self.parent = parent
         self.code = code
+        # Copiar y guardar usan siempre la cadena original, no el contenido del widget
         self.on_copy = lambda: on_copy(code)
         self.on_save = lambda: on_save(code)
         self.on_close = on_close
+        self.highlight = highlight
+        
+        # Estado de la inserción por bloques y del resaltado
+        self.insert_position = 0
+        self.highlighted_lines = set()
+        self.highlight_pending = False
         
         # Crear ventana
         self.window = tk.Toplevel(parent)
         self.window.title(title)
         self.window.geometry("800x600")
         
-        # Widget de texto para el código
-        self.text_widget = tk.Text(self.window, wrap="none")
+        # Añadir botones (antes que el texto para que siempre queden visibles)
+        button_frame = ttk.Frame(self.window)
+        button_frame.pack(side="bottom", fill="x", padx=10, pady=10)
+        
+        ttk.Button(button_frame, text="Copy to Clipboard", command=self.on_copy).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Save to File", command=self.on_save).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Close", command=self.window.destroy).pack(side="right", padx=5)
+        
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side="left", padx=10)
+        
+        # Widget de texto para el código (de solo lectura)
+        self.text_widget = tk.Text(self.window, wrap="none", state="disabled")
         self.text_widget.pack(fill="both", expand=True)
+        self.text_widget.tag_configure("guide_tag", foreground="#0000CC")
         
         # Añadir barras de desplazamiento
-        y_scrollbar = ttk.Scrollbar(self.text_widget, orient="vertical", command=self.text_widget.yview)
+        self.y_scrollbar = ttk.Scrollbar(self.text_widget, orient="vertical", command=self.text_widget.yview)
         x_scrollbar = ttk.Scrollbar(self.text_widget, orient="horizontal", command=self.text_widget.xview)
-        self.text_widget.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
-        y_scrollbar.pack(side="right", fill="y")
+        self.text_widget.configure(yscrollcommand=self.on_y_scroll, xscrollcommand=x_scrollbar.set)
+        self.y_scrollbar.pack(side="right", fill="y")
         x_scrollbar.pack(side="bottom", fill="x")
         
-        # Insertar código
-        self.text_widget.insert("1.0", code)
+        # Insertar código por bloques
+        self.window.after_idle(self.insert_next_chunk)
+    
+    def insert_next_chunk(self):
+        """Inserta el siguiente bloque de código y programa el siguiente."""
+        if not self.window.winfo_exists():
+            return
         
-        # Añadir botones
-        button_frame = ttk.Frame(self.window)
-        button_frame.pack(fill="x", padx=10, pady=10)
+        end = min(len(self.code), self.insert_position + self.CHUNK_SIZE)
+        if end < len(self.code):
+            # Cortar en un salto de línea para no dejar líneas a medias
+            newline = self.code.rfind("\n", self.insert_position, end)
+            if newline >= self.insert_position:
+                end = newline + 1
         
-        ttk.Button(button_frame, text="Copy to Clipboard", command=self.on_copy).pack(side="left", padx=5)
-        ttk.Button(button_frame, text="Save to File", command=self.on_save).pack(side="left", padx=5)
-        ttk.Button(button_frame, text="Close", command=self.window.destroy).pack(side="right", padx=5)
-        
-        # Hacer el widget de texto de solo lectura
+        self.text_widget.config(state="normal")
+        self.text_widget.insert("end-1c", self.code[self.insert_position:end])
         self.text_widget.config(state="disabled")
+        self.insert_position = end
+        
+        if self.insert_position < len(self.code):
+            self.status_label.config(text=f"Loading... {100 * self.insert_position // len(self.code)}%")
+            self.window.after_idle(self.insert_next_chunk)
+        else:
+            self.status_label.config(text="")
+        self.schedule_highlight()
+    
+    def on_y_scroll(self, first, last):
+        """
+        Actualiza la barra de desplazamiento y resalta la nueva zona visible.
+        
+        Args:
+            first (str): Fracción superior visible
+            last (str): Fracción inferior visible
+        """
+        self.y_scrollbar.set(first, last)
+        self.schedule_highlight()
+    
+    def schedule_highlight(self):
+        """Programa el resaltado de la zona visible (una sola vez por ciclo inactivo)."""
+        if self.highlight and not self.highlight_pending:
+            self.highlight_pending = True
+            self.window.after_idle(self.highlight_visible)
+    
+    def highlight_visible(self):
+        """Resalta las etiquetas de las líneas visibles que aún no se han procesado."""
+        self.highlight_pending = False
+        if not self.window.winfo_exists():
+            return
+        
+        first_line = int(self.text_widget.index("@0,0").split(".")[0])
+        last_line = int(self.text_widget.index(f"@0,{self.text_widget.winfo_height()}").split(".")[0])
+        
+        for line in range(first_line, last_line + 1):
+            if line in self.highlighted_lines:
+                continue
+            
+            # Las líneas vacías pueden ser el final aún no cargado: no se marcan
+            text = self.text_widget.get(f"{line}.0", f"{line}.end")
+            if not text:
+                continue
+            self.highlighted_lines.add(line)
+            
+            for match in self.TAG_PATTERN.finditer(text):
+                self.text_widget.tag_add("guide_tag", f"{line}.{match.start()}", f"{line}.{match.end()}")
+
+class ProgressDialog:
+    """Diálogo de progreso de una tarea en segundo plano, con botón de cancelar."""
+    
+    # Intervalo (ms) de consulta del estado de la tarea
+    POLL_INTERVAL = 100
+    
+    def __init__(self, parent, title, task, on_finished):
+        """
+        Inicializa el diálogo y lanza la tarea.
+        
+        Args:
+            parent: Widget padre
+            title (str): Título de la ventana
+            task (BackgroundTask): Tarea a ejecutar
+            on_finished: Función que recibe la tarea al terminar (en el hilo de Tk)
+        """
+        self.task = task
+        self.on_finished = on_finished
+        
+        # Crear ventana
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.resizable(False, False)
+        self.window.transient(parent)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        ttk.Label(self.window, text=task.description or title).pack(fill="x", padx=10, pady=(10, 5))
+        
+        self.progress_bar = ttk.Progressbar(self.window, length=320, mode="indeterminate")
+        self.progress_bar.pack(fill="x", padx=10, pady=5)
+        
+        self.status_label = ttk.Label(self.window, text="")
+        self.status_label.pack(fill="x", padx=10)
+        
+        self.cancel_button = ttk.Button(self.window, text="Cancel", command=self.cancel)
+        self.cancel_button.pack(pady=10)
+        
+        # Lanzar la tarea y consultar su estado desde el bucle de Tk
+        self.task.start()
+        self.window.after(self.POLL_INTERVAL, self.poll)
+    
+    def poll(self):
+        """Actualiza el progreso y, al terminar, entrega la tarea al callback."""
+        if self.task.finished:
+            self.window.destroy()
+            self.on_finished(self.task)
+            return
+        
+        if self.task.total:
+            self.progress_bar.config(mode="determinate", value=100 * self.task.done / self.task.total)
+            self.status_label.config(text=f"{self.task.done:,} / {self.task.total:,} {self.task.unit}")
+        else:
+            self.progress_bar.step(5)
+            self.status_label.config(text=f"{self.task.done:,} {self.task.unit}")
+        
+        self.window.after(self.POLL_INTERVAL, self.poll)
+    
+    def cancel(self):
+        """Solicita la cancelación de la tarea."""
+        self.task.cancel()
+        self.cancel_button.config(state="disabled")
+        self.status_label.config(text="Cancelling...")
 
 class QuestHistoryDialog:
     """Diálogo para mostrar el historial de misiones."""
@@ -98,10 +244,8 @@ class QuestHistoryDialog:
         scrollbar.pack(side="right", fill="y")
         
         # Poblar con datos
-        for quest_id, data in self.quest_history.items():
-            actions_str = ", ".join(data['actions_used'])
-            class_str = data.get('class', "")
-            self.tree.insert("", "end", values=(quest_id, data['name'], actions_str, class_str))
+        for quest_id in self.quest_history:
+            self.set_quest_row(quest_id)
             
         # Añadir botones
         button_frame = ttk.Frame(self.window)
@@ -113,6 +257,37 @@ class QuestHistoryDialog:
         ttk.Button(button_frame, text="Close", 
                 command=self.window.destroy).pack(side="right", padx=5)
     
+    def set_quest_row(self, quest_id):
+        """
+        Añade o actualiza la fila de una misión (el ID de la misión identifica la fila).
+        
+        Args:
+            quest_id (str): ID de la misión
+        """
+        data = self.quest_history.get(quest_id)
+        if data is None:
+            return
+        
+        values = (quest_id, data['name'], ", ".join(data['actions_used']), data.get('class', ""))
+        if self.tree.exists(quest_id):
+            self.tree.item(quest_id, values=values)
+        else:
+            self.tree.insert("", "end", iid=quest_id, values=values)
+    
+    def quests_changed(self, events):
+        """
+        Actualiza solo las filas de las misiones que cambiaron en el historial.
+        
+        Args:
+            events (list): Eventos del historial (ver QuestHistory)
+        """
+        for event in events:
+            if event['type'] == 'reset':
+                self.tree.delete(*self.tree.get_children())
+            else:
+                for quest_id in event['quest_ids']:
+                    self.set_quest_row(quest_id)
+    
     def use_selected_quest(self):
         """Utiliza la misión seleccionada del historial."""
         selected_items = self.tree.selection()
@@ -133,6 +308,169 @@ class QuestHistoryDialog:
         # Cerrar la ventana
         self.window.destroy()
 
+class AutosaveBrowserDialog:
+    """Diálogo para explorar el historial de autoguardados desde el manifiesto."""
+    
+    def __init__(self, parent, autosave_history, on_load_selected):
+        """
+        Inicializa el diálogo de autoguardados.
+        
+        Args:
+            parent: Widget padre
+            autosave_history (list): Entradas del manifiesto de autoguardados
+            on_load_selected: Función a llamar con el nombre del archivo seleccionado
+        """
+        self.parent = parent
+        self.on_load_selected = on_load_selected
+        
+        # Crear ventana
+        self.window = tk.Toplevel(parent)
+        self.window.title("Autosaves")
+        self.window.geometry("700x400")
+        
+        # Crear treeview para los autoguardados
+        columns = ("guide", "timestamp", "steps", "size")
+        self.tree = ttk.Treeview(self.window, columns=columns, show="headings")
+        
+        # Definir cabeceras de columnas
+        self.tree.heading("guide", text="Guide")
+        self.tree.heading("timestamp", text="Last Saved")
+        self.tree.heading("steps", text="Steps")
+        self.tree.heading("size", text="Size")
+        
+        # Establecer anchos de columnas
+        self.tree.column("guide", width=300)
+        self.tree.column("timestamp", width=150, anchor="center")
+        self.tree.column("steps", width=80, anchor="center")
+        self.tree.column("size", width=100, anchor="center")
+        
+        # Añadir barra de desplazamiento
+        scrollbar = ttk.Scrollbar(self.window, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        # Empaquetar tree y scrollbar
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Poblar con datos (el iid del ítem es el nombre del archivo)
+        for entry in autosave_history:
+            size_str = f"{entry.get('size', 0) / 1024:.1f} KB"
+            self.tree.insert("", "end", iid=entry['file'], values=(
+                entry.get('guide_name', ""),
+                entry.get('timestamp', ""),
+                entry.get('steps', 0),
+                size_str
+            ))
+        
+        self.tree.bind("<Double-1>", lambda event: self.load_selected())
+        
+        # Añadir botones
+        button_frame = ttk.Frame(self.window)
+        button_frame.pack(fill="x", padx=10, pady=10)
+        
+        ttk.Button(button_frame, text="Load Selected", 
+                command=self.load_selected).pack(side="left", padx=5)
+        
+        ttk.Button(button_frame, text="Close", 
+                command=self.window.destroy).pack(side="right", padx=5)
+    
+    def load_selected(self):
+        """Carga el autoguardado seleccionado."""
+        selected_items = self.tree.selection()
+        if not selected_items:
+            return
+        
+        # Cerrar la ventana antes de cargar
+        self.window.destroy()
+        
+        # Llamar al callback con el nombre del archivo
+        self.on_load_selected(selected_items[0])
+
+class GuideLibraryDialog:
+    """Diálogo para consultar misiones y problemas de orden en una biblioteca de guías."""
+    
+    def __init__(self, parent, library):
+        """
+        Inicializa el diálogo de la biblioteca de guías.
+        
+        Args:
+            parent: Widget padre
+            library (GuideLibrary): Biblioteca de guías indexada
+        """
+        self.parent = parent
+        self.library = library
+        self.quest_id_var = tk.StringVar()
+        
+        # Crear ventana
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Guide Library ({len(library.guides)} guides)")
+        self.window.geometry("800x600")
+        
+        # Búsqueda de misiones
+        search_frame = ttk.LabelFrame(self.window, text="Find Quest")
+        search_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        entry_frame = ttk.Frame(search_frame)
+        entry_frame.pack(fill="x", padx=5, pady=5)
+        ttk.Label(entry_frame, text="Quest ID:").pack(side="left", padx=5)
+        quest_id_entry = ttk.Entry(entry_frame, textvariable=self.quest_id_var, width=10)
+        quest_id_entry.pack(side="left", padx=5)
+        quest_id_entry.bind("<Return>", lambda event: self.find_quest())
+        ttk.Button(entry_frame, text="Find", command=self.find_quest).pack(side="left", padx=5)
+        
+        self.results_tree = ttk.Treeview(search_frame, columns=("guide", "step", "action"), show="headings", height=6)
+        self.results_tree.heading("guide", text="Guide")
+        self.results_tree.heading("step", text="Step")
+        self.results_tree.heading("action", text="Action")
+        self.results_tree.column("guide", width=400)
+        self.results_tree.column("step", width=80, anchor="center")
+        self.results_tree.column("action", width=80, anchor="center")
+        self.results_tree.pack(fill="both", expand=True, padx=5, pady=5)
+        
+        # Problemas de orden a lo largo de la cadena de guías
+        issues_frame = ttk.LabelFrame(self.window, text="Ordering Issues")
+        issues_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        self.issues_tree = ttk.Treeview(issues_frame, columns=("guide", "step", "questid", "issue"), show="headings")
+        self.issues_tree.heading("guide", text="Guide")
+        self.issues_tree.heading("step", text="Step")
+        self.issues_tree.heading("questid", text="QID")
+        self.issues_tree.heading("issue", text="Issue")
+        self.issues_tree.column("guide", width=200)
+        self.issues_tree.column("step", width=60, anchor="center")
+        self.issues_tree.column("questid", width=60, anchor="center")
+        self.issues_tree.column("issue", width=400)
+        
+        scrollbar = ttk.Scrollbar(issues_frame, orient="vertical", command=self.issues_tree.yview)
+        self.issues_tree.configure(yscrollcommand=scrollbar.set)
+        self.issues_tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        for issue in library.check_ordering():
+            step = issue['step'] + 1 if issue['step'] is not None else ""
+            self.issues_tree.insert("", "end", values=(
+                library.get_guide_name(issue['guide']),
+                step,
+                issue['quest_id'],
+                issue['message']
+            ))
+        
+        # Añadir botones
+        button_frame = ttk.Frame(self.window)
+        button_frame.pack(fill="x", padx=10, pady=10)
+        
+        ttk.Button(button_frame, text="Close", 
+                command=self.window.destroy).pack(side="right", padx=5)
+    
+    def find_quest(self):
+        """Muestra dónde se acepta, completa y entrega la misión indicada."""
+        for item in self.results_tree.get_children():
+            self.results_tree.delete(item)
+        
+        quest_id = self.quest_id_var.get().strip()
+        for key, index, action in self.library.find_quest(quest_id):
+            self.results_tree.insert("", "end", values=(self.library.get_guide_name(key), index + 1, action))
+
 def show_action_types_dialog(parent, action_types):
     """
     Muestra un diálogo con información sobre los tipos de acciones.
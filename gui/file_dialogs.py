@@ -0,0 +1,303 @@
+import os
+from tkinter import filedialog, messagebox
+
+from utils.file_handler import FileHandler
+
+class FileDialogs:
+    """Diálogos de archivo de la interfaz (las operaciones de disco están en FileHandler)."""
+    
+    @staticmethod
+    def load_autosave(basename):
+        """
+        Carga un archivo de autoguardado concreto.
+        
+        Args:
+            basename (str): Nombre del archivo de autoguardado (sin la ruta)
+        
+        Returns:
+            dict or None: Datos de la guía cargada o None si hubo un error
+        """
+        try:
+            guide_data = FileHandler.read_autosave(basename)
+            
+            timestamp = guide_data.get("timestamp", "desconocido")
+            messagebox.showinfo("Autoguardado", f"Guía cargada desde autoguardado\nÚltima modificación: {timestamp}")
+            return guide_data
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudo cargar el autoguardado: {str(e)}")
+            return None
+    
+    @staticmethod
+    def load_last_autosave():
+        """
+        Carga el último archivo de autoguardado disponible.
+        
+        Returns:
+            dict or None: Datos de la guía cargada o None si no hay autosaves
+        """
+        latest = FileHandler.get_latest_autosave()
+        if not latest:
+            messagebox.showinfo("Autoguardado", "No hay archivos de autoguardado disponibles.")
+            return None
+        
+        return FileDialogs.load_autosave(latest)
+    
+    @staticmethod
+    def ask_guide_save_filename(guide_data):
+        """
+        Solicita el archivo donde guardar una guía.
+        
+        Args:
+            guide_data (dict): Datos de la guía (para el nombre predeterminado)
+        
+        Returns:
+            str or None: Ruta elegida o None si se canceló
+        """
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            initialfile=FileHandler.get_default_guide_filename(guide_data)
+        )
+        return filename or None
+    
+    @staticmethod
+    def save_guide(guide_data):
+        """
+        Guarda los datos de la guía en un archivo JSON.
+        
+        Args:
+            guide_data (dict): Datos de la guía a guardar
+        
+        Returns:
+            bool: True si se guardó correctamente, False en caso contrario
+        """
+        filename = FileDialogs.ask_guide_save_filename(guide_data)
+        
+        if not filename:
+            return False  # Usuario canceló la operación
+        
+        # Guardar en el archivo
+        try:
+            FileHandler.write_json_atomic(filename, guide_data)
+            messagebox.showinfo("Éxito", f"Datos de la guía guardados en {filename}")
+            return True
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al guardar la guía: {str(e)}")
+            return False
+    
+    @staticmethod
+    def choose_guide_file(title="Open Guide"):
+        """
+        Solicita al usuario un archivo de guía JSON.
+        
+        Args:
+            title (str, optional): Título del diálogo. Defaults to "Open Guide".
+        
+        Returns:
+            str or None: Ruta del archivo o None si se canceló
+        """
+        filename = filedialog.askopenfilename(
+            title=title,
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        return filename or None
+    
+    @staticmethod
+    def load_guide():
+        """
+        Carga los datos de una guía desde un archivo JSON.
+        
+        Returns:
+            dict or None: Datos de la guía cargada o None si hubo un error
+        """
+        filename = FileDialogs.choose_guide_file()
+        
+        if not filename:
+            return None  # Usuario canceló la operación
+        
+        try:
+            guide_data = FileHandler.read_guide_file(filename)
+            
+            messagebox.showinfo("Éxito", f"Guía cargada desde {filename}")
+            return guide_data
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al cargar la guía: {str(e)}")
+            return None
+    
+    @staticmethod
+    def choose_step_table_file():
+        """
+        Solicita al usuario una tabla CSV o TSV de pasos.
+        
+        Returns:
+            str or None: Ruta del archivo o None si se canceló
+        """
+        filename = filedialog.askopenfilename(
+            title="Import steps",
+            filetypes=[("Spreadsheet tables", "*.csv *.tsv *.txt"), ("All files", "*.*")]
+        )
+        return filename or None
+    
+    @staticmethod
+    def choose_guide_directory(title="Select guide library folder"):
+        """
+        Solicita al usuario un directorio con archivos de guía.
+        
+        Args:
+            title (str, optional): Título del diálogo. Defaults to "Select guide library folder".
+        
+        Returns:
+            str or None: Directorio seleccionado o None si se canceló
+        """
+        directory = filedialog.askdirectory(title=title)
+        return directory or None
+    
+    @staticmethod
+    def ask_lua_save_filename(guide_zone, guide_level_range):
+        """
+        Solicita el archivo donde guardar el código Lua.
+        
+        Args:
+            guide_zone (str): Zona de la guía
+            guide_level_range (str): Rango de niveles de la guía
+        
+        Returns:
+            str or None: Ruta elegida o None si se canceló
+        """
+        # Crear nombre de archivo basado en la información de la guía
+        default_filename = FileHandler.get_lua_filename(guide_zone, guide_level_range)
+        
+        # Solicitar nombre de archivo
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".lua",
+            filetypes=[("Lua files", "*.lua"), ("All files", "*.*")],
+            initialfile=default_filename
+        )
+        return filename or None
+    
+    @staticmethod
+    def ask_diff_save_filename(guide_zone, guide_level_range):
+        """
+        Solicita el archivo donde guardar la comparación de dos guías.
+        
+        Args:
+            guide_zone (str): Zona de la guía
+            guide_level_range (str): Rango de niveles de la guía
+        
+        Returns:
+            str or None: Ruta elegida o None si se canceló
+        """
+        # Mismo nombre base que el archivo Lua de la guía
+        default_filename = os.path.splitext(FileHandler.get_lua_filename(guide_zone, guide_level_range))[0] + ".diff"
+        
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".diff",
+            filetypes=[("Diff files", "*.diff *.patch"), ("Text files", "*.txt"), ("All files", "*.*")],
+            initialfile=default_filename
+        )
+        return filename or None
+    
+    @staticmethod
+    def save_lua_to_file(lua_code, guide_zone, guide_level_range):
+        """
+        Guarda el código Lua generado en un archivo.
+        
+        Args:
+            lua_code (str): Código Lua a guardar
+            guide_zone (str): Zona de la guía
+            guide_level_range (str): Rango de niveles de la guía
+        
+        Returns:
+            bool: True si se guardó correctamente, False en caso contrario
+        """
+        filename = FileDialogs.ask_lua_save_filename(guide_zone, guide_level_range)
+        
+        if not filename:
+            return False  # Usuario canceló la operación
+        
+        # Guardar en el archivo
+        try:
+            FileHandler.write_text_atomic(filename, lua_code)
+            messagebox.showinfo("Éxito", f"Guía guardada en {filename}")
+            return True
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al guardar el archivo: {str(e)}")
+            return False
+    
+    @staticmethod
+    def ask_quest_db_export_filename():
+        """
+        Solicita el archivo donde exportar la base de datos de misiones.
+        
+        Returns:
+            str or None: Ruta elegida o None si se canceló
+        """
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            initialfile="guia_phermuth_quest_db.json"
+        )
+        return filename or None
+    
+    @staticmethod
+    def export_quest_db(quest_history):
+        """
+        Exporta la base de datos de misiones a un archivo JSON.
+        
+        Args:
+            quest_history (dict): Historial de misiones a exportar
+        
+        Returns:
+            bool: True si se exportó correctamente, False en caso contrario
+        """
+        if not quest_history:
+            messagebox.showinfo("Exportar", "No hay misiones en el historial para exportar.")
+            return False
+        
+        filename = FileDialogs.ask_quest_db_export_filename()
+        
+        if not filename:
+            return False  # Usuario canceló la operación
+        
+        try:
+            FileHandler.write_json_atomic(filename, quest_history)
+            messagebox.showinfo("Éxito", f"Base de datos de misiones exportada a {filename}")
+            return True
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al exportar la base de datos: {str(e)}")
+            return False
+    
+    @staticmethod
+    def ask_quest_db_import_filename():
+        """
+        Solicita el archivo de base de datos de misiones a importar.
+        
+        Returns:
+            str or None: Ruta elegida o None si se canceló
+        """
+        filename = filedialog.askopenfilename(
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        return filename or None
+    
+    @staticmethod
+    def import_quest_db():
+        """
+        Importa una base de datos de misiones desde un archivo JSON.
+        
+        Returns:
+            dict or None: Base de datos importada o None si hubo un error
+        """
+        filename = FileDialogs.ask_quest_db_import_filename()
+        
+        if not filename:
+            return None  # Usuario canceló la operación
+        
+        try:
+            imported_db = FileHandler.read_quest_db(filename)
+            
+            messagebox.showinfo("Éxito", f"Base de datos de misiones importada desde {filename}\nImportadas {len(imported_db)} misiones.")
+            return imported_db
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al importar la base de datos: {str(e)}")
+            return None
\ No newline at end of file
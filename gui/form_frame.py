@@ -4,7 +4,11 @@ from tkinter import ttk
 class FormFrame:
     """Frame para el formulario de pasos de la guía."""
     
-    def __init__(self, parent, on_add_step, on_clear_form, on_generate_lua, on_delete_selected, on_move_up, on_move_down):
+    # Espera (ms) tras el último evento antes de consultar la misión
+    LOOKUP_DELAY = 250
+    
+    def __init__(self, parent, on_add_step, on_clear_form, on_generate_lua, on_delete_selected, on_move_up, on_move_down,
+                 on_move_to, on_duplicate_selected):
         """
         Inicializa el frame del formulario.
         
@@ -16,6 +20,8 @@ class FormFrame:
             on_delete_selected: Función callback para eliminar paso seleccionado
             on_move_up: Función callback para mover paso hacia arriba
             on_move_down: Función callback para mover paso hacia abajo
+            on_move_to: Función callback para mover los pasos seleccionados a una posición
+            on_duplicate_selected: Función callback para duplicar los pasos seleccionados
         """
         # Variables
         self.action_var = tk.StringVar(value="A")
@@ -36,10 +42,16 @@ class FormFrame:
         self.on_delete_selected = on_delete_selected
         self.on_move_up = on_move_up
         self.on_move_down = on_move_down
+        self.on_move_to = on_move_to
+        self.on_duplicate_selected = on_duplicate_selected
         
         # Diccionario para tipos de acciones
         self.action_types = {}
         
+        # Consulta de misión pendiente (debounce) y generación de la última consulta
+        self.lookup_after_id = None
+        self.lookup_generation = 0
+        
         # Crear frame principal
         self.frame = ttk.LabelFrame(parent, text="Quest Step Information")
         
@@ -55,9 +67,8 @@ class FormFrame:
         self.action_desc_label = ttk.Label(row1, text="", font=("", 8, "italic"))
         self.action_desc_label.pack(side="left", padx=5)
         
-        # Eventos para combo de acción
-        self.action_combo.bind("<<ComboboxSelected>>", self.update_action_description)
-        self.action_combo.bind("<<ComboboxSelected>>", self.action_changed, add="+")
+        # Evento para combo de acción
+        self.action_combo.bind("<<ComboboxSelected>>", self.action_changed)
         
         ttk.Label(row1, text="Quest ID:").pack(side="left", padx=5)
         self.quest_id_entry = ttk.Entry(row1, textvariable=self.quest_id_var, width=8)
@@ -107,6 +118,21 @@ class FormFrame:
         ttk.Label(row3, text="Object ID:").pack(side="left", padx=5)
         ttk.Entry(row3, textvariable=self.obj_id_var, width=8).pack(side="left", padx=5)
         
+        # Sugerencias de puntos conocidos cerca de las coordenadas
+        row4 = ttk.Frame(self.frame)
+        row4.pack(fill="x", padx=5, pady=5)
+        
+        ttk.Label(row4, text="Nearby:").pack(side="left", padx=5)
+        self.nearby_var = tk.StringVar()
+        self.nearby_combo = ttk.Combobox(row4, textvariable=self.nearby_var, state="readonly", width=70)
+        self.nearby_combo.pack(side="left", padx=5)
+        self.nearby_combo.bind("<<ComboboxSelected>>", self.nearby_selected)
+        self.nearby_points = []
+        self.get_nearby_callback = None
+        
+        for var in (self.coord_x_var, self.coord_y_var, self.zone_var):
+            var.trace_add("write", self.update_nearby_suggestions)
+        
         # Botones
         self.button_frame = ttk.Frame(self.frame)
         self.button_frame.pack(fill="x", padx=5, pady=10)
@@ -122,6 +148,8 @@ class FormFrame:
         
         ttk.Button(self.button_frame, text="Generate Lua", command=on_generate_lua).pack(side="right", padx=5)
         ttk.Button(self.button_frame, text="Delete Selected", command=on_delete_selected).pack(side="right", padx=5)
+        ttk.Button(self.button_frame, text="Duplicate", command=on_duplicate_selected).pack(side="right", padx=5)
+        ttk.Button(self.button_frame, text="Move To...", command=on_move_to).pack(side="right", padx=5)
         ttk.Button(self.button_frame, text="Move Up", command=on_move_up).pack(side="right", padx=5)
         ttk.Button(self.button_frame, text="Move Down", command=on_move_down).pack(side="right", padx=5)
         
@@ -149,6 +177,56 @@ class FormFrame:
         """
         self.get_coords_callback = callback
     
+    def set_nearby_callback(self, callback):
+        """
+        Establece la función callback para buscar puntos conocidos cercanos.
+        
+        Args:
+            callback: Función que recibe (zona, x, y) y devuelve una lista de puntos
+        """
+        self.get_nearby_callback = callback
+    
+    def update_nearby_suggestions(self, *args):
+        """
+        Actualiza las sugerencias de puntos cercanos a las coordenadas escritas.
+        
+        Args:
+            *args: Argumentos de la traza de la variable (no se usan)
+        """
+        if self.get_nearby_callback is None:
+            return
+        
+        self.nearby_points = self.get_nearby_callback(
+            self.zone_var.get(),
+            self.coord_x_var.get(),
+            self.coord_y_var.get()
+        )
+        self.nearby_combo['values'] = [
+            f"{point['action']} {point['quest_name']}"
+            + (f" [{point['quest_id']}]" if point['quest_id'] else "")
+            + f" ({point['coord_x']}, {point['coord_y']}) - {point['distance']:.1f}"
+            for point in self.nearby_points
+        ]
+        self.nearby_var.set("")
+    
+    def nearby_selected(self, event=None):
+        """
+        Rellena el formulario con el punto cercano seleccionado.
+        
+        Args:
+            event: Evento que desencadenó la selección (opcional)
+        """
+        index = self.nearby_combo.current()
+        if not 0 <= index < len(self.nearby_points):
+            return
+        
+        point = self.nearby_points[index]
+        if point['quest_id']:
+            self.quest_id_var.set(point['quest_id'])
+            self.quest_name_var.set(point['quest_name'])
+        self.coord_x_var.set(point['coord_x'])
+        self.coord_y_var.set(point['coord_y'])
+    
     def pack(self, **kwargs):
         """
         Empaqueta el frame en su contenedor padre.
@@ -212,21 +290,14 @@ class FormFrame:
     def action_changed(self, event=None):
         """
         Maneja el evento de cambio en la acción.
-        Si la acción cambia a "T" y hay un ID de misión, buscar coordenadas.
+        Actualiza la descripción y programa la consulta de la misión
+        (por ejemplo, para recuperar coordenadas al cambiar a "T").
         
         Args:
             event: Evento que desencadenó el cambio (opcional)
         """
-        # Verificar si tenemos el callback para obtener coordenadas
-        if not hasattr(self, 'get_coords_callback'):
-            return
-        
-        action = self.action_var.get()
-        quest_id = self.quest_id_var.get().strip()
-        
-        # Si es una acción de entregar misión (T) y tenemos un ID, intentar recuperar coordenadas
-        if action == 'T' and quest_id:
-            self.try_load_quest_coords(quest_id, action)
+        self.update_action_description()
+        self.schedule_lookup()
     
     def quest_id_changed(self, event=None):
         """
@@ -235,12 +306,59 @@ class FormFrame:
         Args:
             event: Evento que desencadenó el cambio
         """
-        # Obtener el ID de misión desde el formulario
+        self.schedule_lookup()
+    
+    def schedule_lookup(self):
+        """
+        Programa la consulta de la misión actual.
+        Los eventos seguidos se agrupan en una sola consulta tras LOOKUP_DELAY ms.
+        """
+        if self.lookup_after_id is not None:
+            self.frame.after_cancel(self.lookup_after_id)
+        self.lookup_after_id = self.frame.after(self.LOOKUP_DELAY, self.run_lookup)
+    
+    def cancel_lookup(self):
+        """Cancela la consulta pendiente y descarta las que estén en curso."""
+        if self.lookup_after_id is not None:
+            self.frame.after_cancel(self.lookup_after_id)
+            self.lookup_after_id = None
+        self.lookup_generation += 1
+    
+    def run_lookup(self):
+        """Lanza la consulta de la misión actual mediante el callback."""
+        self.lookup_after_id = None
+        self.lookup_generation += 1
+        
         quest_id = self.quest_id_var.get().strip()
+        if quest_id and getattr(self, 'quest_changed_callback', None):
+            self.quest_changed_callback(quest_id, self.action_var.get(), self.lookup_generation)
+        
+    def apply_lookup(self, generation, quest_id, result):
+        """
+        Aplica al formulario el resultado de una consulta de misión.
+        Se descarta si el formulario cambió desde que se lanzó la consulta.
+        
+        Args:
+            generation (int): Generación de la consulta
+            quest_id (str): ID de la misión consultada
+            result (dict): Resultado de QuestHistory.lookup
         
-        # Llamar al callback si está definido
-        if hasattr(self, 'quest_changed_callback') and self.quest_changed_callback:
-            self.quest_changed_callback(quest_id)
+        Returns:
+            bool: True si se aplicó, False si el resultado estaba obsoleto
+        """
+        if generation != self.lookup_generation or quest_id != self.quest_id_var.get().strip():
+            return False
+        
+        if result['name']:
+            self.quest_name_var.set(result['name'])
+        if result['next_action']:
+            self.action_var.set(result['next_action'])
+            self.update_action_description()
+        if result['coords']:
+            coord_x, coord_y = result['coords']
+            self.coord_x_var.set(coord_x)
+            self.coord_y_var.set(coord_y)
+        return True
 
     def set_quest_class(self, quest_class):
         """
@@ -309,6 +427,7 @@ class FormFrame:
     
     def clear_form(self):
         """Limpia el formulario pero mantiene la acción actual."""
+        self.cancel_lookup()
         action = self.action_var.get()
         self.quest_name_var.set("")
         self.quest_id_var.set("")
@@ -328,6 +447,7 @@ class FormFrame:
         Args:
             step_data (dict): Datos del paso
         """
+        self.cancel_lookup()
         self.action_var.set(step_data['action'])
         self.quest_name_var.set(step_data['quest_name'])
         self.quest_id_var.set(step_data['quest_id'])
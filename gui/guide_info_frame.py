@@ -74,4 +74,15 @@ class GuideInfoFrame:
         self.guide_zone_var.set(zone)
         self.guide_level_range_var.set(level_range)
         self.guide_next_zone_var.set(next_zone)
-        self.guide_faction_var.set(faction)
\ No newline at end of file
+        self.guide_faction_var.set(faction)
+    
+    def set_change_callback(self, callback):
+        """
+        Establece la función a llamar cuando cambia cualquier metadato.
+        
+        Args:
+            callback: Función sin argumentos
+        """
+        for var in (self.guide_zone_var, self.guide_level_range_var,
+                    self.guide_next_zone_var, self.guide_faction_var):
+            var.trace_add("write", lambda *args: callback())
\ No newline at end of file
@@ -0,0 +1,130 @@
+import tkinter as tk
+from tkinter import ttk
+
+from utils.lua_generator import LuaGenerator
+
+class LuaPreviewFrame:
+    """
+    Panel con la vista previa del código Lua de la guía.
+    
+    El texto se carga completo una sola vez; después cada cambio en la guía
+    sustituye únicamente las líneas de los pasos afectados.
+    """
+    
+    def __init__(self, parent):
+        """
+        Inicializa el panel de vista previa.
+        
+        Args:
+            parent: Widget padre donde se colocará este frame
+        """
+        self.frame = ttk.LabelFrame(parent, text="Lua Preview")
+        
+        # Widget de texto de solo lectura
+        self.text_widget = tk.Text(self.frame, wrap="none", width=60, state="disabled")
+        y_scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.text_widget.yview)
+        x_scrollbar = ttk.Scrollbar(self.frame, orient="horizontal", command=self.text_widget.xview)
+        self.text_widget.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
+        y_scrollbar.pack(side="right", fill="y")
+        x_scrollbar.pack(side="bottom", fill="x")
+        self.text_widget.pack(side="left", fill="both", expand=True)
+        
+        # Línea del último paso modificado
+        self.text_widget.tag_configure("current", background="#FFFFCC")
+        
+        # Cabecera mostrada y número de líneas que ocupa
+        self.header = ""
+        self.header_lines = 0
+        
+        # Número de pasos mostrados
+        self.step_count = 0
+    
+    def load(self, header, steps):
+        """
+        Carga el código completo (al mostrar el panel o al cargar otra guía).
+        
+        Args:
+            header (str): Cabecera generada por LuaGenerator.format_header
+            steps (iterable): Pasos de la guía
+        """
+        lines = [LuaGenerator.format_step(step) + "\n" for step in steps]
+        self.header = header
+        self.header_lines = header.count("\n")
+        self.step_count = len(lines)
+        
+        self.text_widget.config(state="normal")
+        self.text_widget.delete("1.0", "end")
+        self.text_widget.insert("1.0", header + "".join(lines) + LuaGenerator.FOOTER)
+        self.text_widget.config(state="disabled")
+    
+    def set_header(self, header):
+        """
+        Sustituye la cabecera si ha cambiado.
+        
+        Args:
+            header (str): Nueva cabecera
+        """
+        if header == self.header:
+            return
+        
+        self.text_widget.config(state="normal")
+        self.text_widget.delete("1.0", f"{self.header_lines + 1}.0")
+        self.text_widget.insert("1.0", header)
+        self.text_widget.config(state="disabled")
+        
+        self.header = header
+        self.header_lines = header.count("\n")
+    
+    def replace_steps(self, start, removed_count, steps):
+        """
+        Sustituye las líneas de un bloque de pasos por las de otros pasos.
+        
+        Args:
+            start (int): Índice del primer paso afectado
+            removed_count (int): Número de líneas de pasos a quitar
+            steps (list): Pasos cuyas líneas se insertan en su lugar
+        """
+        first_line = self.header_lines + 1 + start
+        text = "".join(LuaGenerator.format_step(step) + "\n" for step in steps)
+        
+        self.text_widget.config(state="normal")
+        if removed_count:
+            self.text_widget.delete(f"{first_line}.0", f"{first_line + removed_count}.0")
+        if text:
+            self.text_widget.insert(f"{first_line}.0", text)
+        self.text_widget.config(state="disabled")
+        
+        self.step_count += len(steps) - removed_count
+    
+    def move_steps(self, start, end, new_index):
+        """
+        Mueve las líneas de un bloque de pasos sin regenerarlas.
+        
+        Args:
+            start (int): Índice original del primer paso del bloque
+            end (int): Índice siguiente al último paso del bloque
+            new_index (int): Nuevo índice del primer paso del bloque
+        """
+        first_line = self.header_lines + 1 + start
+        end_line = first_line + end - start
+        
+        self.text_widget.config(state="normal")
+        text = self.text_widget.get(f"{first_line}.0", f"{end_line}.0")
+        self.text_widget.delete(f"{first_line}.0", f"{end_line}.0")
+        self.text_widget.insert(f"{self.header_lines + 1 + new_index}.0", text)
+        self.text_widget.config(state="disabled")
+    
+    def show_step(self, index):
+        """
+        Desplaza la vista hasta un paso y lo destaca.
+        
+        Args:
+            index (int or None): Índice del paso o None para quitar el destacado
+        """
+        self.text_widget.tag_remove("current", "1.0", "end")
+        if index is None or not 0 <= index < self.step_count:
+            return
+        
+        line = self.header_lines + 1 + index
+        self.text_widget.tag_add("current", f"{line}.0", f"{line + 1}.0")
+        self.text_widget.see(f"{line}.0")
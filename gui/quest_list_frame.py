@@ -4,20 +4,25 @@ from tkinter import ttk
 class QuestListFrame:
     """Frame para la lista de pasos de la guía."""
     
-    def __init__(self, parent, on_edit_step):
+    # Desplazamiento mínimo (en píxeles) para iniciar un arrastre
+    DRAG_THRESHOLD = 5
+    
+    def __init__(self, parent, on_edit_step, on_drop_steps=None):
         """
         Inicializa el frame de la lista de pasos.
         
         Args:
             parent: Widget padre donde se colocará este frame
             on_edit_step: Función callback para editar un paso
+            on_drop_steps: Función callback que recibe el índice de destino al soltar
+                los pasos arrastrados. Defaults to None.
         """
         # Crear frame principal
         self.frame = ttk.LabelFrame(parent, text="Quest Steps")
         
         # Definir columnas del treeview
-        columns = ("step", "action", "quest", "questid", "note", "coords", "class", "race", "zone", "objid")
-        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings")
+        columns = ("step", "action", "quest", "questid", "note", "coords", "class", "race", "zone", "objid", "issues")
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", selectmode="extended")
         
         # Establecer cabeceras de columnas
         self.tree.heading("step", text="#")
@@ -30,6 +35,7 @@ class QuestListFrame:
         self.tree.heading("race", text="Race")
         self.tree.heading("zone", text="Zone")
         self.tree.heading("objid", text="ObjID")
+        self.tree.heading("issues", text="Issues")
         
         # Establecer anchos de columnas
         self.tree.column("step", width=30, anchor="center")
@@ -42,20 +48,54 @@ class QuestListFrame:
         self.tree.column("race", width=80, anchor="center")
         self.tree.column("zone", width=100)
         self.tree.column("objid", width=50, anchor="center")
+        self.tree.column("issues", width=200)
         
         # Añadir barra de desplazamiento
-        scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
         
         # Empaquetar treeview y barra de desplazamiento
         self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.scrollbar.pack(side="right", fill="y")
         
         # Vincular evento de doble clic para editar paso
         self.tree.bind("<Double-1>", on_edit_step)
+        
+        # Arrastrar y soltar para reordenar pasos
+        self.on_drop_steps = on_drop_steps
+        self.drag_item = None
+        self.drag_start_y = 0
+        self.drag_active = False
+        self.tree.bind("<ButtonPress-1>", self.on_drag_start)
+        self.tree.bind("<B1-Motion>", self.on_drag_motion)
+        self.tree.bind("<ButtonRelease-1>", self.on_drag_release)
 
+        # Callback para obtener los diagnósticos de un paso
+        self.get_diagnostics_callback = None
+
+        # Filas del treeview en el orden de los pasos (evita consultar get_children)
+        self.items = []
+        
+        # Número mostrado en la columna "#" de cada fila. Solo se corrige en las filas
+        # visibles, de modo que insertar o eliminar no renumera toda la lista
+        self.shown_numbers = {}
+        self.renumber_pending = False
+        
+        # Fila destacada como en edición (None si no hay ninguna)
+        self.editing_item = None
+        
         # Configurar estilos de tags
         self.tree.tag_configure("editing", background="#FFFFCC")
+        self.tree.tag_configure("lint", background="#FFD6D6")
+    
+    def set_diagnostics_callback(self, callback):
+        """
+        Establece la función callback para obtener los diagnósticos de un paso.
+        
+        Args:
+            callback: Función que recibe un paso y devuelve una lista de mensajes
+        """
+        self.get_diagnostics_callback = callback
     
     def pack(self, **kwargs):
         """
@@ -74,23 +114,269 @@ class QuestListFrame:
             quest_steps (list): Lista de pasos de la guía
         """
         # Limpiar elementos existentes
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.items)
+        self.items = []
+        self.shown_numbers = {}
+        self.editing_item = None
         
         # Repoblar con datos actualizados
         for i, step in enumerate(quest_steps):
-            self.tree.insert("", "end", values=(
-                i + 1,
-                step['action'],
-                step['quest_name'],
-                step['quest_id'],
-                step['note'],
-                step['coords'],
-                step['class'],
-                step['race'],
-                step['zone'],
-                step['obj_id']
-            ))
+            self.insert_row(i, step)
+    
+    def insert_row(self, index, step):
+        """
+        Inserta la fila de un paso sin renumerar las siguientes.
+        
+        Args:
+            index (int): Índice del paso
+            step (dict): Datos del paso
+        """
+        diagnostics = self.get_diagnostics(step)
+        item = self.tree.insert("", index, values=self.row_values(index, step, diagnostics),
+                                tags=("lint",) if diagnostics else ())
+        self.items.insert(index, item)
+        self.shown_numbers[item] = index + 1
+    
+    def get_diagnostics(self, step):
+        """Obtiene los diagnósticos de un paso mediante el callback, si existe."""
+        return self.get_diagnostics_callback(step) if self.get_diagnostics_callback else []
+    
+    @staticmethod
+    def row_values(index, step, diagnostics):
+        """
+        Construye los valores de las columnas de la fila de un paso.
+        
+        Args:
+            index (int): Índice del paso
+            step (dict): Datos del paso
+            diagnostics (list): Mensajes de diagnóstico del paso
+        
+        Returns:
+            tuple: Valores de las columnas
+        """
+        return (
+            index + 1,
+            step.get('action', ""),
+            step.get('quest_name', ""),
+            step.get('quest_id', ""),
+            step.get('note', ""),
+            step.get('coords', ""),
+            step.get('class', ""),
+            step.get('race', ""),
+            step.get('zone', ""),
+            step.get('obj_id', ""),
+            "; ".join(diagnostics)
+        )
+    
+    def insert_rows(self, index, steps):
+        """
+        Inserta las filas de un bloque de pasos sin repoblar la lista completa.
+        
+        Args:
+            index (int): Índice del primer paso insertado
+            steps (list): Pasos insertados
+        """
+        for offset, step in enumerate(steps):
+            self.insert_row(index + offset, step)
+        self.schedule_renumber()
+    
+    def delete_rows(self, start, end):
+        """
+        Elimina las filas de un bloque de pasos sin repoblar la lista completa.
+        
+        Args:
+            start (int): Índice del primer paso eliminado
+            end (int): Índice siguiente al último paso eliminado
+        """
+        items = self.items[start:end]
+        if self.editing_item in items:
+            self.editing_item = None
+        self.tree.delete(*items)
+        del self.items[start:end]
+        for item in items:
+            self.shown_numbers.pop(item, None)
+        self.schedule_renumber()
+    
+    def update_row(self, index, step):
+        """
+        Sustituye la fila de un paso editado.
+        
+        Args:
+            index (int): Índice del paso
+            step (dict): Nuevos datos del paso
+        """
+        if not 0 <= index < len(self.items):
+            return
+        
+        # Actualizar la fila en su sitio, conservando el destacado de edición
+        item = self.items[index]
+        diagnostics = self.get_diagnostics(step)
+        self.tree.item(item, values=self.row_values(index, step, diagnostics),
+                       tags=self.row_tags(item, diagnostics))
+        self.shown_numbers[item] = index + 1
+    
+    def on_tree_scroll(self, first, last):
+        """
+        Actualiza la barra de desplazamiento y renumera las filas que pasan a ser visibles.
+        
+        Args:
+            first (str): Fracción de la lista en el borde superior de la vista
+            last (str): Fracción de la lista en el borde inferior de la vista
+        """
+        self.scrollbar.set(first, last)
+        self.schedule_renumber()
+    
+    def schedule_renumber(self):
+        """Programa la renumeración de las filas visibles (varias ediciones seguidas se agrupan)."""
+        if not self.renumber_pending:
+            self.renumber_pending = True
+            self.tree.after_idle(self.renumber_visible_rows)
+    
+    def visible_range(self):
+        """
+        Calcula el rango de índices de las filas visibles.
+        
+        Returns:
+            tuple: Índice de la primera fila visible y siguiente a la última
+        """
+        first, last = self.tree.yview()
+        count = len(self.items)
+        return max(int(first * count) - 1, 0), min(int(last * count) + 1, count)
+    
+    def renumber_visible_rows(self):
+        """
+        Corrige la columna "#" de las filas visibles cuyo número ha quedado desfasado.
+        El coste depende del número de filas visibles y no del tamaño de la guía.
+        """
+        self.renumber_pending = False
+        start, end = self.visible_range()
+        for i in range(start, end):
+            item = self.items[i]
+            if self.shown_numbers.get(item) != i + 1:
+                self.tree.set(item, "step", i + 1)
+                self.shown_numbers[item] = i + 1
+    
+    def row_tags(self, item, diagnostics):
+        """Calcula los tags de una fila (el estilo de edición tiene prioridad sobre el de diagnóstico)."""
+        tags = ["editing"] if item == self.editing_item else []
+        if diagnostics:
+            tags.append("lint")
+        return tags
+    
+    def update_row_diagnostics(self, index, diagnostics):
+        """
+        Actualiza los diagnósticos de una fila sin refrescar la lista completa.
+        
+        Args:
+            index (int): Índice del paso
+            diagnostics (list): Mensajes de diagnóstico del paso
+        """
+        if not 0 <= index < len(self.items):
+            return
+        
+        item = self.items[index]
+        self.tree.set(item, "issues", "; ".join(diagnostics))
+        self.tree.item(item, tags=self.row_tags(item, diagnostics))
+    
+    def on_drag_start(self, event):
+        """
+        Inicia un posible arrastre al pulsar sobre una fila.
+        
+        Args:
+            event: Evento de pulsación del ratón
+        """
+        self.drag_item = None
+        self.drag_active = False
+        
+        # Con Shift o Control se mantiene la selección estándar
+        if self.on_drop_steps is None or event.state & 0x0005:
+            return None
+        if self.tree.identify_region(event.x, event.y) != "cell":
+            return None
+        
+        item = self.tree.identify_row(event.y)
+        if not item:
+            return None
+        
+        self.drag_item = item
+        self.drag_start_y = event.y
+        
+        # Conservar la selección múltiple si se pulsa sobre una fila ya seleccionada
+        if item in self.tree.selection():
+            return "break"
+        return None
+    
+    def on_drag_motion(self, event):
+        """
+        Activa el arrastre cuando el ratón se desplaza lo suficiente.
+        
+        Args:
+            event: Evento de movimiento del ratón
+        """
+        if self.drag_item is None:
+            return
+        
+        if not self.drag_active and abs(event.y - self.drag_start_y) >= self.DRAG_THRESHOLD:
+            self.drag_active = True
+            self.tree.configure(cursor="fleur")
+        
+        if self.drag_active:
+            target_item = self.tree.identify_row(event.y)
+            if target_item:
+                self.tree.see(target_item)
+    
+    def on_drag_release(self, event):
+        """
+        Finaliza el arrastre y notifica la posición de destino.
+        
+        Args:
+            event: Evento de liberación del ratón
+        """
+        drag_item, drag_active = self.drag_item, self.drag_active
+        self.drag_item = None
+        self.drag_active = False
+        
+        if drag_item is None:
+            return
+        
+        if not drag_active:
+            # Fue un clic simple sobre una fila seleccionada: seleccionar solo esa
+            self.tree.selection_set(drag_item)
+            self.tree.focus(drag_item)
+            return
+        
+        self.tree.configure(cursor="")
+        
+        target_item = self.tree.identify_row(event.y)
+        if target_item:
+            target_index = self.tree.index(target_item)
+        else:
+            # Soltar por debajo de la última fila equivale a moverlo al final
+            target_index = len(self.items) - 1
+        
+        self.on_drop_steps(target_index)
+    
+    def move_rows(self, start, end, new_index):
+        """
+        Mueve un bloque de filas sin repoblar la lista completa.
+        Solo se renumeran las filas visibles.
+        
+        Args:
+            start (int): Índice del primer paso del bloque original
+            end (int): Índice siguiente al último paso del bloque original
+            new_index (int): Nuevo índice del primer paso del bloque
+        """
+        items = self.items[start:end]
+        del self.items[start:end]
+        self.items[new_index:new_index] = items
+        
+        # Separar el bloque y volver a insertarlo en su nueva posición
+        for item in items:
+            self.tree.detach(item)
+        for offset, item in enumerate(items):
+            self.tree.move(item, "", new_index + offset)
+        
+        self.schedule_renumber()
     
     def get_selected_index(self):
         """
@@ -103,9 +389,16 @@ class QuestListFrame:
         if not selected_items:
             return None
         
-        item = selected_items[0]
-        values = self.tree.item(item, "values")
-        return int(values[0]) - 1  # Restar 1 porque la UI muestra índices desde 1
+        return self.tree.index(selected_items[0])
+    
+    def get_selected_indices(self):
+        """
+        Obtiene los índices de todos los pasos seleccionados.
+        
+        Returns:
+            list: Índices seleccionados en orden ascendente
+        """
+        return sorted(self.tree.index(item) for item in self.tree.selection())
     
     def select_by_index(self, index):
         """
@@ -114,15 +407,22 @@ class QuestListFrame:
         Args:
             index (int): Índice del paso a seleccionar
         """
-        # El índice en la UI es +1 respecto al índice en la lista
-        ui_index = index + 1
+        self.select_range(index, index + 1)
+    
+    def select_range(self, start, end):
+        """
+        Selecciona un bloque contiguo de pasos.
+        
+        Args:
+            start (int): Índice del primer paso
+            end (int): Índice siguiente al último paso
+        """
+        items = self.items[max(start, 0):end]
+        if not items:
+            return
         
-        # Buscar el ítem con ese índice
-        for item in self.tree.get_children():
-            if int(self.tree.item(item, "values")[0]) == ui_index:
-                self.tree.selection_set(item)
-                self.tree.see(item)
-                break
+        self.tree.selection_set(items)
+        self.tree.see(items[0])
 
     def highlight_editing_row(self, index):
         """
@@ -131,17 +431,15 @@ class QuestListFrame:
         Args:
             index (int): Índice del paso que se está editando
         """
-        # Restaurar el estilo normal para todas las filas
-        for item in self.tree.get_children():
-            self.tree.item(item, tags=())
+        # Quitar el estilo de edición de la fila anterior conservando los diagnósticos
+        if self.editing_item is not None:
+            tags = self.tree.item(self.editing_item, "tags")
+            self.tree.item(self.editing_item, tags=[tag for tag in tags if tag != "editing"])
+            self.editing_item = None
         
         # Si se proporciona un índice válido, aplicar estilo de edición
-        if index is not None:
-            for item in self.tree.get_children():
-                values = self.tree.item(item, "values")
-                if values and int(values[0]) - 1 == index:  # Ajuste por índice UI vs índice real
-                    self.tree.item(item, tags=("editing",))
-                    break
-        
-        # Definir el estilo para filas en edición (color de fondo amarillo claro)
-        self.tree.tag_configure("editing", background="#FFFFCC")
\ No newline at end of file
+        if index is not None and 0 <= index < len(self.items):
+            self.editing_item = self.items[index]
+            tags = [tag for tag in self.tree.item(self.editing_item, "tags") if tag != "editing"]
+            # El estilo de edición tiene prioridad sobre el de diagnóstico
+            self.tree.item(self.editing_item, tags=["editing"] + tags)
\ No newline at end of file
@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from controllers.guide_controller import GuideController, GuideError
+from utils.guide_diff import GuideDiff
+from utils.file_handler import FileHandler
+from utils.guide_watcher import GuideWatcher
+from utils.exporters import ExportPipeline
+from utils.quest_reference import QuestReference
+from models.guide import Guide
+
+def load_steps(filename):
+    """
+    Carga los pasos de un archivo de guía JSON.
+    
+    Args:
+        filename (str): Ruta del archivo de guía
+        
+    Returns:
+        tuple: (datos de la guía, lista de pasos)
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        guide_data = json.load(f)
+    return guide_data, guide_data.get("steps", [])
+
+def load_controller(filename):
+    """
+    Carga una guía en un controlador para generarla con los mismos métodos que la aplicación.
+    
+    Args:
+        filename (str): Ruta del archivo de guía
+    
+    Returns:
+        GuideController: Controlador con la guía cargada
+    """
+    controller = GuideController()
+    controller.load_guide(filename)
+    return controller
+
+def command_diff(args):
+    """Muestra los bloques cambiados entre dos guías."""
+    _, old_steps = load_steps(args.old)
+    _, new_steps = load_steps(args.new)
+    
+    hunks = GuideDiff.format_hunks(old_steps, new_steps, context=args.context)
+    if hunks:
+        print(hunks)
+    return 1 if hunks else 0
+
+def command_merge(args):
+    """Fusiona dos guías a partir de su ancestro común."""
+    _, base_steps = load_steps(args.base)
+    our_data, our_steps = load_steps(args.ours)
+    _, their_steps = load_steps(args.theirs)
+    
+    result = GuideDiff.merge(base_steps, our_steps, their_steps)
+    our_data["steps"] = result['steps']
+    
+    output = args.output or args.ours
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(our_data, f, indent=2)
+    
+    for conflict in result['conflicts']:
+        print(f"Conflict at step {conflict['index'] + 1}: "
+              f"{len(conflict['ours'])} ours / {len(conflict['theirs'])} theirs (kept ours)",
+              file=sys.stderr)
+    print(f"Merged {len(result['steps'])} steps into {output} "
+          f"({len(result['conflicts'])} conflicts)")
+    return 1 if result['conflicts'] else 0
+
+def command_lua(args):
+    """Genera el código Lua de una guía, opcionalmente en modo optimizado."""
+    controller = load_controller(args.guide)
+    lua_code, report = controller.generate_lua(optimize=args.optimize)
+    if report is not None:
+        if not report['equivalent']:
+            print("Optimized output did not round-trip; writing the normal output", file=sys.stderr)
+        else:
+            guide_name, _ = controller.get_guide_names()
+            print(f"{guide_name}: {report['original_bytes']} -> {report['optimized_bytes']} bytes "
+                  f"({report['saved_bytes']} saved)", file=sys.stderr)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(lua_code)
+    else:
+        sys.stdout.write(lua_code)
+    return 0
+
+def command_chunks(args):
+    """Divide una guía en bloques RegisterGuide encadenados por niveles o por pasos."""
+    controller = load_controller(args.guide)
+    chunks = controller.generate_chunks(
+        max_steps=args.max_steps, split_at_levels=not args.no_levels, optimize=args.optimize
+    )
+    
+    guide = controller.guide
+    os.makedirs(args.output_dir, exist_ok=True)
+    files = FileHandler.get_chunk_files(args.output_dir, guide.zone, guide.level_range, chunks, args.single_file)
+    for filename in FileHandler.write_text_files(files):
+        print(filename)
+    print(f"{len(chunks)} chunks", file=sys.stderr)
+    return 0
+
+def command_variants(args):
+    """Genera las variantes Lua (facción, clase, raza) de una guía en una sola pasada."""
+    controller = load_controller(args.guide)
+    faction = controller.guide.faction
+    
+    specs = args.variant
+    if not specs:
+        specs = ["Horde", "Alliance"] if faction == "Both" else [faction]
+    code_by_variant = controller.generate_variants(specs, optimize=args.optimize)
+    
+    os.makedirs(args.output_dir, exist_ok=True)
+    for filename in FileHandler.write_text_files(controller.get_variant_files(args.output_dir, code_by_variant)):
+        print(filename)
+    return 0
+
+def command_export(args):
+    """Exporta una guía a varios formatos con un único recorrido de los pasos."""
+    controller = load_controller(args.guide)
+    formats = args.format or list(ExportPipeline.EXPORTERS)
+    base_name = os.path.splitext(os.path.basename(args.guide))[0]
+    
+    os.makedirs(args.output_dir, exist_ok=True)
+    filenames = controller.export_guide(
+        controller.get_guide_data(), formats, args.output_dir, base_name, optimize=args.optimize
+    )
+    for filename in filenames:
+        print(filename)
+    return 0
+
+def command_watch(args):
+    """Compila las guías de un directorio y, salvo con --once, lo vigila."""
+    watcher = GuideWatcher(args.directory, args.output_dir or args.directory, optimize=args.optimize)
+    
+    def report(results):
+        for path, status in results:
+            print(f"{status:8} {os.path.basename(path)}")
+        sys.stdout.flush()
+    
+    started = time.perf_counter()
+    results = watcher.build()
+    report(results)
+    print(f"Build finished in {time.perf_counter() - started:.3f}s", file=sys.stderr)
+    
+    if not args.once:
+        watcher.watch(args.interval, report)
+    return 0
+
+def load_reference_quests(filename):
+    """
+    Lee las misiones de origen para la base de datos de referencia.
+    
+    Acepta un CSV con columnas quest_id, name, zone, level, coord_x y coord_y
+    (o x e y) o una base de datos de misiones exportada desde la aplicación.
+    
+    Args:
+        filename (str): Ruta del archivo de origen
+        
+    Returns:
+        list: Diccionarios de misiones para QuestReference.build
+    """
+    if filename.lower().endswith(".json"):
+        with open(filename, 'r', encoding='utf-8') as f:
+            quest_db = json.load(f)
+        quests = []
+        for quest_id, quest in quest_db.items():
+            giver = quest.get('coords', {}).get('A', {})
+            quests.append({
+                'quest_id': quest_id,
+                'name': quest.get('name', ""),
+                'coord_x': giver.get('x'),
+                'coord_y': giver.get('y')
+            })
+        return quests
+    
+    with open(filename, 'r', encoding='utf-8', newline='') as f:
+        quests = []
+        for row in csv.DictReader(f):
+            row.setdefault('coord_x', row.get('x'))
+            row.setdefault('coord_y', row.get('y'))
+            quests.append(row)
+        return quests
+
+def command_questdb(args):
+    """Genera la base de datos de referencia de misiones a partir de un CSV o JSON."""
+    output = args.output or QuestReference().filename
+    count = QuestReference.build(load_reference_quests(args.source), output)
+    print(f"{count} quests written to {output}")
+    return 0
+
+def command_levels(args):
+    """Lista las guías de un directorio que cubren un nivel o rango de niveles."""
+    level = args.level if '-' in args.level else f"{args.level}-{args.level}"
+    low, high = Guide.parse_level_range(level)
+    if low is None:
+        print(f"Invalid level: {args.level}", file=sys.stderr)
+        return 2
+    
+    index = FileHandler.load_level_index(args.directory)
+    for key in index.overlap(min(low, high), max(low, high), args.faction, args.zone):
+        entry = index.entries[key]
+        print(f"{entry['level_range']:>7}  {entry['faction']:8}  {entry['zone']:20}  {os.path.basename(key)}")
+    return 0
+
+def main(argv=None):
+    """Punto de entrada de las herramientas de línea de comandos."""
+    parser = argparse.ArgumentParser(description="GuiaPhermuth guide tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    diff_parser = subparsers.add_parser("diff", help="Show changed hunks between two guides")
+    diff_parser.add_argument("old", help="Original guide JSON")
+    diff_parser.add_argument("new", help="New guide JSON")
+    diff_parser.add_argument("-C", "--context", type=int, default=2, help="Context steps around changes")
+    diff_parser.set_defaults(func=command_diff)
+    
+    merge_parser = subparsers.add_parser("merge", help="Three-way merge of guide JSON files")
+    merge_parser.add_argument("base", help="Common ancestor guide JSON")
+    merge_parser.add_argument("ours", help="Our guide JSON")
+    merge_parser.add_argument("theirs", help="Their guide JSON")
+    merge_parser.add_argument("-o", "--output", help="Output file (defaults to overwriting ours)")
+    merge_parser.set_defaults(func=command_merge)
+    
+    lua_parser = subparsers.add_parser("lua", help="Generate the Lua code of a guide")
+    lua_parser.add_argument("guide", help="Guide JSON")
+    lua_parser.add_argument("-O", "--optimize", action="store_true", help="Size-optimized output")
+    lua_parser.add_argument("-o", "--output", help="Output file (defaults to stdout)")
+    lua_parser.set_defaults(func=command_lua)
+    
+    chunks_parser = subparsers.add_parser("chunks", help="Split a guide into chained RegisterGuide blocks")
+    chunks_parser.add_argument("guide", help="Guide JSON")
+    chunks_parser.add_argument("-n", "--max-steps", type=int, help="Maximum steps per chunk")
+    chunks_parser.add_argument("--no-levels", action="store_true", help="Do not split at level milestones")
+    chunks_parser.add_argument("--single-file", action="store_true", help="Write all blocks to one file")
+    chunks_parser.add_argument("-o", "--output-dir", default=".", help="Output directory")
+    chunks_parser.add_argument("-O", "--optimize", action="store_true", help="Size-optimized output")
+    chunks_parser.set_defaults(func=command_chunks)
+    
+    variants_parser = subparsers.add_parser("variants", help="Generate filtered Lua builds of a guide")
+    variants_parser.add_argument("guide", help="Guide JSON")
+    variants_parser.add_argument("-v", "--variant", action="append",
+                                 help="Variant as faction[:class[:race]] (repeatable); "
+                                      "defaults to the guide faction(s)")
+    variants_parser.add_argument("-o", "--output-dir", default=".", help="Output directory")
+    variants_parser.add_argument("-O", "--optimize", action="store_true", help="Size-optimized output")
+    variants_parser.set_defaults(func=command_variants)
+    
+    export_parser = subparsers.add_parser("export", help="Export a guide to several formats in one pass")
+    export_parser.add_argument("guide", help="Guide JSON")
+    export_parser.add_argument("-f", "--format", action="append", choices=sorted(ExportPipeline.EXPORTERS),
+                               help="Output format (repeatable); defaults to all formats")
+    export_parser.add_argument("-o", "--output-dir", default=".", help="Output directory")
+    export_parser.add_argument("-O", "--optimize", action="store_true", help="Size-optimized Lua output")
+    export_parser.set_defaults(func=command_export)
+    
+    watch_parser = subparsers.add_parser("watch", help="Compile a guide directory to Lua and watch for changes")
+    watch_parser.add_argument("directory", help="Directory with guide JSON files")
+    watch_parser.add_argument("-o", "--output-dir", help="Output directory (defaults to the guide directory)")
+    watch_parser.add_argument("-i", "--interval", type=float, default=1.0, help="Polling interval in seconds")
+    watch_parser.add_argument("--once", action="store_true", help="Build once and exit")
+    watch_parser.add_argument("-O", "--optimize", action="store_true", help="Size-optimized output")
+    watch_parser.set_defaults(func=command_watch)
+    
+    questdb_parser = subparsers.add_parser("questdb", help="Build the quest reference database")
+    questdb_parser.add_argument("source", help="Quest CSV (quest_id,name,zone,level,coord_x,coord_y) "
+                                               "or exported quest DB JSON")
+    questdb_parser.add_argument("-o", "--output", help="Output file (defaults to the bundled resource)")
+    questdb_parser.set_defaults(func=command_questdb)
+    
+    levels_parser = subparsers.add_parser("levels", help="List the guides of a directory that cover a level")
+    levels_parser.add_argument("directory", help="Directory with guide JSON files")
+    levels_parser.add_argument("level", help="Level or level range (e.g. 34 or 30-35)")
+    levels_parser.add_argument("-f", "--faction", help="Character faction (Both guides always match)")
+    levels_parser.add_argument("-z", "--zone", help="Only guides of this zone")
+    levels_parser.set_defaults(func=command_levels)
+    
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except GuideError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
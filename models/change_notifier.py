@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+
+class ChangeNotifier:
+    """
+    Base de los modelos que avisan de sus cambios a los suscriptores.
+    
+    Cada cambio es un diccionario con su tipo en 'type' y los datos necesarios
+    para aplicarlo de forma incremental (índices, pasos afectados, etc.). Los
+    suscriptores reciben siempre una lista de eventos en el orden en que
+    ocurrieron: dentro de una transacción los eventos se acumulan y se entregan
+    juntos al cerrar la transacción más externa, de modo que una operación
+    compuesta provoca una sola actualización de vista o un solo autoguardado.
+    
+    Los suscriptores inmediatos (índices derivados que deben estar siempre al
+    día con el modelo) reciben cada evento en cuanto ocurre, también dentro
+    de una transacción, y antes que los suscriptores normales.
+    """
+    
+    def __init__(self):
+        """Inicializa el modelo sin suscriptores."""
+        self._subscribers = []
+        self._immediate_subscribers = []
+        self._pending_events = []
+        self._transaction_depth = 0
+    
+    def subscribe(self, callback, immediate=False):
+        """
+        Suscribe una función a los cambios del modelo.
+        
+        Args:
+            callback: Función que recibe una lista de eventos
+            immediate (bool, optional): Recibir cada evento en cuanto ocurre,
+                sin esperar al final de la transacción. Defaults to False.
+        """
+        subscribers = self._immediate_subscribers if immediate else self._subscribers
+        if callback not in subscribers:
+            subscribers.append(callback)
+    
+    def unsubscribe(self, callback):
+        """
+        Cancela la suscripción de una función.
+        
+        Args:
+            callback: Función suscrita
+        """
+        for subscribers in (self._immediate_subscribers, self._subscribers):
+            if callback in subscribers:
+                subscribers.remove(callback)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa los cambios realizados dentro del bloque en un solo lote.
+        Las transacciones pueden anidarse; el lote se entrega al cerrar la más externa.
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._flush()
+    
+    def notify(self, event_type, **data):
+        """
+        Registra un cambio del modelo y lo entrega a los suscriptores.
+        
+        Args:
+            event_type (str): Tipo de cambio
+            **data: Datos del cambio
+        """
+        event = dict(data, type=event_type)
+        for callback in list(self._immediate_subscribers):
+            callback([event])
+        
+        if not self._subscribers:
+            return
+        self._pending_events.append(event)
+        if self._transaction_depth == 0:
+            self._flush()
+    
+    def _flush(self):
+        """Entrega los eventos acumulados a los suscriptores normales."""
+        events, self._pending_events = self._pending_events, []
+        if not events:
+            return
+        for callback in list(self._subscribers):
+            callback(events)
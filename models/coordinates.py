@@ -0,0 +1,150 @@
+class Coordinates:
+    """Utilidades para interpretar y validar coordenadas de mapa (0-100)."""
+    
+    # Rango válido de las coordenadas del mapa
+    MIN_VALUE = 0.0
+    MAX_VALUE = 100.0
+    
+    # Número máximo de textos interpretados que se recuerdan (al superarlo se vacía la caché)
+    PARSE_CACHE_SIZE = 4096
+    
+    # Texto de coordenadas -> par (x, y) o None. Cada texto se convierte a número una
+    # sola vez y el resultado lo comparten el índice espacial, el optimizador de rutas,
+    # el generador Lua y el historial
+    _parsed = {}
+    
+    @staticmethod
+    def parse_value(text):
+        """
+        Convierte una coordenada en texto a número.
+        
+        Args:
+            text (str): Coordenada en texto (acepta coma o punto decimal)
+            
+        Returns:
+            float or None: Coordenada numérica o None si no es válida o está fuera de rango
+        """
+        if text is None:
+            return None
+        text = str(text).strip()
+        if not text:
+            return None
+        try:
+            value = float(text.replace(',', '.'))
+        except ValueError:
+            return None
+        if not Coordinates.MIN_VALUE <= value <= Coordinates.MAX_VALUE:
+            return None
+        return value
+    
+    @staticmethod
+    def parse_pair(coord_x, coord_y):
+        """
+        Convierte un par de coordenadas en texto a números.
+        
+        Args:
+            coord_x (str): Coordenada X
+            coord_y (str): Coordenada Y
+            
+        Returns:
+            tuple or None: Par (x, y) numérico o None si alguna no es válida
+        """
+        key = (coord_x, coord_y)
+        if key in Coordinates._parsed:
+            return Coordinates._parsed[key]
+        
+        x = Coordinates.parse_value(coord_x)
+        y = Coordinates.parse_value(coord_y)
+        return Coordinates._remember(key, None if x is None or y is None else (x, y))
+    
+    @staticmethod
+    def parse_coords_text(coords):
+        """
+        Interpreta el texto combinado de coordenadas ("x, y").
+        
+        Args:
+            coords (str): Texto de coordenadas
+            
+        Returns:
+            tuple or None: Par (x, y) numérico o None si no es válido
+        """
+        if not coords:
+            return None
+        if coords in Coordinates._parsed:
+            return Coordinates._parsed[coords]
+        
+        parts = coords.split(',')
+        pair = Coordinates.parse_pair(parts[0], parts[1]) if len(parts) == 2 else None
+        return Coordinates._remember(coords, pair)
+    
+    @staticmethod
+    def _remember(key, pair):
+        """
+        Guarda el resultado de interpretar un texto de coordenadas.
+        
+        Args:
+            key: Texto interpretado (o par de textos)
+            pair (tuple or None): Resultado de la interpretación
+        
+        Returns:
+            tuple or None: El mismo resultado
+        """
+        if len(Coordinates._parsed) >= Coordinates.PARSE_CACHE_SIZE:
+            Coordinates._parsed.clear()
+        Coordinates._parsed[key] = pair
+        return pair
+    
+    @staticmethod
+    def format_pair(x, y, precision=2):
+        """
+        Formatea un par de coordenadas con una precisión fija, sin ceros sobrantes.
+        
+        Args:
+            x (float): Coordenada X
+            y (float): Coordenada Y
+            precision (int, optional): Decimales como máximo. Defaults to 2.
+            
+        Returns:
+            str: Texto "x, y" (por ejemplo, "45.2, 30")
+        """
+        def format_value(value):
+            text = f"{round(value, precision):.{precision}f}"
+            return text.rstrip('0').rstrip('.') if '.' in text else text
+        return f"{format_value(x)}, {format_value(y)}"
+    
+    @staticmethod
+    def from_step(step):
+        """
+        Obtiene las coordenadas numéricas de un paso.
+        Usa 'coord_x'/'coord_y' y, si no existen, el texto de 'coords'.
+        
+        Args:
+            step (dict): Datos del paso
+            
+        Returns:
+            tuple or None: Par (x, y) numérico o None si el paso no tiene coordenadas válidas
+        """
+        if step.get('coord_x') and step.get('coord_y'):
+            return Coordinates.parse_pair(step['coord_x'], step['coord_y'])
+        return Coordinates.parse_coords_text(step.get('coords'))
+    
+    @staticmethod
+    def validate_step(step):
+        """
+        Valida las coordenadas de un paso.
+        
+        Args:
+            step (dict): Datos del paso
+            
+        Returns:
+            str or None: Mensaje de error o None si las coordenadas son válidas o están vacías
+        """
+        coord_x = (step.get('coord_x') or "").strip()
+        coord_y = (step.get('coord_y') or "").strip()
+        if not coord_x and not coord_y:
+            return None
+        if not coord_x or not coord_y:
+            return "Both X and Y coordinates are required"
+        if Coordinates.parse_pair(coord_x, coord_y) is None:
+            return "Coordinates must be numbers between 0 and 100"
+        return None
@@ -1,16 +1,32 @@
-class Guide:
-    """Clase para representar una guía completa."""
+from models.change_notifier import ChangeNotifier
+from models.step_list import StepList
+
+class Guide(ChangeNotifier):
+    """
+    Clase para representar una guía completa.
+    
+    Cada mutación emite un evento (ver ChangeNotifier):
+    
+    - inserted: 'index' y 'steps' insertados
+    - removed: 'index' y 'steps' eliminados
+    - moved: bloque ['start', 'end') movido a 'index'
+    - updated: 'index', nuevo 'step' y 'old_step'
+    - metadata: cambiaron los metadatos
+    - reset: se sustituyeron todos los pasos (nueva guía o guía cargada)
+    """
     
     def __init__(self):
         """Inicializa una nueva guía vacía."""
+        super().__init__()
+        
         # Metadatos de la guía
         self.zone = ""
         self.level_range = ""
         self.next_zone = ""
         self.faction = "Horde"  # Facción predeterminada
         
-        # Pasos de la guía
-        self.quest_steps = []
+        # Pasos de la guía (almacenamiento posicional con identificadores estables)
+        self.quest_steps = StepList()
     
     def add_step(self, step_data):
         """
@@ -20,6 +36,7 @@ class Guide:
             step_data (dict): Datos del paso a agregar
         """
         self.quest_steps.append(step_data)
+        self.notify('inserted', index=len(self.quest_steps) - 1, steps=[step_data])
     
     def remove_step(self, index):
         """
@@ -32,7 +49,8 @@ class Guide:
             bool: True si el paso se eliminó correctamente, False en caso contrario
         """
         if 0 <= index < len(self.quest_steps):
-            self.quest_steps.pop(index)
+            step = self.quest_steps.pop(index)
+            self.notify('removed', index=index, steps=[step])
             return True
         return False
     
@@ -51,12 +69,104 @@ class Guide:
             return None
             
         new_index = index + direction
-        if 0 <= new_index < len(self.quest_steps):
-            # Intercambiar pasos
-            self.quest_steps[index], self.quest_steps[new_index] = self.quest_steps[new_index], self.quest_steps[index]
+        if 0 <= index < len(self.quest_steps) and 0 <= new_index < len(self.quest_steps):
+            # Mover el paso conservando su identificador
+            self.quest_steps.move(index, index + 1, new_index)
+            self.notify('moved', start=index, end=index + 1, index=new_index)
             return new_index
         return None
     
+    def insert_steps(self, index, steps):
+        """
+        Inserta varios pasos en una posición de la guía en una sola operación.
+        
+        Args:
+            index (int): Índice donde se insertará el primer paso
+            steps (list): Pasos a insertar
+            
+        Returns:
+            int: Índice efectivo donde se insertó el primer paso
+        """
+        steps = list(steps)
+        index = max(0, min(index, len(self.quest_steps)))
+        self.quest_steps.insert_many(index, steps)
+        if steps:
+            self.notify('inserted', index=index, steps=steps)
+        return index
+    
+    def remove_range(self, start, end):
+        """
+        Elimina un bloque contiguo de pasos en una sola operación.
+        
+        Args:
+            start (int): Índice del primer paso a eliminar
+            end (int): Índice siguiente al último paso a eliminar
+            
+        Returns:
+            list: Pasos eliminados (vacía si el rango es inválido)
+        """
+        if not 0 <= start < end <= len(self.quest_steps):
+            return []
+        removed = self.quest_steps.delete_range(start, end)
+        self.notify('removed', index=start, steps=removed)
+        return removed
+    
+    def move_range(self, start, end, target_index):
+        """
+        Mueve un bloque contiguo de pasos a otra posición en una sola operación.
+        
+        Args:
+            start (int): Índice del primer paso del bloque
+            end (int): Índice siguiente al último paso del bloque
+            target_index (int): Índice que ocupará el primer paso del bloque tras moverlo
+            
+        Returns:
+            int or None: Nuevo índice del primer paso o None si no se pudo mover
+        """
+        if not 0 <= start < end <= len(self.quest_steps):
+            return None
+        
+        target_index = max(0, min(target_index, len(self.quest_steps) - (end - start)))
+        if target_index != start:
+            self.quest_steps.move(start, end, target_index)
+            self.notify('moved', start=start, end=end, index=target_index)
+        return target_index
+    
+    def replace_range(self, start, end, steps):
+        """
+        Sustituye un bloque contiguo de pasos por otros en una sola operación.
+        
+        Args:
+            start (int): Índice del primer paso del bloque
+            end (int): Índice siguiente al último paso del bloque
+            steps (list): Pasos que ocuparán el bloque
+            
+        Returns:
+            list: Pasos sustituidos (vacía si el rango es inválido)
+        """
+        if not 0 <= start <= end <= len(self.quest_steps):
+            return []
+        with self.transaction():
+            removed = self.remove_range(start, end)
+            self.insert_steps(start, steps)
+        return removed
+    
+    def duplicate_range(self, start, end):
+        """
+        Duplica un bloque contiguo de pasos e inserta las copias justo después.
+        
+        Args:
+            start (int): Índice del primer paso del bloque
+            end (int): Índice siguiente al último paso del bloque
+            
+        Returns:
+            int or None: Índice de la primera copia o None si el rango es inválido
+        """
+        if not 0 <= start < end <= len(self.quest_steps):
+            return None
+        copies = [dict(step) for step in self.quest_steps[start:end]]
+        return self.insert_steps(end, copies)
+    
     def get_step(self, index):
         """
         Obtiene un paso de la guía.
@@ -76,10 +186,36 @@ class Guide:
         Obtiene todos los pasos de la guía.
         
         Returns:
-            list: Lista de pasos de la guía
+            StepList: Secuencia de pasos de la guía
         """
         return self.quest_steps
     
+    def get_step_id(self, index):
+        """
+        Obtiene el identificador estable de un paso.
+        
+        Args:
+            index (int): Índice del paso
+            
+        Returns:
+            int or None: Identificador del paso o None si el índice es inválido
+        """
+        if 0 <= index < len(self.quest_steps):
+            return self.quest_steps.id_at(index)
+        return None
+    
+    def get_step_index(self, step_id):
+        """
+        Obtiene la posición actual de un paso a partir de su identificador estable.
+        
+        Args:
+            step_id (int): Identificador del paso
+            
+        Returns:
+            int or None: Índice del paso o None si ya no existe
+        """
+        return self.quest_steps.index_of_id(step_id)
+    
     def update_step(self, index, step_data):
         """
         Actualiza un paso existente.
@@ -92,13 +228,16 @@ class Guide:
             bool: True si el paso se actualizó correctamente, False en caso contrario
         """
         if 0 <= index < len(self.quest_steps):
+            old_step = self.quest_steps[index]
             self.quest_steps[index] = step_data
+            self.notify('updated', index=index, step=step_data, old_step=old_step)
             return True
         return False
     
     def clear(self):
         """Limpia todos los pasos de la guía."""
-        self.quest_steps = []
+        self.quest_steps = StepList()
+        self.notify('reset')
     
     def set_metadata(self, zone, level_range, next_zone, faction):
         """
@@ -110,10 +249,14 @@ class Guide:
             next_zone (str): Zona siguiente
             faction (str): Facción (Horde, Alliance, Both)
         """
+        if (zone, level_range, next_zone, faction) == (self.zone, self.level_range, self.next_zone, self.faction):
+            return
+        
         self.zone = zone
         self.level_range = level_range
         self.next_zone = next_zone
         self.faction = faction
+        self.notify('metadata')
     
     def get_guide_name(self):
         """
@@ -126,6 +269,34 @@ class Guide:
             return f"{self.zone} ({self.level_range})"
         return "Custom Guide"
     
+    def get_level_bounds(self):
+        """
+        Interpreta el rango de niveles de la guía ("10-20").
+        
+        Returns:
+            tuple: Par (nivel_min, nivel_max) como enteros, o (None, None) si no es válido
+        """
+        return Guide.parse_level_range(self.level_range)
+    
+    @staticmethod
+    def parse_level_range(level_range):
+        """
+        Interpreta un rango de niveles en texto ("10-20").
+        
+        Args:
+            level_range (str): Rango de niveles
+        
+        Returns:
+            tuple: Par (nivel_min, nivel_max) como enteros, o (None, None) si no es válido
+        """
+        parts = (level_range or "").split('-')
+        if len(parts) != 2:
+            return None, None
+        try:
+            return int(parts[0].strip()), int(parts[1].strip())
+        except ValueError:
+            return None, None
+    
     def get_next_zone_name(self):
         """
         Obtiene el nombre de la zona siguiente basado en los metadatos.
@@ -152,7 +323,29 @@ class Guide:
                 "next_zone": self.next_zone,
                 "faction": self.faction
             },
-            "steps": self.quest_steps
+            "steps": list(self.quest_steps)
+        }
+    
+    def snapshot(self):
+        """
+        Obtiene en O(1) una instantánea de la guía con el formato de to_dict.
+        
+        Los pasos son una secuencia de solo lectura que no ve las ediciones
+        posteriores, así que puede serializarse en otro hilo mientras se sigue
+        editando la guía (los pasos se tratan como valores: update_step los
+        sustituye en lugar de modificarlos).
+        
+        Returns:
+            dict: Diccionario con 'metadata' y 'steps' (FrozenStepList)
+        """
+        return {
+            "metadata": {
+                "zone": self.zone,
+                "level_range": self.level_range,
+                "next_zone": self.next_zone,
+                "faction": self.faction
+            },
+            "steps": self.quest_steps.snapshot()
         }
     
     def from_dict(self, guide_data):
@@ -173,4 +366,5 @@ class Guide:
         self.faction = metadata.get("faction", "Horde")
         
         # Cargar pasos
-        self.quest_steps = guide_data.get("steps", [])
\ No newline at end of file
+        self.quest_steps = StepList(guide_data.get("steps", []))
+        self.notify('reset')
\ No newline at end of file
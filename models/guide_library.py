@@ -0,0 +1,258 @@
+from collections import deque
+
+class GuideLibrary:
+    """
+    Índice de misiones sobre un conjunto de guías encadenadas por `next_zone`.
+    
+    Para cada QID guarda los eventos A/C/T de todas las guías cargadas, de modo
+    que localizar dónde se acepta o entrega una misión no requiere recorrer las
+    guías. La cadena de guías se ordena con un recorrido topológico para detectar
+    misiones completadas o entregadas antes de haber sido aceptadas.
+    """
+    
+    # Acciones que participan en el flujo de una misión
+    QUEST_FLOW_ACTIONS = ('A', 'C', 'T')
+    
+    def __init__(self):
+        """Inicializa una biblioteca vacía."""
+        # Clave de la guía -> Guide
+        self.guides = {}
+        
+        # QID -> {clave de la guía: [(índice del paso, acción), ...]}
+        self.events_by_qid = {}
+        
+        # Clave de la guía -> QIDs con eventos en esa guía
+        self.quest_ids_by_guide = {}
+        
+        # Posición de cada guía en la cadena (se invalida al cambiar las guías)
+        self.chain_rank = None
+    
+    def add_guide(self, key, guide):
+        """
+        Añade o reemplaza una guía e indexa sus eventos de misión.
+        
+        Args:
+            key (str): Clave única de la guía (por ejemplo, la ruta del archivo)
+            guide (Guide): Guía a indexar
+        """
+        self.remove_guide(key)
+        self.guides[key] = guide
+        self.chain_rank = None
+        
+        quest_ids = set()
+        for index, step in enumerate(guide.get_all_steps()):
+            quest_id = step.get('quest_id')
+            if not quest_id or step.get('action') not in self.QUEST_FLOW_ACTIONS:
+                continue
+            events = self.events_by_qid.setdefault(quest_id, {}).setdefault(key, [])
+            events.append((index, step['action']))
+            quest_ids.add(quest_id)
+        self.quest_ids_by_guide[key] = quest_ids
+    
+    def remove_guide(self, key):
+        """
+        Quita una guía de la biblioteca y de los índices.
+        
+        Args:
+            key (str): Clave de la guía
+        """
+        if key not in self.guides:
+            return
+        
+        del self.guides[key]
+        self.chain_rank = None
+        for quest_id in self.quest_ids_by_guide.pop(key, ()):
+            guide_events = self.events_by_qid.get(quest_id, {})
+            guide_events.pop(key, None)
+            if not guide_events:
+                self.events_by_qid.pop(quest_id, None)
+    
+    def find_quest(self, quest_id, action=None):
+        """
+        Localiza los pasos de una misión en todas las guías.
+        
+        Args:
+            quest_id (str): ID de la misión
+            action (str, optional): Filtrar por acción (A, C o T). Defaults to None.
+        
+        Returns:
+            list: Tuplas (clave de la guía, índice del paso, acción) en orden de la cadena
+        """
+        rank = self.get_chain_rank()
+        results = []
+        for key, events in self.events_by_qid.get(quest_id, {}).items():
+            for index, event_action in events:
+                if action is None or event_action == action:
+                    results.append((key, index, event_action))
+        results.sort(key=lambda event: (rank.get(event[0], len(rank)), event[1]))
+        return results
+    
+    def get_chain_edges(self):
+        """
+        Calcula los enlaces entre guías a partir de `next_zone`.
+        
+        Una guía enlaza con la guía de la zona siguiente cuya facción sea compatible,
+        prefiriendo la que empieza en el nivel en que termina la actual.
+        
+        Returns:
+            dict: Clave de la guía -> clave de la guía siguiente
+        """
+        guides_by_zone = {}
+        for key, guide in self.guides.items():
+            guides_by_zone.setdefault(guide.zone, []).append(key)
+        
+        edges = {}
+        for key, guide in self.guides.items():
+            if not guide.next_zone:
+                continue
+            
+            _, level_max = guide.get_level_bounds()
+            candidates = [
+                candidate for candidate in guides_by_zone.get(guide.next_zone, [])
+                if candidate != key and self._factions_compatible(guide, self.guides[candidate])
+            ]
+            if not candidates:
+                continue
+            
+            def distance(candidate):
+                level_min, _ = self.guides[candidate].get_level_bounds()
+                if level_max is None or level_min is None:
+                    return float('inf')
+                return abs(level_min - level_max)
+            
+            edges[key] = min(candidates, key=lambda candidate: (distance(candidate), candidate))
+        return edges
+    
+    def get_chain_order(self):
+        """
+        Ordena las guías con un recorrido topológico de la cadena (algoritmo de Kahn).
+        
+        Returns:
+            tuple: (lista de claves en orden, lista de claves que forman ciclos)
+        """
+        edges = self.get_chain_edges()
+        in_degree = {key: 0 for key in self.guides}
+        for target in edges.values():
+            in_degree[target] += 1
+        
+        queue = deque(sorted(
+            (key for key, degree in in_degree.items() if degree == 0),
+            key=self._level_sort_key
+        ))
+        order = []
+        while queue:
+            key = queue.popleft()
+            order.append(key)
+            target = edges.get(key)
+            if target is not None:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    queue.append(target)
+        
+        ordered = set(order)
+        cycles = sorted((key for key in self.guides if key not in ordered), key=self._level_sort_key)
+        return order, cycles
+    
+    def get_chain_rank(self):
+        """
+        Obtiene la posición de cada guía en el orden topológico.
+        
+        Returns:
+            dict: Clave de la guía -> posición
+        """
+        if self.chain_rank is None:
+            order, cycles = self.get_chain_order()
+            self.chain_rank = {key: rank for rank, key in enumerate(order + cycles)}
+        return self.chain_rank
+    
+    def check_ordering(self):
+        """
+        Detecta misiones completadas o entregadas antes de ser aceptadas a lo largo
+        de la cadena de guías.
+        
+        Un paso C/T es correcto si la misión se aceptó antes en la misma guía o en
+        alguna guía anterior de la cadena.
+        
+        Returns:
+            list: Diccionarios con 'quest_id', 'guide', 'step', 'action' y 'message'
+        """
+        order, cycles = self.get_chain_order()
+        edges = self.get_chain_edges()
+        
+        # Guías anteriores de cada guía, propagadas en orden topológico
+        ancestors = {key: set() for key in self.guides}
+        for key in order:
+            target = edges.get(key)
+            if target is not None and target in ancestors:
+                ancestors[target] |= ancestors[key] | {key}
+        
+        issues = []
+        for key in cycles:
+            issues.append({
+                'quest_id': "",
+                'guide': key,
+                'step': None,
+                'action': "",
+                'message': "Guide is part of a next_zone cycle"
+            })
+        
+        for quest_id, guide_events in self.events_by_qid.items():
+            # Primer índice de aceptación por guía
+            first_accept = {}
+            for key, events in guide_events.items():
+                accept_indices = [index for index, action in events if action == 'A']
+                if accept_indices:
+                    first_accept[key] = min(accept_indices)
+            
+            for key, events in guide_events.items():
+                for index, action in events:
+                    if action == 'A':
+                        continue
+                    if key in first_accept and first_accept[key] < index:
+                        continue
+                    if any(ancestor in first_accept for ancestor in ancestors[key]):
+                        continue
+                    
+                    verb = "turned in" if action == 'T' else "completed"
+                    later = [other for other in first_accept if other != key and other not in ancestors[key]]
+                    if key in first_accept:
+                        message = f"Quest {quest_id} {verb} before being accepted in this guide"
+                    elif later:
+                        message = f"Quest {quest_id} {verb} before being accepted in {self.get_guide_name(later[0])}"
+                    else:
+                        message = f"Quest {quest_id} {verb} but never accepted in the library"
+                    
+                    issues.append({
+                        'quest_id': quest_id,
+                        'guide': key,
+                        'step': index,
+                        'action': action,
+                        'message': message
+                    })
+        
+        rank = self.get_chain_rank()
+        issues.sort(key=lambda issue: (rank.get(issue['guide'], len(rank)), issue['step'] or 0))
+        return issues
+    
+    def get_guide_name(self, key):
+        """
+        Obtiene el nombre visible de una guía de la biblioteca.
+        
+        Args:
+            key (str): Clave de la guía
+        
+        Returns:
+            str: Nombre de la guía
+        """
+        guide = self.guides.get(key)
+        return guide.get_guide_name() if guide else key
+    
+    def _level_sort_key(self, key):
+        """Clave de ordenación por nivel inicial, para un orden topológico estable."""
+        level_min, _ = self.guides[key].get_level_bounds()
+        return (level_min if level_min is not None else float('inf'), key)
+    
+    @staticmethod
+    def _factions_compatible(guide, other):
+        """Indica si dos guías pueden encadenarse según su facción."""
+        return guide.faction == other.faction or "Both" in (guide.faction, other.faction)
@@ -0,0 +1,362 @@
+from bisect import insort
+
+class GuideLinter:
+    """
+    Motor de validación del flujo de misiones (A -> C -> T) de una guía.
+    
+    Mantiene un índice por QID con los pasos de esa misión ordenados según su
+    posición en la guía. La posición se representa con claves de orden espaciadas,
+    de modo que insertar, eliminar o mover pasos no obliga a renumerar el índice;
+    cuando se agota el hueco entre dos claves solo se reparten de nuevo las de
+    los pasos vecinos. Tras cada mutación solo se vuelven a validar las misiones
+    afectadas.
+    
+    Se suscribe a los cambios de la guía como suscriptor inmediato, de modo que
+    sus índices siguen a la guía también dentro de una transacción.
+    """
+    
+    # Acciones que participan en el flujo de una misión
+    QUEST_FLOW_ACTIONS = ('A', 'C', 'T')
+    
+    # Separación inicial entre claves de orden consecutivas
+    ORDER_GAP = 1 << 16
+    
+    # Separación media mínima entre las claves de una ventana de vecinos al reequilibrarla
+    REBALANCE_GAP = 1 << 12
+    
+    def __init__(self, guide):
+        """
+        Inicializa el motor de validación para una guía.
+        
+        Args:
+            guide (Guide): Guía a validar
+        """
+        self.guide = guide
+        
+        # Clave de orden de cada paso (por identidad del diccionario)
+        self.order_keys = {}
+        
+        # QID -> lista ordenada de (clave de orden, id del paso)
+        self.steps_by_qid = {}
+        
+        # id del paso -> paso (para resolver las entradas del índice)
+        self.steps_by_id = {}
+        
+        # id del paso -> lista de mensajes de diagnóstico
+        self.diagnostics = {}
+        
+        # ids de los pasos cuyos diagnósticos cambiaron y aún no se han consultado
+        self.changed_steps = set()
+        
+        self.rebuild()
+        guide.subscribe(self.guide_changed, immediate=True)
+    
+    def rebuild(self):
+        """
+        Reconstruye los índices y valida toda la guía en una sola pasada.
+        
+        Returns:
+            set: ids de los pasos con diagnósticos
+        """
+        self.order_keys = {}
+        self.steps_by_qid = {}
+        self.steps_by_id = {}
+        self.diagnostics = {}
+        
+        for i, step in enumerate(self.guide.get_all_steps()):
+            key = (i + 1) * self.ORDER_GAP
+            self.order_keys[id(step)] = key
+            self.steps_by_id[id(step)] = step
+            quest_id = self._flow_quest_id(step)
+            if quest_id:
+                self.steps_by_qid.setdefault(quest_id, []).append((key, id(step)))
+        
+        for quest_id in self.steps_by_qid:
+            self._check_quest(quest_id)
+        
+        return set(self.diagnostics)
+    
+    def guide_changed(self, events):
+        """
+        Aplica los cambios de la guía a los índices y valida las misiones afectadas.
+        
+        Args:
+            events (list): Eventos de la guía (ver Guide)
+        """
+        for event in events:
+            event_type = event['type']
+            if event_type == 'inserted':
+                self.changed_steps |= self.steps_inserted(event['index'], len(event['steps']))
+            elif event_type == 'removed':
+                self.changed_steps |= self.steps_removed(event['steps'])
+            elif event_type == 'moved':
+                self.changed_steps |= self.steps_moved(event['index'], event['end'] - event['start'])
+            elif event_type == 'updated':
+                self.changed_steps |= self.step_replaced(event['old_step'], event['index'])
+            elif event_type == 'reset':
+                self.changed_steps |= self._renumber_and_recheck()
+    
+    def pop_changed_steps(self):
+        """
+        Obtiene y olvida los pasos cuyos diagnósticos cambiaron desde la última consulta.
+        
+        Returns:
+            set: ids de los pasos cuyos diagnósticos cambiaron
+        """
+        changed, self.changed_steps = self.changed_steps, set()
+        return changed
+    
+    def get_diagnostics(self, step):
+        """
+        Obtiene los diagnósticos de un paso.
+        
+        Args:
+            step (dict): Paso de la guía
+        
+        Returns:
+            list: Mensajes de diagnóstico (vacía si el paso es correcto)
+        """
+        return self.diagnostics.get(id(step), [])
+    
+    def steps_inserted(self, index, count):
+        """
+        Registra un bloque de pasos insertado en la guía y valida sus misiones.
+        
+        Args:
+            index (int): Índice donde se insertó el primer paso
+            count (int): Número de pasos insertados
+        
+        Returns:
+            set: ids de los pasos cuyos diagnósticos cambiaron
+        """
+        steps = self.guide.get_all_steps()
+        lower, upper = self._key_bounds(index, index + count)
+        
+        # Sin hueco suficiente entre vecinos: repartir las claves de los pasos cercanos
+        if upper - lower <= count:
+            self._rebalance(index, count)
+            lower, upper = self._key_bounds(index, index + count)
+        
+        quest_ids = set()
+        for offset, step in enumerate(steps[index:index + count]):
+            key = lower + (upper - lower) * (offset + 1) // (count + 1)
+            self.order_keys[id(step)] = key
+            self.steps_by_id[id(step)] = step
+            
+            quest_id = self._flow_quest_id(step)
+            if quest_id:
+                insort(self.steps_by_qid.setdefault(quest_id, []), (key, id(step)))
+                quest_ids.add(quest_id)
+        
+        changed = set()
+        for quest_id in quest_ids:
+            changed |= self._check_quest(quest_id)
+        return changed
+    
+    def steps_removed(self, removed_steps):
+        """
+        Registra varios pasos eliminados de la guía y valida de nuevo sus misiones.
+        
+        Args:
+            removed_steps (list): Pasos eliminados
+        
+        Returns:
+            set: ids de los pasos cuyos diagnósticos cambiaron
+        """
+        changed = set()
+        quest_ids = set()
+        for step in removed_steps:
+            if self.diagnostics.pop(id(step), None):
+                changed.add(id(step))
+            quest_id = self._forget_step(step)
+            if quest_id:
+                quest_ids.add(quest_id)
+        
+        for quest_id in quest_ids:
+            changed |= self._check_quest(quest_id)
+        return changed
+    
+    def steps_moved(self, index, count):
+        """
+        Registra un bloque de pasos movido en la guía.
+        
+        Solo cambia el orden relativo de las misiones del bloque movido,
+        por lo que únicamente se validan esas misiones.
+        
+        Args:
+            index (int): Nuevo índice del primer paso del bloque
+            count (int): Número de pasos del bloque
+        
+        Returns:
+            set: ids de los pasos cuyos diagnósticos cambiaron
+        """
+        for step in self.guide.get_all_steps()[index:index + count]:
+            self._forget_step(step)
+        return self.steps_inserted(index, count)
+    
+    def step_replaced(self, old_step, index):
+        """
+        Registra la sustitución de un paso (edición) y valida las misiones afectadas.
+        
+        Args:
+            old_step (dict): Paso anterior
+            index (int): Índice del paso actualizado
+        
+        Returns:
+            set: ids de los pasos cuyos diagnósticos cambiaron
+        """
+        changed = self.steps_removed([old_step])
+        return changed | self.steps_inserted(index, 1)
+    
+    def _key_bounds(self, start, end):
+        """
+        Obtiene las claves de orden entre las que queda un bloque de posiciones de la guía.
+        
+        Args:
+            start (int): Índice de la primera posición del bloque
+            end (int): Índice siguiente a la última posición del bloque
+        
+        Returns:
+            tuple: (clave del paso anterior o 0, clave del paso siguiente); al final
+            de la guía se deja una separación de ORDER_GAP por posición
+        """
+        steps = self.guide.get_all_steps()
+        lower = self.order_keys[id(steps[start - 1])] if start > 0 else 0
+        if end < len(steps):
+            upper = self.order_keys[id(steps[end])]
+        else:
+            upper = lower + (end - start + 1) * self.ORDER_GAP
+        return lower, upper
+        
+    def _rebalance(self, index, count):
+        """
+        Reparte de nuevo las claves de orden de los pasos vecinos a un bloque sin clave.
+        
+        La ventana de vecinos se duplica hasta que sus claves dejan una separación
+        media de al menos REBALANCE_GAP (al llegar al final de la guía siempre la
+        dejan). Las claves nuevas conservan el orden relativo, así que los
+        diagnósticos no cambian y solo se actualizan las entradas del índice por QID.
+        
+        Args:
+            index (int): Índice del primer paso del bloque
+            count (int): Número de pasos del bloque (aún sin clave de orden)
+        """
+        steps = self.guide.get_all_steps()
+        width = max(count, 1)
+        while True:
+            start = max(0, index - width)
+            end = min(len(steps), index + count + width)
+            lower, upper = self._key_bounds(start, end)
+            if upper - lower >= (end - start + 1) * self.REBALANCE_GAP:
+                break
+            width *= 2
+        
+        quest_ids = set()
+        slots = end - start + 1
+        for position in range(start, end):
+            if index <= position < index + count:
+                continue
+            step = steps[position]
+            self.order_keys[id(step)] = lower + (upper - lower) * (position - start + 1) // slots
+            quest_id = self._flow_quest_id(step)
+            if quest_id:
+                quest_ids.add(quest_id)
+        
+        for quest_id in quest_ids:
+            entries = self.steps_by_qid[quest_id]
+            entries[:] = [(self.order_keys[step_id], step_id) for _, step_id in entries]
+    
+    def _forget_step(self, step):
+        """
+        Quita un paso de los índices sin validar su misión.
+        
+        Args:
+            step (dict): Paso a quitar
+        
+        Returns:
+            str or None: QID del paso si estaba en el índice de misiones
+        """
+        key = self.order_keys.pop(id(step), None)
+        self.steps_by_id.pop(id(step), None)
+        
+        quest_id = self._flow_quest_id(step)
+        if not quest_id or key is None or quest_id not in self.steps_by_qid:
+            return None
+        
+        entries = self.steps_by_qid[quest_id]
+        if (key, id(step)) in entries:
+            entries.remove((key, id(step)))
+        if not entries:
+            del self.steps_by_qid[quest_id]
+        return quest_id
+    
+    def _renumber_and_recheck(self):
+        """
+        Reasigna todas las claves de orden y valida de nuevo la guía.
+        
+        Returns:
+            set: ids de los pasos cuyos diagnósticos cambiaron
+        """
+        previous = dict(self.diagnostics)
+        self.rebuild()
+        return {
+            step_id for step_id in set(previous) | set(self.diagnostics)
+            if previous.get(step_id) != self.diagnostics.get(step_id)
+        }
+    
+    def _flow_quest_id(self, step):
+        """
+        Obtiene el QID de un paso si participa en el flujo de la misión.
+        
+        Args:
+            step (dict): Paso de la guía
+        
+        Returns:
+            str or None: QID del paso o None si no aplica
+        """
+        if step.get('action') in self.QUEST_FLOW_ACTIONS:
+            return step.get('quest_id') or None
+        return None
+    
+    def _check_quest(self, quest_id):
+        """
+        Valida el flujo de una misión recorriendo solo sus pasos.
+        
+        Args:
+            quest_id (str): ID de la misión
+        
+        Returns:
+            set: ids de los pasos cuyos diagnósticos cambiaron
+        """
+        changed = set()
+        accepted = set()  # Restricciones (clase, raza) con la misión aceptada
+        turned_in = set()  # Restricciones (clase, raza) con la misión entregada
+        
+        for _, step_id in self.steps_by_qid.get(quest_id, []):
+            step = self.steps_by_id[step_id]
+            action = step['action']
+            constraint = (step.get('class', ""), step.get('race', ""))
+            messages = []
+            
+            if action == 'A':
+                if constraint in accepted:
+                    messages.append(f"Quest {quest_id} accepted more than once")
+                accepted.add(constraint)
+            elif action == 'C':
+                if not accepted:
+                    messages.append(f"Quest {quest_id} completed before being accepted")
+            elif action == 'T':
+                if not accepted:
+                    messages.append(f"Quest {quest_id} turned in before being accepted")
+                elif constraint in turned_in:
+                    messages.append(f"Quest {quest_id} turned in more than once")
+                turned_in.add(constraint)
+            
+            if messages != self.diagnostics.get(step_id, []):
+                changed.add(step_id)
+            if messages:
+                self.diagnostics[step_id] = messages
+            else:
+                self.diagnostics.pop(step_id, None)
+        
+        return changed
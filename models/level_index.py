@@ -0,0 +1,214 @@
+import random
+
+from models.guide import Guide
+
+class _IntervalNode:
+    """Nodo interno de LevelIndex."""
+    
+    __slots__ = ('low', 'high', 'key', 'priority', 'max_high', 'left', 'right')
+    
+    def __init__(self, low, high, key):
+        self.low = low
+        self.high = high
+        self.key = key
+        self.priority = random.random()
+        self.max_high = high
+        self.left = None
+        self.right = None
+
+class LevelIndex:
+    """
+    Índice de rangos de niveles de un conjunto de guías (árbol de intervalos).
+    
+    Los rangos "10-20" se interpretan una sola vez al añadir la guía. Los
+    intervalos se guardan en un treap ordenado por nivel inicial y cada nodo
+    conoce el nivel final máximo de su subárbol, de modo que las consultas por
+    nivel o por rango descartan ramas enteras sin recorrerlas.
+    """
+    
+    def __init__(self):
+        """Inicializa un índice vacío."""
+        self._root = None
+        
+        # Clave de la guía -> {'zone', 'faction', 'level_range', 'low', 'high', 'stamp'}
+        self.entries = {}
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def add(self, key, zone, level_range, faction, stamp=None):
+        """
+        Añade o reemplaza una guía en el índice.
+        
+        Args:
+            key (str): Clave única de la guía (por ejemplo, la ruta del archivo)
+            zone (str): Zona de la guía
+            level_range (str): Rango de niveles en texto ("10-20")
+            faction (str): Facción (Horde, Alliance, Both)
+            stamp (list, optional): Marca del archivo para detectar cambios. Defaults to None.
+        """
+        self.remove(key)
+        
+        low, high = Guide.parse_level_range(level_range)
+        if low is not None and high < low:
+            low, high = high, low
+        self.entries[key] = {
+            'zone': zone,
+            'faction': faction,
+            'level_range': level_range,
+            'low': low,
+            'high': high,
+            'stamp': stamp
+        }
+        
+        # Las guías sin rango válido se conservan en las entradas, pero no en el árbol
+        if low is not None:
+            left, right = self._split(self._root, (low, key))
+            self._root = self._merge(self._merge(left, _IntervalNode(low, high, key)), right)
+    
+    def add_guide(self, key, guide, stamp=None):
+        """
+        Añade o reemplaza una guía a partir de sus metadatos.
+        
+        Args:
+            key (str): Clave única de la guía
+            guide (Guide): Guía a indexar
+            stamp (list, optional): Marca del archivo para detectar cambios. Defaults to None.
+        """
+        self.add(key, guide.zone, guide.level_range, guide.faction, stamp)
+    
+    def remove(self, key):
+        """
+        Quita una guía del índice.
+        
+        Args:
+            key (str): Clave de la guía
+        """
+        entry = self.entries.pop(key, None)
+        if entry is None or entry['low'] is None:
+            return
+        
+        left, rest = self._split(self._root, (entry['low'], key))
+        _, right = self._split(rest, (entry['low'], key, True))
+        self._root = self._merge(left, right)
+    
+    def stab(self, level, faction=None, zone=None):
+        """
+        Busca las guías cuyo rango contiene un nivel.
+        
+        Args:
+            level (int): Nivel buscado
+            faction (str, optional): Facción del personaje (las guías "Both" siempre valen). Defaults to None.
+            zone (str, optional): Limitar a una zona. Defaults to None.
+        
+        Returns:
+            list: Claves de las guías ordenadas por nivel inicial
+        """
+        return self.overlap(level, level, faction, zone)
+    
+    def overlap(self, low, high, faction=None, zone=None):
+        """
+        Busca las guías cuyo rango se solapa con un rango de niveles.
+        
+        Args:
+            low (int): Nivel inicial del rango buscado
+            high (int): Nivel final del rango buscado
+            faction (str, optional): Facción del personaje (las guías "Both" siempre valen). Defaults to None.
+            zone (str, optional): Limitar a una zona. Defaults to None.
+        
+        Returns:
+            list: Claves de las guías ordenadas por nivel inicial
+        """
+        results = []
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            # Descender por la izquierda mientras el subárbol pueda solaparse
+            while node is not None and node.max_high >= low:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            
+            # A la derecha solo hay niveles iniciales mayores: nada más puede solaparse
+            if node.low > high:
+                break
+            if node.high >= low and self._matches(self.entries[node.key], faction, zone):
+                results.append(node.key)
+            node = node.right
+        return results
+    
+    def to_dict(self):
+        """
+        Convierte el índice a un diccionario para serialización.
+        
+        Returns:
+            dict: Clave de la guía -> metadatos indexados
+        """
+        return {
+            key: {
+                'zone': entry['zone'],
+                'faction': entry['faction'],
+                'level_range': entry['level_range'],
+                'stamp': entry['stamp']
+            }
+            for key, entry in self.entries.items()
+        }
+    
+    def from_dict(self, index_data):
+        """
+        Carga el índice desde un diccionario.
+        
+        Args:
+            index_data (dict): Diccionario generado por to_dict
+        """
+        self._root = None
+        self.entries = {}
+        for key, entry in (index_data or {}).items():
+            self.add(key, entry.get('zone', ""), entry.get('level_range', ""),
+                     entry.get('faction', "Horde"), entry.get('stamp'))
+    
+    @staticmethod
+    def _matches(entry, faction, zone):
+        """Comprueba los filtros de facción y zona de una entrada."""
+        if zone is not None and entry['zone'] != zone:
+            return False
+        if faction is None or faction == "Both":
+            return True
+        return entry['faction'] in (faction, "Both")
+    
+    @staticmethod
+    def _update(node):
+        """Recalcula el nivel final máximo del subárbol de un nodo."""
+        node.max_high = node.high
+        if node.left is not None and node.left.max_high > node.max_high:
+            node.max_high = node.left.max_high
+        if node.right is not None and node.right.max_high > node.max_high:
+            node.max_high = node.right.max_high
+    
+    def _split(self, node, sort_key):
+        """Divide un treap en (nodos con (low, key) < sort_key, resto)."""
+        if node is None:
+            return None, None
+        if (node.low, node.key) < sort_key:
+            node.right, right = self._split(node.right, sort_key)
+            self._update(node)
+            return node, right
+        left, node.left = self._split(node.left, sort_key)
+        self._update(node)
+        return left, node
+    
+    def _merge(self, left, right):
+        """Une dos treaps (todos los nodos de `left` preceden a los de `right`)."""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            self._update(left)
+            return left
+        right.left = self._merge(left, right.left)
+        self._update(right)
+        return right
@@ -1,9 +1,25 @@
-class QuestHistory:
-    """Clase para gestionar el historial de misiones."""
+from models.change_notifier import ChangeNotifier
+from models.coordinates import Coordinates
+
+class QuestHistory(ChangeNotifier):
+    """
+    Clase para gestionar el historial de misiones.
+    
+    Emite el evento 'quests_changed' (con los 'quest_ids' afectados) al añadir
+    o importar misiones y 'reset' al vaciarlo (ver ChangeNotifier).
+    
+    Las entradas nunca se modifican en su sitio: add_quest crea una entrada
+    nueva. Así snapshot() puede entregar el diccionario actual sin copiarlo y
+    solo la siguiente mutación copia el diccionario de primer nivel.
+    """
     
     def __init__(self):
         """Inicializa un nuevo historial de misiones vacío."""
+        super().__init__()
         self.quest_history = {}
+        
+        # El diccionario actual se entregó en una instantánea y no debe modificarse
+        self._shared = False
     
     def add_quest(self, quest_id, quest_name, action, coords_x=None, coords_y=None, quest_class=None):
         """
@@ -17,38 +33,68 @@ class QuestHistory:
             coords_y (str, optional): Coordenada Y. Defaults to None.
             quest_class (str, optional): Clase asociada a la misión. Defaults to None.
         """
+        if self._merge_quest(quest_id, quest_name, action, coords_x, coords_y, quest_class):
+            self.notify('quests_changed', quest_ids=[quest_id])
+    
+    def add_quests(self, quests):
+        """
+        Agrega o actualiza varias misiones emitiendo un solo evento.
+        
+        Args:
+            quests (iterable): Tuplas con los argumentos de add_quest
+                (quest_id, quest_name, action, coords_x, coords_y, quest_class)
+        """
+        quest_ids = {}
+        for quest in quests:
+            if self._merge_quest(*quest):
+                quest_ids[quest[0]] = None
+        if quest_ids:
+            self.notify('quests_changed', quest_ids=list(quest_ids))
+    
+    def _merge_quest(self, quest_id, quest_name, action, coords_x=None, coords_y=None, quest_class=None):
+        """
+        Incorpora una misión al historial sin emitir eventos (ver add_quest).
+        
+        Returns:
+            bool: True si se incorporó (la misión tiene ID)
+        """
         if not quest_id:
-            return
+            return False
             
         if quest_id not in self.quest_history:
             # Crear nuevo registro de misión
-            self.quest_history[quest_id] = {
+            entry = {
                 'name': quest_name,
                 'actions_used': [action],
                 'coords': {},
                 'class': quest_class
             }
         else:
+            # Copiar el registro existente (puede estar en una instantánea)
+            old_entry = self.quest_history[quest_id]
+            entry = dict(old_entry)
+            entry['coords'] = dict(old_entry.get('coords', {}))
+            
             # Actualizar nombre de la misión
-            self.quest_history[quest_id]['name'] = quest_name
+            entry['name'] = quest_name
             
             # Agregar acción si no está ya
-            if action not in self.quest_history[quest_id]['actions_used']:
-                self.quest_history[quest_id]['actions_used'].append(action)
+            if action not in old_entry['actions_used']:
+                entry['actions_used'] = old_entry['actions_used'] + [action]
             
             # Actualizar clase si se proporciona y no existía antes
-            if quest_class and not self.quest_history[quest_id].get('class'):
-                self.quest_history[quest_id]['class'] = quest_class
+            if quest_class and not old_entry.get('class'):
+                entry['class'] = quest_class
         
-        # Guardar coordenadas para esta acción si se proporcionan
-        if coords_x and coords_y:
-            if 'coords' not in self.quest_history[quest_id]:
-                self.quest_history[quest_id]['coords'] = {}
-            
-            self.quest_history[quest_id]['coords'][action] = {
+        # Guardar coordenadas para esta acción si se proporcionan y son válidas
+        if coords_x and coords_y and Coordinates.parse_pair(coords_x, coords_y) is not None:
+            entry['coords'][action] = {
                 'x': coords_x,
                 'y': coords_y
             }
+        
+        self._writable()[quest_id] = entry
+        return True
     
     def get_quest_name(self, quest_id):
         """
@@ -123,8 +169,19 @@ class QuestHistory:
         if not quest_id or quest_id not in self.quest_history:
             return None
         
-        actions_used = self.quest_history[quest_id]['actions_used']
+        return QuestHistory.next_action(self.quest_history[quest_id]['actions_used'])
+        
+    @staticmethod
+    def next_action(actions_used):
+        """
+        Sugiere la siguiente acción del flujo de una misión.
+        
+        Args:
+            actions_used (iterable): Acciones ya usadas para la misión
         
+        Returns:
+            str: Acción sugerida o None si no hay sugerencia
+        """
         # Flujo típico de misión: A -> C -> T
         if 'A' in actions_used and 'C' not in actions_used:
             return 'C'
@@ -145,6 +202,36 @@ class QuestHistory:
         """
         return quest_id in self.quest_history
     
+    def lookup(self, quest_id, action):
+        """
+        Reúne en una sola consulta los datos para autocompletar el formulario.
+        
+        Args:
+            quest_id (str): ID de la misión
+            action (str): Acción actual del formulario
+        
+        Returns:
+            dict or None: Diccionario con 'name', 'next_action' y 'coords'
+            (par (x, y) o None), o None si la misión no está en el historial
+        """
+        if not quest_id or quest_id not in self.quest_history:
+            return None
+        
+        next_action = self.suggest_next_action(quest_id)
+        
+        # Las coordenadas solo se autocompletan al entregar la misión
+        coords = None
+        if (next_action or action) == 'T':
+            coord_x, coord_y = self.get_quest_coords(quest_id, 'T')
+            if coord_x and coord_y:
+                coords = (coord_x, coord_y)
+        
+        return {
+            'name': self.get_quest_name(quest_id),
+            'next_action': next_action,
+            'coords': coords
+        }
+    
     def get_all_quests(self):
         """
         Obtiene todas las misiones del historial.
@@ -154,6 +241,23 @@ class QuestHistory:
         """
         return self.quest_history
     
+    def snapshot(self):
+        """
+        Obtiene en O(1) una instantánea del historial que no ve los cambios posteriores.
+        
+        Returns:
+            dict: Historial de misiones (no debe modificarse)
+        """
+        self._shared = True
+        return self.quest_history
+    
+    def _writable(self):
+        """Obtiene el diccionario del historial, copiándolo si está en una instantánea."""
+        if self._shared:
+            self.quest_history = dict(self.quest_history)
+            self._shared = False
+        return self.quest_history
+    
     def update_from_dict(self, quest_history_dict):
         """
         Actualiza el historial desde un diccionario.
@@ -162,8 +266,254 @@ class QuestHistory:
             quest_history_dict (dict): Diccionario con datos de historial
         """
         if quest_history_dict:
-            self.quest_history.update(quest_history_dict)
+            self._writable().update(quest_history_dict)
+            self.notify('quests_changed', quest_ids=list(quest_history_dict))
     
     def clear(self):
         """Limpia el historial de misiones."""
-        self.quest_history = {}
\ No newline at end of file
+        self.quest_history = {}
+        self._shared = False
+        self.notify('reset')
+
+class DerivedQuestHistory:
+    """
+    Estado de las misiones de una guía, derivado de sus pasos.
+    
+    A diferencia de QuestHistory (persistente, compartido entre guías y solo
+    de adición), este estado refleja exactamente los pasos actuales de la guía:
+    al eliminar o editar un paso desaparecen su acción, sus coordenadas y su
+    clase. Se mantiene con contadores de referencias por (QID, acción) a partir
+    de los eventos de la guía, así que cada mutación cuesta O(1) por paso y
+    solo al cargar una guía se recorre entera.
+    
+    El nombre, la clase y las coordenadas vigentes se eligen por la posición
+    de los pasos en la guía (StepList.index_of_step), no por el orden en que
+    se añadieron, así que el resultado es el mismo que el de rebuild() después
+    de mover o editar pasos.
+    """
+    
+    def __init__(self, guide):
+        """
+        Inicializa el estado para una guía y se suscribe a sus cambios.
+        
+        Args:
+            guide (Guide): Guía de la que se derivan las misiones
+        """
+        self.guide = guide
+        
+        # QID -> {acción: número de pasos}
+        self.action_counts = {}
+        
+        # QID -> {id del paso: paso} (el último en la guía da el nombre vigente)
+        self.names = {}
+        
+        # QID -> {id del paso: paso} (solo pasos con clase; el primero en la guía da la clase vigente)
+        self.classes = {}
+        
+        # (QID, acción) -> {id del paso: paso} (solo coordenadas válidas; el último en la guía da las vigentes)
+        self.coords = {}
+        
+        self.rebuild()
+        guide.subscribe(self.guide_changed, immediate=True)
+    
+    def rebuild(self):
+        """Reconstruye el estado a partir de todos los pasos de la guía."""
+        self.action_counts = {}
+        self.names = {}
+        self.classes = {}
+        self.coords = {}
+        for step in self.guide.get_all_steps():
+            self.add_step(step)
+    
+    def guide_changed(self, events):
+        """
+        Aplica los cambios de la guía (mover pasos no cambia el estado).
+        
+        Args:
+            events (list): Eventos de la guía (ver Guide)
+        """
+        for event in events:
+            event_type = event['type']
+            if event_type == 'inserted':
+                for step in event['steps']:
+                    self.add_step(step)
+            elif event_type == 'removed':
+                for step in event['steps']:
+                    self.remove_step(step)
+            elif event_type == 'updated':
+                self.remove_step(event['old_step'])
+                self.add_step(event['step'])
+            elif event_type == 'reset':
+                self.rebuild()
+    
+    def add_step(self, step):
+        """
+        Suma un paso al estado.
+        
+        Args:
+            step (dict): Paso de la guía
+        """
+        quest_id = step.get('quest_id')
+        if not quest_id:
+            return
+        
+        action = step.get('action', "")
+        counts = self.action_counts.setdefault(quest_id, {})
+        counts[action] = counts.get(action, 0) + 1
+        self.names.setdefault(quest_id, {})[id(step)] = step
+        
+        if step.get('class'):
+            self.classes.setdefault(quest_id, {})[id(step)] = step
+        
+        coord_x, coord_y = step.get('coord_x'), step.get('coord_y')
+        if coord_x and coord_y and Coordinates.parse_pair(coord_x, coord_y) is not None:
+            self.coords.setdefault((quest_id, action), {})[id(step)] = step
+    
+    def remove_step(self, step):
+        """
+        Resta un paso del estado.
+        
+        Args:
+            step (dict): Paso eliminado o sustituido
+        """
+        quest_id = step.get('quest_id')
+        counts = self.action_counts.get(quest_id)
+        if not quest_id or counts is None:
+            return
+        
+        action = step.get('action', "")
+        if counts.get(action, 0) > 1:
+            counts[action] -= 1
+        else:
+            counts.pop(action, None)
+        
+        for table, key in ((self.names, quest_id), (self.classes, quest_id), (self.coords, (quest_id, action))):
+            entries = table.get(key)
+            if entries is not None:
+                entries.pop(id(step), None)
+                if not entries:
+                    del table[key]
+        
+        if not counts:
+            del self.action_counts[quest_id]
+    
+    def _pick_step(self, entries, last=True):
+        """
+        Elige entre los pasos de una misión el primero o el último según su posición en la guía.
+        
+        Args:
+            entries (dict): Id del paso -> paso
+            last (bool, optional): Elegir el último en lugar del primero. Defaults to True.
+        
+        Returns:
+            dict: Paso elegido
+        """
+        steps = self.guide.get_all_steps()
+        pick = max if last else min
+        return pick(entries.values(), key=steps.index_of_step)
+    
+    def has_quest(self, quest_id):
+        """
+        Verifica si algún paso de la guía usa la misión.
+        
+        Args:
+            quest_id (str): ID de la misión
+        
+        Returns:
+            bool: True si la misión aparece en la guía
+        """
+        return quest_id in self.action_counts
+    
+    def get_actions(self, quest_id):
+        """
+        Obtiene las acciones que usan los pasos de la guía para una misión.
+        
+        Args:
+            quest_id (str): ID de la misión
+        
+        Returns:
+            dict: Acción -> número de pasos
+        """
+        return dict(self.action_counts.get(quest_id, {}))
+    
+    def get_quest_name(self, quest_id):
+        """
+        Obtiene el nombre de una misión (el del último de sus pasos en la guía).
+        
+        Args:
+            quest_id (str): ID de la misión
+        
+        Returns:
+            str: Nombre de la misión o cadena vacía si no aparece en la guía
+        """
+        names = self.names.get(quest_id)
+        return self._pick_step(names).get('quest_name', "") if names else ""
+    
+    def get_quest_class(self, quest_id):
+        """
+        Obtiene la clase asociada a una misión (la del primero de sus pasos con clase en la guía).
+        
+        Args:
+            quest_id (str): ID de la misión
+        
+        Returns:
+            str: Clase de la misión o None si ningún paso tiene clase
+        """
+        classes = self.classes.get(quest_id)
+        return self._pick_step(classes, last=False)['class'] if classes else None
+    
+    def get_quest_coords(self, quest_id, action=None):
+        """
+        Obtiene las coordenadas de una misión para una acción (mismas reglas que QuestHistory).
+        
+        Args:
+            quest_id (str): ID de la misión
+            action (str, optional): Acción específica. Defaults to None.
+        
+        Returns:
+            tuple: Par (coord_x, coord_y) o (None, None) si no hay datos
+        """
+        for candidate in (action, 'A' if action == 'T' else None):
+            coords = self.coords.get((quest_id, candidate)) if candidate else None
+            if coords:
+                step = self._pick_step(coords)
+                return step['coord_x'], step['coord_y']
+        return None, None
+    
+    def suggest_next_action(self, quest_id):
+        """
+        Sugiere la siguiente acción para una misión según los pasos actuales de la guía.
+        
+        Args:
+            quest_id (str): ID de la misión
+        
+        Returns:
+            str: Acción sugerida o None si no hay sugerencia
+        """
+        counts = self.action_counts.get(quest_id)
+        if not counts:
+            return None
+        return QuestHistory.next_action(counts)
+    
+    def get_all_quests(self):
+        """
+        Obtiene el estado completo con el mismo formato que QuestHistory.get_all_quests.
+        
+        Returns:
+            dict: QID -> {'name', 'actions_used', 'coords', 'class'}
+        """
+        steps = self.guide.get_all_steps()
+        quests = {}
+        for quest_id in self.action_counts:
+            # Acciones en el orden en que aparecen por primera vez en la guía
+            quest_steps = sorted(self.names[quest_id].values(), key=steps.index_of_step)
+            quests[quest_id] = {
+                'name': quest_steps[-1].get('quest_name', ""),
+                'actions_used': list(dict.fromkeys(step.get('action', "") for step in quest_steps)),
+                'coords': {},
+                'class': self.get_quest_class(quest_id)
+            }
+        for (quest_id, action), coords in self.coords.items():
+            step = self._pick_step(coords)
+            quests[quest_id]['coords'][action] = {'x': step['coord_x'], 'y': step['coord_y']}
+        return quests
\ No newline at end of file
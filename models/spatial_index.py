@@ -0,0 +1,128 @@
+import math
+
+from models.coordinates import Coordinates
+
+class SpatialIndex:
+    """
+    Índice espacial por zona basado en una rejilla uniforme.
+    
+    Cada zona se divide en celdas de tamaño fijo sobre el rango 0-100 del mapa,
+    de modo que buscar puntos cercanos solo revisa las celdas próximas.
+    """
+    
+    # Tamaño de celda en unidades de coordenada de mapa
+    CELL_SIZE = 5.0
+    
+    def __init__(self):
+        """Inicializa un índice vacío."""
+        # zona -> {(celda_x, celda_y): {clave: entrada}}
+        self.cells = {}
+        
+        # clave -> (zona, celda)
+        self.locations = {}
+    
+    def clear(self):
+        """Vacía el índice."""
+        self.cells = {}
+        self.locations = {}
+    
+    def add(self, key, zone, x, y, data):
+        """
+        Añade o reemplaza un punto en el índice.
+        
+        Args:
+            key: Clave única del punto
+            zone (str): Zona del punto
+            x (float): Coordenada X
+            y (float): Coordenada Y
+            data (dict): Datos asociados al punto
+        """
+        self.remove(key)
+        cell = self._cell_of(x, y)
+        self.cells.setdefault(zone, {}).setdefault(cell, {})[key] = (x, y, data)
+        self.locations[key] = (zone, cell)
+    
+    def remove(self, key):
+        """
+        Quita un punto del índice.
+        
+        Args:
+            key: Clave del punto
+        """
+        location = self.locations.pop(key, None)
+        if location is None:
+            return
+        zone, cell = location
+        zone_cells = self.cells.get(zone, {})
+        entries = zone_cells.get(cell, {})
+        entries.pop(key, None)
+        if not entries:
+            zone_cells.pop(cell, None)
+    
+    def nearby(self, zone, x, y, radius=5.0, limit=10):
+        """
+        Busca los puntos más cercanos a una posición dentro de una zona.
+        
+        Args:
+            zone (str): Zona donde buscar
+            x (float): Coordenada X
+            y (float): Coordenada Y
+            radius (float, optional): Distancia máxima. Defaults to 5.0.
+            limit (int, optional): Número máximo de resultados. Defaults to 10.
+            
+        Returns:
+            list: Tuplas (distancia, x, y, datos) ordenadas por distancia
+        """
+        zone_cells = self.cells.get(zone)
+        if not zone_cells:
+            return []
+        
+        min_cx, min_cy = self._cell_of(x - radius, y - radius)
+        max_cx, max_cy = self._cell_of(x + radius, y + radius)
+        
+        results = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                for px, py, data in zone_cells.get((cx, cy), {}).values():
+                    distance = math.hypot(px - x, py - y)
+                    if distance <= radius:
+                        results.append((distance, px, py, data))
+        
+        results.sort(key=lambda result: result[0])
+        return results[:limit]
+    
+    def add_steps(self, steps, default_zone=""):
+        """
+        Indexa los pasos con coordenadas válidas.
+        Los pasos sin zona propia se indexan en la zona por defecto.
+        
+        Args:
+            steps (iterable): Pasos de la guía
+            default_zone (str, optional): Zona de la guía. Defaults to "".
+        """
+        for step in steps:
+            coords = Coordinates.from_step(step)
+            if coords is None:
+                self.remove(id(step))
+                continue
+            self.add(id(step), step.get('zone') or default_zone, coords[0], coords[1], {
+                'action': step.get('action', ""),
+                'quest_id': step.get('quest_id', ""),
+                'quest_name': step.get('quest_name', ""),
+                'coord_x': step.get('coord_x') or f"{coords[0]:g}",
+                'coord_y': step.get('coord_y') or f"{coords[1]:g}"
+            })
+    
+    def remove_steps(self, steps):
+        """
+        Quita varios pasos del índice.
+        
+        Args:
+            steps (iterable): Pasos a quitar
+        """
+        for step in steps:
+            self.remove(id(step))
+    
+    def _cell_of(self, x, y):
+        """Obtiene la celda de la rejilla que contiene una posición."""
+        return int(math.floor(x / self.CELL_SIZE)), int(math.floor(y / self.CELL_SIZE))
@@ -0,0 +1,472 @@
+import random
+from collections.abc import Sequence
+
+class _StepNode:
+    """Nodo interno de StepList."""
+    
+    __slots__ = ('step', 'step_id', 'priority', 'size', 'left', 'right', 'parent', 'owner')
+    
+    def __init__(self, step, step_id, owner=None):
+        self.step = step
+        self.step_id = step_id
+        self.owner = owner
+        self.priority = random.random()
+        self.size = 1
+        self.left = None
+        self.right = None
+        self.parent = None
+
+class FrozenStepList(Sequence):
+    """
+    Secuencia de pasos de solo lectura que comparte los nodos de un StepList.
+    
+    La obtiene StepList.snapshot() en O(1). Los hilos de trabajo pueden
+    recorrerla mientras la secuencia original se sigue editando: StepList
+    copia los nodos compartidos antes de modificarlos, así que la instantánea
+    nunca ve cambios posteriores.
+    """
+    
+    def __init__(self, root=None):
+        """
+        Inicializa la secuencia.
+        
+        Args:
+            root (_StepNode, optional): Raíz del treap compartido. Defaults to None.
+        """
+        self._root = root
+    
+    def __len__(self):
+        return self._root.size if self._root else 0
+    
+    def __bool__(self):
+        return self._root is not None
+    
+    def __iter__(self):
+        return self._iter_range(0, len(self))
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, stride = index.indices(len(self))
+            if stride != 1:
+                return list(self)[index]
+            return list(self._iter_range(start, stop))
+        return self._node_at(self._normalize_index(index)).step
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)!r})"
+    
+    def _normalize_index(self, index):
+        """Convierte un índice (posiblemente negativo) en uno válido o lanza IndexError."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StepList index out of range")
+        return index
+    
+    def _node_at(self, index):
+        """Obtiene el nodo en una posición descendiendo por tamaños."""
+        node = self._root
+        while node is not None:
+            left_size = node.left.size if node.left else 0
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node
+            else:
+                index -= left_size + 1
+                node = node.right
+        raise IndexError("StepList index out of range")
+    
+    def _iter_range(self, start, stop):
+        """Recorre en orden los pasos con índice en [start, stop)."""
+        if start >= stop:
+            return
+        
+        # Descender hasta `start` apilando los ancestros pendientes
+        stack = []
+        node = self._root
+        index = start
+        while node is not None:
+            left_size = node.left.size if node.left else 0
+            if index < left_size:
+                stack.append(node)
+                node = node.left
+            elif index == left_size:
+                stack.append(node)
+                break
+            else:
+                index -= left_size + 1
+                node = node.right
+        
+        remaining = stop - start
+        while stack and remaining > 0:
+            node = stack.pop()
+            yield node.step
+            remaining -= 1
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+class StepList(FrozenStepList):
+    """
+    Secuencia de pasos con almacenamiento posicional (treap implícito).
+    
+    Se comporta como una lista de Python para lectura, iteración y mutaciones
+    habituales, pero insertar, eliminar, mover bloques y consultar posiciones
+    cuesta O(log n) en lugar de desplazar toda la lista. Cada paso recibe un
+    identificador estable que se conserva al moverlo o editarlo.
+    
+    snapshot() devuelve en O(1) una copia de solo lectura. Los nodos que
+    comparte con ella se copian (copia de camino desde la raíz) la primera vez
+    que una mutación los toca, lo que añade O(log n) a esa mutación.
+    """
+    
+    def __init__(self, steps=None):
+        """
+        Inicializa la secuencia.
+        
+        Args:
+            steps (iterable, optional): Pasos iniciales. Defaults to None.
+        """
+        super().__init__()
+        self._nodes = {}
+        self._nodes_by_step = {}
+        self._next_id = 1
+        
+        # Propietario de los nodos que se pueden modificar sin copiarlos
+        self._owner = object()
+        if steps:
+            self._root = self._build(list(steps))
+    
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            start, stop, stride = index.indices(len(self))
+            if stride != 1:
+                raise ValueError("StepList solo admite slices contiguos")
+            self.delete_range(start, max(start, stop))
+            self.insert_many(start, value)
+            return
+        node = self._own_path(self._normalize_index(index))
+        self._nodes_by_step.pop(id(node.step), None)
+        node.step = value
+        self._nodes_by_step[id(value)] = node
+    
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, stride = index.indices(len(self))
+            if stride != 1:
+                raise ValueError("StepList solo admite slices contiguos")
+            self.delete_range(start, max(start, stop))
+            return
+        index = self._normalize_index(index)
+        self.delete_range(index, index + 1)
+    
+    def snapshot(self):
+        """
+        Obtiene una instantánea inmutable de la secuencia en O(1).
+        
+        Returns:
+            FrozenStepList: Secuencia de solo lectura con los pasos actuales
+        """
+        # Todos los nodos actuales pasan a ser compartidos con la instantánea
+        self._owner = object()
+        return FrozenStepList(self._root)
+    
+    def append(self, step):
+        """
+        Añade un paso al final.
+        
+        Args:
+            step (dict): Paso a añadir
+        """
+        self.insert_many(len(self), [step])
+    
+    def extend(self, steps):
+        """
+        Añade varios pasos al final.
+        
+        Args:
+            steps (iterable): Pasos a añadir
+        """
+        self.insert_many(len(self), steps)
+    
+    def insert(self, index, step):
+        """
+        Inserta un paso en una posición.
+        
+        Args:
+            index (int): Posición de inserción
+            step (dict): Paso a insertar
+        """
+        self.insert_many(index, [step])
+    
+    def pop(self, index=-1):
+        """
+        Elimina y devuelve el paso en una posición.
+        
+        Args:
+            index (int, optional): Posición del paso. Defaults to -1.
+        
+        Returns:
+            dict: Paso eliminado
+        """
+        index = self._normalize_index(index)
+        return self.delete_range(index, index + 1)[0]
+    
+    def insert_many(self, index, steps):
+        """
+        Inserta un bloque de pasos en una posición.
+        
+        Args:
+            index (int): Posición del primer paso insertado
+            steps (iterable): Pasos a insertar
+        """
+        block = self._build(list(steps))
+        if block is None:
+            return
+        index = max(0, min(index, len(self)))
+        left, right = self._split(self._root, index)
+        self._set_root(self._merge(self._merge(left, block), right))
+    
+    def delete_range(self, start, end):
+        """
+        Elimina un bloque contiguo de pasos.
+        
+        Args:
+            start (int): Índice del primer paso
+            end (int): Índice siguiente al último paso
+        
+        Returns:
+            list: Pasos eliminados
+        """
+        if start >= end:
+            return []
+        left, rest = self._split(self._root, start)
+        middle, right = self._split(rest, end - start)
+        self._set_root(self._merge(left, right))
+        
+        removed = []
+        for node in self._iter_nodes(middle):
+            del self._nodes[node.step_id]
+            self._nodes_by_step.pop(id(node.step), None)
+            removed.append(node.step)
+        return removed
+    
+    def move(self, start, end, target_index):
+        """
+        Mueve un bloque contiguo de pasos conservando sus identificadores.
+        
+        Args:
+            start (int): Índice del primer paso del bloque
+            end (int): Índice siguiente al último paso del bloque
+            target_index (int): Índice que ocupará el primer paso tras moverlo
+        """
+        left, rest = self._split(self._root, start)
+        block, right = self._split(rest, end - start)
+        remaining = self._merge(left, right)
+        left, right = self._split(remaining, target_index)
+        self._set_root(self._merge(self._merge(left, block), right))
+    
+    def id_at(self, index):
+        """
+        Obtiene el identificador estable del paso en una posición.
+        
+        Args:
+            index (int): Índice del paso
+        
+        Returns:
+            int: Identificador estable del paso
+        """
+        return self._node_at(self._normalize_index(index)).step_id
+    
+    def index_of_id(self, step_id):
+        """
+        Obtiene la posición actual de un paso a partir de su identificador.
+        
+        Args:
+            step_id (int): Identificador estable del paso
+        
+        Returns:
+            int or None: Índice del paso o None si no existe
+        """
+        return self._index_of_node(self._nodes.get(step_id))
+    
+    def index_of_step(self, step):
+        """
+        Obtiene la posición actual de un paso por identidad (no por igualdad).
+        
+        Args:
+            step (dict): Paso de la secuencia
+        
+        Returns:
+            int or None: Índice del paso o None si no está en la secuencia
+        """
+        return self._index_of_node(self._nodes_by_step.get(id(step)))
+    
+    def _index_of_node(self, node):
+        """Calcula la posición de un nodo subiendo por sus padres."""
+        if node is None:
+            return None
+        
+        index = node.left.size if node.left else 0
+        while node.parent is not None:
+            if node is node.parent.right:
+                index += (node.parent.left.size if node.parent.left else 0) + 1
+            node = node.parent
+        return index
+    
+    def get_by_id(self, step_id):
+        """
+        Obtiene un paso a partir de su identificador estable.
+        
+        Args:
+            step_id (int): Identificador estable del paso
+        
+        Returns:
+            dict or None: Paso o None si no existe
+        """
+        node = self._nodes.get(step_id)
+        return node.step if node else None
+    
+    def _new_node(self, step):
+        """Crea un nodo con un identificador estable nuevo."""
+        node = _StepNode(step, self._next_id, self._owner)
+        self._nodes[node.step_id] = node
+        self._nodes_by_step[id(step)] = node
+        self._next_id += 1
+        return node
+    
+    def _build(self, steps):
+        """Construye un treap a partir de una lista en O(k) (árbol cartesiano)."""
+        stack = []
+        for step in steps:
+            node = self._new_node(step)
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = stack.pop()
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+        if not stack:
+            return None
+        
+        root = stack[0]
+        root.parent = None
+        # Recalcular tamaños y padres en postorden
+        for node in reversed(list(self._iter_preorder(root))):
+            self._update(node)
+        return root
+    
+    def _own(self, node):
+        """
+        Obtiene una versión modificable de un nodo: el propio nodo si pertenece a
+        la secuencia o una copia si lo comparte con una instantánea.
+        """
+        if node.owner is self._owner:
+            return node
+        
+        copy = _StepNode(node.step, node.step_id, self._owner)
+        copy.priority = node.priority
+        copy.size = node.size
+        copy.left = node.left
+        copy.right = node.right
+        copy.parent = node.parent
+        self._nodes[copy.step_id] = copy
+        self._nodes_by_step[id(copy.step)] = copy
+        return copy
+    
+    def _own_path(self, index):
+        """Obtiene el nodo de una posición copiando los nodos compartidos desde la raíz."""
+        node = self._own(self._root)
+        self._set_root(node)
+        self._update(node)
+        while True:
+            left_size = node.left.size if node.left else 0
+            if index == left_size:
+                return node
+            if index < left_size:
+                node.left = child = self._own(node.left)
+            else:
+                index -= left_size + 1
+                node.right = child = self._own(node.right)
+            self._update(node)
+            self._update(child)
+            node = child
+    
+    def _set_root(self, root):
+        """Establece la raíz del treap."""
+        self._root = root
+        if root is not None:
+            root.parent = None
+    
+    @staticmethod
+    def _update(node):
+        """Recalcula el tamaño de un nodo y el padre de sus hijos."""
+        node.size = 1
+        if node.left is not None:
+            node.size += node.left.size
+            node.left.parent = node
+        if node.right is not None:
+            node.size += node.right.size
+            node.right.parent = node
+    
+    def _split(self, node, count):
+        """Divide un treap en (primeros `count` nodos, resto)."""
+        if node is None:
+            return None, None
+        node = self._own(node)
+        left_size = node.left.size if node.left else 0
+        if count <= left_size:
+            left, node.left = self._split(node.left, count)
+            self._update(node)
+            if left is not None:
+                left.parent = None
+            return left, node
+        node.right, right = self._split(node.right, count - left_size - 1)
+        self._update(node)
+        if right is not None:
+            right.parent = None
+        return node, right
+    
+    def _merge(self, left, right):
+        """Une dos treaps (todos los nodos de `left` preceden a los de `right`)."""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left = self._own(left)
+            left.right = self._merge(left.right, right)
+            self._update(left)
+            return left
+        right = self._own(right)
+        right.left = self._merge(left, right.left)
+        self._update(right)
+        return right
+    
+    @staticmethod
+    def _iter_preorder(root):
+        """Recorre los nodos de un subárbol en preorden."""
+        stack = [root] if root else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+    
+    @staticmethod
+    def _iter_nodes(root):
+        """Recorre los nodos de un subárbol en orden."""
+        stack = []
+        node = root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
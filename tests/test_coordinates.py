@@ -0,0 +1,48 @@
+import pytest
+
+from models.coordinates import Coordinates
+
+@pytest.mark.parametrize("coord_x, coord_y, expected", [
+    ("45.2", "30", (45.2, 30.0)),
+    ("45,2", " 30 ", (45.2, 30.0)),
+    ("0", "100", (0.0, 100.0)),
+    ("100.1", "30", None),
+    ("-1", "30", None),
+    ("abc", "30", None),
+    ("", "30", None),
+    (None, "30", None)
+])
+def test_parse_pair_validates_the_map_range(coord_x, coord_y, expected):
+    assert Coordinates.parse_pair(coord_x, coord_y) == expected
+    # La segunda vez se obtiene de la caché con el mismo resultado
+    assert Coordinates.parse_pair(coord_x, coord_y) == expected
+
+def test_coordinate_texts_are_parsed_once(monkeypatch):
+    Coordinates._parsed.clear()
+    calls = []
+    parse_value = Coordinates.parse_value
+    monkeypatch.setattr(Coordinates, "parse_value", staticmethod(lambda text: calls.append(text) or parse_value(text)))
+    
+    step = {'coords': "52.5, 30.25"}
+    assert Coordinates.from_step(step) == (52.5, 30.25)
+    assert Coordinates.from_step(dict(step)) == (52.5, 30.25)
+    assert Coordinates.parse_coords_text("52.5, 30.25") == (52.5, 30.25)
+    assert calls == ["52.5", " 30.25"]
+    
+    # Los textos inválidos también se recuerdan
+    assert Coordinates.parse_coords_text("1, 2, 3") is None
+    assert Coordinates.parse_coords_text("1, 2, 3") is None
+    assert Coordinates.from_step({'coord_x': "120", 'coord_y': "5"}) is None
+    assert Coordinates.from_step({'coord_x': "120", 'coord_y': "5"}) is None
+    assert calls == ["52.5", " 30.25", "120", "5"]
+
+def test_parse_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(Coordinates, "PARSE_CACHE_SIZE", 10)
+    Coordinates._parsed.clear()
+    for value in range(25):
+        assert Coordinates.parse_pair(str(value), "1") == (float(value), 1.0)
+        assert len(Coordinates._parsed) <= 10
+
+def test_format_pair_drops_trailing_zeros():
+    assert Coordinates.format_pair(45.2049, 33.1) == "45.2, 33.1"
+    assert Coordinates.format_pair(52, 30.0) == "52, 30"
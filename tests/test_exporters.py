@@ -0,0 +1,111 @@
+import csv
+import io
+import os
+
+import pytest
+
+from utils.exporters import CsvExporter, ExportPipeline, GuideExporter, HtmlExporter, LuaExporter, MarkdownExporter
+from utils.lua_generator import LuaGenerator
+
+METADATA = {'zone': "Durotar", 'level_range': "1-12", 'next_zone': "The Barrens", 'faction': "Horde"}
+
+def make_step(number, **fields):
+    """Crea un paso con todos los campos del formulario."""
+    step = {'action': "A", 'quest_name': f"Quest {number}", 'quest_id': str(number), 'note': "",
+            'coords': "42.1, 68.3", 'class': "", 'race': "", 'zone': "", 'obj_id': ""}
+    step.update(fields)
+    return step
+
+STEPS = [
+    make_step(1),
+    make_step(2, note="Kill <boars> & | loot", zone="Durotar"),
+    make_step(3, action="T", coords="", zone="The Barrens", **{'class': "Mage"})
+]
+
+def export(exporter_class, steps=STEPS, **kwargs):
+    """Exporta los pasos con un exportador y devuelve el texto generado."""
+    stream = io.StringIO()
+    assert ExportPipeline.run(steps, METADATA, [exporter_class(stream, **kwargs)]) == len(steps)
+    return stream.getvalue()
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_lua_export_matches_the_generator(optimize):
+    guide_name, next_zone = LuaGenerator.get_guide_names("Durotar", "1-12", "The Barrens")
+    assert export(LuaExporter, optimize=optimize) == LuaGenerator.generate_lua(
+        STEPS, guide_name, next_zone, "Horde", optimize=optimize, guide_zone="Durotar")
+
+def test_tabular_exports_contain_every_step():
+    rows = list(csv.reader(io.StringIO(export(CsvExporter))))
+    assert rows[0] == ["#"] + [label for _, label in GuideExporter.COLUMNS]
+    assert rows[2] == ["2", "A", "Quest 2", "2", "Kill <boars> & | loot", "42.1, 68.3", "", "", "Durotar", ""]
+    assert len(rows) == 4
+    
+    markdown = export(MarkdownExporter).splitlines()
+    assert markdown[0] == "# Durotar (1-12)"
+    assert markdown[-2] == "| 2 | A | Quest 2 | 2 | Kill <boars> & \\| loot | 42.1, 68.3 |  |  | Durotar |  |"
+    
+    page = export(HtmlExporter)
+    assert "<title>Durotar (1-12)</title>" in page
+    assert "<td>Kill &lt;boars&gt; &amp; | loot</td>" in page
+    assert page.count("<tr><td>") == 3 and page.endswith("</html>\n")
+
+def test_one_pass_feeds_every_exporter():
+    class CountingList(list):
+        iterations = 0
+        
+        def __iter__(self):
+            CountingList.iterations += 1
+            return super().__iter__()
+    
+    streams = [io.StringIO() for _ in range(4)]
+    exporters = [LuaExporter(streams[0]), CsvExporter(streams[1]), MarkdownExporter(streams[2]), HtmlExporter(streams[3])]
+    ExportPipeline.run(CountingList(STEPS), METADATA, exporters)
+    assert CountingList.iterations == 1
+    assert [stream.getvalue() for stream in streams] == [export(exporter_class) for exporter_class in
+                                                          (LuaExporter, CsvExporter, MarkdownExporter, HtmlExporter)]
+
+def test_exporters_must_implement_write_step():
+    class Incomplete(GuideExporter):
+        name = "incomplete"
+    
+    with pytest.raises(TypeError):
+        Incomplete(io.StringIO())
+
+def test_export_to_files_writes_every_format(tmp_path):
+    filenames = ExportPipeline.export_to_files(STEPS, METADATA, ["lua", "csv", "md", "html"], str(tmp_path), "guide")
+    assert [os.path.basename(filename) for filename in filenames] == ["guide.lua", "guide.csv", "guide.md", "guide.html"]
+    with open(filenames[1], 'r', encoding='utf-8', newline="") as f:
+        assert f.read() == export(CsvExporter)
+    assert sorted(os.listdir(tmp_path)) == ["guide.csv", "guide.html", "guide.lua", "guide.md"]
+    
+    with pytest.raises(ValueError):
+        ExportPipeline.export_to_files(STEPS, METADATA, ["lua", "pdf"], str(tmp_path), "guide")
+
+def test_failed_export_leaves_existing_files_intact(tmp_path, monkeypatch):
+    ExportPipeline.export_to_files(STEPS, METADATA, ["lua", "csv"], str(tmp_path), "guide")
+    before = {name: (tmp_path / name).read_bytes() for name in os.listdir(tmp_path)}
+    
+    def fail(self, index, step):
+        if index == 2:
+            raise RuntimeError("disk full")
+        self.writer.writerow([index])
+    
+    monkeypatch.setattr(CsvExporter, "write_step", fail)
+    with pytest.raises(RuntimeError):
+        ExportPipeline.export_to_files(STEPS[::-1], METADATA, ["lua", "csv"], str(tmp_path), "guide")
+    assert {name: (tmp_path / name).read_bytes() for name in os.listdir(tmp_path)} == before
+
+def test_register_exporter_adds_a_format(tmp_path, monkeypatch):
+    monkeypatch.setattr(ExportPipeline, "EXPORTERS", dict(ExportPipeline.EXPORTERS))
+    
+    class QuestIdExporter(GuideExporter):
+        name = "ids"
+        extension = ".txt"
+        
+        def write_step(self, index, step):
+            self.stream.write(step['quest_id'] + "\n")
+    
+    ExportPipeline.register_exporter(QuestIdExporter)
+    filename, = ExportPipeline.export_to_files(STEPS, METADATA, ["ids"], str(tmp_path), "guide")
+    assert (tmp_path / "guide.txt").read_text(encoding='utf-8') == "1\n2\n3\n"
+    assert filename == str(tmp_path / "guide.txt")
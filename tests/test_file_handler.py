@@ -0,0 +1,21 @@
+import pytest
+
+from utils.file_handler import FileHandler
+
+def test_write_text_files_writes_every_file(tmp_path):
+    files = {str(tmp_path / f"part_{index:02d}.lua"): f"-- {index}\n" for index in range(12)}
+    assert FileHandler.write_text_files(files) == list(files)
+    for filename, content in files.items():
+        with open(filename, 'r', encoding='utf-8') as f:
+            assert f.read() == content
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(f"part_{index:02d}.lua" for index in range(12))
+
+def test_write_text_files_does_not_truncate_on_failure(tmp_path):
+    target = tmp_path / "guide.lua"
+    target.write_text("old contents", encoding='utf-8')
+    
+    # Un contenido que no se puede escribir falla antes de reemplazar el archivo
+    with pytest.raises(TypeError):
+        FileHandler.write_text_files({str(target): None})
+    assert target.read_text(encoding='utf-8') == "old contents"
+    assert [path.name for path in tmp_path.iterdir()] == ["guide.lua"]
@@ -0,0 +1,135 @@
+import pytest
+
+from models.guide import Guide
+
+def make_step(number):
+    """Crea un paso distinto por identidad (los pasos se buscan por id())."""
+    return {'action': "A", 'quest_id': str(number)}
+
+def make_guide(count):
+    """
+    Crea una guía con pasos numerados y un registro de los lotes de eventos.
+    
+    Args:
+        count (int): Número de pasos
+    
+    Returns:
+        tuple: Guía y lista de lotes recibidos por un suscriptor no inmediato
+    """
+    guide = Guide()
+    guide.insert_steps(0, [make_step(number) for number in range(count)])
+    batches = []
+    guide.subscribe(batches.append)
+    return guide, batches
+
+def quest_ids(guide):
+    """Identificadores de misión de los pasos de la guía, en orden."""
+    return [step['quest_id'] for step in guide.get_all_steps()]
+
+def test_insert_steps_clamps_the_index_and_emits_one_event():
+    guide, batches = make_guide(3)
+    block = [make_step(10), make_step(11)]
+    
+    assert guide.insert_steps(1, block) == 1
+    assert quest_ids(guide) == ["0", "10", "11", "1", "2"]
+    assert guide.get_step(1) is block[0]
+    assert batches == [[{'type': "inserted", 'index': 1, 'steps': block}]]
+    
+    # Los índices fuera de rango se ajustan a los extremos
+    assert guide.insert_steps(99, [make_step(12)]) == 5
+    assert guide.insert_steps(-5, [make_step(13)]) == 0
+    assert quest_ids(guide) == ["13", "0", "10", "11", "1", "2", "12"]
+    
+    # Insertar un bloque vacío no emite eventos
+    guide.insert_steps(0, [])
+    assert len(batches) == 3
+
+def test_remove_range_returns_the_removed_steps():
+    guide, batches = make_guide(6)
+    steps = list(guide.get_all_steps())
+    
+    removed = guide.remove_range(1, 4)
+    assert [step['quest_id'] for step in removed] == ["1", "2", "3"]
+    assert all(a is b for a, b in zip(removed, steps[1:4]))
+    assert quest_ids(guide) == ["0", "4", "5"]
+    assert batches == [[{'type': "removed", 'index': 1, 'steps': removed}]]
+    
+    # Un rango vacío o fuera de la guía no cambia nada
+    for start, end in ((2, 2), (2, 1), (-1, 2), (1, 4)):
+        assert guide.remove_range(start, end) == []
+    assert quest_ids(guide) == ["0", "4", "5"]
+    assert len(batches) == 1
+
+@pytest.mark.parametrize("start, end, target", [
+    (0, 2, 3), (3, 5, 0), (1, 4, 2), (1, 4, 3), (2, 4, 99), (2, 4, -3)
+])
+def test_move_range_matches_list_semantics(start, end, target):
+    guide, batches = make_guide(7)
+    expected = quest_ids(guide)
+    block = expected[start:end]
+    del expected[start:end]
+    clamped = max(0, min(target, len(expected)))
+    expected[clamped:clamped] = block
+    
+    assert guide.move_range(start, end, target) == clamped
+    assert quest_ids(guide) == expected
+    assert batches == [[{'type': "moved", 'start': start, 'end': end, 'index': clamped}]]
+
+def test_move_range_keeps_step_ids_and_ignores_no_op_moves():
+    guide, batches = make_guide(6)
+    ids = [guide.get_step_id(index) for index in range(6)]
+    
+    # Destino dentro del propio bloque desplazado una posición
+    assert guide.move_range(1, 4, 2) == 2
+    assert [guide.get_step_id(index) for index in range(6)] == [ids[0], ids[4], ids[1], ids[2], ids[3], ids[5]]
+    assert guide.get_step_index(ids[1]) == 2
+    
+    # Mover a la posición que ya ocupa no emite eventos
+    assert guide.move_range(2, 5, 2) == 2
+    assert guide.move_range(3, 3, 0) is None
+    assert len(batches) == 1
+
+def test_duplicate_range_inserts_copies_after_the_block():
+    guide, batches = make_guide(4)
+    originals = list(guide.get_all_steps())[1:3]
+    
+    assert guide.duplicate_range(1, 3) == 3
+    assert quest_ids(guide) == ["0", "1", "2", "1", "2", "3"]
+    
+    # Las copias son pasos nuevos, no referencias a los originales
+    copies = guide.get_all_steps()[3:5]
+    for original, copy in zip(originals, copies):
+        assert copy == original and copy is not original
+    copies[0]['quest_id'] = "changed"
+    assert originals[0]['quest_id'] == "1"
+    assert guide.get_step_id(3) not in (guide.get_step_id(1), guide.get_step_id(2))
+    
+    assert [event['type'] for batch in batches for event in batch] == ["inserted"]
+    assert guide.duplicate_range(2, 2) is None
+
+def test_replace_range_delivers_one_batch():
+    guide, batches = make_guide(5)
+    immediate = []
+    guide.subscribe(immediate.append, immediate=True)
+    block = [make_step(10), make_step(11), make_step(12)]
+    
+    removed = guide.replace_range(1, 3, block)
+    assert [step['quest_id'] for step in removed] == ["1", "2"]
+    assert quest_ids(guide) == ["0", "10", "11", "12", "3", "4"]
+    
+    # Los suscriptores normales reciben un solo lote; los inmediatos, cada evento
+    assert len(batches) == 1
+    assert [(event['type'], event['index']) for event in batches[0]] == [("removed", 1), ("inserted", 1)]
+    assert [[event['type'] for event in batch] for batch in immediate] == [["removed"], ["inserted"]]
+    
+    # Dentro de una transacción externa el lote se entrega al cerrarla
+    with guide.transaction():
+        guide.replace_range(0, 1, [make_step(20)])
+        guide.replace_range(5, 6, [])
+        assert len(batches) == 1
+    assert len(batches) == 2
+    assert [event['type'] for event in batches[1]] == ["removed", "inserted", "removed"]
+    assert quest_ids(guide) == ["20", "10", "11", "12", "3"]
+    
+    assert guide.replace_range(3, 1, block) == []
+    assert len(batches) == 2
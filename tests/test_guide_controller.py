@@ -0,0 +1,168 @@
+import json
+
+import pytest
+
+from controllers.guide_controller import GuideController, GuideError
+from utils.lua_generator import LuaGenerator
+
+def make_step(action, quest_id, coords="", **fields):
+    """Crea un paso con todos los campos del formulario."""
+    coord_x, _, coord_y = coords.partition(",")
+    step = {
+        'action': action, 'quest_name': f"Quest {quest_id}", 'quest_id': quest_id, 'note': "",
+        'coords': coords, 'coord_x': coord_x.strip(), 'coord_y': coord_y.strip(),
+        'class': "", 'race': "", 'zone': "", 'obj_id': ""
+    }
+    step.update(fields)
+    return step
+
+def write_guide(path, zone, level_range, steps):
+    """Escribe un archivo de guía JSON."""
+    metadata = {'zone': zone, 'level_range': level_range, 'next_zone': "", 'faction': "Horde"}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'metadata': metadata, 'steps': steps}, f)
+
+def test_sync_library_replaces_the_saved_copy_of_the_open_guide(tmp_path):
+    write_guide(tmp_path / "durotar.json", "Durotar", "1-10", [make_step("A", "1", "50, 50")])
+    write_guide(tmp_path / "barrens.json", "The Barrens", "10-20", [make_step("T", "1", "60, 60")])
+    
+    controller = GuideController()
+    controller.load_library(str(tmp_path))
+    assert [point['quest_id'] for point in controller.get_nearby_points("Durotar", "50", "50")] == ["1"]
+    
+    # La guía abierta tiene el mismo nombre que durotar.json pero otras coordenadas
+    controller.set_metadata("Durotar", "1-10", "", "Horde")
+    controller.add_step(make_step("A", "1", "10, 10"))
+    library = controller.sync_library()
+    
+    assert str(tmp_path / "durotar.json") not in library.guides
+    assert controller.get_nearby_points("Durotar", "50", "50") == []
+    assert [(point['coord_x'], point['coord_y']) for point in controller.get_nearby_points("Durotar", "10", "10")] \
+        == [("10", "10")]
+    assert library.find_quest("1", "A") == [(GuideController.CURRENT_GUIDE_KEY, 0, "A")]
+
+def test_editing_the_open_guide_drops_its_stale_library_entry():
+    controller = GuideController()
+    controller.set_metadata("Durotar", "1-10", "", "Horde")
+    controller.add_step(make_step("A", "2"))
+    assert controller.sync_library().find_quest("2") == [(GuideController.CURRENT_GUIDE_KEY, 0, "A")]
+    
+    controller.import_steps([make_step("N", "", quest_name="Note")], index=0)
+    assert GuideController.CURRENT_GUIDE_KEY not in controller.guide_library.guides
+    assert controller.sync_library().find_quest("2") == [(GuideController.CURRENT_GUIDE_KEY, 1, "A")]
+
+def step_ids(controller):
+    """Identificadores estables de los pasos de la guía abierta."""
+    return [controller.guide.get_step_id(index) for index in range(len(controller.guide.get_all_steps()))]
+
+def test_add_step_validates_and_replaces_by_index():
+    controller = GuideController()
+    with pytest.raises(GuideError):
+        controller.add_step(make_step("A", "1", quest_name=""))
+    with pytest.raises(GuideError):
+        controller.add_step(make_step("A", "1", "150, 20"))
+    assert not controller.guide.get_all_steps()
+    
+    assert controller.add_step(make_step("A", "1", "10, 20")) == 0
+    assert controller.add_step(make_step("C", "1")) == 1
+    first_id = controller.guide.get_step_id(0)
+    
+    # Sustituir por índice conserva la posición y el identificador del paso
+    assert controller.add_step(make_step("T", "1", "30, 40"), index=1) == 1
+    assert [step['action'] for step in controller.guide.get_all_steps()] == ["A", "T"]
+    assert controller.guide.get_step_id(0) == first_id
+    assert controller.quest_history.get_quest_coords("1", 'T') == ("30", "40")
+
+def test_range_operations_notify_one_batch_each():
+    controller = GuideController()
+    controller.import_steps([make_step("A", str(number)) for number in range(5)])
+    batches = []
+    controller.guide.subscribe(batches.append)
+    
+    assert controller.move_range(1, 3, 1) is None
+    assert controller.move_range(0, 2, 3) == 3
+    assert [step['quest_id'] for step in controller.guide.get_all_steps()] == ["2", "3", "4", "0", "1"]
+    assert controller.duplicate_range(3, 5) == 5
+    assert [step['quest_id'] for step in controller.remove_range(0, 3)] == ["2", "3", "4"]
+    assert [step['quest_id'] for step in controller.guide.get_all_steps()] == ["0", "1", "0", "1"]
+    assert [[event['type'] for event in batch] for batch in batches] == [["moved"], ["inserted"], ["removed"]]
+
+def test_apply_steps_reverts_to_an_earlier_snapshot():
+    controller = GuideController()
+    controller.import_steps([make_step("A", str(number), f"{number * 10}, 50") for number in range(1, 6)])
+    saved_steps = list(controller.guide.get_all_steps())
+    saved_ids = step_ids(controller)
+    
+    controller.add_step(make_step("T", "2", "25, 50"), index=1)
+    controller.remove_range(3, 4)
+    controller.add_step(make_step("N", "", quest_name="Extra"))
+    assert "T" in [point['action'] for point in controller.get_nearby_points("", "25", "50")]
+    
+    # Volver a la copia anterior solo toca los bloques cambiados
+    assert controller.apply_steps(saved_steps) == 3
+    assert list(controller.guide.get_all_steps()) == saved_steps
+    assert [step_ids(controller)[index] for index in (0, 2, 4)] == [saved_ids[index] for index in (0, 2, 4)]
+    assert "T" not in [point['action'] for point in controller.get_nearby_points("", "25", "50")]
+    assert controller.apply_steps(saved_steps) == 0
+
+def test_merge_steps_combines_both_sides_and_keeps_ours_on_conflict():
+    base = [make_step("A", str(number)) for number in range(1, 7)]
+    controller = GuideController()
+    controller.import_steps(base)
+    unchanged_id = controller.guide.get_step_id(2)
+    
+    # Nosotros editamos el paso 1 y el 5; ellos el paso 1 y añaden uno al final
+    controller.add_step(make_step("A", "1", note="ours"), index=0)
+    controller.add_step(make_step("A", "5", note="ours"), index=4)
+    theirs = [make_step("A", "1", note="theirs")] + base[1:] + [make_step("T", "7")]
+    
+    result = controller.merge_steps(base, theirs)
+    assert [conflict['index'] for conflict in result['conflicts']] == [0]
+    assert [step['note'] for step in controller.guide.get_all_steps()] == ["ours", "", "", "", "ours", "", ""]
+    assert (controller.guide.get_all_steps()[-1]['action'], controller.guide.get_all_steps()[-1]['quest_id']) == \
+        ("T", "7")
+    assert controller.guide.get_step_id(2) == unchanged_id
+
+def test_generate_lua_requires_steps_and_reports_optimization():
+    controller = GuideController()
+    controller.set_metadata("Durotar", "1-10", "The Barrens", "Horde")
+    with pytest.raises(GuideError):
+        controller.generate_lua()
+    
+    controller.import_steps([make_step("A", "1", "10, 20"), make_step("T", "1", "30, 40")])
+    code, report = controller.generate_lua()
+    assert report is None and "Quest 1" in code
+    optimized, report = controller.generate_lua(optimize=True)
+    assert report['equivalent']
+    assert optimized == LuaGenerator.generate_lua(controller.guide.get_all_steps(), *controller.get_guide_names(),
+                                                  "Horde", optimize=True, guide_zone="Durotar")
+
+def test_save_and_load_round_trip(tmp_path):
+    controller = GuideController()
+    controller.set_metadata("Durotar", "1-10", "The Barrens", "Horde")
+    with pytest.raises(GuideError):
+        controller.save_guide(str(tmp_path / "empty.json"))
+    
+    controller.import_steps([make_step("A", "1", "10, 20"), make_step("T", "1", "30, 40")])
+    filename = str(tmp_path / "durotar.json")
+    saved = controller.save_guide(filename)
+    
+    loaded = GuideController()
+    assert loaded.load_guide(filename) == json.loads(json.dumps(saved))
+    assert list(loaded.guide.get_all_steps()) == list(controller.guide.get_all_steps())
+    assert loaded.quest_history.get_all_quests() == controller.quest_history.get_all_quests()
+    assert loaded.guide.get_guide_name() == controller.guide.get_guide_name()
+
+def test_spatial_index_follows_edits():
+    controller = GuideController()
+    controller.set_metadata("Durotar", "1-10", "", "Horde")
+    controller.add_step(make_step("A", "1", "10, 10"))
+    controller.add_step(make_step("A", "2", "80, 80"))
+    assert [point['quest_id'] for point in controller.get_nearby_points("Durotar", "10", "10")] == ["1"]
+    
+    controller.add_step(make_step("A", "1", "60, 60"), index=0)
+    assert controller.get_nearby_points("Durotar", "10", "10") == []
+    assert [point['quest_id'] for point in controller.get_nearby_points("Durotar", "60", "60")] == ["1"]
+    
+    controller.remove_range(1, 2)
+    assert controller.get_nearby_points("Durotar", "80", "80") == []
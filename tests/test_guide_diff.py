@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+from utils.guide_diff import GuideDiff
+
+# Contenidos posibles de un paso; pocos para que haya pasos repetidos
+QUEST_IDS = [str(number) for number in range(8)]
+
+def random_step(rng):
+    """Crea un paso con contenido aleatorio de un conjunto pequeño."""
+    return {'action': rng.choice("ACT"), 'quest_id': rng.choice(QUEST_IDS)}
+
+def random_steps(rng, size):
+    """Crea una lista de pasos aleatorios."""
+    return [random_step(rng) for _ in range(size)]
+
+def edit(rng, steps, edits):
+    """
+    Aplica ediciones aleatorias (insertar, eliminar, sustituir, mover) a una copia.
+    
+    Args:
+        rng (random.Random): Generador aleatorio
+        steps (list): Pasos originales
+        edits (int): Número de ediciones
+    
+    Returns:
+        list: Pasos editados
+    """
+    result = list(steps)
+    for _ in range(edits):
+        operation = rng.choice(("insert", "delete", "replace", "move"))
+        if operation == "insert" or not result:
+            index = rng.randint(0, len(result))
+            result[index:index] = random_steps(rng, rng.randint(1, 3))
+        elif operation == "delete":
+            start = rng.randrange(len(result))
+            del result[start:start + rng.randint(1, 3)]
+        elif operation == "replace":
+            result[rng.randrange(len(result))] = random_step(rng)
+        else:
+            start = rng.randrange(len(result))
+            block = result[start:start + rng.randint(1, 3)]
+            del result[start:start + len(block)]
+            target = rng.randint(0, len(result))
+            result[target:target] = block
+    return result
+
+def keys(steps):
+    """Claves de contenido de una lista de pasos."""
+    return [GuideDiff.step_key(step) for step in steps]
+
+def apply_opcodes(old_steps, new_steps, opcodes):
+    """Reconstruye la lista nueva a partir de la original y de las operaciones."""
+    result = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'equal':
+            result.extend(old_steps[i1:i2])
+        else:
+            result.extend(new_steps[j1:j2])
+    return result
+
+@pytest.mark.parametrize("seed", range(200))
+def test_opcodes_rebuild_new_steps(seed):
+    rng = random.Random(seed)
+    old_steps = random_steps(rng, rng.randint(0, 40))
+    new_steps = edit(rng, old_steps, rng.randint(0, 8))
+    opcodes = GuideDiff.diff(old_steps, new_steps)
+    
+    # Las operaciones cubren ambas listas de forma contigua y sin huecos
+    i = j = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j)
+        assert tag in ('equal', 'delete', 'insert', 'replace')
+        if tag == 'equal':
+            assert keys(old_steps[i1:i2]) == keys(new_steps[j1:j2])
+        elif tag == 'delete':
+            assert i1 < i2 and j1 == j2
+        elif tag == 'insert':
+            assert i1 == i2 and j1 < j2
+        else:
+            assert i1 < i2 and j1 < j2
+        i, j = i2, j2
+    assert (i, j) == (len(old_steps), len(new_steps))
+    
+    assert keys(apply_opcodes(old_steps, new_steps, opcodes)) == keys(new_steps)
+
+def test_identical_lists_are_one_equal_block():
+    rng = random.Random(0)
+    steps = random_steps(rng, 30)
+    assert GuideDiff.diff(steps, [dict(step) for step in steps]) == [('equal', 0, 30, 0, 30)]
+    assert GuideDiff.diff([], []) == []
+
+@pytest.mark.parametrize("seed", range(200))
+def test_merge_identities(seed):
+    rng = random.Random(seed)
+    base = random_steps(rng, rng.randint(0, 30))
+    ours = edit(rng, base, rng.randint(0, 5))
+    theirs = edit(rng, base, rng.randint(0, 5))
+    
+    # Sin cambios en un lado, el resultado es el otro lado
+    for result, expected in ((GuideDiff.merge(base, ours, base), ours),
+                             (GuideDiff.merge(base, base, theirs), theirs)):
+        assert keys(result['steps']) == keys(expected)
+        assert result['conflicts'] == []
+    
+    # Los mismos cambios en ambos lados no son un conflicto
+    same = GuideDiff.merge(base, ours, ours)
+    assert keys(same['steps']) == keys(ours)
+    assert same['conflicts'] == []
+    
+    # En un conflicto se conserva nuestra versión de la región
+    result = GuideDiff.merge(base, ours, theirs)
+    for conflict in result['conflicts']:
+        start = conflict['index']
+        assert keys(result['steps'][start:start + len(conflict['ours'])]) == keys(conflict['ours'])
+
+def test_merge_applies_changes_from_both_sides():
+    rng = random.Random(1)
+    base = random_steps(rng, 40)
+    
+    # Cambios en regiones separadas de la base
+    ours = base[:5] + [{'action': "N", 'quest_id': "ours"}] + base[5:]
+    theirs = base[:30] + base[32:]
+    result = GuideDiff.merge(base, ours, theirs)
+    
+    assert result['conflicts'] == []
+    assert keys(result['steps']) == keys(base[:5] + [ours[5]] + base[5:30] + base[32:])
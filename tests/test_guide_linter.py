@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from models.guide import Guide
+from models.guide_linter import GuideLinter
+
+def make_step(action, quest_id, **fields):
+    """Crea un paso del flujo de una misión."""
+    step = {'action': action, 'quest_name': f"Quest {quest_id}", 'quest_id': quest_id, 'class': "", 'race': ""}
+    step.update(fields)
+    return step
+
+def diagnostics(linter, guide):
+    """Diagnósticos de todos los pasos de la guía, en orden."""
+    return [linter.get_diagnostics(step) for step in guide.get_all_steps()]
+
+def reference_diagnostics(guide):
+    """Diagnósticos de una validación completa de los mismos pasos en otra guía."""
+    reference = Guide()
+    reference.insert_steps(0, list(guide.get_all_steps()))
+    return diagnostics(GuideLinter(reference), reference)
+
+def test_reports_quest_flow_errors():
+    guide = Guide()
+    guide.insert_steps(0, [
+        make_step("C", "1"),
+        make_step("A", "1"),
+        make_step("A", "1"),
+        make_step("T", "2"),
+        make_step("T", "1"),
+        make_step("T", "1"),
+        # La misma misión para otra clase no es un duplicado
+        make_step("A", "1", **{'class': "Mage"}),
+        # Las acciones fuera del flujo no se validan
+        make_step("R", "3")
+    ])
+    linter = GuideLinter(guide)
+    assert diagnostics(linter, guide) == [
+        ["Quest 1 completed before being accepted"],
+        [],
+        ["Quest 1 accepted more than once"],
+        ["Quest 2 turned in before being accepted"],
+        [],
+        ["Quest 1 turned in more than once"],
+        [],
+        []
+    ]
+
+def test_edits_revalidate_only_the_affected_quests():
+    guide = Guide()
+    guide.insert_steps(0, [make_step("A", "1"), make_step("T", "1"), make_step("A", "2"), make_step("T", "2")])
+    linter = GuideLinter(guide)
+    assert linter.pop_changed_steps() == set()
+    
+    # Mover la entrega antes de la aceptación solo afecta a la misión 1
+    guide.move_range(1, 2, 0)
+    turn_in = guide.get_step(0)
+    assert linter.get_diagnostics(turn_in) == ["Quest 1 turned in before being accepted"]
+    assert linter.pop_changed_steps() == {id(turn_in)}
+    
+    # Sustituir el paso corrige el diagnóstico
+    guide.update_step(0, make_step("N", "", quest_name="Note"))
+    assert diagnostics(linter, guide) == [[], [], [], []]
+    assert linter.pop_changed_steps() == {id(turn_in)}
+    
+    # Eliminar la aceptación marca la entrega posterior
+    guide.remove_range(2, 3)
+    assert diagnostics(linter, guide) == [[], [], ["Quest 2 turned in before being accepted"]]
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_validation_matches_a_full_rebuild(seed):
+    rng = random.Random(seed)
+    
+    def random_step():
+        return make_step(rng.choice("ACTR"), str(rng.randint(1, 8)), **{'class': rng.choice(["", "Mage"])})
+    
+    guide = Guide()
+    linter = GuideLinter(guide)
+    for operation in range(600):
+        size = len(guide.get_all_steps())
+        choice = rng.random()
+        if choice < 0.3 or size < 3:
+            guide.insert_steps(rng.randint(0, size), [random_step() for _ in range(rng.randint(1, 3))])
+        elif choice < 0.45:
+            # Inserciones repetidas en el mismo punto agotan el hueco entre claves
+            guide.insert_steps(size // 2, [random_step()])
+        elif choice < 0.6:
+            start = rng.randrange(size)
+            guide.remove_range(start, min(size, start + rng.randint(1, 2)))
+        elif choice < 0.8:
+            start = rng.randrange(size)
+            end = min(size, start + rng.randint(1, 3))
+            guide.move_range(start, end, rng.randint(0, size - (end - start)))
+        else:
+            guide.update_step(rng.randrange(size), random_step())
+        
+        if operation % 20 == 0:
+            steps = guide.get_all_steps()
+            keys = [linter.order_keys[id(step)] for step in steps]
+            assert keys == sorted(set(keys))
+            assert diagnostics(linter, guide) == reference_diagnostics(guide)
+    assert diagnostics(linter, guide) == reference_diagnostics(guide)
+
+def test_hot_spot_insertions_rebalance_locally(monkeypatch):
+    guide = Guide()
+    guide.insert_steps(0, [make_step("A", str(number % 50)) for number in range(400)])
+    linter = GuideLinter(guide)
+    
+    rebuilds = []
+    rebuild = GuideLinter.rebuild
+    monkeypatch.setattr(GuideLinter, "rebuild", lambda self: rebuilds.append(1) or rebuild(self))
+    for number in range(500):
+        guide.insert_steps(200, [make_step("T", str(number % 50))])
+    
+    keys = [linter.order_keys[id(step)] for step in guide.get_all_steps()]
+    assert keys == sorted(set(keys))
+    assert rebuilds == []
+    assert diagnostics(linter, guide) == reference_diagnostics(guide)
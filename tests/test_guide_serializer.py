@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from models.guide import Guide
+from utils.background_task import BackgroundTask
+from utils.guide_serializer import GuideSerializer
+
+def make_document(count):
+    """Crea un documento de guía con `count` pasos y su historial."""
+    steps = [{'action': "A", 'quest_name': f"Quest «{number}»", 'quest_id': str(number), 'coords': "10, 20"}
+             for number in range(count)]
+    history = {str(number): {'name': f"Quest {number}", 'actions_used': ["A"], 'coords': {}}
+               for number in range(count)}
+    metadata = {'zone': "Durotar", 'level_range': "1-10", 'next_zone': "", 'faction': "Horde"}
+    return {'metadata': metadata, 'steps': steps, 'quest_history': history}
+
+def reference(data, compact):
+    """Salida de json.dumps con las mismas opciones que el codificador."""
+    if compact:
+        return json.dumps(data, separators=(',', ':'), default=BackgroundTask.json_default)
+    return json.dumps(data, indent=2, default=BackgroundTask.json_default)
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("count", [0, 1, 5])
+def test_encode_matches_json_dumps(compact, count):
+    data = make_document(count)
+    assert GuideSerializer(compact).encode(data) == reference(data, compact)
+    
+    data['quest_history'] = {}
+    data['extra'] = {'nested': [1, {'a': None}]}
+    assert GuideSerializer(compact).encode(data) == reference(data, compact)
+    assert GuideSerializer(compact).encode({}) == "{}"
+
+def test_only_replaced_steps_are_encoded_again():
+    serializer = GuideSerializer()
+    data = make_document(10)
+    serializer.encode(data)
+    assert serializer.last_encoded == 20
+    
+    # Los pasos editados se sustituyen por diccionarios nuevos
+    data['steps'][3] = dict(data['steps'][3], note="edited")
+    del data['steps'][0]
+    assert serializer.encode(data) == reference(data, False)
+    assert serializer.last_encoded == 1
+    assert serializer.encode(data) == reference(data, False)
+    assert serializer.last_encoded == 0
+
+def test_write_round_trips_through_guide(tmp_path):
+    data = make_document(3)
+    filename = str(tmp_path / "guide.json")
+    GuideSerializer(compact=True).write(filename, data)
+    assert not (tmp_path / "guide.json.tmp").exists()
+    
+    with open(filename, 'r', encoding='utf-8') as f:
+        loaded = json.load(f)
+    assert loaded == data
+    guide = Guide()
+    guide.from_dict(loaded)
+    assert list(guide.get_all_steps()) == data['steps']
+    assert guide.zone == "Durotar"
@@ -0,0 +1,76 @@
+import json
+import os
+
+from models.coordinates import Coordinates
+from utils.guide_watcher import GuideWatcher
+from utils.lua_generator import LuaGenerator
+
+GUIDE = {
+    "metadata": {"zone": "Durotar", "level_range": "1-12", "next_zone": "The Barrens", "faction": "Horde"},
+    "steps": [{"action": "A", "quest_name": "Your Place In The World", "quest_id": "4641",
+               "note": "", "coords": "42.1, 68.3", "class": "", "race": "", "zone": "", "obj_id": ""}]
+}
+
+def write_json(path, data):
+    """Escribe un archivo JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+def count_reads(watcher):
+    """
+    Cuenta las rutas que el compilador vuelve a leer.
+    
+    Args:
+        watcher (GuideWatcher): Compilador a vigilar
+    
+    Returns:
+        list: Rutas pasadas a _build_file (se amplía en cada pasada)
+    """
+    reads = []
+    build_file = watcher._build_file
+    watcher._build_file = lambda path, stat: reads.append(os.path.basename(path)) or build_file(path, stat)
+    return reads
+
+def test_build_compiles_once_and_reuses_the_cache(tmp_path):
+    write_json(tmp_path / "Durotar.json", GUIDE)
+    watcher = GuideWatcher(str(tmp_path), str(tmp_path / "out"))
+    
+    assert [status for _, status in watcher.build()] == ["compiled"]
+    assert (tmp_path / "out" / "Durotar.lua").read_text(encoding='utf-8') == \
+        watcher.compile_guide(GUIDE)
+    assert watcher.build() == []
+    
+    # Sin el Lua de salida, la guía se recupera de la caché sin generarla
+    os.remove(tmp_path / "out" / "Durotar.lua")
+    assert [status for _, status in GuideWatcher(str(tmp_path), str(tmp_path / "out")).build()] == ["cached"]
+
+def test_invalid_files_are_indexed_as_skipped(tmp_path):
+    write_json(tmp_path / "settings.json", {"theme": "dark"})
+    (tmp_path / "broken.json").write_text("{not json", encoding='utf-8')
+    write_json(tmp_path / "Durotar.json", GUIDE)
+    
+    watcher = GuideWatcher(str(tmp_path), str(tmp_path / "out"))
+    reads = count_reads(watcher)
+    assert [os.path.basename(path) for path, _ in watcher.build()] == ["Durotar.json"]
+    assert sorted(reads) == ["Durotar.json", "broken.json", "settings.json"]
+    assert sorted(os.listdir(tmp_path / "out")) == ["Durotar.lua"]
+    
+    # Las pasadas siguientes no vuelven a leer los archivos descartados, tampoco tras reiniciar
+    assert watcher.build() == []
+    restarted = GuideWatcher(str(tmp_path), str(tmp_path / "out"))
+    restarted_reads = count_reads(restarted)
+    assert restarted.build() == []
+    assert len(reads) == 3 and restarted_reads == []
+    assert restarted.index[str(tmp_path / "settings.json")]['skipped']
+    
+    # Si el archivo pasa a ser una guía, se compila
+    write_json(tmp_path / "settings.json", GUIDE)
+    assert [(os.path.basename(path), status) for path, status in restarted.build()] == [("settings.json", "cached")]
+    assert 'skipped' not in restarted.index[str(tmp_path / "settings.json")]
+
+def test_generator_key_covers_the_coordinate_code(tmp_path, monkeypatch):
+    key = GuideWatcher(str(tmp_path), str(tmp_path / "out")).generator_key
+    assert Coordinates in GuideWatcher.GENERATOR_CLASSES
+    
+    monkeypatch.setattr(GuideWatcher, "GENERATOR_CLASSES", (LuaGenerator,))
+    assert GuideWatcher(str(tmp_path), str(tmp_path / "out")).generator_key != key
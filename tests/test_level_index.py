@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from models.guide import Guide
+from models.level_index import LevelIndex
+
+ZONES = ["Durotar", "The Barrens", "Ashenvale"]
+FACTIONS = ["Horde", "Alliance", "Both"]
+
+def brute_force(entries, low, high, faction=None, zone=None):
+    """Consulta de referencia recorriendo todas las entradas."""
+    results = []
+    for key, (entry_zone, entry_low, entry_high, entry_faction) in entries.items():
+        if entry_low is None or entry_high < low or entry_low > high:
+            continue
+        if zone is not None and entry_zone != zone:
+            continue
+        if faction not in (None, "Both") and entry_faction not in (faction, "Both"):
+            continue
+        results.append((entry_low, key))
+    return [key for _, key in sorted(results)]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_queries_match_brute_force(seed):
+    rng = random.Random(seed)
+    index = LevelIndex()
+    entries = {}
+    for operation in range(400):
+        key = f"guide_{rng.randint(0, 60):02d}.json"
+        if rng.random() < 0.25:
+            index.remove(key)
+            entries.pop(key, None)
+        else:
+            low = rng.randint(1, 60)
+            high = low + rng.randint(0, 10)
+            # Algunos rangos invertidos y algunos inválidos
+            level_range = rng.choice([f"{low}-{high}", f"{high}-{low}", f"{low}", "", "x-y"])
+            zone, faction = rng.choice(ZONES), rng.choice(FACTIONS)
+            index.add(key, zone, level_range, faction)
+            parsed_low, parsed_high = Guide.parse_level_range(level_range)
+            if parsed_low is not None:
+                parsed_low, parsed_high = min(parsed_low, parsed_high), max(parsed_low, parsed_high)
+            entries[key] = (zone, parsed_low, parsed_high, faction)
+        
+        if operation % 10 == 0:
+            low = rng.randint(0, 70)
+            high = low + rng.randint(0, 15)
+            faction = rng.choice([None] + FACTIONS)
+            zone = rng.choice([None] + ZONES)
+            assert index.overlap(low, high, faction, zone) == brute_force(entries, low, high, faction, zone)
+            assert index.stab(low) == brute_force(entries, low, low)
+    assert len(index) == len(entries)
+
+def test_faction_filter_includes_neutral_guides():
+    index = LevelIndex()
+    index.add("horde.json", "Durotar", "1-10", "Horde")
+    index.add("alliance.json", "Elwynn Forest", "1-10", "Alliance")
+    index.add("both.json", "Westfall", "5-15", "Both")
+    index.add("later.json", "The Barrens", "11-20", "Horde")
+    
+    assert index.stab(7, "Horde") == ["horde.json", "both.json"]
+    assert index.stab(7, "Alliance") == ["alliance.json", "both.json"]
+    assert sorted(index.stab(7)) == ["alliance.json", "both.json", "horde.json"]
+    assert index.overlap(9, 12, "Horde", "The Barrens") == ["later.json"]
+
+def test_round_trip_keeps_entries_and_replaces_keys():
+    index = LevelIndex()
+    index.add("a.json", "Durotar", "1-10", "Horde", stamp=[1, 2])
+    index.add("b.json", "Mulgore", "", "Horde")
+    index.add("a.json", "Durotar", "20-30", "Horde", stamp=[3, 4])
+    assert index.stab(5) == [] and index.stab(25) == ["a.json"]
+    
+    copy = LevelIndex()
+    copy.from_dict(index.to_dict())
+    assert copy.to_dict() == index.to_dict()
+    assert copy.entries["a.json"]['stamp'] == [3, 4]
+    assert copy.stab(25) == ["a.json"]
+    # Las guías sin rango se conservan aunque no aparezcan en las consultas
+    assert "b.json" in copy.entries
@@ -0,0 +1,107 @@
+import pytest
+
+from utils.lua_generator import LuaGenerator
+
+# Listas fijas para no depender de los recursos
+RACES_BY_FACTION = {"Alliance": ("Human", "Dwarf"), "Horde": ("Orc", "Troll")}
+CLASSES = ["", "Mage", "Rogue"]
+
+def parse_variant(spec, default_faction="Horde"):
+    """Interpreta una variante con las listas fijas de las pruebas."""
+    return LuaGenerator.parse_variant(spec, default_faction, RACES_BY_FACTION, CLASSES)
+
+def test_parse_variant_normalizes_values():
+    variant = parse_variant("alliance:mage:human")
+    assert (variant['name'], variant['faction'], variant['class'], variant['race']) == \
+        ("Alliance_Mage_Human", "Alliance", "Mage", "Human")
+    assert variant['faction_races'] == ("Human", "Dwarf")
+    
+    # Los campos vacíos no filtran y la facción por defecto es la de la guía
+    variant = parse_variant(":Rogue")
+    assert (variant['name'], variant['faction']) == ("Horde_Rogue", "Horde")
+    assert parse_variant("Both")['faction_races'] is None
+
+@pytest.mark.parametrize("spec", ["Hord:Mage", "Horde:Mage:Mage:X", "Horde:Warlock", "Horde::Human"])
+def test_parse_variant_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        parse_variant(spec)
+
+def test_variant_filters_steps_of_the_other_faction():
+    steps = [
+        {'action': "A", 'quest_name': "Both", 'race': ""},
+        {'action': "A", 'quest_name': "Alliance", 'race': "Human"},
+        {'action': "A", 'quest_name': "Horde", 'race': "Orc, Troll"}
+    ]
+    variant = parse_variant("Horde")
+    assert [step['quest_name'] for step in steps if LuaGenerator.step_in_variant(step, variant)] == \
+        ["Both", "Horde"]
+    
+    variant = parse_variant("Horde::Troll")
+    assert [step['quest_name'] for step in steps if LuaGenerator.step_in_variant(step, variant)] == \
+        ["Both", "Horde"]
+
+# Campos que se conservan al generar y volver a interpretar una línea
+ROUND_TRIP_FIELDS = ('action', 'quest_name', 'quest_id', 'note', 'coords', 'class', 'race', 'zone', 'obj_id')
+
+def make_step(**fields):
+    """Crea un paso con todos los campos del formulario."""
+    step = dict.fromkeys(ROUND_TRIP_FIELDS, "")
+    step.update(action="A", quest_name="The Test")
+    step.update(fields)
+    return step
+
+GUIDE_ZONE = "Durotar"
+
+ROUND_TRIP_STEPS = [
+    make_step(quest_id="101", note="Talk to Gornek"),
+    # |Z| igual a la zona de la guía (se omite en modo optimizado) y distinta
+    make_step(quest_id="102", zone=GUIDE_ZONE, coords="42.1, 68.3"),
+    make_step(action="T", quest_id="103", zone="The Barrens", coords="52, 30"),
+    # Nota que solo contiene coordenadas (el marcador "--" se omite en modo optimizado)
+    make_step(action="C", quest_id="104", coords="45.25, 33.1"),
+    # Precisión de las coordenadas (se redondea a COORD_PRECISION decimales)
+    make_step(action="C", quest_id="105", note="Kill boars", coords="45.2049, 33.1000"),
+    # Notas con barras verticales
+    make_step(action="N", quest_name="Notes", note="Loot |cff00ff00Pelts|r first | then sell"),
+    make_step(action="A", quest_id="106", note="Ends with a bar|", coords="10, 20", obj_id="7"),
+    make_step(action="A", quest_id="107", **{'class': "Mage, Rogue", 'race': "Orc"})
+]
+
+def generate(steps, optimize):
+    """Genera el código Lua de los pasos de prueba."""
+    return LuaGenerator.generate_lua(steps, "Durotar (1-12)", "The Barrens (12-XX)", "Horde",
+                                     optimize=optimize, guide_zone=GUIDE_ZONE)
+
+def test_normal_output_parses_back_to_the_steps():
+    parsed = LuaGenerator.parse_lua(generate(ROUND_TRIP_STEPS, optimize=False))
+    assert (parsed['guide_name'], parsed['next_zone'], parsed['faction']) == \
+        ("Durotar (1-12)", "The Barrens (12-XX)", "Horde")
+    assert [{field: step[field] for field in ROUND_TRIP_FIELDS} for step in parsed['steps']] == \
+        [{field: step[field] for field in ROUND_TRIP_FIELDS} for step in ROUND_TRIP_STEPS]
+
+def test_optimized_output_parses_to_the_same_steps():
+    original = generate(ROUND_TRIP_STEPS, optimize=False)
+    optimized = generate(ROUND_TRIP_STEPS, optimize=True)
+    assert LuaGenerator.semantic_steps(original, GUIDE_ZONE) == LuaGenerator.semantic_steps(optimized, GUIDE_ZONE)
+    
+    report = LuaGenerator.compare_output(original, optimized, GUIDE_ZONE)
+    assert report['equivalent']
+    assert report['saved_bytes'] > 0
+    
+    parsed = LuaGenerator.parse_lua(optimized)['steps']
+    assert parsed[1]['zone'] == "" and parsed[2]['zone'] == "The Barrens"
+    assert "|N|(45.25, 33.1)|" in optimized and "|N|--" not in optimized
+    assert parsed[4]['coords'] == "45.2, 33.1"
+    assert parsed[5]['note'] == ROUND_TRIP_STEPS[5]['note']
+    assert parsed[6]['note'] == "Ends with a bar|"
+
+def test_compare_output_detects_changed_steps():
+    original = generate(ROUND_TRIP_STEPS, optimize=False)
+    changed = [dict(step) for step in ROUND_TRIP_STEPS]
+    changed[3]['coords'] = "45.3, 33.1"
+    assert not LuaGenerator.compare_output(original, generate(changed, optimize=True), GUIDE_ZONE)['equivalent']
+    
+    # Quitar una zona distinta de la de la guía cambia el significado del paso
+    changed = [dict(step) for step in ROUND_TRIP_STEPS]
+    changed[2]['zone'] = ""
+    assert not LuaGenerator.compare_output(original, generate(changed, optimize=True), GUIDE_ZONE)['equivalent']
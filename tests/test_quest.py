@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from models.guide import Guide
+from models.quest import DerivedQuestHistory, QuestHistory
+
+def make_step(action, quest_id, name=None, coords=("", ""), quest_class=""):
+    """Crea un paso con los campos que usa el historial."""
+    return {'action': action, 'quest_name': name or f"Quest {quest_id}", 'quest_id': quest_id,
+            'coord_x': coords[0], 'coord_y': coords[1], 'class': quest_class}
+
+def rebuilt(guide):
+    """Estado derivado calculado desde cero para los pasos actuales de la guía."""
+    return DerivedQuestHistory(guide).get_all_quests()
+
+def test_quest_history_records_actions_and_suggests_the_next_one():
+    history = QuestHistory()
+    history.add_quest("1", "First", 'A', "10", "20")
+    assert history.suggest_next_action("1") == 'C'
+    history.add_quest("1", "First", 'T', "30", "40", "Mage")
+    assert history.get_all_quests()["1"] == {
+        'name': "First", 'actions_used': ['A', 'T'],
+        'coords': {'A': {'x': "10", 'y': "20"}, 'T': {'x': "30", 'y': "40"}}, 'class': "Mage"
+    }
+    assert history.get_quest_coords("1", 'T') == ("30", "40")
+    
+    # Las coordenadas fuera del mapa no se guardan
+    history.add_quest("2", "Second", 'A', "150", "20")
+    assert history.get_all_quests()["2"]['coords'] == {}
+    assert history.lookup("3", 'A') is None
+
+def test_derived_history_forgets_removed_and_edited_steps():
+    guide = Guide()
+    history = DerivedQuestHistory(guide)
+    guide.insert_steps(0, [
+        make_step("A", "1", "Old name", ("10", "20")),
+        make_step("T", "1", "New name", ("30", "40"), "Mage"),
+        make_step("A", "2")
+    ])
+    assert history.get_quest_name("1") == "New name"
+    assert history.get_quest_class("1") == "Mage"
+    assert history.get_quest_coords("1", 'T') == ("30", "40")
+    assert history.suggest_next_action("2") == 'C'
+    
+    # Al eliminar la entrega desaparecen su acción, sus coordenadas y su clase
+    guide.remove_range(1, 2)
+    assert history.get_actions("1") == {'A': 1}
+    assert history.get_quest_class("1") is None
+    assert history.get_quest_name("1") == "Old name"
+    # Sin coordenadas de entrega se usan las de aceptación
+    assert history.get_quest_coords("1", 'T') == ("10", "20")
+    
+    guide.update_step(1, make_step("N", "", "Note"))
+    assert not history.has_quest("2")
+    assert history.get_all_quests() == rebuilt(guide)
+
+def test_derived_history_follows_guide_order():
+    guide = Guide()
+    history = DerivedQuestHistory(guide)
+    guide.insert_steps(0, [make_step("A", "1", "First"), make_step("C", "1", "Second")])
+    
+    # El nombre es el del último paso en la guía, no el del último añadido
+    guide.move_range(1, 2, 0)
+    assert history.get_quest_name("1") == "First"
+    assert history.get_all_quests()["1"]['actions_used'] == ['C', 'A']
+    assert history.get_all_quests() == rebuilt(guide)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_state_matches_a_rebuild(seed):
+    rng = random.Random(seed)
+    
+    def random_step():
+        return make_step(rng.choice("ACT"), str(rng.randint(1, 6)), f"Name {rng.randint(0, 9)}",
+                         rng.choice([("", ""), ("1.5", "3"), ("20", "40")]), rng.choice(["", "Mage", "Rogue"]))
+    
+    guide = Guide()
+    history = DerivedQuestHistory(guide)
+    for _ in range(300):
+        size = len(guide.get_all_steps())
+        choice = rng.random()
+        if choice < 0.3 or size < 3:
+            guide.insert_steps(rng.randint(0, size), [random_step() for _ in range(rng.randint(1, 3))])
+        elif choice < 0.5:
+            start = rng.randrange(size)
+            guide.remove_range(start, min(size, start + rng.randint(1, 3)))
+        elif choice < 0.75:
+            start = rng.randrange(size)
+            end = min(size, start + rng.randint(1, 3))
+            guide.move_range(start, end, rng.randint(0, size - (end - start)))
+        else:
+            guide.update_step(rng.randrange(size), random_step())
+        assert history.get_all_quests() == rebuilt(guide)
+    
+    guide.clear()
+    assert history.get_all_quests() == {}
@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from controllers.guide_controller import GuideController
+from utils.quest_reference import QuestReference
+
+QUESTS = [
+    {'quest_id': "4641", 'name': "Your Place In The World", 'zone': "Durotar", 'level': "1",
+     'coord_x': "42.1", 'coord_y': "68.3"},
+    {'quest_id': "788", 'name': "Cutting Teeth", 'zone': "Durotar", 'level': "2",
+     'coord_x': "42.69", 'coord_y': "67.2"},
+    {'quest_id': "805", 'name': "Report to Sen'jin Village", 'zone': "Durotar", 'level': 300},
+    {'quest_id': "840", 'name': "Conscript of the Horde", 'zone': "The Barrens", 'level': "",
+     'coord_x': "120", 'coord_y': "10"},
+    {'quest_id': "not a number", 'name': "Ignored"},
+    {'quest_id': "788", 'name': "Cutting Teeth", 'zone': "Durotar", 'level': "3",
+     'coord_x': "42.6", 'coord_y': "67.2"}
+]
+
+@pytest.fixture
+def reference(tmp_path):
+    """Referencia construida con las misiones de prueba."""
+    filename = str(tmp_path / QuestReference.FILENAME)
+    assert QuestReference.build(QUESTS, filename) == 4
+    reference = QuestReference(filename)
+    yield reference
+    reference.close()
+
+def test_build_writes_fixed_width_records_sorted_by_id(reference):
+    assert len(reference) == 4
+    size = QuestReference.HEADER.size + 4 * QuestReference.RECORD.size
+    ids = [QuestReference.RECORD.unpack_from(reference.data, offset)[0]
+           for offset in range(QuestReference.HEADER.size, size, QuestReference.RECORD.size)]
+    assert ids == [788, 805, 840, 4641]
+    
+    # La zona repetida se guarda una sola vez
+    assert reference.data[size:].count(b"Durotar\0") == 1
+
+@pytest.mark.parametrize("quest_id", ["788", "805", "840", "4641", " 4641 ", 4641])
+def test_binary_search_finds_every_quest(reference, quest_id):
+    assert reference.get(quest_id)['quest_id'] == str(int(str(quest_id).strip()))
+
+@pytest.mark.parametrize("quest_id", ["0", "1", "787", "789", "806", "4640", "4642", "99999", "-1", "abc", "",
+                                      str(1 << 32)])
+def test_binary_search_misses(reference, quest_id):
+    assert reference.get(quest_id) is None
+    assert reference.lookup(quest_id, 'A') is None
+
+def test_records_keep_names_levels_and_coordinates(reference):
+    assert reference.get("4641") == {
+        'quest_id': "4641", 'name': "Your Place In The World", 'zone': "Durotar", 'level': 1,
+        'coord_x': "42.1", 'coord_y': "68.3"
+    }
+    # Un ID repetido conserva la última misión
+    assert (reference.get("788")['level'], reference.get("788")['coord_x']) == (3, "42.6")
+    
+    # Nivel fuera de rango, sin nivel y coordenadas ausentes o inválidas
+    assert reference.get("805")['level'] == 255
+    assert reference.get("840")['level'] is None
+    assert (reference.get("805")['coord_x'], reference.get("840")['coord_x']) == ("", "")
+    
+    # Las coordenadas solo se sugieren al aceptar la misión
+    assert reference.lookup("4641", 'A') == {'name': "Your Place In The World", 'next_action': None,
+                                             'coords': ("42.1", "68.3")}
+    assert reference.lookup("4641", 'T')['coords'] is None
+
+def test_missing_or_invalid_files_have_no_data(tmp_path):
+    assert len(QuestReference(str(tmp_path / "missing.db"))) == 0
+    
+    invalid = tmp_path / "invalid.db"
+    invalid.write_bytes(b"not a reference file")
+    assert QuestReference(str(invalid)).get("788") is None
+
+def test_bundled_reference_is_valid():
+    reference = QuestReference()
+    assert os.path.basename(reference.filename) == QuestReference.FILENAME
+    assert reference.open()
+    reference.close()
+
+def test_lookup_falls_back_to_the_reference_after_the_history(reference):
+    controller = GuideController()
+    controller.quest_reference = reference
+    controller.quest_history.add_quest("788", "Cutting Teeth (history)", 'A', "44", "68")
+    
+    # El historial tiene prioridad sobre la referencia
+    assert controller.lookup_known_quest("788", 'A')['name'] == "Cutting Teeth (history)"
+    assert controller.lookup_quest("788", 'A')['name'] == "Cutting Teeth (history)"
+    
+    # Lo que no conoce el historial se busca en la referencia
+    assert controller.lookup_known_quest("4641", 'A') is None
+    assert controller.lookup_quest("4641", 'A') == reference.lookup("4641", 'A')
+    assert controller.lookup_quest("4642", 'A') is None
+    
+    # La guía abierta también tiene prioridad sobre la referencia
+    controller.add_step({'action': "A", 'quest_name': "Your Place (guide)", 'quest_id': "4641", 'note': "",
+                         'coords': "", 'coord_x': "", 'coord_y': "", 'class': "", 'race': "", 'zone': "",
+                         'obj_id': ""})
+    assert controller.lookup_quest("4641", 'T')['name'] == "Your Place (guide)"
@@ -0,0 +1,123 @@
+import math
+import random
+
+import pytest
+
+from utils.route_optimizer import RouteOptimizer
+
+def make_step(action, quest_id, x=None, y=None, zone=""):
+    """Crea un paso con coordenadas opcionales."""
+    coords = f"{x}, {y}" if x is not None else ""
+    return {'action': action, 'quest_id': quest_id, 'coords': coords, 'zone': zone}
+
+def random_route(rng, size):
+    """
+    Crea una ruta aleatoria en la que cada misión sigue el orden A -> C -> T.
+    
+    Args:
+        rng (random.Random): Generador aleatorio
+        size (int): Número aproximado de pasos
+    
+    Returns:
+        list: Pasos de la ruta
+    """
+    pending = {}
+    steps = []
+    for _ in range(size):
+        choice = rng.random()
+        coords = (round(rng.uniform(0, 100), 1), round(rng.uniform(0, 100), 1)) if rng.random() < 0.9 else (None, None)
+        if choice < 0.08:
+            steps.append(make_step(rng.choice(RouteOptimizer.PINNED_ACTIONS), "", *coords))
+        elif choice < 0.15:
+            steps.append(make_step("N", "", *coords))
+        else:
+            # Cada misión se acepta, completa y entrega una sola vez
+            open_quests = [quest_id for quest_id, action in pending.items() if action != "T"]
+            if open_quests and rng.random() < 0.6:
+                quest_id = rng.choice(open_quests)
+            else:
+                quest_id = str(len(pending) + 1)
+            action = {None: "A", "A": "C", "C": "T"}[pending.get(quest_id)]
+            pending[quest_id] = action
+            steps.append(make_step(action, quest_id, *coords))
+    return steps
+
+def check_quest_order(steps):
+    """Comprueba que ninguna misión se completa o entrega antes de aceptarla."""
+    last_rank = {}
+    for step in steps:
+        rank = RouteOptimizer.ACTION_RANK.get(step['action'])
+        if rank is None:
+            continue
+        assert rank >= last_rank.get(step['quest_id'], 0)
+        last_rank[step['quest_id']] = rank
+
+@pytest.mark.parametrize("seed", range(40))
+def test_optimize_respects_precedence_and_pinned_steps(seed):
+    rng = random.Random(seed)
+    steps = random_route(rng, rng.randint(3, 40))
+    result, before, after = RouteOptimizer.optimize(steps, (50, 50))
+    
+    # Mismos pasos, nunca una ruta peor
+    assert sorted(map(id, result)) == sorted(map(id, steps))
+    assert after <= before + 1e-9
+    assert math.isclose(after, RouteOptimizer.route_distance(result, (50, 50)))
+    
+    # Los pasos fijos conservan su posición
+    for index, step in enumerate(steps):
+        if step['action'] in RouteOptimizer.PINNED_ACTIONS:
+            assert result[index] is step
+    
+    check_quest_order(result)
+
+def test_precedence_beats_distance():
+    # Entregar la misión 1 junto al inicio sería más corto, pero antes hay que aceptarla
+    steps = [
+        make_step("A", "2", 90, 90),
+        make_step("A", "1", 80, 80),
+        make_step("T", "1", 11, 11),
+        make_step("T", "2", 12, 12)
+    ]
+    result, before, after = RouteOptimizer.optimize(steps, (10, 10))
+    check_quest_order(result)
+    assert result.index(steps[1]) < result.index(steps[2])
+    assert result.index(steps[0]) < result.index(steps[3])
+    assert after <= before
+
+def test_steps_do_not_cross_zone_changes_or_fast_travel():
+    steps = [
+        make_step("A", "1", 90, 90, "Durotar"),
+        make_step("A", "2", 50, 50, "Durotar"),
+        make_step("A", "3", 10, 10, "Durotar"),
+        make_step("A", "4", 90, 90, "The Barrens"),
+        make_step("A", "5", 10, 10, "The Barrens"),
+        make_step("A", "6", 50, 50, "The Barrens"),
+        make_step("H", "", 50, 50),
+        make_step("A", "7", 90, 90),
+        make_step("A", "8", 10, 10),
+        make_step("A", "9", 50, 50)
+    ]
+    result, before, after = RouteOptimizer.optimize(steps, (10, 10))
+    assert after < before
+    assert result[:3] == [steps[2], steps[1], steps[0]]
+    assert {id(step) for step in result[3:6]} == {id(step) for step in steps[3:6]}
+    assert result[6] is steps[6]
+    assert {id(step) for step in result[7:]} == {id(step) for step in steps[7:]}
+
+def test_steps_without_coordinates_travel_with_the_previous_step():
+    steps = [
+        make_step("N", ""),
+        make_step("A", "1", 90, 90),
+        make_step("N", ""),
+        make_step("A", "2", 50, 50),
+        make_step("A", "3", 10, 10)
+    ]
+    result, _, _ = RouteOptimizer.optimize(steps, (10, 10))
+    assert [step['quest_id'] for step in result] == ["", "3", "2", "1", ""]
+    assert result[0] is steps[0] and result[4] is steps[2]
+
+def test_route_distance_skips_fast_travel_legs():
+    steps = [make_step("A", "1", 0, 0), make_step("A", "2", 3, 4), make_step("F", "", 90, 90),
+             make_step("A", "3", 90, 94)]
+    assert RouteOptimizer.route_distance(steps) == pytest.approx(9.0)
+    assert RouteOptimizer.route_distance(steps, (0, 4)) == pytest.approx(13.0)
@@ -0,0 +1,85 @@
+import pytest
+
+from controllers.guide_controller import GuideController, GuideError
+from utils.step_importer import StepImporter
+
+TABLE = (
+    "Action,Quest Name,ID,X,Y,Class,Race,Zone,Notes,Extra\n"
+    "A,Your Place In The World,4641,42.5,68.3,,,Durotar,\"note, with comma\",zz\n"
+    "c,Cutting Teeth,788,,,warrior,orc,durotar,,\n"
+    "T,Bad coordinates,1,200,5,,,,,\n"
+    "Q,Bad action,2,,,,,,,\n"
+    ",,,,,,,,,\n"
+    "T,Cutting Teeth,788,44.0,70.1,,,,,\n"
+    "A,Unknown zone,3,,,,,Atlantis,,\n"
+)
+
+def write_table(tmp_path, name, text):
+    """Escribe una tabla de prueba y devuelve su ruta."""
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def test_read_steps_maps_normalizes_and_validates(tmp_path):
+    result = StepImporter().read_steps(write_table(tmp_path, "steps.csv", TABLE))
+    
+    assert result['ignored_columns'] == ["Extra"]
+    assert result['errors'] == [
+        "Line 4: Coordinates must be numbers between 0 and 100",
+        "Line 5: Unknown action 'Q'",
+        "Line 8: Unknown zone 'Atlantis'"
+    ]
+    first, second, third = result['steps']
+    assert first == {
+        'action': "A", 'quest_name': "Your Place In The World", 'quest_id': "4641", 'note': "note, with comma",
+        'coords': "42.5, 68.3", 'coord_x': "42.5", 'coord_y': "68.3", 'class': "", 'race': "",
+        'zone': "Durotar", 'obj_id': ""
+    }
+    # Los valores se normalizan a la forma de las listas
+    assert (second['action'], second['class'], second['race'], second['zone']) == ("C", "Warrior", "Orc", "Durotar")
+    assert (third['action'], third['coords']) == ("T", "44.0, 70.1")
+
+def test_tsv_and_combined_coordinates(tmp_path):
+    text = "type\tname\tqid\tcoordinates\tobject id\nR\tRun to Razor Hill\t\t52.2, 43.1\t77\n"
+    steps = StepImporter().read_steps(write_table(tmp_path, "steps.tsv", text))['steps']
+    assert [(step['action'], step['coord_x'], step['coord_y'], step['obj_id']) for step in steps] == \
+        [("R", "52.2", "43.1", "77")]
+    
+    # El separador también se detecta en archivos con otra extensión
+    text = "Action;Quest Name;Coords\nA;Semicolons;10, 20\n"
+    assert StepImporter().read_steps(write_table(tmp_path, "steps.txt", text))['steps'][0]['coords'] == "10, 20"
+
+def test_explicit_mapping_replaces_detection(tmp_path):
+    text = "What,Title,Quest\nA,Sarkoth,790\n"
+    path = write_table(tmp_path, "steps.csv", text)
+    with pytest.raises(ValueError):
+        StepImporter().read_steps(path)
+    
+    result = StepImporter().read_steps(path, mapping={'what': "action", 'Title': "quest_name", 'QUEST': "quest_id"})
+    assert [(step['action'], step['quest_name'], step['quest_id']) for step in result['steps']] == \
+        [("A", "Sarkoth", "790")]
+    assert result['ignored_columns'] == []
+
+def test_duplicate_headers_keep_the_first_column():
+    assert StepImporter.map_columns(["Quest Name", "name", "Quest-Name", "QID"]) == \
+        ["quest_name", None, None, "quest_id"]
+
+def test_controller_imports_the_table_in_one_batch(tmp_path):
+    path = write_table(tmp_path, "steps.csv", TABLE)
+    with pytest.raises(GuideError):
+        GuideController.read_step_table(write_table(tmp_path, "empty.csv", ""))
+    
+    steps = GuideController.read_step_table(path)['steps']
+    controller = GuideController()
+    controller.add_step({'action': "N", 'quest_name': "Start", 'quest_id': ""})
+    batches = []
+    history_batches = []
+    controller.guide.subscribe(batches.append)
+    controller.quest_history.subscribe(history_batches.append)
+    
+    assert controller.import_steps(steps, index=0) == 0
+    assert [step['quest_name'] for step in controller.guide.get_all_steps()] == \
+        ["Your Place In The World", "Cutting Teeth", "Cutting Teeth", "Start"]
+    assert [[event['type'] for event in batch] for batch in batches] == [["inserted"]]
+    assert len(history_batches) == 1
+    assert controller.quest_history.get_all_quests()["788"]['actions_used'] == ["C", "T"]
@@ -0,0 +1,178 @@
+import random
+
+import pytest
+
+from models.step_list import FrozenStepList, StepList
+
+# Operaciones aleatorias por prueba diferencial
+OPERATIONS = 3000
+
+def make_step(number):
+    """Crea un paso distinto por identidad (los pasos se buscan por id())."""
+    return {'action': "A", 'quest_id': str(number)}
+
+def check_same(steps, expected):
+    """
+    Comprueba que una StepList se comporta como la lista de referencia.
+    
+    Args:
+        steps (FrozenStepList): Secuencia a comprobar
+        expected (list): Lista de Python con los mismos pasos
+    """
+    assert len(steps) == len(expected)
+    assert bool(steps) == bool(expected)
+    assert list(steps) == expected
+    assert all(a is b for a, b in zip(steps, expected))
+    if expected:
+        assert steps[0] is expected[0]
+        assert steps[-1] is expected[-1]
+        start = len(expected) // 3
+        assert steps[start:start + 5] == expected[start:start + 5]
+
+def apply_random_operation(rng, steps, expected, counter):
+    """
+    Aplica la misma mutación aleatoria a una StepList y a una lista.
+    
+    Args:
+        rng (random.Random): Generador aleatorio
+        steps (StepList): Secuencia a comprobar
+        expected (list): Lista de referencia
+        counter (list): Contador de pasos creados (se incrementa)
+    """
+    def new_steps(count):
+        created = [make_step(counter[0] + offset) for offset in range(count)]
+        counter[0] += count
+        return created
+    
+    size = len(expected)
+    operation = rng.choice(("append", "extend", "insert", "insert_many", "pop", "delete_range",
+                            "move", "setitem", "delitem", "set_slice", "del_slice"))
+    if operation in ("pop", "delete_range", "move", "setitem", "delitem", "del_slice") and not size:
+        operation = "insert_many"
+    
+    if operation == "append":
+        step = new_steps(1)[0]
+        steps.append(step)
+        expected.append(step)
+    elif operation == "extend":
+        block = new_steps(rng.randint(0, 4))
+        steps.extend(block)
+        expected.extend(block)
+    elif operation == "insert":
+        index = rng.randint(0, size)
+        step = new_steps(1)[0]
+        steps.insert(index, step)
+        expected.insert(index, step)
+    elif operation == "insert_many":
+        index = rng.randint(0, size)
+        block = new_steps(rng.randint(1, 8))
+        steps.insert_many(index, block)
+        expected[index:index] = block
+    elif operation == "pop":
+        index = rng.randint(-size, size - 1)
+        assert steps.pop(index) is expected.pop(index)
+    elif operation == "delete_range":
+        start = rng.randint(0, size - 1)
+        end = rng.randint(start, min(size, start + 6))
+        removed = steps.delete_range(start, end)
+        assert removed == expected[start:end]
+        del expected[start:end]
+    elif operation == "move":
+        start = rng.randint(0, size - 1)
+        end = rng.randint(start + 1, min(size, start + 6))
+        target = rng.randint(0, size - (end - start))
+        steps.move(start, end, target)
+        block = expected[start:end]
+        del expected[start:end]
+        expected[target:target] = block
+    elif operation == "setitem":
+        index = rng.randint(-size, size - 1)
+        step = new_steps(1)[0]
+        steps[index] = step
+        expected[index] = step
+    elif operation == "delitem":
+        index = rng.randint(-size, size - 1)
+        del steps[index]
+        del expected[index]
+    elif operation == "set_slice":
+        start = rng.randint(0, size)
+        stop = rng.randint(start, min(size, start + 4))
+        block = new_steps(rng.randint(0, 4))
+        steps[start:stop] = block
+        expected[start:stop] = block
+    else:
+        start = rng.randint(0, size - 1)
+        stop = rng.randint(start, min(size, start + 4))
+        del steps[start:stop]
+        del expected[start:stop]
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_list(seed):
+    rng = random.Random(seed)
+    counter = [0]
+    initial = [make_step(number) for number in range(rng.randint(0, 20))]
+    counter[0] = len(initial)
+    steps = StepList(initial)
+    expected = list(initial)
+    
+    for _ in range(OPERATIONS):
+        apply_random_operation(rng, steps, expected, counter)
+        check_same(steps, expected)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_stable_ids_follow_steps(seed):
+    rng = random.Random(seed)
+    counter = [0]
+    steps = StepList()
+    expected = []
+    
+    for _ in range(OPERATIONS):
+        apply_random_operation(rng, steps, expected, counter)
+        if not expected:
+            continue
+        
+        index = rng.randrange(len(expected))
+        step_id = steps.id_at(index)
+        assert steps.index_of_id(step_id) == index
+        assert steps.get_by_id(step_id) is expected[index]
+        assert steps.index_of_step(expected[index]) == index
+    
+    # Los identificadores son únicos y se conservan al mover bloques
+    ids = [steps.id_at(index) for index in range(len(steps))]
+    assert len(set(ids)) == len(ids)
+    if len(steps) > 2:
+        steps.move(0, 2, len(steps) - 2)
+        assert [steps.id_at(index) for index in range(len(steps))] == ids[2:] + ids[:2]
+    assert steps.index_of_step(make_step(-1)) is None
+
+@pytest.mark.parametrize("seed", range(4))
+def test_snapshots_are_unaffected_by_later_mutations(seed):
+    rng = random.Random(seed)
+    counter = [0]
+    steps = StepList()
+    expected = []
+    snapshots = []
+    
+    for operation in range(OPERATIONS):
+        apply_random_operation(rng, steps, expected, counter)
+        if operation % 25 == 0:
+            snapshots.append((steps.snapshot(), list(expected)))
+    
+    check_same(steps, expected)
+    for snapshot, contents in snapshots:
+        assert isinstance(snapshot, FrozenStepList)
+        check_same(snapshot, contents)
+
+def test_snapshot_is_read_only():
+    snapshot = StepList([make_step(1), make_step(2)]).snapshot()
+    assert not hasattr(snapshot, "insert_many")
+    with pytest.raises(TypeError):
+        snapshot[0] = make_step(3)
+
+def test_rejects_extended_slices():
+    steps = StepList([make_step(number) for number in range(6)])
+    assert steps[::2] == list(steps)[::2]
+    with pytest.raises(ValueError):
+        steps[::2] = [make_step(7), make_step(8), make_step(9)]
+    with pytest.raises(ValueError):
+        del steps[::2]
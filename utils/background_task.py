@@ -0,0 +1,271 @@
+import json
+import os
+import threading
+from collections.abc import Sequence
+
+class TaskCancelled(Exception):
+    """Se lanza dentro de una tarea cuando el usuario la cancela."""
+
+class BackgroundTask:
+    """
+    Operación de archivo ejecutada en un hilo de trabajo.
+    
+    El hilo solo escribe el progreso y el resultado en atributos simples; la
+    interfaz los consulta periódicamente (con `after`) y nunca se toca Tk
+    desde el hilo de trabajo.
+    """
+    
+    # Tamaño de los bloques leídos o escritos entre comprobaciones de cancelación
+    CHUNK_SIZE = 256 * 1024
+    
+    # Cerrojos por archivo para serializar escrituras concurrentes del mismo archivo
+    _file_locks = {}
+    _file_locks_guard = threading.Lock()
+    
+    def __init__(self, work, description=""):
+        """
+        Inicializa la tarea.
+        
+        Args:
+            work: Función que recibe la tarea y devuelve el resultado
+            description (str, optional): Texto descriptivo para la interfaz. Defaults to "".
+        """
+        self.work = work
+        self.description = description
+        
+        # Progreso: cantidad procesada, total (None si se desconoce) y unidad
+        self.done = 0
+        self.total = None
+        self.unit = "bytes"
+        
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self.finished = False
+        self.cancel_event = threading.Event()
+        self.thread = None
+    
+    def start(self):
+        """Lanza la tarea en un hilo de trabajo."""
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def cancel(self):
+        """Solicita la cancelación; la tarea se detiene en el siguiente bloque."""
+        self.cancel_event.set()
+    
+    def report(self, done, total=None, unit=None):
+        """
+        Actualiza el progreso y comprueba la cancelación.
+        
+        Args:
+            done (int): Cantidad procesada
+            total (int, optional): Cantidad total. Defaults to None.
+            unit (str, optional): Unidad del progreso. Defaults to None.
+        
+        Raises:
+            TaskCancelled: Si se solicitó la cancelación
+        """
+        self.done = done
+        if total is not None:
+            self.total = total
+        if unit is not None:
+            self.unit = unit
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+    
+    def _run(self):
+        """Ejecuta el trabajo y guarda el resultado o el error."""
+        try:
+            self.result = self.work(self)
+        except TaskCancelled:
+            self.cancelled = True
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = True
+    
+    @staticmethod
+    def json_default(value):
+        """
+        Convierte a JSON los valores que json no reconoce por sí mismo.
+        
+        Las instantáneas de la guía (FrozenStepList) se codifican como listas.
+        
+        Args:
+            value: Valor que json no sabe codificar
+        
+        Returns:
+            list: Valor equivalente serializable
+        
+        Raises:
+            TypeError: Si el valor no es una secuencia
+        """
+        if isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
+            return list(value)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    
+    @staticmethod
+    def get_file_lock(filename):
+        """
+        Obtiene el cerrojo asociado a un archivo.
+        
+        Args:
+            filename (str): Ruta del archivo
+        
+        Returns:
+            threading.Lock: Cerrojo compartido por todas las escrituras de ese archivo
+        """
+        key = os.path.abspath(filename)
+        with BackgroundTask._file_locks_guard:
+            return BackgroundTask._file_locks.setdefault(key, threading.Lock())
+    
+    def write_chunks(self, filename, chunks):
+        """
+        Escribe un archivo a partir de fragmentos de texto, de forma atómica.
+        
+        Si se cancela, el archivo original queda intacto.
+        
+        Args:
+            filename (str): Ruta del archivo destino
+            chunks (iterable): Fragmentos de texto
+        """
+        temp_filename = f"{filename}.tmp"
+        with BackgroundTask.get_file_lock(filename):
+            try:
+                written = 0
+                pending = []
+                pending_size = 0
+                with open(temp_filename, 'w', encoding='utf-8') as f:
+                    for chunk in chunks:
+                        pending.append(chunk)
+                        pending_size += len(chunk)
+                        if pending_size >= self.CHUNK_SIZE:
+                            f.write("".join(pending))
+                            written += pending_size
+                            pending, pending_size = [], 0
+                            self.report(written)
+                    f.write("".join(pending))
+                    written += pending_size
+                self.report(written)
+                os.replace(temp_filename, filename)
+            except BaseException:
+                if os.path.exists(temp_filename):
+                    os.remove(temp_filename)
+                raise
+    
+    def write_text(self, filename, text):
+        """
+        Escribe un archivo de texto por bloques informando del progreso.
+        
+        Args:
+            filename (str): Ruta del archivo destino
+            text (str): Contenido
+        """
+        self.total = len(text)
+        self.write_chunks(filename, (text[i:i + self.CHUNK_SIZE] for i in range(0, len(text), self.CHUNK_SIZE)))
+    
+    def write_json(self, filename, data, indent=2):
+        """
+        Codifica y escribe un archivo JSON de forma incremental.
+        
+        Args:
+            filename (str): Ruta del archivo destino
+            data: Datos serializables a JSON
+            indent (int, optional): Sangría del JSON. Defaults to 2.
+        """
+        self.write_chunks(filename, json.JSONEncoder(indent=indent, default=BackgroundTask.json_default).iterencode(data))
+    
+    def read_json(self, filename):
+        """
+        Lee un archivo JSON por bloques informando del progreso.
+        
+        Args:
+            filename (str): Ruta del archivo
+        
+        Returns:
+            Datos del archivo JSON
+        """
+        total = os.path.getsize(filename)
+        self.report(0, total)
+        parts = []
+        read = 0
+        with open(filename, 'rb') as f:
+            while True:
+                chunk = f.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                parts.append(chunk)
+                read += len(chunk)
+                self.report(read)
+        return json.loads(b"".join(parts).decode('utf-8'))
+
+class BackgroundWriter:
+    """
+    Escritor en un hilo de trabajo propio que agrupa las escrituras pendientes.
+    
+    submit() no bloquea: entrega los datos al hilo y vuelve. Si llegan datos
+    nuevos mientras se escribe, solo se conserva el último envío pendiente,
+    de modo que una ráfaga de ediciones provoca como mucho una escritura en
+    curso y otra pendiente. Los datos deben ser instantáneas que no cambien
+    mientras se escriben (ver Guide.snapshot y QuestHistory.snapshot).
+    """
+    
+    def __init__(self, write):
+        """
+        Inicializa el escritor.
+        
+        Args:
+            write: Función que recibe los datos y los escribe (se llama en el hilo de trabajo)
+        """
+        self.write = write
+        self._condition = threading.Condition()
+        self._pending = None
+        self._has_pending = False
+        self._busy = False
+        self._thread = None
+    
+    def submit(self, data):
+        """
+        Programa la escritura de unos datos, sustituyendo a los pendientes.
+        
+        Args:
+            data: Datos a escribir
+        """
+        with self._condition:
+            self._pending = data
+            self._has_pending = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+    
+    def flush(self, timeout=None):
+        """
+        Espera a que terminen la escritura en curso y la pendiente.
+        
+        Args:
+            timeout (float, optional): Tiempo máximo de espera en segundos. Defaults to None.
+        
+        Returns:
+            bool: True si no queda nada por escribir
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._has_pending and not self._busy, timeout)
+    
+    def _run(self):
+        """Bucle del hilo de trabajo: escribe el último envío pendiente."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._has_pending)
+                data, self._pending = self._pending, None
+                self._has_pending = False
+                self._busy = True
+            try:
+                self.write(data)
+            except Exception as e:
+                print(f"Error en escritura en segundo plano: {str(e)}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
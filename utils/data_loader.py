@@ -61,5 +61,16 @@ class DataLoader:
     
     @staticmethod
     def load_race_list():
-        """Carga la lista de razas desde el archivo JSON."""
-        return DataLoader.load_json_resource('race_list.json')
\ No newline at end of file
+        """Carga la lista de razas (con la opción vacía) desde el archivo JSON."""
+        races_by_faction = DataLoader.load_races_by_faction()
+        if not races_by_faction:
+            return [""]
+        return [""] + [race for races in races_by_faction.values() for race in races]
+    
+    @staticmethod
+    def load_races_by_faction():
+        """Carga las razas jugables de cada facción desde el archivo JSON."""
+        data = DataLoader.load_json_resource('race_list.json')
+        if not isinstance(data, dict):
+            return {}
+        return {faction: tuple(races) for faction, races in data.items()}
\ No newline at end of file
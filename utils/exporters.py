@@ -0,0 +1,288 @@
+import csv
+import html
+import os
+from abc import ABC, abstractmethod
+
+from utils.lua_generator import LuaGenerator
+
+class GuideExporter(ABC):
+    """
+    Formato de exportación de una guía.
+    
+    Cada exportador escribe de forma incremental en su propio flujo de texto:
+    `begin` con los metadatos, `write_step` por cada paso y `end` al terminar.
+    Varios exportadores pueden alimentarse con un único recorrido de los pasos
+    (ver ExportPipeline). Las subclases deben implementar `write_step`.
+    """
+    
+    # Clave del formato y extensión del archivo
+    name = ""
+    extension = ""
+    
+    # Columnas de los formatos tabulares
+    COLUMNS = (
+        ("action", "Action"), ("quest_name", "Quest Name"), ("quest_id", "QID"), ("note", "Note"),
+        ("coords", "Coords"), ("class", "Class"), ("race", "Race"), ("zone", "Zone"), ("obj_id", "ObjID")
+    )
+    
+    def __init__(self, stream):
+        """
+        Inicializa el exportador.
+        
+        Args:
+            stream: Flujo de texto donde se escribe la salida
+        """
+        self.stream = stream
+    
+    def begin(self, metadata):
+        """
+        Escribe el inicio del documento.
+        
+        Args:
+            metadata (dict): Metadatos de la guía (zone, level_range, next_zone, faction)
+        """
+    
+    @abstractmethod
+    def write_step(self, index, step):
+        """
+        Escribe un paso.
+        
+        Args:
+            index (int): Índice del paso
+            step (dict): Datos del paso
+        """
+    
+    def end(self):
+        """Escribe el final del documento."""
+    
+    @staticmethod
+    def get_title(metadata):
+        """
+        Obtiene el título visible de la guía.
+        
+        Args:
+            metadata (dict): Metadatos de la guía
+        
+        Returns:
+            str: Título de la guía
+        """
+        guide_name, _ = LuaGenerator.get_guide_names(
+            metadata.get("zone", ""), metadata.get("level_range", ""), metadata.get("next_zone", "")
+        )
+        return guide_name
+
+class LuaExporter(GuideExporter):
+    """Exportador al formato Lua del addon (mismo resultado que LuaGenerator.generate_lua)."""
+    
+    name = "lua"
+    extension = ".lua"
+    
+    def __init__(self, stream, optimize=False):
+        """
+        Inicializa el exportador Lua.
+        
+        Args:
+            stream: Flujo de texto donde se escribe la salida
+            optimize (bool, optional): Generar la salida reducida. Defaults to False.
+        """
+        super().__init__(stream)
+        self.optimize = optimize
+        self.guide_zone = ""
+    
+    def begin(self, metadata):
+        """Escribe la cabecera RegisterGuide."""
+        self.guide_zone = metadata.get("zone", "")
+        guide_name, next_zone_name = LuaGenerator.get_guide_names(
+            self.guide_zone, metadata.get("level_range", ""), metadata.get("next_zone", "")
+        )
+        self.stream.write(LuaGenerator.format_header(guide_name, next_zone_name, metadata.get("faction", "Horde")))
+    
+    def write_step(self, index, step):
+        """Escribe la línea Lua del paso."""
+        if self.optimize:
+            line = LuaGenerator.format_step(LuaGenerator.optimize_step(step, self.guide_zone), True)
+        else:
+            line = LuaGenerator.format_step(step)
+        self.stream.write(line + "\n")
+    
+    def end(self):
+        """Cierra el bloque de pasos y la función de registro."""
+        self.stream.write(LuaGenerator.FOOTER)
+
+class CsvExporter(GuideExporter):
+    """Exportador a CSV para revisar la guía en una hoja de cálculo."""
+    
+    name = "csv"
+    extension = ".csv"
+    
+    def __init__(self, stream):
+        """Inicializa el escritor CSV sobre el flujo."""
+        super().__init__(stream)
+        self.writer = csv.writer(stream)
+    
+    def begin(self, metadata):
+        """Escribe la fila de cabeceras."""
+        self.writer.writerow(["#"] + [label for _, label in self.COLUMNS])
+    
+    def write_step(self, index, step):
+        """Escribe la fila del paso."""
+        self.writer.writerow([index + 1] + [step.get(field, "") for field, _ in self.COLUMNS])
+
+class MarkdownExporter(GuideExporter):
+    """Exportador a una tabla Markdown."""
+    
+    name = "md"
+    extension = ".md"
+    
+    def begin(self, metadata):
+        """Escribe el título y la cabecera de la tabla."""
+        self.stream.write(f"# {self.get_title(metadata)}\n\n")
+        if metadata.get("faction"):
+            self.stream.write(f"Faction: {metadata['faction']}\n\n")
+        self.stream.write("| # | " + " | ".join(label for _, label in self.COLUMNS) + " |\n")
+        self.stream.write("|---|" + "---|" * len(self.COLUMNS) + "\n")
+    
+    def write_step(self, index, step):
+        """Escribe la fila del paso."""
+        cells = [self.escape(step.get(field, "")) for field, _ in self.COLUMNS]
+        self.stream.write(f"| {index + 1} | " + " | ".join(cells) + " |\n")
+    
+    @staticmethod
+    def escape(value):
+        """Escapa el texto de una celda Markdown."""
+        return str(value or "").replace("\\", "\\\\").replace("|", "\\|").replace("\n", " ")
+
+class HtmlExporter(GuideExporter):
+    """Exportador a una página HTML con la tabla de pasos."""
+    
+    name = "html"
+    extension = ".html"
+    
+    def begin(self, metadata):
+        """Escribe el inicio de la página y la cabecera de la tabla."""
+        title = html.escape(self.get_title(metadata))
+        self.stream.write(
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{title}</title>\n</head>\n<body>\n<h1>{title}</h1>\n"
+        )
+        if metadata.get("faction"):
+            self.stream.write(f"<p>Faction: {html.escape(metadata['faction'])}</p>\n")
+        self.stream.write("<table>\n<tr><th>#</th>"
+                          + "".join(f"<th>{label}</th>" for _, label in self.COLUMNS) + "</tr>\n")
+    
+    def write_step(self, index, step):
+        """Escribe la fila del paso."""
+        cells = "".join(f"<td>{html.escape(str(step.get(field, '') or ''))}</td>" for field, _ in self.COLUMNS)
+        self.stream.write(f"<tr><td>{index + 1}</td>{cells}</tr>\n")
+    
+    def end(self):
+        """Cierra la tabla y la página."""
+        self.stream.write("</table>\n</body>\n</html>\n")
+
+class ExportPipeline:
+    """Alimenta varios exportadores con un único recorrido de los pasos."""
+    
+    # Formatos disponibles: clave -> clase del exportador
+    EXPORTERS = {exporter.name: exporter for exporter in (LuaExporter, CsvExporter, MarkdownExporter, HtmlExporter)}
+    
+    # Pasos entre informes de progreso
+    PROGRESS_INTERVAL = 500
+    
+    @staticmethod
+    def register_exporter(exporter_class):
+        """
+        Registra un formato de exportación adicional.
+        
+        Args:
+            exporter_class (type): Subclase de GuideExporter con `name` y `extension`
+        """
+        ExportPipeline.EXPORTERS[exporter_class.name] = exporter_class
+    
+    @staticmethod
+    def run(steps, metadata, exporters, task=None):
+        """
+        Recorre los pasos una sola vez y los entrega a todos los exportadores.
+        
+        Args:
+            steps (iterable): Pasos de la guía
+            metadata (dict): Metadatos de la guía
+            exporters (list): Instancias de GuideExporter
+            task (BackgroundTask, optional): Tarea para informar del progreso. Defaults to None.
+        
+        Returns:
+            int: Número de pasos exportados
+        """
+        total = len(steps) if hasattr(steps, '__len__') else None
+        for exporter in exporters:
+            exporter.begin(metadata)
+        
+        count = 0
+        for index, step in enumerate(steps):
+            for exporter in exporters:
+                exporter.write_step(index, step)
+            count += 1
+            if task is not None and count % ExportPipeline.PROGRESS_INTERVAL == 0:
+                task.report(count, total, "steps")
+        
+        for exporter in exporters:
+            exporter.end()
+        if task is not None:
+            task.report(count, total, "steps")
+        return count
+    
+    @staticmethod
+    def export_to_files(steps, metadata, formats, directory, base_name, optimize=False, task=None):
+        """
+        Exporta una guía a varios formatos, cada uno en su archivo, con un solo recorrido.
+        
+        Cada formato se escribe en un archivo temporal que sustituye al destino
+        solo cuando todos han terminado; si algo falla, los archivos existentes
+        quedan intactos.
+        
+        Args:
+            steps (iterable): Pasos de la guía
+            metadata (dict): Metadatos de la guía
+            formats (list): Claves de los formatos (por ejemplo, ["lua", "csv"])
+            directory (str): Directorio de salida
+            base_name (str): Nombre de los archivos sin extensión
+            optimize (bool, optional): Salida Lua reducida. Defaults to False.
+            task (BackgroundTask, optional): Tarea para informar del progreso. Defaults to None.
+        
+        Returns:
+            list: Rutas de los archivos escritos
+        
+        Raises:
+            ValueError: Si algún formato no existe
+        """
+        unknown = [name for name in formats if name not in ExportPipeline.EXPORTERS]
+        if unknown:
+            raise ValueError(f"Unknown export format: {', '.join(unknown)}")
+        
+        streams = []
+        exporters = []
+        filenames = []
+        try:
+            for name in formats:
+                exporter_class = ExportPipeline.EXPORTERS[name]
+                filename = os.path.join(directory, base_name + exporter_class.extension)
+                filenames.append(filename)
+                # newline="" para que el módulo csv controle los saltos de línea
+                stream = open(f"{filename}.tmp", 'w', encoding='utf-8', newline="" if name == "csv" else None)
+                streams.append(stream)
+                if exporter_class is LuaExporter:
+                    exporters.append(exporter_class(stream, optimize=optimize))
+                else:
+                    exporters.append(exporter_class(stream))
+            
+            ExportPipeline.run(steps, metadata, exporters, task)
+            for stream in streams:
+                stream.close()
+            for filename in filenames:
+                os.replace(f"{filename}.tmp", filename)
+        except BaseException:
+            for stream, filename in zip(streams, filenames):
+                stream.close()
+                if os.path.exists(f"{filename}.tmp"):
+                    os.remove(f"{filename}.tmp")
+            raise
+        return filenames
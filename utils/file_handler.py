@@ -1,11 +1,20 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from tkinter import filedialog, messagebox
+
+from models.level_index import LevelIndex
+from utils.background_task import BackgroundTask
 
 class FileHandler:
     """Clase para manejar operaciones de archivos."""
     
+    # Nombre del manifiesto de autoguardados dentro del directorio de autoguardado
+    AUTOSAVE_MANIFEST = "autosave_manifest.json"
+    
+    # Índice de rangos de niveles guardado junto a las guías de una biblioteca
+    LEVEL_INDEX_FILE = ".level_index.json"
+    
     @staticmethod
     def get_autosave_dir():
         """
@@ -25,12 +34,205 @@ class FileHandler:
         return autosave_dir
     
     @staticmethod
-    def autosave(guide_data):
+    def get_manifest_path():
+        """
+        Obtiene la ruta al manifiesto de autoguardados.
+        
+        Returns:
+            str: Ruta al archivo de manifiesto
+        """
+        return os.path.join(FileHandler.get_autosave_dir(), FileHandler.AUTOSAVE_MANIFEST)
+    
+    @staticmethod
+    def write_json_atomic(filename, data, indent=2):
+        """
+        Escribe un archivo JSON de forma atómica (archivo temporal + reemplazo).
+        
+        Args:
+            filename (str): Ruta del archivo destino
+            data: Datos serializables a JSON
+            indent (int, optional): Sangría del JSON. Defaults to 2.
+        """
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, default=BackgroundTask.json_default)
+        os.replace(temp_filename, filename)
+    
+    @staticmethod
+    def write_text_atomic(filename, text):
         """
-        Guarda automáticamente el estado actual en un archivo temporal.
+        Escribe un archivo de texto de forma atómica (archivo temporal + reemplazo).
+        
+        Args:
+            filename (str): Ruta del archivo destino
+            text (str): Contenido del archivo
+        """
+        temp_filename = f"{filename}.tmp"
+        try:
+            with open(temp_filename, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            # No dejar el temporal a medio escribir
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+    
+    @staticmethod
+    def read_autosave_manifest():
+        """
+        Lee el manifiesto de autoguardados.
+        
+        Returns:
+            dict: Manifiesto con las claves 'latest' y 'entries'
+        """
+        try:
+            with open(FileHandler.get_manifest_path(), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if isinstance(manifest, dict) and isinstance(manifest.get('entries'), dict):
+                return manifest
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        return {'latest': None, 'entries': {}}
+    
+    @staticmethod
+    def build_manifest_entry(filename, guide_data, size):
+        """
+        Construye la entrada del manifiesto para un autoguardado.
+        
+        Args:
+            filename (str): Nombre del archivo de autoguardado (sin la ruta)
+            guide_data (dict): Datos de la guía guardada
+            size (int): Tamaño del archivo en bytes
+            
+        Returns:
+            dict: Entrada con archivo, nombre de guía, timestamp, número de pasos y tamaño
+        """
+        metadata = guide_data.get('metadata', {})
+        if metadata.get('zone') and metadata.get('level_range'):
+            guide_name = f"{metadata['zone']} ({metadata['level_range']})"
+        else:
+            guide_name = "Custom Guide"
+        
+        return {
+            'file': filename,
+            'guide_name': guide_name,
+            'timestamp': guide_data.get('timestamp', ''),
+            'steps': len(guide_data.get('steps', [])),
+            'size': size
+        }
+    
+    @staticmethod
+    def update_autosave_manifest(filename, guide_data, size):
+        """
+        Registra un autoguardado en el manifiesto y lo marca como el más reciente.
+        
+        Args:
+            filename (str): Nombre del archivo de autoguardado (sin la ruta)
+            guide_data (dict): Datos de la guía guardada
+            size (int): Tamaño del archivo en bytes
+        """
+        manifest = FileHandler.read_autosave_manifest()
+        manifest['entries'][filename] = FileHandler.build_manifest_entry(filename, guide_data, size)
+        manifest['latest'] = filename
+        FileHandler.write_json_atomic(FileHandler.get_manifest_path(), manifest)
+    
+    @staticmethod
+    def rebuild_autosave_manifest():
+        """
+        Reconstruye el manifiesto recorriendo el directorio de autoguardado.
+        Solo se usa cuando el manifiesto no existe o está desactualizado.
+        
+        Returns:
+            dict: Manifiesto reconstruido
+        """
+        autosave_dir = FileHandler.get_autosave_dir()
+        manifest = {'latest': None, 'entries': {}}
+        latest_mtime = None
+        
+        for filename in os.listdir(autosave_dir):
+            if not filename.endswith('.autosave.json'):
+                continue
+            path = os.path.join(autosave_dir, filename)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    guide_data = json.load(f)
+                stat = os.stat(path)
+            except (OSError, json.JSONDecodeError):
+                continue
+            
+            manifest['entries'][filename] = FileHandler.build_manifest_entry(filename, guide_data, stat.st_size)
+            if latest_mtime is None or stat.st_mtime > latest_mtime:
+                latest_mtime = stat.st_mtime
+                manifest['latest'] = filename
+        
+        try:
+            FileHandler.write_json_atomic(FileHandler.get_manifest_path(), manifest)
+        except Exception as e:
+            print(f"Error al reconstruir el manifiesto de autoguardado: {str(e)}")
+        return manifest
+    
+    @staticmethod
+    def get_latest_autosave():
+        """
+        Obtiene el autoguardado más reciente.
+        El archivo se obtiene del manifiesto; solo se recorre el directorio
+        si el manifiesto no existe o apunta a un archivo inexistente.
+        
+        Returns:
+            str or None: Nombre del archivo de autoguardado o None si no hay autoguardados
+        """
+        autosave_dir = FileHandler.get_autosave_dir()
+        
+        latest = FileHandler.read_autosave_manifest().get('latest')
+        if not latest or not os.path.exists(os.path.join(autosave_dir, latest)):
+            latest = FileHandler.rebuild_autosave_manifest().get('latest')
+        return latest
+    
+    @staticmethod
+    def read_autosave(basename):
+        """
+        Lee un archivo de autoguardado concreto.
+        
+        Args:
+            basename (str): Nombre del archivo de autoguardado (sin la ruta)
+            
+        Returns:
+            dict: Datos de la guía
+        """
+        with open(os.path.join(FileHandler.get_autosave_dir(), basename), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def get_autosave_history():
+        """
+        Obtiene el historial de autoguardados desde el manifiesto, sin abrir las guías.
+        
+        Returns:
+            list: Entradas del manifiesto ordenadas de la más reciente a la más antigua
+        """
+        manifest = FileHandler.read_autosave_manifest()
+        if not manifest['entries']:
+            manifest = FileHandler.rebuild_autosave_manifest()
+        return sorted(
+            manifest['entries'].values(),
+            key=lambda entry: entry.get('timestamp', ''),
+            reverse=True
+        )
+    
+    @staticmethod
+    def autosave(guide_data, serializer=None):
+        """
+        Guarda automáticamente el estado actual en un archivo temporal
+        y actualiza el manifiesto de autoguardados.
+        
+        No modifica guide_data, así que puede llamarse desde un hilo de trabajo
+        con una instantánea de la guía (ver GuideController.get_guide_data).
         
         Args:
             guide_data (dict): Datos de la guía a guardar
+            serializer (GuideSerializer, optional): Codificador con caché de pasos.
+                Defaults to None (se usa json.dump).
         """
         autosave_dir = FileHandler.get_autosave_dir()
         
@@ -41,15 +243,20 @@ class FileHandler:
         else:
             base_name = f"autosave_{datetime.now().strftime('%Y%m%d')}"
         
-        filename = os.path.join(autosave_dir, f"{base_name}.autosave.json")
+        basename = f"{base_name}.autosave.json"
+        filename = os.path.join(autosave_dir, basename)
         
-        # Añadir timestamp al guide_data
-        guide_data['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Añadir timestamp a una copia de primer nivel de guide_data
+        guide_data = dict(guide_data, timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
         
-        # Guardar en el archivo
+        # Guardar en el archivo y registrar en el manifiesto (un autoguardado cada vez)
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(guide_data, f, indent=2)
+            with BackgroundTask.get_file_lock(FileHandler.get_manifest_path()):
+                if serializer is not None:
+                    serializer.write(filename, guide_data)
+                else:
+                    FileHandler.write_json_atomic(filename, guide_data)
+                FileHandler.update_autosave_manifest(basename, guide_data, os.path.getsize(filename))
             print(f"Autosalvado completado: {filename}")
             return True
         except Exception as e:
@@ -57,196 +264,275 @@ class FileHandler:
             return False
     
     @staticmethod
-    def load_last_autosave():
+    def get_default_guide_filename(guide_data):
         """
-        Carga el último archivo de autoguardado disponible.
+        Obtiene el nombre de archivo predeterminado de una guía.
         
+        Args:
+            guide_data (dict): Datos de la guía
+            
         Returns:
-            dict or None: Datos de la guía cargada o None si no hay autosaves
+            str: Nombre de archivo (por ejemplo, "10_20_Durotar.json")
         """
-        autosave_dir = FileHandler.get_autosave_dir()
-        
-        # Buscar el archivo de autoguardado más reciente
-        autosave_files = [f for f in os.listdir(autosave_dir) if f.endswith('.autosave.json')]
-        if not autosave_files:
-            messagebox.showinfo("Autoguardado", "No hay archivos de autoguardado disponibles.")
-            return None
+        metadata = guide_data.get('metadata', {})
+        if metadata.get('zone') and metadata.get('level_range'):
+            return f"{metadata['level_range'].replace('-', '_')}_{metadata['zone'].replace(' ', '_')}.json"
+        return "guia_phermuth_data.json"
+    
+    @staticmethod
+    def read_guide_file(filename):
+        """
+        Lee un archivo de guía JSON sin mostrar diálogos.
         
-        # Ordenar por fecha de modificación (más reciente primero)
-        latest_file = max(
-            [os.path.join(autosave_dir, f) for f in autosave_files],
-            key=os.path.getmtime
-        )
+        Args:
+            filename (str): Ruta del archivo
+            
+        Returns:
+            dict: Datos de la guía
+        """
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def is_guide_filename(filename):
+        """
+        Indica si un nombre de archivo puede ser una guía (JSON que no es
+        autoguardado ni un archivo oculto como el índice de niveles).
         
-        # Cargar el archivo
-        try:
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                guide_data = json.load(f)
+        Args:
+            filename (str): Nombre del archivo
             
-            timestamp = guide_data.get("timestamp", "desconocido")
-            messagebox.showinfo("Autoguardado", f"Guía cargada desde autoguardado\nÚltima modificación: {timestamp}")
-            return guide_data
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo cargar el autoguardado: {str(e)}")
-            return None
+        Returns:
+            bool: True si el archivo se debe tratar como guía
+        """
+        return (filename.endswith('.json') and not filename.endswith('.autosave.json')
+                and not filename.startswith('.'))
     
     @staticmethod
-    def save_guide(guide_data):
+    def load_guide_directory(directory):
         """
-        Guarda los datos de la guía en un archivo JSON.
+        Carga todas las guías JSON de un directorio (sin autoguardados).
         
         Args:
-            guide_data (dict): Datos de la guía a guardar
+            directory (str): Directorio con los archivos de guía
             
         Returns:
-            bool: True si se guardó correctamente, False en caso contrario
+            dict: Ruta del archivo -> datos de la guía
         """
-        metadata = guide_data.get('metadata', {})
+        guides = {}
+        for filename in sorted(os.listdir(directory)):
+            if not FileHandler.is_guide_filename(filename):
+                continue
+            
+            path = os.path.join(directory, filename)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    guide_data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error al cargar la guía {filename}: {str(e)}")
+                continue
+            
+            # Ignorar archivos JSON que no son guías (p. ej. bases de datos de misiones)
+            if isinstance(guide_data, dict) and "steps" in guide_data:
+                guides[path] = guide_data
+        return guides
+    
+    @staticmethod
+    def get_guide_stamp(path):
+        """
+        Obtiene la marca de un archivo de guía para detectar cambios.
         
-        # Determinar nombre de archivo predeterminado
-        if metadata.get('zone') and metadata.get('level_range'):
-            default_filename = f"{metadata['level_range'].replace('-', '_')}_{metadata['zone'].replace(' ', '_')}.json"
-        else:
-            default_filename = "guia_phermuth_data.json"
+        Args:
+            path (str): Ruta del archivo
             
-        # Solicitar nombre de archivo
-        filename = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-            initialfile=default_filename
-        )
+        Returns:
+            list: [fecha de modificación en ns, tamaño]
+        """
+        stat = os.stat(path)
+        return [stat.st_mtime_ns, stat.st_size]
+    
+    @staticmethod
+    def load_level_index(directory):
+        """
+        Carga el índice de niveles de un directorio de guías.
         
-        if not filename:
-            return False  # Usuario canceló la operación
+        Solo se vuelven a leer las guías cuya marca ha cambiado desde la última
+        vez; el índice se guarda de nuevo si hubo cambios.
         
-        # Guardar en el archivo
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(guide_data, f, indent=2)
-            messagebox.showinfo("Éxito", f"Datos de la guía guardados en {filename}")
-            return True
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al guardar la guía: {str(e)}")
-            return False
+        Args:
+            directory (str): Directorio con los archivos de guía
+            
+        Returns:
+            LevelIndex: Índice con las rutas de las guías como claves
+        """
+        index_path = os.path.join(directory, FileHandler.LEVEL_INDEX_FILE)
+        index = LevelIndex()
+        with BackgroundTask.get_file_lock(index_path):
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    index_data = json.load(f)
+                index.from_dict({
+                    os.path.join(directory, filename): entry
+                    for filename, entry in index_data.get('guides', {}).items()
+                })
+            except (OSError, json.JSONDecodeError, AttributeError):
+                pass
+            
+            changed = False
+            present = set()
+            for filename in sorted(os.listdir(directory)):
+                if not FileHandler.is_guide_filename(filename):
+                    continue
+                path = os.path.join(directory, filename)
+                stamp = FileHandler.get_guide_stamp(path)
+                entry = index.entries.get(path)
+                if entry is not None and entry['stamp'] == stamp:
+                    present.add(path)
+                    continue
+                
+                try:
+                    guide_data = FileHandler.read_guide_file(path)
+                except (OSError, json.JSONDecodeError):
+                    continue
+                if not isinstance(guide_data, dict) or "steps" not in guide_data:
+                    continue
+                
+                metadata = guide_data.get("metadata", {})
+                index.add(path, metadata.get("zone", ""), metadata.get("level_range", ""),
+                          metadata.get("faction", "Horde"), stamp)
+                present.add(path)
+                changed = True
+            
+            for path in [path for path in index.entries if path not in present]:
+                index.remove(path)
+                changed = True
+            
+            if changed:
+                FileHandler._write_level_index(index_path, index)
+        return index
     
     @staticmethod
-    def load_guide():
+    def update_level_index(filename, guide_data):
         """
-        Carga los datos de una guía desde un archivo JSON.
+        Actualiza la entrada de una guía recién guardada en el índice de niveles
+        de su directorio (si el directorio ya tiene índice).
         
+        Args:
+            filename (str): Ruta del archivo de guía guardado
+            guide_data (dict): Datos de la guía guardada
+            
         Returns:
-            dict or None: Datos de la guía cargada o None si hubo un error
+            bool: True si se actualizó el índice
         """
-        filename = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
-        )
-        
-        if not filename:
-            return None  # Usuario canceló la operación
+        directory = os.path.dirname(os.path.abspath(filename))
+        index_path = os.path.join(directory, FileHandler.LEVEL_INDEX_FILE)
+        if not os.path.exists(index_path) or not FileHandler.is_guide_filename(os.path.basename(filename)):
+            return False
         
-        try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                guide_data = json.load(f)
+        with BackgroundTask.get_file_lock(index_path):
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    index_data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return False
             
-            messagebox.showinfo("Éxito", f"Guía cargada desde {filename}")
-            return guide_data
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al cargar la guía: {str(e)}")
-            return None
+            metadata = guide_data.get("metadata", {})
+            index_data.setdefault('guides', {})[os.path.basename(filename)] = {
+                'zone': metadata.get("zone", ""),
+                'faction': metadata.get("faction", "Horde"),
+                'level_range': metadata.get("level_range", ""),
+                'stamp': FileHandler.get_guide_stamp(filename)
+            }
+            FileHandler.write_text_atomic(index_path, json.dumps(index_data, indent=2))
+        return True
+    
+    @staticmethod
+    def _write_level_index(index_path, index):
+        """Guarda un índice de niveles con los nombres de archivo como claves."""
+        index_data = {
+            'guides': {
+                os.path.basename(path): entry for path, entry in index.to_dict().items()
+            }
+        }
+        FileHandler.write_text_atomic(index_path, json.dumps(index_data, indent=2))
     
     @staticmethod
-    def save_lua_to_file(lua_code, guide_zone, guide_level_range):
+    def get_lua_filename(guide_zone, guide_level_range, suffix=""):
         """
-        Guarda el código Lua generado en un archivo.
+        Construye el nombre de archivo Lua predeterminado de una guía.
         
         Args:
-            lua_code (str): Código Lua a guardar
             guide_zone (str): Zona de la guía
             guide_level_range (str): Rango de niveles de la guía
+            suffix (str, optional): Sufijo de la variante. Defaults to "".
             
         Returns:
-            bool: True si se guardó correctamente, False en caso contrario
+            str: Nombre del archivo
         """
-        # Crear nombre de archivo basado en la información de la guía
         if guide_zone and guide_level_range:
-            default_filename = f"{guide_level_range.replace('-', '_')}_{guide_zone.replace(' ', '_')}.lua"
+            base_name = f"{guide_level_range.replace('-', '_')}_{guide_zone.replace(' ', '_')}"
         else:
-            default_filename = "guia_phermuth_guide.lua"
-        
-        # Solicitar nombre de archivo
-        filename = filedialog.asksaveasfilename(
-            defaultextension=".lua",
-            filetypes=[("Lua files", "*.lua"), ("All files", "*.*")],
-            initialfile=default_filename
-        )
-        
-        if not filename:
-            return False  # Usuario canceló la operación
-        
-        # Guardar en el archivo
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(lua_code)
-            messagebox.showinfo("Éxito", f"Guía guardada en {filename}")
-            return True
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al guardar el archivo: {str(e)}")
-            return False
+            base_name = "guia_phermuth_guide"
+        if suffix:
+            base_name += f"_{suffix}"
+        return f"{base_name}.lua"
     
     @staticmethod
-    def export_quest_db(quest_history):
+    def get_chunk_files(directory, guide_zone, guide_level_range, chunks, single_file=False):
         """
-        Exporta la base de datos de misiones a un archivo JSON.
+        Asigna archivos de salida a los fragmentos Lua de una guía.
         
         Args:
-            quest_history (dict): Historial de misiones a exportar
+            directory (str): Directorio de salida
+            guide_zone (str): Zona de la guía
+            guide_level_range (str): Rango de niveles de la guía completa
+            chunks (list): Pares (rango de niveles, código Lua) en orden de la cadena
+            single_file (bool, optional): Escribir todos los bloques en un solo archivo.
+                Defaults to False.
             
         Returns:
-            bool: True si se exportó correctamente, False en caso contrario
+            dict: Ruta del archivo -> contenido
         """
-        if not quest_history:
-            messagebox.showinfo("Exportar", "No hay misiones en el historial para exportar.")
-            return False
-            
-        filename = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-            initialfile="guia_phermuth_quest_db.json"
-        )
-        
-        if not filename:
-            return False  # Usuario canceló la operación
+        if single_file:
+            filename = FileHandler.get_lua_filename(guide_zone, guide_level_range)
+            return {os.path.join(directory, filename): "\n".join(code for _, code in chunks)}
         
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(quest_history, f, indent=2)
-            messagebox.showinfo("Éxito", f"Base de datos de misiones exportada a {filename}")
-            return True
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al exportar la base de datos: {str(e)}")
-            return False
+        # El número de parte conserva el orden de carga de la cadena
+        return {
+            os.path.join(directory, FileHandler.get_lua_filename(guide_zone, chunk_range, f"{index + 1:02d}")): code
+            for index, (chunk_range, code) in enumerate(chunks)
+        }
     
     @staticmethod
-    def import_quest_db():
+    def write_text_files(files):
         """
-        Importa una base de datos de misiones desde un archivo JSON.
+        Escribe varios archivos de texto en paralelo, cada uno de forma atómica
+        (un fallo a mitad de escritura no deja un archivo truncado).
         
+        Args:
+            files (dict): Ruta del archivo -> contenido
+            
         Returns:
-            dict or None: Base de datos importada o None si hubo un error
+            list: Rutas escritas, en el mismo orden
         """
-        filename = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
-        )
+        def write(item):
+            filename, content = item
+            FileHandler.write_text_atomic(filename, content)
+            return filename
         
-        if not filename:
-            return None  # Usuario canceló la operación
+        with ThreadPoolExecutor(max_workers=min(8, len(files) or 1)) as executor:
+            return list(executor.map(write, files.items()))
+    
+    @staticmethod
+    def read_quest_db(filename):
+        """
+        Lee una base de datos de misiones exportada.
         
-        try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                imported_db = json.load(f)
+        Args:
+            filename (str): Ruta del archivo JSON
             
-            messagebox.showinfo("Éxito", f"Base de datos de misiones importada desde {filename}\nImportadas {len(imported_db)} misiones.")
-            return imported_db
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al importar la base de datos: {str(e)}")
-            return None
\ No newline at end of file
+        Returns:
+            dict: Historial de misiones
+        """
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
\ No newline at end of file
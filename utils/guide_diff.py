@@ -0,0 +1,380 @@
+import json
+from bisect import bisect_left
+
+from utils.lua_generator import LuaGenerator
+
+class GuideDiff:
+    """
+    Diferencias y fusión a tres bandas entre listas de pasos de guías.
+    
+    Los pasos se comparan por una clave de contenido. El diff usa el algoritmo
+    patience (anclas en pasos únicos en ambas listas) y recurre a Myers solo en
+    los huecos entre anclas, por lo que es casi lineal en guías grandes.
+    """
+    
+    # Máximo de ediciones que Myers explora en un hueco antes de rendirse
+    MAX_MYERS_EDITS = 2000
+    
+    @staticmethod
+    def step_key(step):
+        """
+        Obtiene la clave de contenido de un paso.
+        
+        Args:
+            step (dict): Datos del paso
+        
+        Returns:
+            str: Clave que solo coincide entre pasos con el mismo contenido
+        """
+        return json.dumps(step, sort_keys=True, ensure_ascii=False)
+    
+    @staticmethod
+    def diff(old_steps, new_steps):
+        """
+        Calcula las diferencias entre dos listas de pasos.
+        
+        Args:
+            old_steps (list): Pasos originales
+            new_steps (list): Pasos nuevos
+        
+        Returns:
+            list: Operaciones (tag, i1, i2, j1, j2) con tag 'equal', 'delete',
+                'insert' o 'replace', como difflib.SequenceMatcher.get_opcodes()
+        """
+        old_keys = [GuideDiff.step_key(step) for step in old_steps]
+        new_keys = [GuideDiff.step_key(step) for step in new_steps]
+        
+        matches = []
+        GuideDiff._patience(old_keys, 0, len(old_keys), new_keys, 0, len(new_keys), matches)
+        return GuideDiff._matches_to_opcodes(matches, len(old_keys), len(new_keys))
+    
+    @staticmethod
+    def _patience(a, a_lo, a_hi, b, b_lo, b_hi, matches):
+        """
+        Añade a `matches` los pares (i, j) coincidentes entre a[a_lo:a_hi] y b[b_lo:b_hi].
+        """
+        # Prefijo común
+        while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+            matches.append((a_lo, b_lo))
+            a_lo += 1
+            b_lo += 1
+        
+        # Sufijo común (se añade al final para mantener el orden)
+        suffix = []
+        while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+            a_hi -= 1
+            b_hi -= 1
+            suffix.append((a_hi, b_hi))
+        
+        if a_lo < a_hi and b_lo < b_hi:
+            anchors = GuideDiff._unique_anchors(a, a_lo, a_hi, b, b_lo, b_hi)
+            if anchors:
+                prev_a, prev_b = a_lo, b_lo
+                for i, j in anchors:
+                    GuideDiff._patience(a, prev_a, i, b, prev_b, j, matches)
+                    matches.append((i, j))
+                    prev_a, prev_b = i + 1, j + 1
+                GuideDiff._patience(a, prev_a, a_hi, b, prev_b, b_hi, matches)
+            else:
+                GuideDiff._myers(a, a_lo, a_hi, b, b_lo, b_hi, matches)
+        
+        matches.extend(reversed(suffix))
+    
+    @staticmethod
+    def _unique_anchors(a, a_lo, a_hi, b, b_lo, b_hi):
+        """
+        Obtiene la subsecuencia creciente más larga de pasos únicos en ambos lados.
+        
+        Returns:
+            list: Pares (i, j) en orden creciente
+        """
+        counts = {}
+        for i in range(a_lo, a_hi):
+            entry = counts.setdefault(a[i], [0, 0, i])
+            entry[0] += 1
+        for j in range(b_lo, b_hi):
+            entry = counts.get(b[j])
+            if entry is not None:
+                entry[1] += 1
+                entry.append(j)
+        
+        pairs = [
+            (entry[2], entry[3]) for entry in counts.values()
+            if entry[0] == 1 and entry[1] == 1
+        ]
+        if not pairs:
+            return []
+        pairs.sort()
+        
+        # Ordenación patience para la subsecuencia creciente más larga (por j)
+        tails = []
+        tail_indices = []
+        previous = [None] * len(pairs)
+        for index, (_, j) in enumerate(pairs):
+            position = bisect_left(tails, j)
+            if position == len(tails):
+                tails.append(j)
+                tail_indices.append(index)
+            else:
+                tails[position] = j
+                tail_indices[position] = index
+            previous[index] = tail_indices[position - 1] if position > 0 else None
+        
+        result = []
+        index = tail_indices[-1]
+        while index is not None:
+            result.append(pairs[index])
+            index = previous[index]
+        result.reverse()
+        return result
+    
+    @staticmethod
+    def _myers(a, a_lo, a_hi, b, b_lo, b_hi, matches):
+        """
+        Algoritmo de Myers O(ND) para un hueco sin anclas únicas.
+        Si el hueco exige demasiadas ediciones, se trata como un reemplazo completo.
+        """
+        n, m = a_hi - a_lo, b_hi - b_lo
+        max_edits = min(n + m, GuideDiff.MAX_MYERS_EDITS)
+        offset = max_edits + 1
+        v = [0] * (2 * max_edits + 3)
+        trace = []
+        
+        for d in range(max_edits + 1):
+            trace.append(list(v))
+            for k in range(-d, d + 1, 2):
+                if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                    x = v[offset + k + 1]
+                else:
+                    x = v[offset + k - 1] + 1
+                y = x - k
+                while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                    x += 1
+                    y += 1
+                v[offset + k] = x
+                if x >= n and y >= m:
+                    GuideDiff._myers_backtrack(trace, d, offset, a_lo, b_lo, n, m, matches)
+                    return
+        # Demasiadas diferencias: sin coincidencias en el hueco (reemplazo)
+    
+    @staticmethod
+    def _myers_backtrack(trace, d_final, offset, a_lo, b_lo, n, m, matches):
+        """Reconstruye las coincidencias a partir de la traza de Myers."""
+        found = []
+        x, y = n, m
+        for d in range(d_final, 0, -1):
+            v = trace[d]
+            k = x - y
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                prev_k = k + 1
+            else:
+                prev_k = k - 1
+            prev_x = v[offset + prev_k]
+            prev_y = prev_x - prev_k
+            while x > prev_x and y > prev_y:
+                x -= 1
+                y -= 1
+                found.append((a_lo + x, b_lo + y))
+            x, y = prev_x, prev_y
+        while x > 0 and y > 0:
+            x -= 1
+            y -= 1
+            found.append((a_lo + x, b_lo + y))
+        matches.extend(reversed(found))
+    
+    @staticmethod
+    def _matches_to_opcodes(matches, n, m):
+        """Convierte los pares coincidentes en operaciones de diff."""
+        opcodes = []
+        i = j = 0
+        for mi, mj in matches + [(n, m)]:
+            if i < mi and j < mj:
+                opcodes.append(('replace', i, mi, j, mj))
+            elif i < mi:
+                opcodes.append(('delete', i, mi, j, j))
+            elif j < mj:
+                opcodes.append(('insert', i, i, j, mj))
+            if mi < n and mj < m:
+                if opcodes and opcodes[-1][0] == 'equal' and opcodes[-1][2] == mi:
+                    tag, i1, _, j1, _ = opcodes[-1]
+                    opcodes[-1] = (tag, i1, mi + 1, j1, mj + 1)
+                else:
+                    opcodes.append(('equal', mi, mi + 1, mj, mj + 1))
+            i, j = mi + 1, mj + 1
+        return opcodes
+    
+    @staticmethod
+    def format_hunks(old_steps, new_steps, opcodes=None, context=2):
+        """
+        Genera una vista de solo los bloques cambiados, con contexto.
+        
+        Args:
+            old_steps (list): Pasos originales
+            new_steps (list): Pasos nuevos
+            opcodes (list, optional): Operaciones ya calculadas. Defaults to None.
+            context (int, optional): Pasos de contexto alrededor de cada cambio. Defaults to 2.
+        
+        Returns:
+            str: Texto con los bloques cambiados ('-' eliminado, '+' añadido, '~' movido)
+        """
+        if opcodes is None:
+            opcodes = GuideDiff.diff(old_steps, new_steps)
+        
+        # Pasos eliminados que reaparecen insertados en otro lugar se marcan como movidos
+        deleted = {}
+        inserted = {}
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag in ('delete', 'replace'):
+                for i in range(i1, i2):
+                    deleted.setdefault(GuideDiff.step_key(old_steps[i]), 0)
+                    deleted[GuideDiff.step_key(old_steps[i])] += 1
+            if tag in ('insert', 'replace'):
+                for j in range(j1, j2):
+                    inserted.setdefault(GuideDiff.step_key(new_steps[j]), 0)
+                    inserted[GuideDiff.step_key(new_steps[j])] += 1
+        moved = {key for key in deleted if key in inserted}
+        
+        def line(prefix, step):
+            marker = '~' if GuideDiff.step_key(step) in moved else prefix
+            return f"{marker} {LuaGenerator.format_step(step)}"
+        
+        lines = []
+        for group in GuideDiff._group_opcodes(opcodes, context):
+            first, last = group[0], group[-1]
+            lines.append(f"@@ -{first[1] + 1},{last[2] - first[1]} +{first[3] + 1},{last[4] - first[3]} @@")
+            for tag, i1, i2, j1, j2 in group:
+                if tag == 'equal':
+                    lines.extend(f"  {LuaGenerator.format_step(step)}" for step in old_steps[i1:i2])
+                    continue
+                lines.extend(line('-', step) for step in old_steps[i1:i2])
+                lines.extend(line('+', step) for step in new_steps[j1:j2])
+        return "\n".join(lines)
+    
+    @staticmethod
+    def _group_opcodes(opcodes, context):
+        """Agrupa las operaciones en bloques con `context` pasos iguales alrededor."""
+        groups = []
+        group = []
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == 'equal':
+                if group:
+                    # Cerrar el bloque actual con contexto posterior
+                    if i2 - i1 > 2 * context:
+                        group.append((tag, i1, i1 + context, j1, j1 + context))
+                        groups.append(group)
+                        group = []
+                        i1, j1 = i2 - context, j2 - context
+                    else:
+                        group.append((tag, i1, i2, j1, j2))
+                        continue
+                # Contexto previo del siguiente bloque
+                i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+                group = [(tag, i1, i2, j1, j2)]
+            else:
+                group.append((tag, i1, i2, j1, j2))
+        
+        if group and any(op[0] != 'equal' for op in group):
+            if group[-1][0] == 'equal':
+                tag, i1, i2, j1, j2 = group[-1]
+                group[-1] = (tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context))
+            groups.append(group)
+        return groups
+    
+    @staticmethod
+    def merge(base_steps, our_steps, their_steps):
+        """
+        Fusión a tres bandas de listas de pasos.
+        
+        Los cambios de un solo lado (inserciones, eliminaciones y, por tanto,
+        movimientos) se aplican automáticamente. Los cambios de ambos lados sobre
+        la misma zona de la base son conflictos salvo que sean idénticos; en ese
+        caso se conserva nuestra versión y se informa del conflicto.
+        
+        Args:
+            base_steps (list): Pasos del ancestro común
+            our_steps (list): Nuestros pasos
+            their_steps (list): Sus pasos
+        
+        Returns:
+            dict: 'steps' con los pasos fusionados y 'conflicts' con la lista de
+                conflictos ('index', 'base', 'ours', 'theirs')
+        """
+        our_changes = GuideDiff._changes(GuideDiff.diff(base_steps, our_steps))
+        their_changes = GuideDiff._changes(GuideDiff.diff(base_steps, their_steps))
+        
+        merged = []
+        conflicts = []
+        base_pos = 0
+        o = t = 0
+        while o < len(our_changes) or t < len(their_changes):
+            # Elegir el siguiente cambio y agrupar los que se solapan en la base
+            candidates = []
+            if o < len(our_changes):
+                candidates.append(our_changes[o][0])
+            if t < len(their_changes):
+                candidates.append(their_changes[t][0])
+            start = min(candidates)
+            end = start
+            ours_group, theirs_group = [], []
+            changed = True
+            while changed:
+                changed = False
+                if o < len(our_changes) and GuideDiff._overlaps(our_changes[o], start, end):
+                    end = max(end, our_changes[o][1])
+                    ours_group.append(our_changes[o])
+                    o += 1
+                    changed = True
+                if t < len(their_changes) and GuideDiff._overlaps(their_changes[t], start, end):
+                    end = max(end, their_changes[t][1])
+                    theirs_group.append(their_changes[t])
+                    t += 1
+                    changed = True
+            
+            merged.extend(base_steps[base_pos:start])
+            ours_region = GuideDiff._apply(base_steps, start, end, ours_group, our_steps)
+            theirs_region = GuideDiff._apply(base_steps, start, end, theirs_group, their_steps)
+            
+            if not theirs_group:
+                merged.extend(ours_region)
+            elif not ours_group:
+                merged.extend(theirs_region)
+            elif [GuideDiff.step_key(s) for s in ours_region] == [GuideDiff.step_key(s) for s in theirs_region]:
+                merged.extend(ours_region)
+            else:
+                conflicts.append({
+                    'index': len(merged),
+                    'base': base_steps[start:end],
+                    'ours': ours_region,
+                    'theirs': theirs_region
+                })
+                merged.extend(ours_region)
+            base_pos = end
+        
+        merged.extend(base_steps[base_pos:])
+        return {'steps': merged, 'conflicts': conflicts}
+    
+    @staticmethod
+    def _changes(opcodes):
+        """Obtiene los cambios (base_i1, base_i2, j1, j2) de un diff contra la base."""
+        return [(i1, i2, j1, j2) for tag, i1, i2, j1, j2 in opcodes if tag != 'equal']
+    
+    @staticmethod
+    def _overlaps(change, start, end):
+        """
+        Indica si un cambio se solapa con la región [start, end) de la base.
+        Los cambios que empiezan en el mismo punto (p. ej. dos inserciones) también
+        se consideran solapados; los que solo son contiguos, no.
+        """
+        return change[0] < end or change[0] == start
+    
+    @staticmethod
+    def _apply(base_steps, start, end, group, side_steps):
+        """Reconstruye la región [start, end) de la base tras aplicar los cambios de un lado."""
+        result = []
+        position = start
+        for i1, i2, j1, j2 in group:
+            result.extend(base_steps[position:i1])
+            result.extend(side_steps[j1:j2])
+            position = i2
+        result.extend(base_steps[position:end])
+        return result
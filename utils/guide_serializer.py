@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+
+from utils.background_task import BackgroundTask
+
+class GuideSerializer:
+    """
+    Codificador JSON de guías que reutiliza el texto de los pasos ya codificados.
+    
+    Los pasos y las entradas del historial de misiones se tratan como valores:
+    al editarlos se sustituyen por diccionarios nuevos en lugar de modificarse
+    (ver Guide.update_step y QuestHistory.add_quest). Por eso el fragmento JSON
+    de cada uno se puede guardar en caché por identidad y solo se codifican
+    los que no estaban en el documento anterior. El documento se compone
+    escribiendo directamente los fragmentos en el archivo, sin construir una
+    cadena con toda la guía.
+    
+    El resultado es idéntico al de json.dump (con indent=2 o, en modo compacto,
+    sin espacios), así que se lee igual con Guide.from_dict.
+    """
+    
+    # Claves del documento cuyos elementos se codifican por separado (lista o diccionario)
+    CACHED_LISTS = ('steps',)
+    CACHED_DICTS = ('quest_history',)
+    
+    def __init__(self, compact=False):
+        """
+        Inicializa el codificador.
+        
+        Args:
+            compact (bool, optional): Generar JSON sin sangría ni espacios. Defaults to False.
+        """
+        self.compact = compact
+        self._encoder = json.JSONEncoder(
+            indent=None if compact else 2,
+            separators=(',', ':') if compact else (',', ': '),
+            default=BackgroundTask.json_default
+        )
+        self._colon = ':' if compact else ': '
+        
+        # id(valor) -> (valor, fragmento); se conserva el valor para que su id no se reutilice
+        self._fragments = {}
+        self._lock = threading.Lock()
+        
+        # Fragmentos codificados (no reutilizados) en el último documento
+        self.last_encoded = 0
+    
+    def encode_chunks(self, data):
+        """
+        Codifica un documento (por ejemplo, el de GuideController.get_guide_data) en fragmentos.
+        
+        Args:
+            data (dict): Documento a codificar
+        
+        Returns:
+            list: Fragmentos de texto cuya concatenación es el JSON del documento
+        """
+        with self._lock:
+            fragments = {}
+            self.last_encoded = 0
+            chunks = ["{"]
+            for position, (key, value) in enumerate(data.items()):
+                chunks.append(f"{',' if position else ''}{self._newline(1)}{self._encoder.encode(key)}{self._colon}")
+                if key in self.CACHED_LISTS and value is not None:
+                    self._append_list(chunks, value, fragments)
+                elif key in self.CACHED_DICTS and isinstance(value, dict):
+                    self._append_dict(chunks, value, fragments)
+                else:
+                    chunks.append(self._indent(self._encoder.encode(value), 1))
+            chunks.append(self._newline(0) + "}" if data else "}")
+            
+            # Descartar los fragmentos de pasos y misiones que ya no están en la guía
+            self._fragments = fragments
+        return chunks
+    
+    def encode(self, data):
+        """
+        Codifica un documento completo en una cadena.
+        
+        Args:
+            data (dict): Documento a codificar
+        
+        Returns:
+            str: JSON del documento
+        """
+        return "".join(self.encode_chunks(data))
+    
+    def write(self, filename, data, task=None):
+        """
+        Escribe un documento en un archivo de forma atómica.
+        
+        Args:
+            filename (str): Ruta del archivo destino
+            data (dict): Documento a codificar
+            task (BackgroundTask, optional): Tarea para informar del progreso. Defaults to None.
+        """
+        chunks = self.encode_chunks(data)
+        if task is not None:
+            task.total = sum(len(chunk) for chunk in chunks)
+            task.write_chunks(filename, chunks)
+            return
+        
+        temp_filename = f"{filename}.tmp"
+        with BackgroundTask.get_file_lock(filename):
+            with open(temp_filename, 'w', encoding='utf-8') as f:
+                f.writelines(chunks)
+            os.replace(temp_filename, filename)
+    
+    def _append_list(self, chunks, values, fragments):
+        """Añade una lista cuyos elementos se codifican con caché."""
+        if not values:
+            chunks.append("[]")
+            return
+        chunks.append("[")
+        for position, value in enumerate(values):
+            chunks.append(("," if position else "") + self._newline(2))
+            chunks.append(self._fragment(value, fragments))
+        chunks.append(self._newline(1) + "]")
+    
+    def _append_dict(self, chunks, values, fragments):
+        """Añade un diccionario cuyos valores se codifican con caché."""
+        if not values:
+            chunks.append("{}")
+            return
+        chunks.append("{")
+        for position, (key, value) in enumerate(values.items()):
+            chunks.append(f"{',' if position else ''}{self._newline(2)}{self._encoder.encode(key)}{self._colon}")
+            chunks.append(self._fragment(value, fragments))
+        chunks.append(self._newline(1) + "}")
+    
+    def _fragment(self, value, fragments):
+        """Obtiene el fragmento de un elemento de segundo nivel, codificándolo si no está en caché."""
+        cached = self._fragments.get(id(value))
+        if cached is not None and cached[0] is value:
+            text = cached[1]
+        else:
+            text = self._indent(self._encoder.encode(value), 2)
+            self.last_encoded += 1
+        fragments[id(value)] = (value, text)
+        return text
+    
+    def _newline(self, level):
+        """Salto de línea y sangría de un nivel de anidamiento (nada en modo compacto)."""
+        return "" if self.compact else "\n" + "  " * level
+    
+    def _indent(self, text, level):
+        """Desplaza un fragmento codificado al nivel de anidamiento en que se escribe."""
+        if self.compact:
+            return text
+        return text.replace("\n", self._newline(level))
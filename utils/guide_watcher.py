@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import sys
+import time
+
+from models.coordinates import Coordinates
+from models.guide import Guide
+from utils.file_handler import FileHandler
+from utils.lua_generator import LuaGenerator
+
+class GuideWatcher:
+    """
+    Compila a Lua un directorio de guías JSON y lo vigila en busca de cambios.
+    
+    Cada pasada solo consulta `os.stat` de los archivos cuyo tamaño y fecha de
+    modificación no han cambiado. Si cambian, se calcula el hash del contenido y
+    solo se recompila cuando el hash es distinto. El resultado de LuaGenerator se
+    guarda en una caché direccionada por contenido, de modo que recompilar una
+    guía ya vista (o reconstruir una biblioteca sin cambios) no genera nada.
+    """
+    
+    # Directorio de la caché dentro del directorio de guías
+    CACHE_DIR = ".guide_cache"
+    
+    # Índice persistente de (mtime, tamaño, hash) por archivo de guía
+    INDEX_FILE = "index.json"
+    
+    # Clases cuyo código determina el Lua generado (forman parte de la clave de caché)
+    GENERATOR_CLASSES = (LuaGenerator, Coordinates, Guide)
+    
+    def __init__(self, source_dir, output_dir, cache_dir=None, optimize=False):
+        """
+        Inicializa el compilador de guías.
+        
+        Args:
+            source_dir (str): Directorio con las guías JSON
+            output_dir (str): Directorio donde se escriben los archivos Lua
+            cache_dir (str, optional): Directorio de la caché. Defaults to None
+                (CACHE_DIR dentro de source_dir).
+            optimize (bool, optional): Generar la salida reducida. Defaults to False.
+        """
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.cache_dir = cache_dir or os.path.join(source_dir, self.CACHE_DIR)
+        self.optimize = optimize
+        
+        # Ruta de la guía -> {'mtime', 'size', 'hash'} y 'skipped' si no es una guía válida
+        self.index = {}
+        
+        # Las opciones y el código del generador forman parte de la clave de caché
+        self.generator_key = self._get_generator_key()
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._load_index()
+    
+    def build(self):
+        """
+        Realiza una pasada sobre el directorio y compila lo que haya cambiado.
+        
+        Returns:
+            list: Pares (ruta de la guía, estado) de las guías procesadas; el estado es
+                'compiled', 'cached' o 'removed' (su archivo Lua se elimina). Las guías
+                sin cambios no se incluyen.
+        """
+        results = []
+        seen = set()
+        index_changed = False
+        for entry in sorted(os.scandir(self.source_dir), key=lambda entry: entry.name):
+            if not entry.is_file() or not FileHandler.is_guide_filename(entry.name):
+                continue
+            seen.add(entry.path)
+            
+            stat = entry.stat()
+            cached = self.index.get(entry.path)
+            if (cached and cached['mtime'] == stat.st_mtime_ns and cached['size'] == stat.st_size
+                    and self._is_up_to_date(cached, entry.path)):
+                continue
+            
+            status = self._build_file(entry.path, stat)
+            if status:
+                results.append((entry.path, status))
+        
+            # Un cambio de fecha sin cambio de contenido no compila nada pero actualiza el índice
+            if self.index.get(entry.path) != cached:
+                index_changed = True
+        
+        for path in [path for path in self.index if path not in seen]:
+            del self.index[path]
+            index_changed = True
+            
+            # No dejar el Lua compilado de una guía que ya no existe
+            try:
+                os.remove(self.get_output_path(path))
+            except FileNotFoundError:
+                pass
+            results.append((path, 'removed'))
+        
+        if index_changed:
+            self._save_index()
+        return results
+    
+    def watch(self, interval=1.0, on_results=None):
+        """
+        Vigila el directorio indefinidamente (hasta Ctrl+C).
+        
+        Args:
+            interval (float, optional): Segundos entre pasadas. Defaults to 1.0.
+            on_results: Función que recibe los resultados de cada pasada con cambios.
+                Defaults to None.
+        """
+        try:
+            while True:
+                results = self.build()
+                if results and on_results:
+                    on_results(results)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+    
+    def get_output_path(self, path):
+        """
+        Obtiene el archivo Lua de salida de una guía.
+        
+        Args:
+            path (str): Ruta de la guía JSON
+        
+        Returns:
+            str: Ruta del archivo Lua
+        """
+        base_name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.output_dir, f"{base_name}.lua")
+    
+    def _build_file(self, path, stat):
+        """
+        Compila una guía si su contenido ha cambiado.
+        
+        Args:
+            path (str): Ruta de la guía JSON
+            stat (os.stat_result): Estado del archivo
+        
+        Returns:
+            str or None: 'compiled', 'cached' o None si no hubo cambios o no es una guía
+        """
+        with open(path, 'rb') as f:
+            content = f.read()
+        content_hash = hashlib.sha256(content).hexdigest()
+        output_path = self.get_output_path(path)
+        
+        cached = self.index.get(path)
+        self.index[path] = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'hash': content_hash}
+        if cached and cached['hash'] == content_hash and self._is_up_to_date(cached, path):
+            if cached.get('skipped'):
+                self.index[path]['skipped'] = True
+            return None
+        
+        # Caché direccionada por contenido: misma guía + mismo generador = mismo Lua
+        cache_key = hashlib.sha256(f"{self.generator_key}:{content_hash}".encode('utf-8')).hexdigest()
+        cache_path = os.path.join(self.cache_dir, f"{cache_key}.lua")
+        
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                lua_code = f.read()
+            status = 'cached'
+        else:
+            try:
+                guide_data = json.loads(content.decode('utf-8'))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                guide_data = None
+            if not isinstance(guide_data, dict) or "steps" not in guide_data:
+                # Recordar que no es una guía para no volver a leerlo mientras no cambie
+                self.index[path]['skipped'] = True
+                return None
+            lua_code = self.compile_guide(guide_data)
+            FileHandler.write_text_atomic(cache_path, lua_code)
+            status = 'compiled'
+        
+        FileHandler.write_text_atomic(output_path, lua_code)
+        return status
+    
+    def _is_up_to_date(self, cached, path):
+        """
+        Indica si la entrada del índice de una guía no requiere compilarla de nuevo.
+        
+        Args:
+            cached (dict): Entrada del índice
+            path (str): Ruta de la guía JSON
+        
+        Returns:
+            bool: True si el archivo se descartó por no ser una guía o su Lua existe
+        """
+        return cached.get('skipped', False) or os.path.exists(self.get_output_path(path))
+    
+    def compile_guide(self, guide_data):
+        """
+        Genera el código Lua de una guía.
+        
+        Args:
+            guide_data (dict): Datos de la guía
+        
+        Returns:
+            str: Código Lua generado
+        """
+        metadata = guide_data.get("metadata", {})
+        zone = metadata.get("zone", "")
+        guide_name, next_zone_name = LuaGenerator.get_guide_names(
+            zone, metadata.get("level_range", ""), metadata.get("next_zone", "")
+        )
+        return LuaGenerator.generate_lua(
+            guide_data.get("steps", []), guide_name, next_zone_name, metadata.get("faction", "Horde"),
+            optimize=self.optimize, guide_zone=zone
+        )
+    
+    def _get_generator_key(self):
+        """Calcula una huella del generador (código y opciones) para invalidar la caché."""
+        source_hash = hashlib.sha256()
+        for generator_class in self.GENERATOR_CLASSES:
+            with open(sys.modules[generator_class.__module__].__file__, 'rb') as f:
+                source_hash.update(f.read())
+        return f"{source_hash.hexdigest()}:optimize={self.optimize}"
+    
+    def _load_index(self):
+        """Carga el índice persistente de la caché."""
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        
+        # Un índice de otro generador u otras opciones no sirve para saltar archivos
+        if data.get('generator') == self.generator_key and data.get('output_dir') == os.path.abspath(self.output_dir):
+            self.index = data.get('files', {})
+    
+    def _save_index(self):
+        """Guarda el índice persistente de la caché."""
+        FileHandler.write_json_atomic(os.path.join(self.cache_dir, self.INDEX_FILE), {
+            'generator': self.generator_key,
+            'output_dir': os.path.abspath(self.output_dir),
+            'files': self.index
+        }, indent=None)
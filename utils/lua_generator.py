@@ -1,8 +1,55 @@
+import re
+
+from models.coordinates import Coordinates
+from models.guide import Guide
+from utils.data_loader import DataLoader
+
 class LuaGenerator:
     """Clase para generar código Lua a partir de los datos de la guía."""
     
+    # Cierre del bloque de pasos y de la función de registro
+    FOOTER = '\n]]\nend)\n'
+    
+    # Decimales de las coordenadas en el modo optimizado
+    COORD_PRECISION = 2
+    
+    # Etiqueta de la línea -> campo del paso
+    TAG_FIELDS = {'QID': 'quest_id', 'N': 'note', 'C': 'class', 'R': 'race', 'Z': 'zone', 'OBJ': 'obj_id'}
+    
+    # Cabecera de registro y comienzo de cada etiqueta dentro de una línea
+    HEADER_PATTERN = re.compile(r'GuiaPhermuth:RegisterGuide\("(.*?)", "(.*?)", "(.*?)",function\(\)')
+    TAG_START_PATTERN = re.compile(r" \|(QID|N|C|R|Z|OBJ)\|")
+    
+    # Pasos mínimos de un fragmento antes de cortar en un hito de nivel
+    MIN_CHUNK_STEPS = 20
+    
+    # Nivel objetivo dentro del texto de un paso de farmeo (G)
+    LEVEL_PATTERN = re.compile(r"\b(\d{1,2})\b")
+    
     @staticmethod
-    def generate_lua(quest_steps, guide_name, next_zone, faction):
+    def get_guide_names(zone, level_range, next_zone):
+        """
+        Calcula el nombre de la guía y el de la guía siguiente a partir de los metadatos.
+        
+        Args:
+            zone (str): Zona de la guía
+            level_range (str): Rango de niveles (por ejemplo, "10-20")
+            next_zone (str): Zona siguiente
+            
+        Returns:
+            tuple: (nombre de la guía, nombre de la guía siguiente o "nil" si no hay)
+        """
+        guide_name = f"{zone} ({level_range})" if zone and level_range else "Custom Guide"
+        if not next_zone:
+            next_zone_name = "nil"
+        elif zone and '-' in level_range:
+            next_zone_name = f"{next_zone} ({level_range.split('-')[1]}-XX)"
+        else:
+            next_zone_name = next_zone
+        return guide_name, next_zone_name
+    
+    @staticmethod
+    def generate_lua(quest_steps, guide_name, next_zone, faction, optimize=False, guide_zone=""):
         """
         Genera código Lua a partir de los datos de la guía.
         
@@ -11,63 +58,482 @@ class LuaGenerator:
             guide_name (str): Nombre de la guía
             next_zone (str): Zona siguiente
             faction (str): Facción (Horde, Alliance, Both)
+            optimize (bool, optional): Generar la salida reducida. Defaults to False.
+            guide_zone (str, optional): Zona de la guía, para omitir |Z| redundantes
+                en el modo optimizado. Defaults to "".
             
         Returns:
             str: Código Lua generado
         """
-        # Determinar el nombre de la guía y la zona siguiente
-        if not guide_name:
-            guide_name = "Custom Guide"
-        
-        if not next_zone or next_zone == "":
-            next_zone = "nil"
-        
         # Inicio del código Lua
-        lua_code = f'GuiaPhermuth:RegisterGuide("{guide_name}", "{next_zone}", "{faction}",function()\n\n'
-        lua_code += 'return [[\n\n'
+        lua_code = LuaGenerator.format_header(guide_name, next_zone, faction)
         
         # Agregar pasos de la guía
         for step in quest_steps:
-            line = f"{step['action']} {step['quest_name']}"
+            if optimize:
+                lua_code += LuaGenerator.format_step(LuaGenerator.optimize_step(step, guide_zone), True) + "\n"
+            else:
+                lua_code += LuaGenerator.format_step(step) + "\n"
+        
+        # Fin del código Lua
+        lua_code += LuaGenerator.FOOTER
+        
+        return lua_code
+    
+    @staticmethod
+    def parse_variant(spec, default_faction="Both", races_by_faction=None, classes=None):
+        """
+        Interpreta una variante escrita como "faccion[:clase[:raza]]".
+        
+        Los campos vacíos no filtran: "Horde" es la compilación de la Horda con todas
+        las clases y ":Mage" la de magos con la facción de la guía. La facción, la
+        clase y la raza se comprueban contra las listas de DataLoader (sin distinguir
+        mayúsculas) y se normalizan a su forma canónica.
+        
+        Args:
+            spec (str): Descripción de la variante
+            default_faction (str, optional): Facción si no se indica. Defaults to "Both".
+            races_by_faction (dict, optional): Facción -> razas jugables. Defaults to None
+                (las de DataLoader.load_races_by_faction).
+            classes (list, optional): Clases válidas. Defaults to None
+                (las de DataLoader.load_class_list).
+            
+        Returns:
+            dict: Variante con 'name', 'faction', 'class', 'race' y 'faction_races'
+            (razas de la facción o None si la facción no filtra razas)
+        
+        Raises:
+            ValueError: Si la variante tiene más de tres campos o algún valor no existe
+        """
+        parts = spec.split(":")
+        if len(parts) > 3:
+            raise ValueError(f"Invalid variant '{spec}': use faction[:class[:race]]")
+        faction, class_name, race = (part.strip() for part in parts + [""] * (3 - len(parts)))
+        faction = faction or default_faction
+        
+        if races_by_faction is None:
+            races_by_faction = DataLoader.load_races_by_faction()
+        if classes is None:
+            classes = DataLoader.load_class_list()
+        
+        factions = {name.lower(): name for name in list(races_by_faction) + ["Both"]}
+        if faction.lower() not in factions:
+            raise ValueError(f"Unknown faction '{faction}' in variant '{spec}'")
+        faction = factions[faction.lower()]
+        faction_races = races_by_faction.get(faction)
+        
+        class_names = {name.lower(): name for name in classes if name}
+        if class_name and class_name.lower() not in class_names:
+            raise ValueError(f"Unknown class '{class_name}' in variant '{spec}'")
+        class_name = class_names.get(class_name.lower(), "")
+        
+        playable = faction_races or [name for races in races_by_faction.values() for name in races]
+        race_names = {name.lower(): name for name in playable}
+        if race and race.lower() not in race_names:
+            raise ValueError(f"Unknown race '{race}' for faction {faction} in variant '{spec}'")
+        race = race_names.get(race.lower(), "")
+        
+        name = "_".join(part for part in (faction, class_name, race) if part)
+        return {'name': name, 'faction': faction, 'class': class_name, 'race': race,
+                'faction_races': faction_races}
+    
+    @staticmethod
+    def step_in_variant(step, variant):
+        """
+        Indica si un paso forma parte de una variante según sus restricciones |C| y |R|.
+        
+        Args:
+            step (dict): Datos del paso
+            variant (dict): Variante creada con parse_variant
+            
+        Returns:
+            bool: True si el paso se incluye en la variante
+        """
+        step_classes = [value.strip() for value in (step.get('class') or "").split(",") if value.strip()]
+        if variant['class'] and step_classes and variant['class'] not in step_classes:
+            return False
+        
+        step_races = [value.strip() for value in (step.get('race') or "").split(",") if value.strip()]
+        if not step_races:
+            return True
+        if variant['race']:
+            return variant['race'] in step_races
+        
+        faction_races = variant.get('faction_races')
+        return faction_races is None or any(race in faction_races for race in step_races)
+    
+    @staticmethod
+    def generate_variants(quest_steps, guide_name, next_zone, variants, optimize=False, guide_zone=""):
+        """
+        Genera el código Lua de varias variantes en una sola pasada por los pasos.
+        
+        Cada paso se formatea una sola vez y su línea se comparte entre todas las
+        variantes que lo incluyen.
+        
+        Args:
+            quest_steps (list): Lista de pasos de la guía
+            guide_name (str): Nombre de la guía
+            next_zone (str): Zona siguiente
+            variants (list): Variantes creadas con parse_variant
+            optimize (bool, optional): Generar la salida reducida. Defaults to False.
+            guide_zone (str, optional): Zona de la guía (modo optimizado). Defaults to "".
+            
+        Returns:
+            dict: Nombre de la variante -> código Lua
+        """
+        lines_by_variant = {variant['name']: [] for variant in variants}
+        for step in quest_steps:
+            if optimize:
+                line = LuaGenerator.format_step(LuaGenerator.optimize_step(step, guide_zone), True) + "\n"
+            else:
+                line = LuaGenerator.format_step(step) + "\n"
+            for variant in variants:
+                if LuaGenerator.step_in_variant(step, variant):
+                    lines_by_variant[variant['name']].append(line)
+        
+        return {
+            variant['name']: (LuaGenerator.format_header(guide_name, next_zone, variant['faction'])
+                              + "".join(lines_by_variant[variant['name']])
+                              + LuaGenerator.FOOTER)
+            for variant in variants
+        }
+    
+    @staticmethod
+    def get_milestone_level(step):
+        """
+        Obtiene el nivel alcanzado en un paso de farmeo ("G Grind to 12").
+        
+        Args:
+            step (dict): Datos del paso
+            
+        Returns:
+            int or None: Nivel del hito o None si el paso no es un hito de nivel
+        """
+        if step.get('action') != 'G':
+            return None
+        for text in (step.get('quest_name'), step.get('note')):
+            match = LuaGenerator.LEVEL_PATTERN.search(text or "")
+            if match:
+                return int(match.group(1))
+        return None
+    
+    @staticmethod
+    def split_guide(quest_steps, level_range, max_steps=None, split_at_levels=True):
+        """
+        Divide los pasos de una guía en fragmentos por hitos de nivel o por número de pasos.
+        
+        Se corta tras cada paso G que alcanza un nivel dentro del rango de la guía
+        (si el fragmento tiene al menos MIN_CHUNK_STEPS pasos) y siempre que un
+        fragmento llega a `max_steps`; las partes de un mismo tramo comparten rango.
+        
+        Args:
+            quest_steps (list): Lista de pasos de la guía
+            level_range (str): Rango de niveles de la guía ("10-20")
+            max_steps (int, optional): Máximo de pasos por fragmento. Defaults to None.
+            split_at_levels (bool, optional): Cortar en los hitos de nivel. Defaults to True.
+            
+        Returns:
+            list: Fragmentos como diccionarios con 'steps' y 'level_range'
+        """
+        level_min, level_max = Guide.parse_level_range(level_range)
+        
+        # Cada fragmento pertenece a un tramo de niveles; un tramo largo se divide en partes
+        chunks = []
+        bracket_starts = [level_min]
+        bracket_ends = []
+        current = []
+        for step in quest_steps:
+            current.append(step)
+            
+            milestone = LuaGenerator.get_milestone_level(step) if split_at_levels else None
+            at_milestone = (
+                milestone is not None and level_min is not None
+                and bracket_starts[-1] < milestone < level_max
+                and len(current) >= LuaGenerator.MIN_CHUNK_STEPS
+            )
+            if at_milestone or (max_steps and len(current) >= max_steps):
+                chunks.append((len(bracket_starts) - 1, current))
+                current = []
+                if at_milestone:
+                    bracket_ends.append(milestone)
+                    bracket_starts.append(milestone)
+        if current or not chunks:
+            chunks.append((len(bracket_starts) - 1, current))
+        bracket_ends.append(level_max)
+        
+        result = []
+        for bracket, steps in chunks:
+            if level_min is None or level_max is None:
+                chunk_range = level_range
+            else:
+                chunk_range = f"{bracket_starts[bracket]}-{bracket_ends[bracket]}"
+            result.append({'steps': steps, 'level_range': chunk_range})
+        return result
+    
+    @staticmethod
+    def generate_chunked_lua(quest_steps, zone, level_range, next_zone, faction,
+                             max_steps=None, split_at_levels=True, optimize=False):
+        """
+        Genera una guía como varios bloques RegisterGuide encadenados.
+        
+        Cada fragmento enlaza con el siguiente por su nombre, de modo que el addon
+        solo carga el fragmento activo; el último enlaza con la zona siguiente.
+        
+        Args:
+            quest_steps (list): Lista de pasos de la guía
+            zone (str): Zona de la guía
+            level_range (str): Rango de niveles de la guía
+            next_zone (str): Zona siguiente
+            faction (str): Facción (Horde, Alliance, Both)
+            max_steps (int, optional): Máximo de pasos por fragmento. Defaults to None.
+            split_at_levels (bool, optional): Cortar en los hitos de nivel. Defaults to True.
+            optimize (bool, optional): Generar la salida reducida. Defaults to False.
             
-            # Agregar ID de misión si se proporciona
-            if step['quest_id']:
-                line += f" |QID|{step['quest_id']}|"
+        Returns:
+            list: Pares (rango de niveles del fragmento, código Lua)
+        """
+        chunks = LuaGenerator.split_guide(quest_steps, level_range, max_steps, split_at_levels)
+        
+        # Nombres únicos: fragmentos con el mismo rango se numeran
+        range_counts = {}
+        for chunk in chunks:
+            range_counts[chunk['level_range']] = range_counts.get(chunk['level_range'], 0) + 1
+        seen = {}
+        for chunk in chunks:
+            guide_name, _ = LuaGenerator.get_guide_names(zone, chunk['level_range'], next_zone)
+            if range_counts[chunk['level_range']] > 1:
+                seen[chunk['level_range']] = seen.get(chunk['level_range'], 0) + 1
+                guide_name += f" Part {seen[chunk['level_range']]}"
+            chunk['guide_name'] = guide_name
+        
+        result = []
+        for index, chunk in enumerate(chunks):
+            if index + 1 < len(chunks):
+                chunk_next = chunks[index + 1]['guide_name']
+            else:
+                _, chunk_next = LuaGenerator.get_guide_names(zone, level_range, next_zone)
+            lua_code = LuaGenerator.generate_lua(
+                chunk['steps'], chunk['guide_name'], chunk_next, faction,
+                optimize=optimize, guide_zone=zone
+            )
+            result.append((chunk['level_range'], lua_code))
+        return result
+    
+    @staticmethod
+    def format_header(guide_name, next_zone, faction):
+        """
+        Genera la cabecera de registro de la guía (hasta la primera línea de pasos).
+        
+        Todas las salidas Lua (generación, variantes, fragmentos, exportación y
+        vista previa) pasan por aquí, así que los valores vacíos se normalizan
+        en este único punto: sin nombre es "Custom Guide" y sin zona siguiente "nil".
+        
+        Args:
+            guide_name (str): Nombre de la guía
+            next_zone (str): Zona siguiente
+            faction (str): Facción (Horde, Alliance, Both)
             
-            # Manejar notas y coordenadas
-            has_note = step['note'] and step['note'].strip()
-            has_coords = step['coords'] and step['coords'].strip()
+        Returns:
+            str: Cabecera terminada en salto de línea
+        """
+        guide_name = guide_name or "Custom Guide"
+        next_zone = next_zone or "nil"
+        return (f'GuiaPhermuth:RegisterGuide("{guide_name}", "{next_zone}", "{faction}",function()\n\n'
+                'return [[\n\n')
+    
+    @staticmethod
+    def format_step(step, compact=False):
+        """
+        Genera la línea de la guía correspondiente a un paso.
+        
+        Args:
+            step (dict): Datos del paso
+            compact (bool, optional): Omitir el marcador "--" de las notas que solo
+                contienen coordenadas. Defaults to False.
+            
+        Returns:
+            str: Línea del paso (sin salto de línea)
+        """
+        line = f"{step['action']} {step['quest_name']}"
+        
+        # Agregar ID de misión si se proporciona
+        if step['quest_id']:
+            line += f" |QID|{step['quest_id']}|"
+        
+        # Manejar notas y coordenadas
+        has_note = step['note'] and step['note'].strip()
+        has_coords = step['coords'] and step['coords'].strip()
+        
+        if has_note or has_coords:
+            # Si hay nota o coordenadas, crear una etiqueta de nota
+            note_text = step['note'] if has_note else ("" if compact else "--")
+            line += f" |N|{note_text}"
             
-            if has_note or has_coords:
-                # Si hay nota o coordenadas, crear una etiqueta de nota
-                note_text = step['note'] if has_note else "--"
-                line += f" |N|{note_text}"
-                
-                # Añadir coordenadas dentro de la nota si existen
-                if has_coords:
-                    line += f" ({step['coords']})"
-                
-                line += "|"
+            # Añadir coordenadas dentro de la nota si existen
+            if has_coords:
+                line += f" ({step['coords']})" if note_text else f"({step['coords']})"
+            
+            line += "|"
+        
+        # Agregar restricción de clase si se proporciona
+        if step['class']:
+            line += f" |C|{step['class']}|"
+        
+        # Agregar restricción de raza si se proporciona
+        if step['race']:
+            line += f" |R|{step['race']}|"
+        
+        # Agregar zona si se proporciona
+        if step['zone']:
+            line += f" |Z|{step['zone']}|"
+        
+        # Agregar ID de objeto si se proporciona
+        if step['obj_id']:
+            line += f" |OBJ|{step['obj_id']}|"
+        
+        return line
+    
+    @staticmethod
+    def optimize_step(step, guide_zone=""):
+        """
+        Prepara una copia reducida de un paso para el modo optimizado.
+        
+        Quita la zona si coincide con la de la guía y normaliza la precisión
+        de las coordenadas. El paso original no se modifica.
+        
+        Args:
+            step (dict): Datos del paso
+            guide_zone (str, optional): Zona de la guía. Defaults to "".
             
-            # Agregar restricción de clase si se proporciona
-            if step['class']:
-                line += f" |C|{step['class']}|"
+        Returns:
+            dict: Paso reducido
+        """
+        optimized = dict(step)
+        if guide_zone and step['zone'] == guide_zone:
+            optimized['zone'] = ""
+        
+        coords = Coordinates.parse_coords_text(step['coords'])
+        if coords is not None:
+            optimized['coords'] = Coordinates.format_pair(coords[0], coords[1], LuaGenerator.COORD_PRECISION)
+        return optimized
+    
+    @staticmethod
+    def parse_lua(lua_code):
+        """
+        Interpreta el código Lua generado (operación inversa de generate_lua).
+        
+        Args:
+            lua_code (str): Código Lua de una guía
             
-            # Agregar restricción de raza si se proporciona
-            if step['race']:
-                line += f" |R|{step['race']}|"
+        Returns:
+            dict: 'guide_name', 'next_zone', 'faction' y 'steps' (pasos con los mismos
+                campos que en la guía; las coordenadas de la nota quedan en 'coords')
             
-            # Agregar zona si se proporciona
-            if step['zone']:
-                line += f" |Z|{step['zone']}|"
+        Raises:
+            ValueError: Si el código no tiene el formato de una guía
+        """
+        header = LuaGenerator.HEADER_PATTERN.search(lua_code)
+        body_start = lua_code.find("return [[")
+        body_end = lua_code.rfind("]]")
+        if header is None or body_start < 0 or body_end < body_start:
+            raise ValueError("Not a GuiaPhermuth guide")
+        
+        steps = []
+        for line in lua_code[body_start + len("return [["):body_end].split("\n"):
+            if line.strip():
+                steps.append(LuaGenerator.parse_step_line(line))
+        
+        return {
+            'guide_name': header.group(1),
+            'next_zone': header.group(2),
+            'faction': header.group(3),
+            'steps': steps
+        }
+    
+    @staticmethod
+    def parse_step_line(line):
+        """
+        Interpreta una línea de paso de la guía.
+        
+        Args:
+            line (str): Línea generada por format_step
             
-            # Agregar ID de objeto si se proporciona
-            if step['obj_id']:
-                line += f" |OBJ|{step['obj_id']}|"
+        Returns:
+            dict: Datos del paso
+        """
+        action, _, rest = line.partition(" ")
+        step = {'action': action, 'coords': ""}
+        for field in LuaGenerator.TAG_FIELDS.values():
+            step[field] = ""
+        
+        matches = list(LuaGenerator.TAG_START_PATTERN.finditer(rest))
+        step['quest_name'] = rest[:matches[0].start()] if matches else rest
+        
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(rest)
+            value = rest[match.end():end]
+            if value.endswith("|"):
+                value = value[:-1]
             
-            lua_code += line + "\n"
+            tag = match.group(1)
+            if tag == 'N':
+                # Las coordenadas van al final de la nota entre paréntesis
+                coords_match = re.search(r" ?\(([^()]*)\)$", value)
+                if coords_match and Coordinates.parse_coords_text(coords_match.group(1)) is not None:
+                    step['coords'] = coords_match.group(1)
+                    value = value[:coords_match.start()]
+                step['note'] = "" if value == "--" else value
+            else:
+                step[LuaGenerator.TAG_FIELDS[tag]] = value
+        return step
+    
+    @staticmethod
+    def semantic_steps(lua_code, guide_zone=""):
+        """
+        Obtiene una forma normalizada de los pasos para comparar dos salidas.
         
-        # Fin del código Lua
-        lua_code += '\n]]\nend)\n'
+        Args:
+            lua_code (str): Código Lua de una guía
+            guide_zone (str, optional): Zona implícita de los pasos sin |Z|. Defaults to "".
+            
+        Returns:
+            list: Tuplas comparables, una por paso
+        """
+        normalized = []
+        for step in LuaGenerator.parse_lua(lua_code)['steps']:
+            coords = Coordinates.parse_coords_text(step['coords'])
+            if coords is not None:
+                coords = tuple(round(value, LuaGenerator.COORD_PRECISION) for value in coords)
+            normalized.append((
+                step['action'], step['quest_name'], step['quest_id'], step['note'], coords,
+                step['class'], step['race'], step['zone'] or guide_zone, step['obj_id']
+            ))
+        return normalized
+    
+    @staticmethod
+    def compare_output(original_code, optimized_code, guide_zone=""):
+        """
+        Compara la salida normal y la optimizada de una guía.
         
-        return lua_code
\ No newline at end of file
+        Args:
+            original_code (str): Código generado en modo normal
+            optimized_code (str): Código generado en modo optimizado
+            guide_zone (str, optional): Zona de la guía. Defaults to "".
+            
+        Returns:
+            dict: 'original_bytes', 'optimized_bytes', 'saved_bytes' y 'equivalent'
+                (True si ambas salidas describen los mismos pasos)
+        """
+        original_bytes = len(original_code.encode('utf-8'))
+        optimized_bytes = len(optimized_code.encode('utf-8'))
+        equivalent = (
+            LuaGenerator.parse_lua(original_code)['guide_name'] == LuaGenerator.parse_lua(optimized_code)['guide_name']
+            and LuaGenerator.semantic_steps(original_code, guide_zone)
+            == LuaGenerator.semantic_steps(optimized_code, guide_zone)
+        )
+        return {
+            'original_bytes': original_bytes,
+            'optimized_bytes': optimized_bytes,
+            'saved_bytes': original_bytes - optimized_bytes,
+            'equivalent': equivalent
+        }
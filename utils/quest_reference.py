@@ -0,0 +1,246 @@
+import mmap
+import os
+import struct
+
+from models.coordinates import Coordinates
+from utils.data_loader import DataLoader
+
+class QuestReference:
+    """
+    Base de datos de referencia de misiones, de solo lectura.
+    
+    El archivo contiene una cabecera, un array de registros de ancho fijo
+    ordenados por ID de misión y, a continuación, los textos (nombre y zona)
+    terminados en cero. Se abre con mmap y cada consulta es una búsqueda
+    binaria sobre los registros, así que no se carga nada en memoria.
+    """
+    
+    # Archivo incluido en la carpeta resources
+    FILENAME = "quest_reference.db"
+    
+    MAGIC = b"GPQR"
+    VERSION = 1
+    
+    # Cabecera: firma, versión, tamaño de registro y número de registros
+    HEADER = struct.Struct("<4sHHI")
+    
+    # Registro: ID, posición del nombre, posición de la zona, x, y (centésimas) y nivel
+    RECORD = struct.Struct("<IIIHHB3x")
+    
+    # Valor de coordenada para los registros sin coordenadas
+    NO_COORD = 0xFFFF
+    
+    def __init__(self, filename=None):
+        """
+        Inicializa la base de datos (el archivo se abre en la primera consulta).
+        
+        Args:
+            filename (str, optional): Ruta del archivo. Defaults to None (el incluido en resources).
+        """
+        self.filename = filename or DataLoader.get_resource_path(QuestReference.FILENAME)
+        self.data = None
+        self.count = 0
+        self.strings_offset = 0
+        self.opened = False
+    
+    def open(self):
+        """
+        Proyecta el archivo en memoria si existe y es válido.
+        
+        Returns:
+            bool: True si hay datos disponibles
+        """
+        if self.opened:
+            return self.data is not None
+        self.opened = True
+        
+        try:
+            with open(self.filename, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Archivo inexistente o vacío: la referencia queda sin datos
+            return False
+        
+        if len(data) < QuestReference.HEADER.size:
+            data.close()
+            return False
+        magic, version, record_size, count = QuestReference.HEADER.unpack_from(data, 0)
+        if (magic != QuestReference.MAGIC or version != QuestReference.VERSION
+                or record_size != QuestReference.RECORD.size):
+            print(f"Invalid quest reference file: {self.filename}")
+            data.close()
+            return False
+        
+        self.data = data
+        self.count = count
+        self.strings_offset = QuestReference.HEADER.size + count * record_size
+        return True
+    
+    def close(self):
+        """Libera la proyección del archivo."""
+        if self.data is not None:
+            self.data.close()
+        self.data = None
+        self.count = 0
+        self.opened = False
+    
+    def __len__(self):
+        """Devuelve el número de misiones de la referencia."""
+        self.open()
+        return self.count
+    
+    def find_record(self, quest_id):
+        """
+        Busca el registro de una misión mediante búsqueda binaria.
+        
+        Args:
+            quest_id (int): ID de la misión
+        
+        Returns:
+            tuple or None: Campos del registro o None si no existe
+        """
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record = QuestReference.RECORD.unpack_from(
+                self.data, QuestReference.HEADER.size + middle * QuestReference.RECORD.size)
+            if record[0] < quest_id:
+                low = middle + 1
+            elif record[0] > quest_id:
+                high = middle
+            else:
+                return record
+        return None
+    
+    def read_string(self, offset):
+        """
+        Lee un texto de la zona de textos.
+        
+        Args:
+            offset (int): Posición relativa al inicio de los textos
+        
+        Returns:
+            str: Texto leído
+        """
+        start = self.strings_offset + offset
+        end = self.data.find(b"\0", start)
+        return self.data[start:end].decode('utf-8')
+    
+    def get(self, quest_id):
+        """
+        Obtiene los datos de referencia de una misión.
+        
+        Args:
+            quest_id (str or int): ID de la misión
+        
+        Returns:
+            dict or None: Diccionario con 'quest_id', 'name', 'zone', 'level',
+            'coord_x' y 'coord_y', o None si la misión no está en la referencia
+        """
+        try:
+            quest_id = int(str(quest_id).strip())
+        except ValueError:
+            return None
+        if not 0 <= quest_id <= 0xFFFFFFFF or not self.open():
+            return None
+        
+        record = self.find_record(quest_id)
+        if record is None:
+            return None
+        
+        _, name_offset, zone_offset, x, y, level = record
+        coord_x = coord_y = ""
+        if x != QuestReference.NO_COORD and y != QuestReference.NO_COORD:
+            coord_x, coord_y = Coordinates.format_pair(x / 100, y / 100).split(", ")
+        return {
+            'quest_id': str(quest_id),
+            'name': self.read_string(name_offset),
+            'zone': self.read_string(zone_offset),
+            'level': level or None,
+            'coord_x': coord_x,
+            'coord_y': coord_y
+        }
+    
+    def lookup(self, quest_id, action):
+        """
+        Reúne los datos para autocompletar el formulario (mismo formato que QuestHistory.lookup).
+        
+        Args:
+            quest_id (str): ID de la misión
+            action (str): Acción actual del formulario
+        
+        Returns:
+            dict or None: Diccionario con 'name', 'next_action' y 'coords', o None si no existe
+        """
+        quest = self.get(quest_id)
+        if quest is None:
+            return None
+        
+        # Las coordenadas de referencia son las de quien da la misión
+        coords = None
+        if action == 'A' and quest['coord_x']:
+            coords = (quest['coord_x'], quest['coord_y'])
+        
+        return {
+            'name': quest['name'],
+            'next_action': None,
+            'coords': coords
+        }
+    
+    @staticmethod
+    def build(quests, filename):
+        """
+        Genera un archivo de referencia a partir de una lista de misiones.
+        
+        Args:
+            quests (iterable): Diccionarios con 'quest_id', 'name' y, opcionalmente,
+                'zone', 'level', 'coord_x' y 'coord_y'
+            filename (str): Ruta del archivo a generar
+        
+        Returns:
+            int: Número de misiones escritas (los IDs repetidos conservan la última)
+        """
+        by_id = {}
+        for quest in quests:
+            try:
+                quest_id = int(str(quest.get('quest_id', '')).strip())
+            except ValueError:
+                continue
+            if 0 <= quest_id <= 0xFFFFFFFF:
+                by_id[quest_id] = quest
+        
+        strings = bytearray()
+        string_offsets = {}
+        
+        def add_string(text):
+            # Los textos repetidos (sobre todo las zonas) se guardan una sola vez
+            text = (text or "").replace("\0", "")
+            if text not in string_offsets:
+                string_offsets[text] = len(strings)
+                strings.extend(text.encode('utf-8') + b"\0")
+            return string_offsets[text]
+        
+        records = bytearray()
+        for quest_id in sorted(by_id):
+            quest = by_id[quest_id]
+            x = y = QuestReference.NO_COORD
+            pair = Coordinates.parse_pair(quest.get('coord_x'), quest.get('coord_y'))
+            if pair is not None:
+                x, y = round(pair[0] * 100), round(pair[1] * 100)
+            try:
+                level = max(0, min(int(quest.get('level') or 0), 255))
+            except (TypeError, ValueError):
+                level = 0
+            records.extend(QuestReference.RECORD.pack(
+                quest_id, add_string(quest.get('name')), add_string(quest.get('zone')), x, y, level))
+        
+        header = QuestReference.HEADER.pack(
+            QuestReference.MAGIC, QuestReference.VERSION, QuestReference.RECORD.size, len(by_id))
+        
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, 'wb') as f:
+            f.write(header)
+            f.write(records)
+            f.write(strings)
+        os.replace(temp_filename, filename)
+        return len(by_id)
@@ -0,0 +1,356 @@
+import math
+
+from models.coordinates import Coordinates
+
+class RouteOptimizer:
+    """
+    Reordena pasos de una guía para reducir la distancia recorrida.
+    
+    Los pasos fijos (hearthstone, vuelos, barcos...) no se mueven y dividen el rango
+    en tramos que se optimizan por separado. Dentro de cada tramo se respeta el
+    orden A -> C -> T de cada misión. Se parte de la heurística del vecino más
+    cercano y se mejora con 2-opt y Or-opt.
+    """
+    
+    # Acciones que nunca se mueven
+    PINNED_ACTIONS = ('H', 'h', 'F', 'b', 'D')
+    
+    # Orden obligatorio de las acciones de una misión
+    ACTION_RANK = {'A': 0, 'C': 1, 'T': 2}
+    
+    # Máximo de pasadas de mejora local por tramo
+    MAX_PASSES = 50
+    
+    @staticmethod
+    def optimize(steps, start_coords=None):
+        """
+        Optimiza el orden de un rango de pasos.
+        
+        Args:
+            steps (list): Pasos del rango a optimizar
+            start_coords (tuple, optional): Posición (x, y) antes del rango. Defaults to None.
+        
+        Returns:
+            tuple: (pasos reordenados, distancia antes, distancia después)
+        """
+        steps = list(steps)
+        distance_before = RouteOptimizer.route_distance(steps, start_coords)
+        
+        result = []
+        position = start_coords
+        for pinned, segment in RouteOptimizer._split_segments(steps):
+            if pinned:
+                result.extend(segment)
+            else:
+                result.extend(RouteOptimizer._optimize_segment(segment, position))
+            
+            # La posición tras el tramo es la del último paso con coordenadas
+            for step in reversed(result):
+                coords = Coordinates.from_step(step)
+                if coords is not None:
+                    position = coords
+                    break
+        
+        distance_after = RouteOptimizer.route_distance(result, start_coords)
+        
+        # Nunca empeorar la ruta original
+        if distance_after >= distance_before:
+            return steps, distance_before, distance_before
+        return result, distance_before, distance_after
+    
+    @staticmethod
+    def route_distance(steps, start_coords=None):
+        """
+        Calcula la distancia total recorrida entre pasos con coordenadas.
+        Los tramos tras un paso fijo (viaje rápido) no se cuentan.
+        
+        Args:
+            steps (list): Pasos en orden
+            start_coords (tuple, optional): Posición inicial. Defaults to None.
+        
+        Returns:
+            float: Distancia total estimada (unidades de mapa)
+        """
+        total = 0.0
+        position = start_coords
+        for step in steps:
+            if step.get('action') in RouteOptimizer.PINNED_ACTIONS:
+                position = None
+            coords = Coordinates.from_step(step)
+            if coords is None:
+                continue
+            if position is not None:
+                total += math.hypot(coords[0] - position[0], coords[1] - position[1])
+            position = coords
+        return total
+    
+    @staticmethod
+    def _split_segments(steps):
+        """
+        Divide los pasos en tramos móviles y pasos fijos.
+        Un cambio de zona también se trata como frontera fija.
+        
+        Args:
+            steps (list): Pasos del rango
+        
+        Returns:
+            list: Pares (es_fijo, lista de pasos)
+        """
+        segments = []
+        current = []
+        current_zone = None
+        for step in steps:
+            zone = step.get('zone') or ""
+            if step.get('action') in RouteOptimizer.PINNED_ACTIONS:
+                if current:
+                    segments.append((False, current))
+                segments.append((True, [step]))
+                current = []
+                current_zone = None
+                continue
+            if current and zone and current_zone and zone != current_zone:
+                segments.append((False, current))
+                current = []
+            current.append(step)
+            current_zone = zone or current_zone
+        if current:
+            segments.append((False, current))
+        return segments
+    
+    @staticmethod
+    def _build_units(segment):
+        """
+        Agrupa cada paso con coordenadas con los pasos sin coordenadas que le siguen.
+        
+        Args:
+            segment (list): Pasos de un tramo
+        
+        Returns:
+            tuple: (pasos iniciales sin coordenadas, lista de unidades)
+        """
+        leading = []
+        units = []
+        for step in segment:
+            coords = Coordinates.from_step(step)
+            if coords is not None:
+                units.append({'coords': coords, 'steps': [step]})
+            elif units:
+                units[-1]['steps'].append(step)
+            else:
+                leading.append(step)
+        return leading, units
+    
+    @staticmethod
+    def _precedence(units):
+        """
+        Calcula las restricciones de orden entre unidades (A antes de C antes de T).
+        
+        Args:
+            units (list): Unidades del tramo
+        
+        Returns:
+            list: Conjuntos de unidades que deben ir antes de cada unidad
+        """
+        ranks_by_quest = {}
+        for index, unit in enumerate(units):
+            for step in unit['steps']:
+                rank = RouteOptimizer.ACTION_RANK.get(step.get('action'))
+                if rank is not None and step.get('quest_id'):
+                    ranks_by_quest.setdefault(step['quest_id'], []).append((rank, index))
+        
+        predecessors = [set() for _ in units]
+        for events in ranks_by_quest.values():
+            for rank, index in events:
+                for other_rank, other_index in events:
+                    if other_rank < rank and other_index != index:
+                        predecessors[index].add(other_index)
+        return predecessors
+    
+    @staticmethod
+    def _distance_matrix(points):
+        """
+        Calcula la matriz de distancias euclídeas entre puntos.
+        
+        Args:
+            points (list): Coordenadas (x, y)
+        
+        Returns:
+            list: Matriz de distancias como lista de listas
+        """
+        return [[math.hypot(ax - bx, ay - by) for bx, by in points] for ax, ay in points]
+    
+    @staticmethod
+    def _optimize_segment(segment, start_coords):
+        """
+        Optimiza un tramo móvil respetando el orden de las misiones.
+        
+        Args:
+            segment (list): Pasos del tramo
+            start_coords (tuple or None): Posición antes del tramo
+        
+        Returns:
+            list: Pasos del tramo reordenados
+        """
+        leading, units = RouteOptimizer._build_units(segment)
+        if len(units) < 3:
+            return segment
+        
+        predecessors = RouteOptimizer._precedence(units)
+        
+        # El nodo 0 es la posición de partida (o la primera unidad si no hay)
+        points = [start_coords or units[0]['coords']] + [unit['coords'] for unit in units]
+        matrix = RouteOptimizer._distance_matrix(points)
+        
+        order = RouteOptimizer._nearest_neighbour(matrix, predecessors)
+        order = RouteOptimizer._improve(order, matrix, predecessors)
+        
+        result = list(leading)
+        for index in order:
+            result.extend(units[index]['steps'])
+        return result
+    
+    @staticmethod
+    def _nearest_neighbour(matrix, predecessors):
+        """
+        Construye una ruta inicial eligiendo siempre la unidad disponible más cercana.
+        
+        Args:
+            matrix (list): Matriz de distancias (nodo 0 = salida)
+            predecessors (list): Restricciones de orden por unidad
+        
+        Returns:
+            list: Orden de las unidades
+        """
+        count = len(predecessors)
+        placed = set()
+        order = []
+        current = 0
+        while len(order) < count:
+            available = [
+                unit for unit in range(count)
+                if unit not in placed and predecessors[unit] <= placed
+            ]
+            if not available:
+                # Restricciones cíclicas (datos incoherentes): conservar el orden original
+                available = [unit for unit in range(count) if unit not in placed][:1]
+            best = min(available, key=lambda unit: matrix[current][unit + 1])
+            order.append(best)
+            placed.add(best)
+            current = best + 1
+        return order
+    
+    @staticmethod
+    def _is_feasible(order, predecessors):
+        """Indica si un orden respeta todas las restricciones de precedencia."""
+        position = {unit: index for index, unit in enumerate(order)}
+        return all(
+            position[before] < position[unit]
+            for unit, required in enumerate(predecessors)
+            for before in required
+        )
+    
+    @staticmethod
+    def _improve(order, matrix, predecessors):
+        """
+        Mejora la ruta con movimientos 2-opt y Or-opt que respetan las restricciones.
+        
+        Se mantiene la posición de cada unidad en la ruta, de modo que la
+        factibilidad de un movimiento se comprueba solo con las restricciones
+        de las unidades que cambian de orden relativo, sin recorrer la ruta.
+        
+        Args:
+            order (list): Orden inicial de las unidades
+            matrix (list): Matriz de distancias (nodo 0 = salida)
+            predecessors (list): Restricciones de orden por unidad
+        
+        Returns:
+            list: Orden mejorado
+        """
+        if not RouteOptimizer._is_feasible(order, predecessors):
+            return order
+        
+        successors = [set() for _ in predecessors]
+        for unit, required in enumerate(predecessors):
+            for before in required:
+                successors[before].add(unit)
+        
+        count = len(order)
+        position = [0] * count
+        
+        def place(start, end):
+            for index in range(start, end):
+                position[order[index]] = index
+        
+        def node(route, index):
+            return 0 if index < 0 else route[index] + 1
+        
+        place(0, count)
+        for _ in range(RouteOptimizer.MAX_PASSES):
+            improved = False
+            
+            # 2-opt: invertir el tramo [i, j] de la ruta abierta. Solo se incumple
+            # una restricción si el tramo contiene una unidad y su predecesora, y
+            # entonces también la incumplen todos los tramos más largos.
+            for i in range(count - 1):
+                for j in range(i + 1, count):
+                    if any(i <= position[before] for before in predecessors[order[j]]):
+                        break
+                    a, b = node(order, i - 1), node(order, i)
+                    c = node(order, j)
+                    d = node(order, j + 1) if j + 1 < count else None
+                    delta = matrix[a][c] - matrix[a][b]
+                    if d is not None:
+                        delta += matrix[b][d] - matrix[c][d]
+                    if delta < -1e-9:
+                        order[i:j + 1] = order[i:j + 1][::-1]
+                        place(i, j + 1)
+                        improved = True
+            
+            # Or-opt: mover bloques de 1 a 3 unidades a otra posición
+            for length in (1, 2, 3):
+                i = 0
+                while i + length <= count:
+                    block = order[i:i + length]
+                    first, last = block[0] + 1, block[-1] + 1
+                    before = node(order, i - 1)
+                    after = node(order, i + length) if i + length < count else None
+                    
+                    # Ahorro al quitar el bloque de su posición actual
+                    removal = matrix[before][first]
+                    if after is not None:
+                        removal += matrix[last][after] - matrix[before][after]
+                    
+                    # El bloque debe quedar tras sus predecesoras y antes de sus sucesoras
+                    # externas: solo son válidas las posiciones entre ambas
+                    latest, earliest = -1, count
+                    for unit in block:
+                        for other in predecessors[unit]:
+                            if position[other] < i:
+                                latest = max(latest, position[other])
+                        for other in successors[unit]:
+                            if position[other] >= i + length:
+                                earliest = min(earliest, position[other])
+                    
+                    rest = order[:i] + order[i + length:]
+                    best_j, best_delta = None, -1e-9
+                    for j in range(latest + 1, earliest - length + 1):
+                        if j == i:
+                            continue
+                        x = node(rest, j - 1)
+                        y = rest[j] + 1 if j < len(rest) else None
+                        insertion = matrix[x][first]
+                        if y is not None:
+                            insertion += matrix[last][y] - matrix[x][y]
+                        delta = insertion - removal
+                        if delta < best_delta:
+                            best_j, best_delta = j, delta
+                    
+                    if best_j is not None:
+                        order = rest[:best_j] + block + rest[best_j:]
+                        place(min(i, best_j), max(i, best_j) + length)
+                        improved = True
+                    i += 1
+            
+            if not improved:
+                break
+        return order
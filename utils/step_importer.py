@@ -0,0 +1,219 @@
+import csv
+
+from models.coordinates import Coordinates
+from utils.data_loader import DataLoader
+
+class StepImporter:
+    """
+    Importador de pasos desde tablas CSV o TSV (por ejemplo, exportadas de una hoja de cálculo).
+    
+    El archivo se lee fila a fila sin cargarlo entero en memoria. Cada
+    columna se asigna a un campo del paso (por su cabecera o con una
+    asignación explícita) y cada fila se valida en la misma pasada: acción,
+    clase, raza y zona contra las listas de DataLoader, campos obligatorios y
+    coordenadas. Los nombres se normalizan a la forma de las listas
+    ("warrior" -> "Warrior").
+    """
+    
+    # Campos de un paso (los mismos que produce FormFrame)
+    FIELDS = ('action', 'quest_name', 'quest_id', 'note', 'coords', 'coord_x', 'coord_y',
+              'class', 'race', 'zone', 'obj_id')
+    
+    # Nombres de cabecera reconocidos además del propio nombre del campo
+    HEADER_ALIASES = {
+        'type': 'action',
+        'name': 'quest_name',
+        'quest': 'quest_name',
+        'id': 'quest_id',
+        'qid': 'quest_id',
+        'notes': 'note',
+        'coordinates': 'coords',
+        'x': 'coord_x',
+        'y': 'coord_y',
+        'obj': 'obj_id',
+        'object': 'obj_id',
+        'object_id': 'obj_id',
+        'item': 'obj_id'
+    }
+    
+    # Filas procesadas entre informes de progreso
+    REPORT_INTERVAL = 1000
+    
+    def __init__(self, action_types=None, classes=None, races=None, zones=None):
+        """
+        Inicializa el importador con las listas válidas (por defecto, las de DataLoader).
+        
+        Args:
+            action_types (dict, optional): Tipos de acción. Defaults to None.
+            classes (list, optional): Clases. Defaults to None.
+            races (list, optional): Razas. Defaults to None.
+            zones (list, optional): Zonas. Defaults to None.
+        """
+        if action_types is None:
+            action_types = DataLoader.load_action_types()
+        
+        # Valor en minúsculas -> valor canónico
+        self.actions = {action.lower(): action for action in action_types}
+        self.classes = self._lookup(DataLoader.load_class_list() if classes is None else classes)
+        self.races = self._lookup(DataLoader.load_race_list() if races is None else races)
+        self.zones = self._lookup(DataLoader.load_zone_list() if zones is None else zones)
+    
+    @staticmethod
+    def _lookup(values):
+        """Construye la tabla de búsqueda sin distinguir mayúsculas de una lista de valores."""
+        lookup = {value.lower(): value for value in values}
+        lookup.setdefault("", "")
+        return lookup
+    
+    @staticmethod
+    def normalize_header(header):
+        """
+        Normaliza el texto de una cabecera ("Quest Name" -> "quest_name").
+        
+        Args:
+            header (str): Texto de la cabecera
+        
+        Returns:
+            str: Cabecera normalizada
+        """
+        return "_".join(header.strip().lower().replace("-", " ").replace("_", " ").split())
+    
+    @staticmethod
+    def map_columns(header, mapping=None):
+        """
+        Asigna las columnas de una tabla a los campos del paso.
+        
+        Args:
+            header (list): Cabeceras de la tabla
+            mapping (dict, optional): Cabecera -> campo; sustituye a la detección
+                automática. Defaults to None.
+        
+        Returns:
+            list: Campo de cada columna o None si la columna se ignora
+        """
+        if mapping is not None:
+            normalized = {StepImporter.normalize_header(name): field for name, field in mapping.items()}
+            return [normalized.get(StepImporter.normalize_header(name)) for name in header]
+        
+        fields = []
+        for name in header:
+            name = StepImporter.normalize_header(name)
+            field = name if name in StepImporter.FIELDS else StepImporter.HEADER_ALIASES.get(name)
+            fields.append(field if field not in fields else None)
+        return fields
+    
+    @staticmethod
+    def detect_delimiter(filename, sample):
+        """
+        Detecta el separador de columnas de una tabla.
+        
+        Args:
+            filename (str): Ruta del archivo (la extensión .tsv implica tabulador)
+            sample (str): Comienzo del archivo
+        
+        Returns:
+            str: Separador de columnas
+        """
+        if filename.lower().endswith(('.tsv', '.tab')):
+            return "\t"
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+        except csv.Error:
+            return ","
+    
+    def read_steps(self, filename, mapping=None, delimiter=None, task=None):
+        """
+        Lee y valida los pasos de una tabla CSV o TSV en una sola pasada.
+        
+        Args:
+            filename (str): Ruta del archivo (la primera fila son las cabeceras)
+            mapping (dict, optional): Cabecera -> campo del paso. Defaults to None (detección automática).
+            delimiter (str, optional): Separador de columnas. Defaults to None (detección automática).
+            task (BackgroundTask, optional): Tarea para informar del progreso. Defaults to None.
+        
+        Returns:
+            dict: 'steps' válidos, 'errors' (mensajes con el número de línea) y
+            'ignored_columns' (cabeceras sin campo asignado)
+        
+        Raises:
+            ValueError: Si la tabla no tiene cabeceras o no tiene columna de acción o de nombre
+        """
+        steps = []
+        errors = []
+        with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+            if delimiter is None:
+                delimiter = self.detect_delimiter(filename, f.read(4096))
+                f.seek(0)
+            reader = csv.reader(f, delimiter=delimiter)
+            
+            header = next(reader, None)
+            if not header:
+                raise ValueError("The file has no header row")
+            fields = self.map_columns(header, mapping)
+            if 'action' not in fields or 'quest_name' not in fields:
+                raise ValueError("The file needs Action and Quest Name columns")
+            
+            rows = 0
+            for row in reader:
+                rows += 1
+                if task is not None and rows % self.REPORT_INTERVAL == 0:
+                    task.report(rows, unit="rows")
+                if not any(value.strip() for value in row):
+                    continue
+                
+                try:
+                    steps.append(self.build_step(fields, row))
+                except ValueError as e:
+                    errors.append(f"Line {reader.line_num}: {str(e)}")
+        
+        if task is not None:
+            task.report(rows, unit="rows")
+        return {
+            'steps': steps,
+            'errors': errors,
+            'ignored_columns': [name for name, field in zip(header, fields) if field is None]
+        }
+    
+    def build_step(self, fields, row):
+        """
+        Construye y valida un paso a partir de una fila.
+        
+        Args:
+            fields (list): Campo de cada columna (ver map_columns)
+            row (list): Valores de la fila
+        
+        Returns:
+            dict: Paso con todos los campos del formulario
+        
+        Raises:
+            ValueError: Si algún valor no es válido
+        """
+        step = dict.fromkeys(self.FIELDS, "")
+        for field, value in zip(fields, row):
+            if field is not None:
+                step[field] = value.strip()
+        
+        action = self.actions.get(step['action'].lower())
+        if action is None:
+            raise ValueError(f"Unknown action '{step['action']}'")
+        step['action'] = action
+        if not step['quest_name']:
+            raise ValueError("Quest Name is required")
+        
+        for field, lookup in (('class', self.classes), ('race', self.races), ('zone', self.zones)):
+            value = lookup.get(step[field].lower())
+            if value is None:
+                raise ValueError(f"Unknown {field} '{step[field]}'")
+            step[field] = value
+        
+        # Completar las coordenadas en ambos formatos ("x, y" y por separado)
+        if not step['coord_x'] and not step['coord_y'] and step['coords']:
+            parts = step['coords'].split(',')
+            if len(parts) != 2:
+                raise ValueError(f"Invalid coordinates '{step['coords']}'")
+            step['coord_x'], step['coord_y'] = parts[0].strip(), parts[1].strip()
+        coords_error = Coordinates.validate_step(step)
+        if coords_error:
+            raise ValueError(coords_error)
+        step['coords'] = f"{step['coord_x']}, {step['coord_y']}" if step['coord_x'] else ""
+        return step